@@ -6,7 +6,13 @@ from .experience_calculator import calculate_experience_score
 from .education_calculator import calculate_education_score
 from .location_calculator import calculate_location_score
 from .salary_calculator import calculate_salary_score
-from .semantic_calculator import calculate_semantic_score, is_semantic_enabled
+from .semantic_calculator import (
+    JOB_TEXT_PREFETCH,
+    RECRUITER_TEXT_PREFETCH,
+    calculate_semantic_score,
+    calculate_semantic_scores,
+    is_semantic_enabled,
+)
 
 __all__ = [
     'calculate_skill_score',
@@ -15,5 +21,8 @@ __all__ = [
     'calculate_location_score',
     'calculate_salary_score',
     'calculate_semantic_score',
+    'calculate_semantic_scores',
     'is_semantic_enabled',
+    'JOB_TEXT_PREFETCH',
+    'RECRUITER_TEXT_PREFETCH',
 ]
@@ -3,10 +3,18 @@ import logging
 from decimal import Decimal
 from typing import Optional
 
+import numpy as np
+
 from apps.assessment.ai_matching_scores.services.gemini_service import GeminiService
+from apps.assessment.ai_matching_scores.services.embedding_store import EmbeddingStore
 
 logger = logging.getLogger(__name__)
 
+# Relations read by _build_job_text / _build_recruiter_text; prefetch them
+# when building texts for many rows so each text costs no extra query
+JOB_TEXT_PREFETCH = ('required_skills__skill',)
+RECRUITER_TEXT_PREFETCH = ('skills__skill', 'education')
+
 
 def get_embedding_model() -> str:
     """Get the embedding model name."""
@@ -26,21 +34,141 @@ def get_embedding(text: str) -> Optional[list[float]]:
     return GeminiService.get_embedding(text)
 
 
+def get_embeddings(texts: list[str]) -> list[Optional[list[float]]]:
+    """
+    Get embedding vectors for many texts with batched Gemini requests.
+    
+    Returns:
+        List aligned with texts (None where embedding failed)
+    """
+    return GeminiService.get_embeddings(texts)
+
+
+def get_cached_embedding(text: str) -> Optional[list[float]]:
+    """
+    Get embedding for a text, reusing the persistent store when possible.
+    
+    Only texts never seen before (for the current model) reach the Gemini API.
+    """
+    return EmbeddingStore.get_or_embed(text, get_embedding_model(), get_embedding)
+
+
+def get_cached_embeddings(texts: list[str]) -> dict[str, list[float]]:
+    """
+    Get embeddings for many texts: one store query, batched API calls only
+    for misses.
+    
+    Returns:
+        Dict mapping text -> embedding (texts whose embedding failed are absent)
+    """
+    model_name = get_embedding_model()
+    found = EmbeddingStore.get_many(texts, model_name)
+    
+    missing = [text for text in dict.fromkeys(texts) if text not in found]
+    if not missing:
+        return found
+    
+    for text, values in zip(missing, get_embeddings(missing)):
+        if values:
+            EmbeddingStore.put(text, model_name, values)
+            found[text] = values
+    
+    return found
+
+
+def normalize_vector(vector) -> np.ndarray:
+    """Return a float32 unit vector (all zeros if the input has zero norm)."""
+    vec = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    if norm == 0:
+        return np.zeros_like(vec)
+    return vec / norm
+
+
+def build_embedding_matrix(vectors: list) -> np.ndarray:
+    """
+    Stack vectors into a contiguous float32 matrix with L2-normalized rows.
+    
+    Zero-norm rows stay zero so their similarity is 0.0, like cosine_similarity.
+    """
+    if len(vectors) == 0:
+        return np.zeros((0, 0), dtype=np.float32)
+    
+    matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def batch_cosine_similarity(vector, matrix: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of one vector against every row of a normalized matrix.
+    
+    Args:
+        vector: Query embedding (job or recruiter)
+        matrix: Output of build_embedding_matrix for the other side
+        
+    Returns:
+        1-D float32 array of similarities, one per matrix row
+    """
+    if matrix.size == 0:
+        return np.zeros(matrix.shape[0], dtype=np.float32)
+    
+    query = normalize_vector(vector)
+    if query.shape[0] != matrix.shape[1]:
+        return np.zeros(matrix.shape[0], dtype=np.float32)
+    
+    return matrix @ query
+
+
 def cosine_similarity(vec1: list[float], vec2: list[float]) -> float:
     """
     Calculate cosine similarity between two vectors.
     """
-    if not vec1 or not vec2 or len(vec1) != len(vec2):
+    if vec1 is None or vec2 is None or len(vec1) == 0 or len(vec1) != len(vec2):
         return 0.0
     
-    dot_product = sum(a * b for a, b in zip(vec1, vec2))
-    magnitude1 = sum(a * a for a in vec1) ** 0.5
-    magnitude2 = sum(b * b for b in vec2) ** 0.5
-    
-    if magnitude1 == 0 or magnitude2 == 0:
-        return 0.0
+    return float(np.dot(normalize_vector(vec1), normalize_vector(vec2)))
+
+
+def _disabled_result() -> dict:
+    return {
+        'score': Decimal('0.00'),
+        'is_semantic': False,
+        'details': {
+            'status': 'disabled',
+            'message': 'Gemini API not configured. Using rule-based matching only.',
+        }
+    }
+
+
+def _fallback_result(status: str, message: str) -> dict:
+    return {
+        'score': Decimal('50.00'),
+        'is_semantic': False,
+        'details': {
+            'status': status,
+            'message': message,
+        }
+    }
+
+
+def _similarity_result(similarity: float, job_text: str, recruiter_text: str) -> dict:
+    # Convert to 0-100 score
+    score = Decimal(str(max(0, min(100, similarity * 100))))
+    score = score.quantize(Decimal('0.01'))
     
-    return dot_product / (magnitude1 * magnitude2)
+    return {
+        'score': score,
+        'is_semantic': True,
+        'details': {
+            'status': 'success',
+            'raw_similarity': float(similarity),
+            'model': get_embedding_model(),
+            'job_text_length': len(job_text),
+            'recruiter_text_length': len(recruiter_text),
+        }
+    }
 
 
 def calculate_semantic_score(job, recruiter) -> dict:
@@ -49,14 +177,7 @@ def calculate_semantic_score(job, recruiter) -> dict:
     """
     # Check if AI is available
     if not is_semantic_enabled():
-        return {
-            'score': Decimal('0.00'),
-            'is_semantic': False,
-            'details': {
-                'status': 'disabled',
-                'message': 'Gemini API not configured. Using rule-based matching only.',
-            }
-        }
+        return _disabled_result()
     
     try:
         # Build job text
@@ -66,62 +187,104 @@ def calculate_semantic_score(job, recruiter) -> dict:
         recruiter_text = _build_recruiter_text(recruiter)
         
         if not job_text or not recruiter_text:
-            return {
-                'score': Decimal('50.00'),
-                'is_semantic': False,
-                'details': {
-                    'status': 'insufficient_data',
-                    'message': 'Not enough text data for semantic analysis',
-                }
-            }
-        
-        # Get embeddings
-        job_embedding = get_embedding(job_text)
-        recruiter_embedding = get_embedding(recruiter_text)
+            return _fallback_result(
+                'insufficient_data', 'Not enough text data for semantic analysis'
+            )
+        
+        # Get embeddings (cached by content hash)
+        job_embedding = get_cached_embedding(job_text)
+        recruiter_embedding = get_cached_embedding(recruiter_text)
         
         if not job_embedding or not recruiter_embedding:
-            return {
-                'score': Decimal('50.00'),
-                'is_semantic': False,
-                'details': {
-                    'status': 'embedding_failed',
-                    'message': 'Failed to generate embeddings via Gemini',
-                }
-            }
+            return _fallback_result(
+                'embedding_failed', 'Failed to generate embeddings via Gemini'
+            )
         
         # Calculate similarity
         similarity = cosine_similarity(job_embedding, recruiter_embedding)
         
-        # Convert to 0-100 score
-        score = Decimal(str(max(0, min(100, similarity * 100))))
-        score = score.quantize(Decimal('0.01'))
-        
-        return {
-            'score': score,
-            'is_semantic': True,
-            'details': {
-                'status': 'success',
-                'raw_similarity': float(similarity),
-                'model': get_embedding_model(),
-                'job_text_length': len(job_text),
-                'recruiter_text_length': len(recruiter_text),
-            }
-        }
+        return _similarity_result(similarity, job_text, recruiter_text)
         
     except Exception as e:
         logger.error(f"Semantic calculation error: {e}")
-        return {
-            'score': Decimal('50.00'),
-            'is_semantic': False,
-            'details': {
-                'status': 'error',
-                'message': str(e),
-            }
-        }
+        return _fallback_result('error', str(e))
+
+
+def calculate_semantic_scores(anchor, others: list, anchor_is_job: bool = True) -> dict:
+    """
+    Batch semantic scoring: one job against many recruiters, or the reverse.
+    
+    Embeddings are fetched in bulk and all similarities are computed in a
+    single matrix-vector product. Each result has the same shape as
+    calculate_semantic_score.
+    
+    Args:
+        anchor: Job (anchor_is_job=True) or Recruiter instance
+        others: Recruiters (anchor_is_job=True) or Jobs to score against anchor
+        anchor_is_job: Which side the anchor is on
+        
+    Returns:
+        Dict mapping other.id -> semantic result dict
+    """
+    if not is_semantic_enabled():
+        return {other.id: _disabled_result() for other in others}
+    
+    try:
+        if anchor_is_job:
+            anchor_text = _build_job_text(anchor)
+            other_texts = {other.id: _build_recruiter_text(other) for other in others}
+        else:
+            anchor_text = _build_recruiter_text(anchor)
+            other_texts = {other.id: _build_job_text(other) for other in others}
+        
+        results = {}
+        if not anchor_text:
+            for other_id in other_texts:
+                results[other_id] = _fallback_result(
+                    'insufficient_data', 'Not enough text data for semantic analysis'
+                )
+            return results
+        
+        embeddings = get_cached_embeddings(
+            [anchor_text] + [text for text in other_texts.values() if text]
+        )
+        anchor_embedding = embeddings.get(anchor_text)
+        
+        scored_ids = []
+        scored_vectors = []
+        for other_id, text in other_texts.items():
+            if not text:
+                results[other_id] = _fallback_result(
+                    'insufficient_data', 'Not enough text data for semantic analysis'
+                )
+            elif not anchor_embedding or text not in embeddings:
+                results[other_id] = _fallback_result(
+                    'embedding_failed', 'Failed to generate embeddings via Gemini'
+                )
+            else:
+                scored_ids.append(other_id)
+                scored_vectors.append(embeddings[text])
+        
+        if scored_ids:
+            similarities = batch_cosine_similarity(
+                anchor_embedding, build_embedding_matrix(scored_vectors)
+            )
+            for other_id, similarity in zip(scored_ids, similarities.tolist()):
+                if anchor_is_job:
+                    job_text, recruiter_text = anchor_text, other_texts[other_id]
+                else:
+                    job_text, recruiter_text = other_texts[other_id], anchor_text
+                results[other_id] = _similarity_result(similarity, job_text, recruiter_text)
+        
+        return results
+        
+    except Exception as e:
+        logger.error(f"Batch semantic calculation error: {e}")
+        return {other.id: _fallback_result('error', str(e)) for other in others}
 
 
 def _build_job_text(job) -> str:
-    """Build text representation of job for embedding."""
+    """Build text representation of job for embedding (prefetch JOB_TEXT_PREFETCH)."""
     parts = []
     
     if job.title:
@@ -138,7 +301,7 @@ def _build_job_text(job) -> str:
     
     # Add required skills
     if hasattr(job, 'required_skills'):
-        skills = job.required_skills.select_related('skill').all()
+        skills = job.required_skills.all()
         skill_names = [js.skill.name for js in skills]
         if skill_names:
             parts.append(f"Required Skills: {', '.join(skill_names)}")
@@ -153,7 +316,7 @@ def _build_job_text(job) -> str:
 
 
 def _build_recruiter_text(recruiter) -> str:
-    """Build text representation of recruiter for embedding."""
+    """Build text representation of recruiter for embedding (prefetch RECRUITER_TEXT_PREFETCH)."""
     parts = []
     
     if recruiter.current_position:
@@ -167,7 +330,7 @@ def _build_recruiter_text(recruiter) -> str:
     
     # Add skills
     if hasattr(recruiter, 'skills'):
-        skills = recruiter.skills.select_related('skill').all()
+        skills = recruiter.skills.all()
         skill_items = []
         for rs in skills:
             skill_items.append(f"{rs.skill.name} ({rs.proficiency_level})")
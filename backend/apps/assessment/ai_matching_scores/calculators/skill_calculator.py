@@ -16,7 +16,12 @@ PROFICIENCY_WEIGHTS = {
 }
 
 
-def calculate_skill_score(job: Job, recruiter: Recruiter) -> dict:
+def calculate_skill_score(
+    job: Job,
+    recruiter: Recruiter,
+    job_skills: Optional[list[JobSkill]] = None,
+    recruiter_skills: Optional[list[RecruiterSkill]] = None,
+) -> dict:
     """
     Calculate skill match score between Job and Recruiter.
     
@@ -32,24 +37,29 @@ def calculate_skill_score(job: Job, recruiter: Recruiter) -> dict:
     Args:
         job: Job instance
         recruiter: Recruiter instance
+        job_skills: Preloaded JobSkill rows (with skill) for the job; queried when omitted
+        recruiter_skills: Preloaded RecruiterSkill rows for the recruiter; queried when omitted
         
     Returns:
         dict with score (0-100), matched_skills, missing_skills, details
     """
     # Get job required skills
-    job_skills = JobSkill.objects.filter(job=job).select_related('skill')
+    if job_skills is None:
+        job_skills = JobSkill.objects.filter(job=job).select_related('skill')
+    job_skills = list(job_skills)
     
     # Get recruiter skills
-    recruiter_skills = RecruiterSkill.objects.filter(
-        recruiter=recruiter
-    ).select_related('skill')
+    if recruiter_skills is None:
+        recruiter_skills = RecruiterSkill.objects.filter(
+            recruiter=recruiter
+        ).select_related('skill')
     
     # Create lookup for recruiter skills by skill_id
     recruiter_skill_map = {
         rs.skill_id: rs for rs in recruiter_skills
     }
     
-    if not job_skills.exists():
+    if not job_skills:
         # No skills required, give 100% score
         return {
             'score': Decimal('100.00'),
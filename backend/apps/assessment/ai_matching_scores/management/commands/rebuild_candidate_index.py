@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.assessment.ai_matching_scores.services.candidate_index import (
+    get_index_directory,
+    rebuild_candidate_index,
+)
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the candidate ANN index from all public, job-seeking recruiter profiles'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Rebuilding candidate index in {get_index_directory()} ...")
+
+        try:
+            count = rebuild_candidate_index()
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} recruiters"))
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"Error: {e}"))
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessment_ai_matching_scores', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SemanticEmbedding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, verbose_name='Hash nội dung')),
+                ('model_name', models.CharField(max_length=100, verbose_name='Model embedding')),
+                ('dimensions', models.PositiveIntegerField(verbose_name='Số chiều')),
+                ('vector', models.BinaryField(verbose_name='Vector (float32)')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Ngày tạo')),
+            ],
+            options={
+                'verbose_name': 'Embedding ngữ nghĩa',
+                'verbose_name_plural': 'Embedding ngữ nghĩa',
+                'db_table': 'semantic_embeddings',
+                'unique_together': {('content_hash', 'model_name')},
+            },
+        ),
+    ]
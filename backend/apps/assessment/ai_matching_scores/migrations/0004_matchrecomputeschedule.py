@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessment_ai_matching_scores', '0003_semanticembedding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchRecomputeSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target_type', models.CharField(choices=[('recruiter', 'Ứng viên'), ('job', 'Tin tuyển dụng')], max_length=20, verbose_name='Loại đối tượng')),
+                ('target_id', models.BigIntegerField(verbose_name='ID đối tượng')),
+                ('pending_triggers', models.PositiveIntegerField(default=0, verbose_name='Số trigger đang chờ')),
+                ('total_triggers', models.PositiveIntegerField(default=0, verbose_name='Tổng số trigger')),
+                ('total_runs', models.PositiveIntegerField(default=0, verbose_name='Tổng số lần tính lại')),
+                ('first_trigger_at', models.DateTimeField(blank=True, null=True, verbose_name='Trigger đầu tiên đang chờ')),
+                ('due_at', models.DateTimeField(blank=True, null=True, verbose_name='Thời điểm tính lại')),
+                ('last_run_at', models.DateTimeField(blank=True, null=True, verbose_name='Lần tính lại gần nhất')),
+            ],
+            options={
+                'verbose_name': 'Lịch tính lại matching',
+                'verbose_name_plural': 'Lịch tính lại matching',
+                'db_table': 'match_recompute_schedules',
+                'unique_together': {('target_type', 'target_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessment_ai_matching_scores', '0004_matchrecomputeschedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchrecomputeschedule',
+            name='scheduled_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Thời điểm đưa task vào hàng đợi'),
+        ),
+    ]
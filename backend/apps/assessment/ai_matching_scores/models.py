@@ -82,3 +82,96 @@ class AIMatchingScore(models.Model):
     
     def __str__(self):
         return f"{self.recruiter.user.full_name} - {self.job.title} : {self.overall_score}"
+
+
+class SemanticEmbedding(models.Model):
+    """Bảng Semantic_Embeddings - Cache vector embedding theo nội dung"""
+    
+    content_hash = models.CharField(
+        max_length=64,
+        verbose_name='Hash nội dung'
+    )
+    model_name = models.CharField(
+        max_length=100,
+        verbose_name='Model embedding'
+    )
+    dimensions = models.PositiveIntegerField(
+        verbose_name='Số chiều'
+    )
+    vector = models.BinaryField(
+        verbose_name='Vector (float32)'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Ngày tạo'
+    )
+    
+    class Meta:
+        db_table = 'semantic_embeddings'
+        verbose_name = 'Embedding ngữ nghĩa'
+        verbose_name_plural = 'Embedding ngữ nghĩa'
+        unique_together = ['content_hash', 'model_name']
+    
+    def __str__(self):
+        return f"{self.model_name} - {self.content_hash[:12]} ({self.dimensions}d)"
+
+
+class MatchRecomputeSchedule(models.Model):
+    """Bảng Match_Recompute_Schedules - Gom các yêu cầu tính lại matching theo đối tượng"""
+    
+    TARGET_RECRUITER = 'recruiter'
+    TARGET_JOB = 'job'
+    TARGET_CHOICES = [
+        (TARGET_RECRUITER, 'Ứng viên'),
+        (TARGET_JOB, 'Tin tuyển dụng'),
+    ]
+    
+    target_type = models.CharField(
+        max_length=20,
+        choices=TARGET_CHOICES,
+        verbose_name='Loại đối tượng'
+    )
+    target_id = models.BigIntegerField(
+        verbose_name='ID đối tượng'
+    )
+    pending_triggers = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Số trigger đang chờ'
+    )
+    total_triggers = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Tổng số trigger'
+    )
+    total_runs = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Tổng số lần tính lại'
+    )
+    first_trigger_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Trigger đầu tiên đang chờ'
+    )
+    due_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Thời điểm tính lại'
+    )
+    last_run_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Lần tính lại gần nhất'
+    )
+    scheduled_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Thời điểm đưa task vào hàng đợi'
+    )
+    
+    class Meta:
+        db_table = 'match_recompute_schedules'
+        verbose_name = 'Lịch tính lại matching'
+        verbose_name_plural = 'Lịch tính lại matching'
+        unique_together = ['target_type', 'target_id']
+    
+    def __str__(self):
+        return f"{self.target_type}#{self.target_id} ({self.pending_triggers} pending)"
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from decimal import Decimal
 from typing import Optional
 from pydantic import BaseModel, Field, field_validator
@@ -8,14 +9,19 @@ from django.db.models import Avg, Count, Max, Min
 
 from apps.assessment.ai_matching_scores.models import AIMatchingScore
 from apps.recruitment.jobs.models import Job
+from apps.recruitment.job_skills.models import JobSkill
 from apps.candidate.recruiters.models import Recruiter
+from apps.candidate.recruiter_skills.models import RecruiterSkill
 from apps.assessment.ai_matching_scores.calculators import (
+    JOB_TEXT_PREFETCH,
+    RECRUITER_TEXT_PREFETCH,
     calculate_skill_score,
     calculate_experience_score,
     calculate_education_score,
     calculate_location_score,
     calculate_salary_score,
     calculate_semantic_score,
+    calculate_semantic_scores,
     is_semantic_enabled,
 )
 
@@ -41,6 +47,19 @@ MATCHING_WEIGHTS_SEMANTIC = {
 }
 
 
+# Fields overwritten when a bulk upsert hits an existing (job, recruiter) row
+BULK_UPDATE_FIELDS = [
+    'overall_score',
+    'skill_match_score',
+    'experience_match_score',
+    'education_match_score',
+    'location_match_score',
+    'salary_match_score',
+    'matching_details',
+    'is_valid',
+]
+
+
 class CalculateMatchInput(BaseModel):
     """Input for calculating a single match."""
     job_id: int
@@ -90,27 +109,72 @@ def calculate_single_match(input_data: CalculateMatchInput) -> AIMatchingScore:
         Job.DoesNotExist: If job not found
         Recruiter.DoesNotExist: If recruiter not found
     """
-    job = Job.objects.select_related('address__commune__province').get(
-        id=input_data.job_id
-    )
-    recruiter = Recruiter.objects.select_related('address__commune__province').get(
-        id=input_data.recruiter_id
+    job = Job.objects.select_related('address__commune__province').prefetch_related(
+        *JOB_TEXT_PREFETCH
+    ).get(id=input_data.job_id)
+    recruiter = Recruiter.objects.select_related('address__commune__province').prefetch_related(
+        *RECRUITER_TEXT_PREFETCH
+    ).get(id=input_data.recruiter_id)
+    
+    return _calculate_match(job, recruiter)
+
+
+def _calculate_match(
+    job: Job,
+    recruiter: Recruiter,
+    semantic_result: Optional[dict] = None
+) -> AIMatchingScore:
+    """
+    Score a loaded job-recruiter pair and save the result.
+    
+    Args:
+        job: Job instance (address__commune__province preloaded)
+        recruiter: Recruiter instance (address__commune__province preloaded)
+        semantic_result: Precomputed semantic result from a batch pass; computed
+            per pair when omitted
+    """
+    score, created = AIMatchingScore.objects.update_or_create(
+        job=job,
+        recruiter=recruiter,
+        defaults=_score_pair(job, recruiter, semantic_result),
     )
     
+    return score
+
+
+def _score_pair(
+    job: Job,
+    recruiter: Recruiter,
+    semantic_result: Optional[dict] = None,
+    job_skills: Optional[list] = None,
+    recruiter_skills: Optional[list] = None,
+) -> dict:
+    """
+    Run all calculators for a pair and build the AIMatchingScore field values.
+    
+    Does not touch the database when skills are preloaded and a semantic
+    result is supplied (or semantic matching is disabled).
+    
+    Returns:
+        Dict of AIMatchingScore field values (overall_score, component scores,
+        matching_details, is_valid)
+    """
     # Calculate individual scores
-    skill_result = calculate_skill_score(job, recruiter)
+    skill_result = calculate_skill_score(job, recruiter, job_skills, recruiter_skills)
     experience_result = calculate_experience_score(job, recruiter)
     education_result = calculate_education_score(job, recruiter)
     location_result = calculate_location_score(job, recruiter)
     salary_result = calculate_salary_score(job, recruiter)
     
     # Calculate semantic score if AI/Gemini is enabled
-    semantic_result = None
     use_semantic = is_semantic_enabled()
     
     if use_semantic:
-        semantic_result = calculate_semantic_score(job, recruiter)
+        if semantic_result is None:
+            semantic_result = calculate_semantic_score(job, recruiter)
         use_semantic = semantic_result.get('is_semantic', False)
+    else:
+        semantic_result = None
     
     # Select weights based on semantic availability
     if use_semantic:
@@ -152,30 +216,106 @@ def calculate_single_match(input_data: CalculateMatchInput) -> AIMatchingScore:
         if isinstance(matching_details[key], dict) and 'score' in matching_details[key]:
             matching_details[key]['score'] = float(matching_details[key]['score'])
     
-    # Create or update score
-    score, created = AIMatchingScore.objects.update_or_create(
-        job=job,
-        recruiter=recruiter,
-        defaults={
-            'overall_score': overall_score,
-            'skill_match_score': skill_result['score'],
-            'experience_match_score': experience_result['score'],
-            'education_match_score': education_result['score'],
-            'location_match_score': location_result['score'],
-            'salary_match_score': salary_result['score'],
-            'matching_details': matching_details,
-            'is_valid': True,
-        }
+    return {
+        'overall_score': overall_score,
+        'skill_match_score': skill_result['score'],
+        'experience_match_score': experience_result['score'],
+        'education_match_score': education_result['score'],
+        'location_match_score': location_result['score'],
+        'salary_match_score': salary_result['score'],
+        'matching_details': matching_details,
+        'is_valid': True,
+    }
+
+
+def _bulk_save_matches(
+    pairs: list[tuple[Job, Recruiter]],
+    semantic_results: dict[tuple[int, int], dict]
+) -> list[AIMatchingScore]:
+    """
+    Score many job-recruiter pairs in memory and upsert them in one statement.
+    
+    Skills for every job and recruiter in the batch are preloaded with two
+    queries, so the query count does not grow with the number of pairs.
+    Addresses must already be loaded via select_related.
+    
+    Args:
+        pairs: (job, recruiter) tuples to score
+        semantic_results: Precomputed semantic results keyed by (job_id, recruiter_id)
+        
+    Returns:
+        List of AIMatchingScore instances (created or updated)
+    """
+    if not pairs:
+        return []
+    
+    job_ids = {job.id for job, _ in pairs}
+    recruiter_ids = {recruiter.id for _, recruiter in pairs}
+    
+    job_skills = defaultdict(list)
+    for job_skill in JobSkill.objects.filter(job_id__in=job_ids).select_related('skill'):
+        job_skills[job_skill.job_id].append(job_skill)
+    
+    recruiter_skills = defaultdict(list)
+    for recruiter_skill in RecruiterSkill.objects.filter(recruiter_id__in=recruiter_ids):
+        recruiter_skills[recruiter_skill.recruiter_id].append(recruiter_skill)
+    
+    scores = []
+    for job, recruiter in pairs:
+        values = _score_pair(
+            job,
+            recruiter,
+            semantic_results.get((job.id, recruiter.id)),
+            job_skills[job.id],
+            recruiter_skills[recruiter.id],
+        )
+        scores.append(AIMatchingScore(job=job, recruiter=recruiter, **values))
+    
+    return AIMatchingScore.objects.bulk_create(
+        scores,
+        update_conflicts=True,
+        unique_fields=['job', 'recruiter'],
+        update_fields=BULK_UPDATE_FIELDS,
     )
+
+
+def _batch_semantic_results(
+    jobs: list[Job],
+    recruiters: list[Recruiter]
+) -> dict[tuple[int, int], dict]:
+    """
+    Compute semantic results for every job-recruiter pair in one vectorized pass.
     
-    return score
+    One side must contain a single entity (the anchor); the other side is
+    scored against it with a single matrix-vector product.
+    
+    Returns:
+        Dict mapping (job_id, recruiter_id) -> semantic result. Empty when
+        semantic matching is disabled or neither side is a single entity.
+    """
+    if not is_semantic_enabled():
+        return {}
+    
+    if len(jobs) == 1:
+        job = jobs[0]
+        results = calculate_semantic_scores(job, recruiters, anchor_is_job=True)
+        return {(job.id, recruiter_id): r for recruiter_id, r in results.items()}
+    
+    if len(recruiters) == 1:
+        recruiter = recruiters[0]
+        results = calculate_semantic_scores(recruiter, jobs, anchor_is_job=False)
+        return {(job_id, recruiter.id): r for job_id, r in results.items()}
+    
+    return {}
 
 
 def batch_calculate_matches(input_data: BatchCalculateInput) -> list[AIMatchingScore]:
     """
     Calculate match scores for multiple recruiters against a single job.
     
-    Uses transaction to ensure atomicity.
+    Semantic similarities for the whole batch are computed in one vectorized
+    pass, all rule-based scores are computed in memory from preloaded data and
+    written with a single upsert. Uses transaction to ensure atomicity.
     
     Args:
         input_data: BatchCalculateInput with job_id and recruiter_ids
@@ -183,23 +323,29 @@ def batch_calculate_matches(input_data: BatchCalculateInput) -> list[AIMatchingS
     Returns:
         List of AIMatchingScore instances
     """
-    results = []
+    job = Job.objects.select_related('address__commune__province').prefetch_related(
+        *JOB_TEXT_PREFETCH
+    ).filter(id=input_data.job_id).first()
+    if job is None:
+        return []
+    
+    # Skip invalid IDs
+    recruiters_by_id = Recruiter.objects.select_related(
+        'address__commune__province'
+    ).prefetch_related(*RECRUITER_TEXT_PREFETCH).in_bulk(input_data.recruiter_ids)
+    recruiters = [
+        recruiters_by_id[recruiter_id]
+        for recruiter_id in dict.fromkeys(input_data.recruiter_ids)
+        if recruiter_id in recruiters_by_id
+    ]
+    
+    semantic_results = _batch_semantic_results([job], recruiters)
     
     with transaction.atomic():
-        for recruiter_id in input_data.recruiter_ids:
-            try:
-                score = calculate_single_match(
-                    CalculateMatchInput(
-                        job_id=input_data.job_id,
-                        recruiter_id=recruiter_id
-                    )
-                )
-                results.append(score)
-            except (Job.DoesNotExist, Recruiter.DoesNotExist):
-                # Skip invalid IDs
-                continue
-    
-    return results
+        return _bulk_save_matches(
+            [(job, recruiter) for recruiter in recruiters],
+            semantic_results
+        )
 
 
 def refresh_matches(input_data: RefreshMatchInput) -> int:
@@ -210,6 +356,9 @@ def refresh_matches(input_data: RefreshMatchInput) -> int:
     If recruiter_id provided: refresh all scores for that recruiter
     If both provided: refresh only that specific pair
     
+    Semantic similarities are computed in one vectorized pass against the
+    fixed job (or recruiter); all scores are written with a single upsert.
+    
     Args:
         input_data: RefreshMatchInput
         
@@ -224,25 +373,40 @@ def refresh_matches(input_data: RefreshMatchInput) -> int:
         filters &= Q(recruiter_id=input_data.recruiter_id)
     
     # Get existing scores to refresh
-    existing_scores = AIMatchingScore.objects.filter(filters)
+    existing_scores = list(
+        AIMatchingScore.objects.filter(filters).only('id', 'job', 'recruiter')
+    )
+    if not existing_scores:
+        return 0
+    
+    jobs = Job.objects.select_related('address__commune__province').prefetch_related(
+        *JOB_TEXT_PREFETCH
+    ).in_bulk({score.job_id for score in existing_scores})
+    recruiters = Recruiter.objects.select_related('address__commune__province').prefetch_related(
+        *RECRUITER_TEXT_PREFETCH
+    ).in_bulk({score.recruiter_id for score in existing_scores})
+    
+    semantic_results = _batch_semantic_results(
+        list(jobs.values()), list(recruiters.values())
+    )
+    
+    pairs = []
+    invalid_ids = []
+    for score in existing_scores:
+        job = jobs.get(score.job_id)
+        recruiter = recruiters.get(score.recruiter_id)
+        if job is None or recruiter is None:
+            invalid_ids.append(score.id)
+        else:
+            pairs.append((job, recruiter))
     
-    count = 0
     with transaction.atomic():
-        for score in existing_scores:
-            try:
-                calculate_single_match(
-                    CalculateMatchInput(
-                        job_id=score.job_id,
-                        recruiter_id=score.recruiter_id
-                    )
-                )
-                count += 1
-            except (Job.DoesNotExist, Recruiter.DoesNotExist):
-                # Mark as invalid if entities no longer exist
-                score.is_valid = False
-                score.save(update_fields=['is_valid'])
-    
-    return count
+        if invalid_ids:
+            # Mark as invalid if entities no longer exist
+            AIMatchingScore.objects.filter(id__in=invalid_ids).update(is_valid=False)
+        _bulk_save_matches(pairs, semantic_results)
+    
+    return len(pairs)
 
 
 def get_matching_insights(
@@ -0,0 +1,544 @@
+import fcntl
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from django.conf import settings
+
+from apps.candidate.recruiters.models import Recruiter
+from apps.assessment.ai_matching_scores.calculators.semantic_calculator import (
+    RECRUITER_TEXT_PREFETCH,
+    _build_job_text,
+    _build_recruiter_text,
+    get_cached_embedding,
+    get_cached_embeddings,
+    is_semantic_enabled,
+    normalize_vector,
+)
+
+logger = logging.getLogger(__name__)
+
+
+META_FILE = 'meta.json'
+DELTA_FILE = 'delta.npz'
+LOCK_FILE = '.lock'
+
+# Compact the delta into the base arrays once it grows past this many rows
+# (or past 10% of the base, whichever is larger)
+DELTA_COMPACT_MIN = 1000
+
+# Rows per chunk when assigning vectors to centroids (bounds peak memory)
+ASSIGN_CHUNK_SIZE = 8192
+
+# Seconds a superseded base is kept on disk for processes still reading it
+BASE_RETENTION_SECONDS = 3600
+
+# Job search statuses that make a recruiter eligible for job matching
+INDEXED_SEARCH_STATUSES = ('active', 'passive')
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Assign each (normalized) row to its most similar centroid."""
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_CHUNK_SIZE):
+        chunk = vectors[start:start + ASSIGN_CHUNK_SIZE]
+        assignments[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignments
+
+
+def _train_centroids(vectors: np.ndarray, n_lists: int, iterations: int = 10) -> np.ndarray:
+    """Spherical k-means over normalized rows. Deterministic for a given input."""
+    rng = np.random.default_rng(0)
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = _assign(vectors, centroids)
+        for list_id in range(n_lists):
+            members = vectors[assignments == list_id]
+            if len(members) == 0:
+                continue
+            centroid = members.sum(axis=0)
+            norm = np.linalg.norm(centroid)
+            if norm > 0:
+                centroids[list_id] = centroid / norm
+
+    return np.ascontiguousarray(centroids, dtype=np.float32)
+
+
+class CandidateIndex:
+    """
+    IVF-flat approximate nearest-neighbour index over recruiter embeddings.
+
+    Layout on disk (under `directory`):
+        meta.json            -> current base version, dimensions, list count
+        base_<version>/      -> ids.npy, vectors.npy, assignments.npy, centroids.npy
+        delta.npz            -> incremental adds/updates and removals since the base
+
+    Base arrays are memory-mapped read-only; each new base is written to a fresh
+    version directory and published by atomically replacing meta.json, so
+    readers never see a half-written base. Incremental changes go to the small
+    delta file under an exclusive file lock and are folded into a new base once
+    the delta grows large. Superseded bases are deleted only once they have
+    been out of date for `retention_seconds`, so a reader that read the old
+    meta.json can still open its files.
+    """
+
+    def __init__(self, directory, retention_seconds: int = BASE_RETENTION_SECONDS):
+        self.directory = Path(directory)
+        self.retention_seconds = retention_seconds
+        self._thread_lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.version = None
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self.centroids = np.zeros((0, 0), dtype=np.float32)
+        self._base_ids = set()
+        self.delta_vectors: dict[int, np.ndarray] = {}
+        self.removed: set[int] = set()
+        self._meta_mtime = None
+        self._delta_mtime = None
+
+    def __len__(self) -> int:
+        stale = self._base_ids & (self.removed | set(self.delta_vectors))
+        return len(self._base_ids) - len(stale) + len(self.delta_vectors)
+
+    def __contains__(self, recruiter_id: int) -> bool:
+        if recruiter_id in self.delta_vectors:
+            return True
+        return recruiter_id in self._base_ids and recruiter_id not in self.removed
+
+    @property
+    def dimensions(self) -> Optional[int]:
+        if self.vectors.ndim == 2 and self.vectors.shape[1]:
+            return self.vectors.shape[1]
+        for vector in self.delta_vectors.values():
+            return vector.shape[0]
+        return None
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _mtime(path: Path) -> Optional[int]:
+        try:
+            return path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def _exclusive(self):
+        """Serialize writers across threads (RLock) and processes (flock)."""
+        with self._thread_lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.directory / LOCK_FILE, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load(self) -> 'CandidateIndex':
+        """Load (memory-map) the current base and the pending delta from disk."""
+        with self._thread_lock:
+            self._load_base()
+            self._load_delta()
+        return self
+
+    def _load_base(self):
+        meta_path = self.directory / META_FILE
+        meta_mtime = self._mtime(meta_path)
+        if meta_mtime is None:
+            delta = (self.delta_vectors, self.removed, self._delta_mtime)
+            self._reset()
+            self.delta_vectors, self.removed, self._delta_mtime = delta
+            return
+
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+        base_dir = self.directory / f"base_{meta['version']}"
+        if meta['size']:
+            self.ids = np.load(base_dir / 'ids.npy', mmap_mode='r')
+            self.vectors = np.load(base_dir / 'vectors.npy', mmap_mode='r')
+            self.assignments = np.load(base_dir / 'assignments.npy', mmap_mode='r')
+            self.centroids = np.load(base_dir / 'centroids.npy')
+        else:
+            # Empty arrays cannot be memory-mapped
+            self.ids = np.zeros(0, dtype=np.int64)
+            self.vectors = np.zeros((0, 0), dtype=np.float32)
+            self.assignments = np.zeros(0, dtype=np.int32)
+            self.centroids = np.zeros((0, 0), dtype=np.float32)
+        self._base_ids = set(self.ids.tolist())
+        self.version = meta['version']
+        self._meta_mtime = meta_mtime
+
+    def _load_delta(self):
+        delta_path = self.directory / DELTA_FILE
+        delta_mtime = self._mtime(delta_path)
+        if delta_mtime is None:
+            self.delta_vectors = {}
+            self.removed = set()
+        else:
+            with np.load(delta_path) as data:
+                self.delta_vectors = {
+                    int(recruiter_id): np.array(vector, dtype=np.float32)
+                    for recruiter_id, vector in zip(data['ids'], data['vectors'])
+                }
+                self.removed = set(data['removed'].tolist())
+        self._delta_mtime = delta_mtime
+
+    def refresh_if_stale(self):
+        """Reload whatever another process has changed since the last load."""
+        with self._thread_lock:
+            if self._mtime(self.directory / META_FILE) != self._meta_mtime:
+                self._load_base()
+            if self._mtime(self.directory / DELTA_FILE) != self._delta_mtime:
+                self._load_delta()
+
+    def _reload_locked(self):
+        """
+        Reload state another process may have changed before mutating it.
+
+        Caller holds the exclusive lock. The base is re-read when meta.json
+        changed (another process compacted), so removals are checked against
+        the current base ids; the delta is always re-read.
+        """
+        if self._mtime(self.directory / META_FILE) != self._meta_mtime:
+            self._load_base()
+        self._load_delta()
+
+    def _write_delta(self):
+        delta_path = self.directory / DELTA_FILE
+        if not self.delta_vectors and not self.removed:
+            if delta_path.exists():
+                delta_path.unlink()
+            self._delta_mtime = None
+            return
+
+        ids = np.fromiter(self.delta_vectors.keys(), dtype=np.int64, count=len(self.delta_vectors))
+        if self.delta_vectors:
+            vectors = np.stack(list(self.delta_vectors.values())).astype(np.float32)
+        else:
+            vectors = np.zeros((0, self.dimensions or 0), dtype=np.float32)
+        removed = np.fromiter(self.removed, dtype=np.int64, count=len(self.removed))
+
+        tmp_path = self.directory / f'.delta.{os.getpid()}.npz'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, ids=ids, vectors=vectors, removed=removed)
+        os.replace(tmp_path, delta_path)
+        self._delta_mtime = self._mtime(delta_path)
+
+    def _write_base(self, ids: np.ndarray, vectors: np.ndarray, centroids: np.ndarray):
+        version = time.time_ns()
+        base_dir = self.directory / f'base_{version}'
+        base_dir.mkdir(parents=True)
+
+        np.save(base_dir / 'ids.npy', ids.astype(np.int64))
+        np.save(base_dir / 'vectors.npy', np.ascontiguousarray(vectors, dtype=np.float32))
+        np.save(base_dir / 'assignments.npy', _assign(vectors, centroids) if len(ids) else np.zeros(0, np.int32))
+        np.save(base_dir / 'centroids.npy', centroids)
+
+        meta = {
+            'version': version,
+            'dimensions': int(vectors.shape[1]) if vectors.ndim == 2 else 0,
+            'n_lists': int(len(centroids)),
+            'size': int(len(ids)),
+        }
+        tmp_path = self.directory / f'.{META_FILE}.{os.getpid()}'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self.directory / META_FILE)
+
+        self._prune_bases_locked(version)
+        self._load_base()
+
+    def _prune_bases_locked(self, current_version: int):
+        """
+        Delete bases superseded more than retention_seconds ago.
+
+        A base is superseded when the next version is published; versions are
+        creation timestamps in ns, so the next version's number is that time.
+        """
+        versions = sorted(
+            int(path.name[len('base_'):])
+            for path in self.directory.glob('base_*')
+            if path.name[len('base_'):].isdigit()
+        )
+        cutoff = time.time_ns() - self.retention_seconds * 1_000_000_000
+        for version, superseded_at in zip(versions, versions[1:]):
+            if version != current_version and superseded_at <= cutoff:
+                shutil.rmtree(self.directory / f'base_{version}', ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Mutations
+    # ------------------------------------------------------------------
+
+    def build(self, items: dict[int, list[float]], n_lists: Optional[int] = None):
+        """
+        Rebuild the index from scratch (trains new centroids, clears the delta).
+
+        Args:
+            items: Mapping recruiter_id -> embedding
+            n_lists: Number of inverted lists (defaults to ~sqrt(N))
+        """
+        with self._exclusive():
+            self._build_locked(items, n_lists)
+
+    def _build_locked(self, items: dict[int, list[float]], n_lists: Optional[int] = None):
+        ids = np.fromiter(items.keys(), dtype=np.int64, count=len(items))
+        if len(ids):
+            vectors = np.stack([normalize_vector(v) for v in items.values()])
+            n_lists = n_lists or max(1, int(np.sqrt(len(ids))))
+            centroids = _train_centroids(vectors, min(n_lists, len(ids)))
+        else:
+            vectors = np.zeros((0, 0), dtype=np.float32)
+            centroids = np.zeros((0, 0), dtype=np.float32)
+
+        self._write_base(ids, vectors, centroids)
+        self.delta_vectors = {}
+        self.removed = set()
+        self._write_delta()
+
+    def add(self, recruiter_id: int, vector):
+        """Insert or replace the embedding for a recruiter."""
+        vec = normalize_vector(vector)
+        with self._exclusive():
+            self._reload_locked()
+            self.delta_vectors[recruiter_id] = vec
+            self.removed.discard(recruiter_id)
+            self._write_delta()
+            self._maybe_compact()
+
+    def remove(self, recruiter_id: int):
+        """Drop a recruiter from the index (no-op if absent)."""
+        with self._exclusive():
+            self._reload_locked()
+            self.delta_vectors.pop(recruiter_id, None)
+            if recruiter_id in self._base_ids:
+                self.removed.add(recruiter_id)
+            self._write_delta()
+            self._maybe_compact()
+
+    def _maybe_compact(self):
+        # Caller holds the exclusive lock
+        pending = len(self.delta_vectors) + len(self.removed)
+        if pending >= max(DELTA_COMPACT_MIN, len(self._base_ids) // 10):
+            self._compact_locked()
+
+    def compact(self):
+        """Fold the delta into a new base, reusing the trained centroids."""
+        with self._exclusive():
+            self._compact_locked()
+
+    def _compact_locked(self):
+        self._load_base()
+        self._load_delta()
+
+        drop = self.removed | set(self.delta_vectors)
+        keep = ~np.isin(self.ids, np.fromiter(drop, dtype=np.int64, count=len(drop)))
+        ids = [np.asarray(self.ids[keep])]
+        vectors = [np.asarray(self.vectors[keep])] if len(self.ids) else []
+
+        if self.delta_vectors:
+            ids.append(np.fromiter(self.delta_vectors.keys(), dtype=np.int64))
+            vectors.append(np.stack(list(self.delta_vectors.values())))
+
+        ids = np.concatenate(ids)
+        if not len(ids):
+            self._build_locked({})
+            return
+        vectors = np.concatenate(vectors).astype(np.float32)
+
+        centroids = self.centroids
+        if centroids.size == 0 or centroids.shape[1] != vectors.shape[1]:
+            centroids = _train_centroids(vectors, max(1, int(np.sqrt(len(ids)))))
+
+        self._write_base(ids, vectors, centroids)
+        self.delta_vectors = {}
+        self.removed = set()
+        self._write_delta()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(self, vector, k: int = 50, n_probe: Optional[int] = None) -> list[tuple[int, float]]:
+        """
+        Return up to k (recruiter_id, similarity) pairs, most similar first.
+
+        Args:
+            vector: Query embedding (e.g. a job embedding)
+            k: Number of neighbours to return
+            n_probe: Inverted lists to scan (defaults to ~1/8 of lists, min 4)
+        """
+        if k <= 0:
+            return []
+
+        query = normalize_vector(vector)
+        candidate_ids = []
+        candidate_sims = []
+
+        with self._thread_lock:
+            if len(self.ids) and self.vectors.shape[1] == query.shape[0]:
+                n_lists = len(self.centroids)
+                if n_probe is None:
+                    n_probe = max(4, n_lists // 8)
+                if n_probe >= n_lists:
+                    rows = np.arange(len(self.ids))
+                else:
+                    probe_lists = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+                    rows = np.flatnonzero(np.isin(self.assignments, probe_lists))
+
+                ids = np.asarray(self.ids[rows])
+                drop = self.removed | set(self.delta_vectors)
+                if drop:
+                    live = ~np.isin(ids, np.fromiter(drop, dtype=np.int64, count=len(drop)))
+                    rows, ids = rows[live], ids[live]
+
+                candidate_ids.append(ids)
+                candidate_sims.append(np.asarray(self.vectors[rows]) @ query)
+
+            delta = [
+                (recruiter_id, vec) for recruiter_id, vec in self.delta_vectors.items()
+                if vec.shape[0] == query.shape[0]
+            ]
+            if delta:
+                candidate_ids.append(np.array([recruiter_id for recruiter_id, _ in delta], dtype=np.int64))
+                candidate_sims.append(np.stack([vec for _, vec in delta]) @ query)
+
+        if not candidate_ids:
+            return []
+
+        ids = np.concatenate(candidate_ids)
+        sims = np.concatenate(candidate_sims)
+        if len(ids) > k:
+            top = np.argpartition(-sims, k - 1)[:k]
+            ids, sims = ids[top], sims[top]
+        order = np.argsort(-sims, kind='stable')
+        return [(int(ids[i]), float(sims[i])) for i in order]
+
+
+_index: Optional[CandidateIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index_directory() -> Path:
+    return Path(getattr(
+        settings,
+        'AI_CANDIDATE_INDEX_DIR',
+        Path(settings.BASE_DIR) / 'var' / 'candidate_index',
+    ))
+
+
+def get_candidate_index() -> CandidateIndex:
+    """Process-wide index, memory-mapped on first use and refreshed when stale."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = CandidateIndex(
+                get_index_directory(),
+                retention_seconds=getattr(settings, 'AI_CANDIDATE_INDEX_RETENTION_SECONDS', BASE_RETENTION_SECONDS),
+            ).load()
+        else:
+            _index.refresh_if_stale()
+    return _index
+
+
+def is_indexable(recruiter: Recruiter) -> bool:
+    """Only public, job-seeking profiles are matched against new jobs."""
+    return (
+        recruiter.is_profile_public
+        and recruiter.job_search_status in INDEXED_SEARCH_STATUSES
+    )
+
+
+def index_recruiter(recruiter_id: int) -> bool:
+    """
+    Add, refresh or remove one recruiter in the candidate index.
+
+    Returns:
+        True if the recruiter is in the index afterwards
+    """
+    index = get_candidate_index()
+    recruiter = Recruiter.objects.prefetch_related(*RECRUITER_TEXT_PREFETCH).filter(id=recruiter_id).first()
+
+    if recruiter is None or not is_indexable(recruiter) or not is_semantic_enabled():
+        index.remove(recruiter_id)
+        return False
+
+    text = _build_recruiter_text(recruiter)
+    embedding = get_cached_embedding(text) if text else None
+    if not embedding:
+        index.remove(recruiter_id)
+        return False
+
+    index.add(recruiter_id, embedding)
+    return True
+
+
+def find_semantic_candidates(job, limit: int = 50) -> list[int]:
+    """
+    Retrieve the recruiter ids whose profiles are semantically closest to a job.
+
+    Returns:
+        Recruiter ids ordered by similarity (empty if semantic matching is
+        disabled, the job has no embedding, or the index is empty)
+    """
+    if not is_semantic_enabled():
+        return []
+
+    index = get_candidate_index()
+    if not len(index):
+        return []
+
+    text = _build_job_text(job)
+    embedding = get_cached_embedding(text) if text else None
+    if not embedding:
+        return []
+
+    return [recruiter_id for recruiter_id, _ in index.search(embedding, k=limit)]
+
+
+def rebuild_candidate_index() -> int:
+    """
+    Rebuild the candidate index from all eligible recruiter profiles.
+
+    Returns:
+        Number of recruiters indexed
+    """
+    index = get_candidate_index()
+    if not is_semantic_enabled():
+        index.build({})
+        return 0
+
+    recruiters = Recruiter.objects.filter(
+        is_profile_public=True,
+        job_search_status__in=INDEXED_SEARCH_STATUSES,
+    ).prefetch_related(*RECRUITER_TEXT_PREFETCH)
+    texts = {}
+    for recruiter in recruiters.iterator(chunk_size=500):
+        text = _build_recruiter_text(recruiter)
+        if text:
+            texts[recruiter.id] = text
+
+    embeddings = get_cached_embeddings(list(texts.values()))
+    items = {
+        recruiter_id: embeddings[text]
+        for recruiter_id, text in texts.items()
+        if text in embeddings
+    }
+
+    index.build(items)
+    logger.info(f"Rebuilt candidate index with {len(items)} recruiters")
+    return len(items)
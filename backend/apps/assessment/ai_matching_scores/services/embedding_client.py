@@ -0,0 +1,318 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import httpx
+from google.genai import errors, types
+
+logger = logging.getLogger(__name__)
+
+
+# HTTP status codes worth retrying: quota/rate limit and transient server errors
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Holds up to `capacity` tokens and refills at `rate` tokens per second.
+    acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self) -> float:
+        """
+        Take one token, waiting if the bucket is empty.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+class RetryBudget:
+    """
+    Global retry budget shared by all requests of a client.
+
+    Every first attempt deposits `ratio` tokens, every retry withdraws one.
+    With ratio=0.2 retries add at most ~20% extra load, so a Gemini outage
+    or quota exhaustion cannot turn into a retry storm. `min_retries` lets a
+    cold client retry a few times before any deposits were made.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, max_tokens: int = 100):
+        self.ratio = ratio
+        self.max_tokens = float(max(max_tokens, min_retries))
+        self.tokens = float(min_retries)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Record a first attempt."""
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Withdraw one retry; False when the budget is exhausted."""
+        with self._lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class EmbeddingMetrics:
+    """
+    Per-call latency and quota counters for the embedding client.
+
+    Latencies of the most recent calls are kept for percentiles;
+    snapshot() returns a plain dict suitable for logging or an admin view.
+    """
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.calls = 0
+        self.texts = 0
+        self.failures = 0
+        self.retries = 0
+        self.retries_denied = 0
+        self.quota_errors = 0
+        self.throttled_seconds = 0.0
+
+    def record_call(self, latency: float, text_count: int, status: str) -> None:
+        with self._lock:
+            self.calls += 1
+            self._latencies.append(latency)
+            if status == 'ok':
+                self.texts += text_count
+            else:
+                self.failures += 1
+            if status == '429':
+                self.quota_errors += 1
+        logger.debug(f"Gemini call: {text_count} texts, {latency * 1000:.1f} ms, status={status}")
+
+    def record_retry(self, allowed: bool) -> None:
+        with self._lock:
+            if allowed:
+                self.retries += 1
+            else:
+                self.retries_denied += 1
+
+    def record_throttle(self, seconds: float) -> None:
+        with self._lock:
+            self.throttled_seconds += seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+
+            def percentile(p):
+                if not latencies:
+                    return 0.0
+                return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+            return {
+                'calls': self.calls,
+                'texts': self.texts,
+                'failures': self.failures,
+                'retries': self.retries,
+                'retries_denied': self.retries_denied,
+                'quota_errors': self.quota_errors,
+                'throttled_seconds': round(self.throttled_seconds, 3),
+                'latency_p50_ms': round(percentile(0.50) * 1000, 1),
+                'latency_p95_ms': round(percentile(0.95) * 1000, 1),
+                'latency_max_ms': round((latencies[-1] if latencies else 0.0) * 1000, 1),
+            }
+
+
+class BatchEmbeddingClient:
+    """
+    Batched Gemini embedding client.
+
+    Groups texts into `embed_content` requests of up to `batch_size` contents,
+    runs up to `max_concurrency` requests in parallel, paces them with a token
+    bucket and retries 429/5xx/transport errors with full-jitter exponential
+    backoff under a shared RetryBudget. The concurrency limit and the rate
+    limiter are per client instance, so all callers sharing the instance
+    share the limits; execute() runs other Gemini requests under them too.
+    """
+
+    def __init__(
+        self,
+        client,
+        model: str = 'text-embedding-004',
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+        requests_per_second: float = 5.0,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        retry_budget: Optional[RetryBudget] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        sleep=time.sleep,
+    ):
+        self.client = client
+        self.model = model
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_budget = retry_budget or RetryBudget()
+        self.rate_limiter = rate_limiter or TokenBucket(requests_per_second)
+        self.metrics = EmbeddingMetrics()
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._sleep = sleep
+
+    def embed(self, texts: list[str]) -> list[Optional[list[float]]]:
+        """
+        Embed many texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List aligned with texts; an entry is None when the text is blank
+            or its batch failed after all retries
+        """
+        results: list[Optional[list[float]]] = [None] * len(texts)
+
+        # Blank texts are never sent (same as GeminiService.get_embedding)
+        pending = [(i, text.strip()) for i, text in enumerate(texts) if text and text.strip()]
+        batches = [
+            pending[start:start + self.batch_size]
+            for start in range(0, len(pending), self.batch_size)
+        ]
+        if not batches:
+            return results
+
+        if len(batches) == 1:
+            batch_results = [self._embed_batch([text for _, text in batches[0]])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+                batch_results = list(executor.map(
+                    lambda batch: self._embed_batch([text for _, text in batch]),
+                    batches
+                ))
+
+        for batch, vectors in zip(batches, batch_results):
+            if vectors is None:
+                continue
+            for (index, _), vector in zip(batch, vectors):
+                results[index] = vector
+
+        return results
+
+    def execute(self, request, text_count: int = 1, label: str = 'request'):
+        """
+        Run any Gemini request under this client's limits.
+
+        Lets other calls sharing the same Gemini quota (e.g. generate_content)
+        go through the same concurrency limit, rate limiter, retry budget and
+        metrics as the embedding batches.
+
+        Args:
+            request: Zero-argument callable performing one API request
+            text_count: Number of texts the request carries (for metrics)
+            label: Name used in log messages
+
+        Returns:
+            The callable's result, or None when it failed after all retries
+        """
+        self.retry_budget.deposit()
+
+        for attempt in range(1, self.max_attempts + 1):
+            status, result = self._call(request, text_count, label)
+            if status == 'ok':
+                return result
+
+            if status not in RETRYABLE_STATUS_CODES and status != 'transport':
+                break
+            if attempt == self.max_attempts:
+                break
+
+            allowed = self.retry_budget.try_spend()
+            self.metrics.record_retry(allowed)
+            if not allowed:
+                logger.warning(f"Gemini retry budget exhausted, giving up on {label}")
+                break
+
+            # Full jitter: uniform in [0, min(max_delay, base * 2^attempt))
+            self._sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+
+        logger.error(f"Gemini {label} failed (status={status})")
+        return None
+
+    def _embed_batch(self, texts: list[str]) -> Optional[list[list[float]]]:
+        """Send one batch with retries. Returns None when the batch failed."""
+
+        def request():
+            response = self.client.models.embed_content(
+                model=self.model,
+                contents=texts,
+                config=types.EmbedContentConfig(
+                    task_type="RETRIEVAL_DOCUMENT",
+                    title="CV Embedding"
+                )
+            )
+            vectors = [list(embedding.values) for embedding in response.embeddings]
+            if len(vectors) != len(texts):
+                raise ValueError(f"expected {len(texts)} embeddings, got {len(vectors)}")
+            return vectors
+
+        return self.execute(request, len(texts), f"embedding batch of {len(texts)} texts")
+
+    def _call(self, request, text_count: int, label: str):
+        """
+        Perform one request under the concurrency and rate limits.
+
+        Returns:
+            Tuple (status, result); result is None on failure. status is
+            'ok', an HTTP status code, 'transport' or 'error'.
+        """
+        with self._semaphore:
+            self.metrics.record_throttle(self.rate_limiter.acquire())
+
+            started = time.monotonic()
+            status, result = 'ok', None
+            try:
+                result = request()
+            except errors.APIError as e:
+                status = e.code
+                logger.warning(f"Gemini {label} API error {e.code}: {e.message}")
+            except httpx.TransportError as e:
+                status = 'transport'
+                logger.warning(f"Gemini {label} transport error: {e}")
+            except Exception as e:
+                status = 'error'
+                logger.error(f"Gemini {label} error: {e}")
+
+            self.metrics.record_call(time.monotonic() - started, text_count, str(status))
+            return status, result
@@ -0,0 +1,102 @@
+import hashlib
+from array import array
+from typing import Optional
+
+from apps.assessment.ai_matching_scores.models import SemanticEmbedding
+
+
+class EmbeddingStore:
+    """
+    Persistent embedding cache keyed by (content hash, model name).
+
+    Vectors are stored as packed float32 bytes. An entry never goes stale:
+    when the source text changes its hash changes too, so the next lookup
+    misses and a fresh embedding is stored under the new key.
+    """
+
+    @staticmethod
+    def content_hash(text: str, model_name: str) -> str:
+        """SHA-256 of the model name and text (model first so vectors never mix)."""
+        payload = f"{model_name}\n{text}".encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    @staticmethod
+    def pack(values) -> bytes:
+        """Pack a sequence of floats into compact float32 bytes."""
+        return array('f', values).tobytes()
+
+    @staticmethod
+    def unpack(blob) -> list[float]:
+        """Unpack float32 bytes back into a list of floats."""
+        vector = array('f')
+        vector.frombytes(bytes(blob))
+        return vector.tolist()
+
+    @classmethod
+    def get(cls, text: str, model_name: str) -> Optional[list[float]]:
+        """Return the cached embedding for text, or None on a miss."""
+        blob = (
+            SemanticEmbedding.objects
+            .filter(content_hash=cls.content_hash(text, model_name), model_name=model_name)
+            .values_list('vector', flat=True)
+            .first()
+        )
+        if blob is None:
+            return None
+        return cls.unpack(blob)
+
+    @classmethod
+    def get_many(cls, texts: list[str], model_name: str) -> dict[str, list[float]]:
+        """
+        Return cached embeddings for many texts with a single query.
+
+        Returns:
+            Dict mapping text -> embedding for the texts that were found
+        """
+        hash_to_texts: dict[str, list[str]] = {}
+        for text in texts:
+            hash_to_texts.setdefault(cls.content_hash(text, model_name), []).append(text)
+
+        rows = SemanticEmbedding.objects.filter(
+            content_hash__in=list(hash_to_texts.keys()),
+            model_name=model_name,
+        ).values_list('content_hash', 'vector')
+
+        found = {}
+        for content_hash, blob in rows:
+            vector = cls.unpack(blob)
+            for text in hash_to_texts[content_hash]:
+                found[text] = vector
+        return found
+
+    @classmethod
+    def put(cls, text: str, model_name: str, values) -> None:
+        """Store an embedding for text. Existing entries are left untouched."""
+        # get_or_create absorbs the race where another worker stores the same text
+        SemanticEmbedding.objects.get_or_create(
+            content_hash=cls.content_hash(text, model_name),
+            model_name=model_name,
+            defaults={
+                'dimensions': len(values),
+                'vector': cls.pack(values),
+            }
+        )
+
+    @classmethod
+    def get_or_embed(cls, text: str, model_name: str, embed_fn) -> Optional[list[float]]:
+        """
+        Return the cached embedding for text, calling embed_fn(text) on a miss.
+
+        Args:
+            text: Source text
+            model_name: Embedding model name (part of the cache key)
+            embed_fn: Callable returning a list of floats or None
+        """
+        cached = cls.get(text, model_name)
+        if cached is not None:
+            return cached
+
+        values = embed_fn(text)
+        if values:
+            cls.put(text, model_name, values)
+        return values
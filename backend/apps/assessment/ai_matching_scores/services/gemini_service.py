@@ -4,10 +4,16 @@ from django.conf import settings
 import logging
 import json
 
+from apps.assessment.ai_matching_scores.services.embedding_client import (
+    BatchEmbeddingClient,
+    RetryBudget,
+)
+
 logger = logging.getLogger(__name__)
 
 class GeminiService:
     _client = None
+    _embedding_client = None
 
     @classmethod
     def _get_client(cls):
@@ -16,7 +22,15 @@ class GeminiService:
                 logger.warning("GEMINI_API_KEY not configured.")
                 return None
             try:
-                cls._client = genai.Client(api_key=settings.GEMINI_API_KEY)
+                # GEMINI_API_BASE_URL lets tests and staging point at a fake server
+                base_url = getattr(settings, 'GEMINI_API_BASE_URL', None)
+                if base_url:
+                    cls._client = genai.Client(
+                        api_key=settings.GEMINI_API_KEY,
+                        http_options=types.HttpOptions(base_url=base_url)
+                    )
+                else:
+                    cls._client = genai.Client(api_key=settings.GEMINI_API_KEY)
             except Exception as e:
                 logger.error(f"Failed to initialize Gemini Client: {e}")
                 return None
@@ -26,31 +40,57 @@ class GeminiService:
     def get_embedding(cls, text: str):
         """
         Get embedding for text using 'text-embedding-004'.
+        Sent as a batch of one through the shared BatchEmbeddingClient.
         Returns list of floats or None.
         """
+        if not text or not text.strip():
+            return None
+        return cls.get_embeddings([text])[0]
+
+    @classmethod
+    def get_embedding_client(cls):
+        """
+        Shared BatchEmbeddingClient bound to the current Gemini client.
+        Generation requests also run through it, since they share the quota.
+        
+        Limits come from settings (GEMINI_EMBED_*). Returns None if Gemini
+        is not configured.
+        """
         client = cls._get_client()
         if not client:
             return None
         
-        try:
-            # Clean text
-            text = text.strip()
-            if not text:
-                return None
-                
-            # Embed content
-            result = client.models.embed_content(
+        if cls._embedding_client is None or cls._embedding_client.client is not client:
+            cls._embedding_client = BatchEmbeddingClient(
+                client,
                 model="text-embedding-004",
-                contents=text,
-                config=types.EmbedContentConfig(
-                    task_type="RETRIEVAL_DOCUMENT",
-                    title="CV Embedding"
-                )
+                batch_size=getattr(settings, 'GEMINI_EMBED_BATCH_SIZE', 100),
+                max_concurrency=getattr(settings, 'GEMINI_EMBED_MAX_CONCURRENCY', 4),
+                requests_per_second=getattr(settings, 'GEMINI_EMBED_REQUESTS_PER_SECOND', 5.0),
+                max_attempts=getattr(settings, 'GEMINI_EMBED_MAX_ATTEMPTS', 4),
+                retry_budget=RetryBudget(
+                    ratio=getattr(settings, 'GEMINI_RETRY_BUDGET_RATIO', 0.2)
+                ),
             )
-            return result.embeddings[0].values
-        except Exception as e:
-            logger.error(f"Gemini embedding error: {e}")
-            return None
+        return cls._embedding_client
+
+    @classmethod
+    def get_embeddings(cls, texts: list[str]) -> list:
+        """
+        Get embeddings for many texts with batched 'text-embedding-004' requests.
+        Returns list aligned with texts (None for blank or failed texts).
+        """
+        embedding_client = cls.get_embedding_client()
+        if not embedding_client:
+            return [None] * len(texts)
+        return embedding_client.embed(texts)
+
+    @classmethod
+    def get_embedding_metrics(cls) -> dict:
+        """Latency/quota counters of the embedding client (empty if unused)."""
+        if cls._embedding_client is None:
+            return {}
+        return cls._embedding_client.metrics.snapshot()
 
     @classmethod
     def generate_content(cls, prompt: str) -> str:
@@ -62,15 +102,14 @@ class GeminiService:
         if not client:
             return None
             
-        try:
-            response = client.models.generate_content(
+        response = cls.get_embedding_client().execute(
+            lambda: client.models.generate_content(
                 model='gemini-2.0-flash',
                 contents=prompt
-            )
-            return response.text
-        except Exception as e:
-            logger.error(f"Gemini generation error: {e}")
-            return None
+            ),
+            label='generation'
+        )
+        return response.text if response is not None else None
 
     @classmethod
     def generate_json(cls, prompt: str, schema: dict = None) -> dict:
@@ -83,21 +122,25 @@ class GeminiService:
         if not client:
             return None
             
-        try:
-            config = types.GenerateContentConfig(
-                response_mime_type='application/json',
-                response_schema=schema if schema else None
-            )
-            
-            response = client.models.generate_content(
+        config = types.GenerateContentConfig(
+            response_mime_type='application/json',
+            response_schema=schema if schema else None
+        )
+
+        # Same Gemini quota as embeddings: share their limiter and retry budget
+        response = cls.get_embedding_client().execute(
+            lambda: client.models.generate_content(
                 model='gemini-2.0-flash',
                 contents=prompt,
                 config=config
-            )
-            
-            if response.text:
-                return json.loads(response.text)
+            ),
+            label='JSON generation'
+        )
+        if response is None or not response.text:
             return None
-        except Exception as e:
+
+        try:
+            return json.loads(response.text)
+        except ValueError as e:
             logger.error(f"Gemini JSON generation error: {e}")
             return None
@@ -0,0 +1,203 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum, Value
+from django.db.models.functions import Least
+from django.utils import timezone
+
+from apps.assessment.ai_matching_scores.models import MatchRecomputeSchedule
+
+logger = logging.getLogger(__name__)
+
+
+def get_debounce_window() -> timedelta:
+    """Quiet period after the last trigger before a recompute runs."""
+    return timedelta(seconds=getattr(settings, 'AI_MATCH_RECOMPUTE_DEBOUNCE_SECONDS', 30))
+
+
+def get_max_wait() -> timedelta:
+    """Upper bound on how long a continuously re-triggered target can wait."""
+    return timedelta(seconds=getattr(settings, 'AI_MATCH_RECOMPUTE_MAX_WAIT_SECONDS', 300))
+
+
+def get_stale_after() -> timedelta:
+    """How long a pending entry may sit past due (and unqueued) before it is re-queued."""
+    return timedelta(seconds=getattr(settings, 'AI_MATCH_RECOMPUTE_STALE_SECONDS', 600))
+
+
+def enqueue_recompute(target_type: str, target_id: int, countdown: float) -> bool:
+    """
+    Enqueue run_match_recompute_task and record when it was scheduled.
+
+    A broker failure is logged instead of raised: the entry stays pending
+    and requeue_stale_recomputes picks it up once it is stale.
+
+    Returns:
+        True if the task was handed to the broker
+    """
+    from apps.assessment.ai_matching_scores.tasks import run_match_recompute_task
+
+    MatchRecomputeSchedule.objects.filter(
+        target_type=target_type,
+        target_id=target_id,
+    ).update(scheduled_at=timezone.now())
+    try:
+        run_match_recompute_task.apply_async(
+            args=[target_type, target_id],
+            countdown=countdown
+        )
+    except Exception as e:
+        logger.error(f"Could not enqueue match recompute for {target_type} {target_id}: {e}")
+        return False
+    return True
+
+
+def schedule_recompute(target_type: str, target_id: int) -> bool:
+    """
+    Record a recompute trigger for a recruiter or job.
+
+    Triggers for the same target are coalesced: the first one creates a
+    pending entry and enqueues a single delayed task, later ones only bump
+    the counters and push due_at back (trailing debounce, capped at
+    first trigger + max wait).
+
+    Args:
+        target_type: MatchRecomputeSchedule.TARGET_RECRUITER or TARGET_JOB
+        target_id: Recruiter or Job id
+
+    Returns:
+        True if a new task was enqueued, False if coalesced into a pending one
+    """
+    window = get_debounce_window()
+
+    for _ in range(3):
+        now = timezone.now()
+
+        # Coalesce into an already pending entry
+        coalesced = MatchRecomputeSchedule.objects.filter(
+            target_type=target_type,
+            target_id=target_id,
+            pending_triggers__gt=0,
+        ).update(
+            pending_triggers=F('pending_triggers') + 1,
+            total_triggers=F('total_triggers') + 1,
+            due_at=Least(Value(now + window), F('first_trigger_at') + get_max_wait()),
+        )
+        if coalesced:
+            return False
+
+        schedule, _ = MatchRecomputeSchedule.objects.get_or_create(
+            target_type=target_type,
+            target_id=target_id,
+        )
+
+        # Open a new pending window; only one concurrent caller wins this
+        opened = MatchRecomputeSchedule.objects.filter(
+            pk=schedule.pk,
+            pending_triggers=0,
+        ).update(
+            pending_triggers=1,
+            total_triggers=F('total_triggers') + 1,
+            first_trigger_at=now,
+            due_at=now + window,
+        )
+        if opened:
+            enqueue_recompute(target_type, target_id, window.total_seconds())
+            return True
+
+    return False
+
+
+def claim_due_recompute(target_type: str, target_id: int) -> tuple[bool, float]:
+    """
+    Claim a pending recompute whose debounce window has elapsed.
+
+    Returns:
+        Tuple (claimed, retry_in). claimed is True when the caller should run
+        the recompute now. Otherwise retry_in is the number of seconds until
+        the entry becomes due (0 when nothing is pending).
+    """
+    with transaction.atomic():
+        schedule = (
+            MatchRecomputeSchedule.objects
+            .select_for_update()
+            .filter(target_type=target_type, target_id=target_id)
+            .first()
+        )
+        if schedule is None or schedule.pending_triggers == 0:
+            return False, 0
+
+        now = timezone.now()
+        if schedule.due_at and schedule.due_at > now:
+            return False, (schedule.due_at - now).total_seconds()
+
+        schedule.pending_triggers = 0
+        schedule.total_runs = F('total_runs') + 1
+        schedule.first_trigger_at = None
+        schedule.due_at = None
+        schedule.last_run_at = now
+        schedule.save(update_fields=[
+            'pending_triggers', 'total_runs', 'first_trigger_at', 'due_at', 'last_run_at'
+        ])
+
+    return True, 0
+
+
+def requeue_stale_recomputes() -> int:
+    """
+    Re-queue pending entries whose task was lost.
+
+    An entry is stale when it has been due, and its last task was
+    scheduled, for longer than get_stale_after(): the apply_async never
+    reached the broker or the task died before claiming it. Each stale
+    entry is claimed by bumping scheduled_at, so concurrent sweeps do not
+    queue it twice.
+
+    Returns:
+        Number of entries re-queued
+    """
+    now = timezone.now()
+    cutoff = now - get_stale_after()
+    stale_filter = Q(scheduled_at__isnull=True) | Q(scheduled_at__lte=cutoff)
+
+    stale = (
+        MatchRecomputeSchedule.objects
+        .filter(stale_filter, pending_triggers__gt=0, due_at__lte=cutoff)
+        .values_list('pk', 'target_type', 'target_id')
+    )
+    requeued = 0
+    for pk, target_type, target_id in stale:
+        claimed = MatchRecomputeSchedule.objects.filter(
+            stale_filter, pk=pk
+        ).update(scheduled_at=now)
+        if claimed and enqueue_recompute(target_type, target_id, 0):
+            requeued += 1
+    return requeued
+
+
+def get_recompute_stats() -> dict:
+    """
+    Triggers received versus recomputes executed.
+
+    Returns:
+        Dict with triggers, executions, saved (triggers that did not cause
+        a run of their own) and pending (targets waiting for their window)
+    """
+    stats = MatchRecomputeSchedule.objects.aggregate(
+        triggers=Sum('total_triggers'),
+        executions=Sum('total_runs'),
+        pending=Count('id', filter=Q(pending_triggers__gt=0)),
+        pending_triggers=Sum('pending_triggers'),
+    )
+    triggers = stats['triggers'] or 0
+    executions = stats['executions'] or 0
+    pending_triggers = stats['pending_triggers'] or 0
+
+    return {
+        'triggers': triggers,
+        'executions': executions,
+        'saved': triggers - executions - pending_triggers,
+        'pending': stats['pending'],
+    }
@@ -3,7 +3,9 @@ from django.db.models.signals import post_save, m2m_changed
 from django.db import transaction
 from apps.candidate.recruiters.models import Recruiter
 from apps.recruitment.jobs.models import Job
-from apps.assessment.ai_matching_scores.tasks import calculate_candidate_matches_task, calculate_job_matches_task
+from apps.assessment.ai_matching_scores.tasks import update_candidate_index_task
+from apps.assessment.ai_matching_scores.models import MatchRecomputeSchedule
+from apps.assessment.ai_matching_scores.services.recompute_scheduler import schedule_recompute
 
 from apps.candidate.recruiter_skills.models import RecruiterSkill
 from apps.recruitment.job_skills.models import JobSkill
@@ -13,15 +15,29 @@ from django.db.models.signals import post_delete
 def trigger_candidate_matching(sender, instance, created, **kwargs):
     """
     Trigger AI matching when a Recruiter profile is created or updated.
+    Triggers are debounced per recruiter (matches and index are refreshed once).
     """
-    transaction.on_commit(lambda: calculate_candidate_matches_task.delay(instance.id))
+    transaction.on_commit(
+        lambda: schedule_recompute(MatchRecomputeSchedule.TARGET_RECRUITER, instance.id)
+    )
+
+@receiver(post_delete, sender=Recruiter)
+def remove_candidate_from_index(sender, instance, **kwargs):
+    """
+    Drop a deleted Recruiter from the candidate ANN index.
+    """
+    recruiter_id = instance.id
+    transaction.on_commit(lambda: update_candidate_index_task.delay(recruiter_id))
 
 @receiver([post_save, post_delete], sender=RecruiterSkill)
 def trigger_candidate_matching_skills(sender, instance, **kwargs):
     """
     Trigger AI matching when Recruiter skills are added/removed/updated.
     """
-    transaction.on_commit(lambda: calculate_candidate_matches_task.delay(instance.recruiter.id))
+    recruiter_id = instance.recruiter_id
+    transaction.on_commit(
+        lambda: schedule_recompute(MatchRecomputeSchedule.TARGET_RECRUITER, recruiter_id)
+    )
 
 @receiver(post_save, sender=Job)
 def trigger_job_matching(sender, instance, created, **kwargs):
@@ -29,7 +45,9 @@ def trigger_job_matching(sender, instance, created, **kwargs):
     Trigger AI matching when a Job is created or updated.
     """
     if instance.status == 'published':
-        transaction.on_commit(lambda: calculate_job_matches_task.delay(instance.id))
+        transaction.on_commit(
+            lambda: schedule_recompute(MatchRecomputeSchedule.TARGET_JOB, instance.id)
+        )
 
 @receiver([post_save, post_delete], sender=JobSkill)
 def trigger_job_matching_skills(sender, instance, **kwargs):
@@ -37,4 +55,7 @@ def trigger_job_matching_skills(sender, instance, **kwargs):
     Trigger AI matching when Job skills are added/removed/updated.
     """
     if instance.job.status == 'published':
-        transaction.on_commit(lambda: calculate_job_matches_task.delay(instance.job.id))
\ No newline at end of file
+        job_id = instance.job_id
+        transaction.on_commit(
+            lambda: schedule_recompute(MatchRecomputeSchedule.TARGET_JOB, job_id)
+        )
\ No newline at end of file
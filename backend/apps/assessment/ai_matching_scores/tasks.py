@@ -1,12 +1,41 @@
 from celery import shared_task
+from celery.signals import worker_process_init
+from django.conf import settings
 from django.db import transaction
 from django.apps import apps
 from celery.utils.log import get_task_logger
 
+from apps.assessment.ai_matching_scores.calculators import JOB_TEXT_PREFETCH
 from apps.assessment.ai_matching_scores.services.matching import AIMatchingService
+from apps.assessment.ai_matching_scores.services.ai_matching_scores import (
+    BatchCalculateInput,
+    batch_calculate_matches,
+)
+from apps.assessment.ai_matching_scores.services.candidate_index import (
+    find_semantic_candidates,
+    get_candidate_index,
+    index_recruiter,
+    rebuild_candidate_index,
+)
+from apps.assessment.ai_matching_scores.services.recompute_scheduler import (
+    claim_due_recompute,
+    enqueue_recompute,
+    requeue_stale_recomputes,
+)
+from apps.assessment.ai_matching_scores.models import MatchRecomputeSchedule
 
 logger = get_task_logger(__name__)
 
+
+@worker_process_init.connect
+def load_candidate_index(**kwargs):
+    """Memory-map the candidate index once per worker process."""
+    try:
+        get_candidate_index()
+    except Exception as e:
+        logger.error(f"Could not load candidate index: {e}")
+
+
 @shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
 def calculate_candidate_matches_task(self, recruiter_id: int):
     """
@@ -45,20 +74,31 @@ def calculate_job_matches_task(self, job_id: int):
         Recruiter = apps.get_model('candidate_recruiters', 'Recruiter')
         Job = apps.get_model('recruitment_jobs', 'Job')
 
-        job = Job.objects.get(id=job_id)
+        job = Job.objects.prefetch_related(*JOB_TEXT_PREFETCH).get(id=job_id)
         
         # Job Filter Strategy:
-        # Match against active candidates.
-        potential_candidates = Recruiter.objects.filter(
-            job_search_status__in=['active', 'passive'],
-            is_profile_public=True
-        ).order_by('-updated_at')[:5] # Limit 5 for demo
+        # Retrieve the top-K semantically closest candidates from the ANN index,
+        # then score them with the rule-based + semantic calculators.
+        top_k = min(getattr(settings, 'AI_CANDIDATE_TOP_K', 50), 100)
+        candidate_ids = find_semantic_candidates(job, limit=top_k)
         
-        results = []
-        for recruiter in potential_candidates:
-            score = AIMatchingService.calculate_matching_score(job, recruiter)
-            if score:
-                results.append(score.overall_score)
+        if candidate_ids:
+            scores = batch_calculate_matches(
+                BatchCalculateInput(job_id=job.id, recruiter_ids=candidate_ids)
+            )
+            results = [score.overall_score for score in scores]
+        else:
+            # Index empty or semantic disabled: match against active candidates.
+            potential_candidates = Recruiter.objects.filter(
+                job_search_status__in=['active', 'passive'],
+                is_profile_public=True
+            ).order_by('-updated_at')[:5] # Limit 5 for demo
+            
+            results = []
+            for recruiter in potential_candidates:
+                score = AIMatchingService.calculate_matching_score(job, recruiter)
+                if score:
+                    results.append(score.overall_score)
 
         logger.info(f"Calculated {len(results)} matches for Job {job_id}")
         return f"Processed {len(results)} candidates"
@@ -66,3 +106,51 @@ def calculate_job_matches_task(self, job_id: int):
     except Exception as e:
         logger.error(f"Error in calculate_job_matches_task: {e}")
         return f"Error: {e}"
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+def update_candidate_index_task(self, recruiter_id: int):
+    """
+    Add, refresh or remove a recruiter in the candidate ANN index.
+    """
+    indexed = index_recruiter(recruiter_id)
+    return f"Recruiter {recruiter_id} {'indexed' if indexed else 'removed'}"
+
+
+@shared_task
+def rebuild_candidate_index_task():
+    """
+    Rebuild the candidate ANN index from scratch (retrains the IVF centroids).
+    """
+    count = rebuild_candidate_index()
+    return f"Indexed {count} recruiters"
+
+
+@shared_task
+def run_match_recompute_task(target_type: str, target_id: int):
+    """
+    Run one coalesced recompute once the target's debounce window has elapsed.
+    
+    If more triggers arrived meanwhile, the task re-schedules itself for the
+    new due time instead of running.
+    """
+    claimed, retry_in = claim_due_recompute(target_type, target_id)
+    if not claimed:
+        if retry_in > 0:
+            enqueue_recompute(target_type, target_id, retry_in)
+            return f"{target_type} {target_id} deferred {retry_in:.0f}s"
+        return f"{target_type} {target_id} nothing pending"
+    
+    if target_type == MatchRecomputeSchedule.TARGET_RECRUITER:
+        calculate_candidate_matches_task.delay(target_id)
+        update_candidate_index_task.delay(target_id)
+    else:
+        calculate_job_matches_task.delay(target_id)
+    return f"{target_type} {target_id} recomputed"
+
+
+@shared_task
+def requeue_stale_recomputes_task():
+    """Periodic sweep re-queuing pending recomputes whose task was lost."""
+    requeued = requeue_stale_recomputes()
+    return f"Re-queued {requeued} stale recomputes"
@@ -521,3 +521,68 @@ class TestSemanticCalculator(TestCase):
         result = is_semantic_enabled()
         self.assertIsInstance(result, bool)
 
+
+
+class TestBatchSemanticCalculator(TestCase):
+    """Tests for the vectorized semantic scoring helpers."""
+    
+    def test_batch_matches_pairwise_cosine(self):
+        """Batch similarities equal the pairwise cosine_similarity results."""
+        from apps.assessment.ai_matching_scores.calculators.semantic_calculator import (
+            batch_cosine_similarity,
+            build_embedding_matrix,
+            cosine_similarity,
+        )
+        
+        query = [1.0, 2.0, 3.0]
+        candidates = [[1.0, 2.0, 3.0], [3.0, 2.0, 1.0], [0.0, 0.0, 0.0], [-1.0, -2.0, -3.0]]
+        
+        matrix = build_embedding_matrix(candidates)
+        similarities = batch_cosine_similarity(query, matrix)
+        
+        self.assertEqual(matrix.dtype.name, 'float32')
+        self.assertTrue(matrix.flags['C_CONTIGUOUS'])
+        for candidate, similarity in zip(candidates, similarities):
+            self.assertAlmostEqual(float(similarity), cosine_similarity(query, candidate), places=5)
+    
+    def test_batch_empty_matrix(self):
+        """Empty candidate list yields no similarities."""
+        from apps.assessment.ai_matching_scores.calculators.semantic_calculator import (
+            batch_cosine_similarity,
+            build_embedding_matrix,
+        )
+        
+        similarities = batch_cosine_similarity([1.0, 0.0], build_embedding_matrix([]))
+        
+        self.assertEqual(len(similarities), 0)
+    
+    @patch('apps.assessment.ai_matching_scores.calculators.semantic_calculator.is_semantic_enabled', return_value=True)
+    @patch('apps.assessment.ai_matching_scores.calculators.semantic_calculator.get_cached_embeddings')
+    def test_calculate_semantic_scores_one_job_many_recruiters(self, mock_embeddings, _):
+        """Each recruiter gets a result shaped like calculate_semantic_score."""
+        from apps.assessment.ai_matching_scores.calculators.semantic_calculator import (
+            calculate_semantic_scores,
+        )
+        
+        job = MagicMock(id=1, title='Python Developer', description=None,
+                        requirements=None, benefits=None, level=None, job_type=None)
+        job.required_skills.select_related.return_value.all.return_value = []
+        
+        close = MagicMock(spec=['id', 'current_position', 'bio', 'years_of_experience'])
+        close.id, close.current_position, close.bio, close.years_of_experience = 10, 'Python', None, 0
+        far = MagicMock(spec=['id', 'current_position', 'bio', 'years_of_experience'])
+        far.id, far.current_position, far.bio, far.years_of_experience = 11, 'Chef', None, 0
+        
+        mock_embeddings.return_value = {
+            'Job Title: Python Developer': [1.0, 0.0],
+            'Current Position: Python': [1.0, 0.0],
+            'Current Position: Chef': [0.0, 1.0],
+        }
+        
+        results = calculate_semantic_scores(job, [close, far], anchor_is_job=True)
+        
+        mock_embeddings.assert_called_once()
+        self.assertEqual(results[10]['score'], Decimal('100.00'))
+        self.assertEqual(results[11]['score'], Decimal('0.00'))
+        self.assertTrue(results[10]['is_semantic'])
+        self.assertEqual(results[10]['details']['status'], 'success')
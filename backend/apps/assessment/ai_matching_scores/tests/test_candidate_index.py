@@ -0,0 +1,174 @@
+"""
+Tests for the candidate ANN index (services/candidate_index.py).
+"""
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from apps.assessment.ai_matching_scores.services import candidate_index
+from apps.assessment.ai_matching_scores.services.candidate_index import CandidateIndex
+
+
+def _random_items(count: int, dimensions: int = 16, seed: int = 1) -> dict[int, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return {i + 1: rng.normal(size=dimensions).astype(np.float32) for i in range(count)}
+
+
+def _exact_top_k(items: dict, query, k: int) -> list[int]:
+    ids = list(items.keys())
+    matrix = np.stack([v / np.linalg.norm(v) for v in items.values()])
+    sims = matrix @ (query / np.linalg.norm(query))
+    return [ids[i] for i in np.argsort(-sims)[:k]]
+
+
+class TestCandidateIndex(SimpleTestCase):
+    """Tests for CandidateIndex."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_search_probing_all_lists_is_exact(self):
+        """With every list probed the result equals brute force."""
+        items = _random_items(200)
+        index = CandidateIndex(self.directory)
+        index.build(items, n_lists=8)
+
+        query = items[7]
+        result = index.search(query, k=10, n_probe=8)
+
+        self.assertEqual([rid for rid, _ in result], _exact_top_k(items, query, 10))
+        self.assertEqual(result[0][0], 7)
+        self.assertAlmostEqual(result[0][1], 1.0, places=5)
+
+    def test_default_probe_finds_nearest(self):
+        """The default (partial) probe still returns the query's own vector first."""
+        items = _random_items(500)
+        index = CandidateIndex(self.directory)
+        index.build(items)
+
+        for recruiter_id in (3, 100, 450):
+            self.assertEqual(index.search(items[recruiter_id], k=5)[0][0], recruiter_id)
+
+    def test_incremental_add_and_remove(self):
+        """Adds and removals are visible immediately without a rebuild."""
+        items = _random_items(50)
+        index = CandidateIndex(self.directory)
+        index.build(items)
+
+        new_vector = np.ones(16, dtype=np.float32)
+        index.add(999, new_vector)
+        index.remove(7)
+
+        ids = [rid for rid, _ in index.search(new_vector, k=100, n_probe=100)]
+        self.assertEqual(ids[0], 999)
+        self.assertNotIn(7, ids)
+        self.assertEqual(len(index), 50)
+
+    def test_update_replaces_old_vector(self):
+        """Re-adding an indexed recruiter replaces its previous embedding."""
+        items = _random_items(20)
+        index = CandidateIndex(self.directory)
+        index.build(items)
+
+        index.add(5, items[6])
+
+        result = index.search(items[6], k=100, n_probe=100)
+        self.assertEqual([rid for rid, _ in result].count(5), 1)
+        self.assertEqual(len(index), 20)
+
+    def test_persisted_and_memory_mapped(self):
+        """A fresh process view loads base (memory-mapped) and delta from disk."""
+        items = _random_items(30)
+        writer = CandidateIndex(self.directory)
+        writer.build(items)
+        writer.add(100, items[1])
+        writer.remove(2)
+
+        reader = CandidateIndex(self.directory).load()
+
+        self.assertIsInstance(reader.vectors, np.memmap)
+        self.assertIn(100, reader)
+        self.assertNotIn(2, reader)
+        self.assertEqual(len(reader), 30)
+
+    def test_reader_refreshes_after_other_writer(self):
+        """refresh_if_stale picks up changes written by another instance."""
+        items = _random_items(10)
+        writer = CandidateIndex(self.directory)
+        writer.build(items)
+        reader = CandidateIndex(self.directory).load()
+
+        writer.add(42, items[3])
+        reader.refresh_if_stale()
+
+        self.assertIn(42, reader)
+
+    def test_remove_sees_base_compacted_elsewhere(self):
+        """A writer whose base is stale still records removals of rows another process compacted in."""
+        items = _random_items(10)
+        writer = CandidateIndex(self.directory)
+        writer.build(items)
+        other = CandidateIndex(self.directory).load()
+
+        other.add(42, items[3])
+        other.compact()
+        writer.remove(42)
+
+        self.assertNotIn(42, CandidateIndex(self.directory).load())
+
+    def test_superseded_base_kept_for_retention(self):
+        """Old bases survive a compaction until the retention period has passed."""
+        items = _random_items(10)
+        index = CandidateIndex(self.directory)
+        index.build(items)
+        index.add(42, items[3])
+
+        index.compact()
+        self.assertEqual(len(list(Path(self.directory).glob('base_*'))), 2)
+
+        index.retention_seconds = 0
+        index.compact()
+        self.assertEqual(
+            [path.name for path in Path(self.directory).glob('base_*')],
+            [f'base_{index.version}']
+        )
+
+    def test_compact_folds_delta_into_base(self):
+        """Compaction keeps the same contents and clears the delta."""
+        items = _random_items(40)
+        index = CandidateIndex(self.directory)
+        index.build(items)
+        index.add(77, items[1])
+        index.remove(3)
+
+        index.compact()
+
+        self.assertEqual(index.delta_vectors, {})
+        self.assertEqual(index.removed, set())
+        self.assertIn(77, index)
+        self.assertNotIn(3, index)
+        self.assertEqual(len(index), 40)
+
+    def test_empty_index(self):
+        """Searching an empty index returns nothing."""
+        index = CandidateIndex(self.directory)
+        index.build({})
+
+        self.assertEqual(index.search([1.0, 0.0], k=5), [])
+        self.assertEqual(len(CandidateIndex(self.directory).load()), 0)
+
+
+class TestFindSemanticCandidates(SimpleTestCase):
+    """Tests for find_semantic_candidates."""
+
+    @patch.object(candidate_index, 'is_semantic_enabled', return_value=False)
+    def test_disabled_returns_empty(self, _):
+        """Without Gemini the caller falls back to its own selection."""
+        self.assertEqual(candidate_index.find_semantic_candidates(object()), [])
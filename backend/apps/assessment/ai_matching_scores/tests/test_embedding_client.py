@@ -0,0 +1,238 @@
+"""
+Tests for the batched Gemini embedding client, run against a local fake
+Gemini server (real google-genai client, real HTTP).
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase, override_settings
+from google import genai
+from google.genai import types
+
+from apps.assessment.ai_matching_scores.services.embedding_client import (
+    BatchEmbeddingClient,
+    RetryBudget,
+    TokenBucket,
+)
+from apps.assessment.ai_matching_scores.services.gemini_service import GeminiService
+
+
+class FakeGeminiServer:
+    """
+    Minimal stand-in for the Gemini batchEmbedContents and generateContent
+    endpoints.
+
+    Each text embeds to [len(text), 1.0]; generation answers with the JSON
+    text '{"score": 85}'. `failures` is a list of HTTP status codes returned
+    (in order) before the server starts succeeding.
+    """
+
+    def __init__(self, failures=None, delay=0.0):
+        self.failures = list(failures or [])
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with fake._lock:
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+                    fake.requests.append(body)
+                    status = fake.failures.pop(0) if fake.failures else 200
+                time.sleep(fake.delay)
+
+                if status == 200 and 'contents' in body:
+                    payload = {'candidates': [
+                        {'content': {'role': 'model', 'parts': [{'text': '{"score": 85}'}]}}
+                    ]}
+                elif status == 200:
+                    payload = {'embeddings': [
+                        {'values': [float(len(r['content']['parts'][0]['text'])), 1.0]}
+                        for r in body['requests']
+                    ]}
+                else:
+                    payload = {'error': {'code': status, 'message': 'fake error', 'status': 'UNAVAILABLE'}}
+
+                out = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(out)))
+                self.end_headers()
+                self.wfile.write(out)
+                with fake._lock:
+                    fake.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def client(self):
+        return genai.Client(api_key='fake_key', http_options=types.HttpOptions(base_url=self.url))
+
+
+def _make_client(server, **kwargs):
+    kwargs.setdefault('requests_per_second', 1000)
+    kwargs.setdefault('base_delay', 0.001)
+    return BatchEmbeddingClient(server.client(), **kwargs)
+
+
+class TestBatchEmbeddingClient(SimpleTestCase):
+    """Tests for BatchEmbeddingClient."""
+
+    def test_groups_texts_into_batches(self):
+        """Seven texts with batch_size=3 need three requests; order is preserved."""
+        texts = ['a', 'bb', 'ccc', 'dddd', 'e', 'ff', 'ggg']
+        with FakeGeminiServer() as server:
+            client = _make_client(server, batch_size=3)
+            result = client.embed(texts)
+
+        self.assertEqual(len(server.requests), 3)
+        self.assertEqual(result, [[float(len(t)), 1.0] for t in texts])
+        self.assertEqual(client.metrics.snapshot()['texts'], 7)
+
+    def test_blank_texts_are_not_sent(self):
+        """Blank entries get None and never reach the API."""
+        with FakeGeminiServer() as server:
+            result = _make_client(server).embed(['', 'abc', '   '])
+
+        self.assertEqual(result, [None, [3.0, 1.0], None])
+        self.assertEqual(len(server.requests[0]['requests']), 1)
+
+    def test_retries_quota_errors(self):
+        """429 and 503 responses are retried and counted as quota/failures."""
+        with FakeGeminiServer(failures=[429, 503]) as server:
+            client = _make_client(server)
+            result = client.embed(['abc'])
+
+        self.assertEqual(result, [[3.0, 1.0]])
+        metrics = client.metrics.snapshot()
+        self.assertEqual(metrics['calls'], 3)
+        self.assertEqual(metrics['retries'], 2)
+        self.assertEqual(metrics['quota_errors'], 1)
+
+    def test_client_errors_are_not_retried(self):
+        """A 400 fails the batch immediately."""
+        with FakeGeminiServer(failures=[400]) as server:
+            result = _make_client(server).embed(['abc'])
+
+        self.assertEqual(result, [None])
+        self.assertEqual(len(server.requests), 1)
+
+    def test_retry_budget_limits_retries(self):
+        """Once the shared budget is spent, failed batches are not retried."""
+        with FakeGeminiServer(failures=[503] * 10) as server:
+            client = _make_client(
+                server,
+                retry_budget=RetryBudget(ratio=0.0, min_retries=1),
+            )
+            result = client.embed(['abc'])
+
+        self.assertEqual(result, [None])
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(client.metrics.snapshot()['retries_denied'], 1)
+
+    def test_concurrency_limit(self):
+        """No more than max_concurrency requests are in flight at once."""
+        with FakeGeminiServer(delay=0.05) as server:
+            client = _make_client(server, batch_size=1, max_concurrency=2)
+            client.embed([f'text {i}' for i in range(6)])
+
+        self.assertEqual(len(server.requests), 6)
+        self.assertLessEqual(server.max_in_flight, 2)
+
+
+class TestTokenBucket(SimpleTestCase):
+    """Tests for TokenBucket."""
+
+    def test_waits_when_empty(self):
+        """Beyond the burst capacity, acquire waits 1/rate per token."""
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0], sleep=sleep)
+
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+        self.assertEqual(len(sleeps), 1)
+
+
+class TestGeminiServiceEmbeddings(SimpleTestCase):
+    """GeminiService.get_embeddings talks to GEMINI_API_BASE_URL."""
+
+    def tearDown(self):
+        GeminiService._client = None
+        GeminiService._embedding_client = None
+
+    def test_get_embeddings_uses_configured_base_url(self):
+        with FakeGeminiServer() as server:
+            GeminiService._client = None
+            with override_settings(GEMINI_API_KEY='fake_key', GEMINI_API_BASE_URL=server.url):
+                result = GeminiService.get_embeddings(['ab', 'abcd'])
+
+        self.assertEqual(result, [[2.0, 1.0], [4.0, 1.0]])
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(GeminiService.get_embedding_metrics()['calls'], 1)
+
+    def test_get_embedding_is_a_batch_of_one(self):
+        """The single-text path goes through the shared limiter and metrics."""
+        with FakeGeminiServer(failures=[429]) as server:
+            GeminiService._client = None
+            with override_settings(GEMINI_API_KEY='fake_key', GEMINI_API_BASE_URL=server.url):
+                result = GeminiService.get_embedding('abc')
+
+        self.assertEqual(result, [3.0, 1.0])
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(server.requests[-1]['requests'][0]['content']['parts'][0]['text'], 'abc')
+        metrics = GeminiService.get_embedding_metrics()
+        self.assertEqual(metrics['calls'], 2)
+        self.assertEqual(metrics['quota_errors'], 1)
+
+    def test_generate_json_shares_retry_budget(self):
+        """generate_json is retried and counted by the same client as embeddings."""
+        with FakeGeminiServer(failures=[503]) as server:
+            GeminiService._client = None
+            with override_settings(GEMINI_API_KEY='fake_key', GEMINI_API_BASE_URL=server.url):
+                embedding_client = GeminiService.get_embedding_client()
+                result = GeminiService.generate_json('Evaluate this profile')
+                GeminiService.get_embeddings(['ab'])
+
+        self.assertEqual(result, {'score': 85})
+        self.assertIs(GeminiService.get_embedding_client(), embedding_client)
+        metrics = GeminiService.get_embedding_metrics()
+        self.assertEqual(metrics['calls'], 3)
+        self.assertEqual(metrics['retries'], 1)
+
+    def test_generate_json_stops_when_budget_is_spent(self):
+        """Once the shared budget is exhausted generate_json gives up without retrying."""
+        with FakeGeminiServer(failures=[503] * 10) as server:
+            GeminiService._client = None
+            with override_settings(GEMINI_API_KEY='fake_key', GEMINI_API_BASE_URL=server.url):
+                GeminiService.get_embedding_client().retry_budget = RetryBudget(ratio=0.0, min_retries=0)
+                result = GeminiService.generate_json('Evaluate this profile')
+
+        self.assertIsNone(result)
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(GeminiService.get_embedding_metrics()['retries_denied'], 1)
@@ -0,0 +1,111 @@
+"""
+Tests for the persistent embedding store used by semantic matching.
+"""
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+
+from apps.assessment.ai_matching_scores.models import SemanticEmbedding
+from apps.assessment.ai_matching_scores.services.embedding_store import EmbeddingStore
+from apps.assessment.ai_matching_scores.calculators.semantic_calculator import (
+    calculate_semantic_score,
+    get_embedding_model,
+)
+
+
+MODEL = 'models/text-embedding-004'
+
+
+class TestEmbeddingStore(TestCase):
+    """Tests for EmbeddingStore."""
+
+    def test_pack_roundtrip_is_float32(self):
+        """Vectors are stored as 4 bytes per dimension."""
+        blob = EmbeddingStore.pack([0.5, -1.0, 0.25])
+
+        self.assertEqual(len(blob), 12)
+        self.assertEqual(EmbeddingStore.unpack(blob), [0.5, -1.0, 0.25])
+
+    def test_hash_depends_on_model(self):
+        """Same text under a different model must not share an entry."""
+        self.assertNotEqual(
+            EmbeddingStore.content_hash('text', MODEL),
+            EmbeddingStore.content_hash('text', 'models/other'),
+        )
+
+    def test_get_or_embed_calls_api_once(self):
+        """Second lookup of the same text is served from the store."""
+        embed_fn = MagicMock(return_value=[1.0, 0.0, 0.0])
+
+        first = EmbeddingStore.get_or_embed('Python Developer', MODEL, embed_fn)
+        second = EmbeddingStore.get_or_embed('Python Developer', MODEL, embed_fn)
+
+        self.assertEqual(first, [1.0, 0.0, 0.0])
+        self.assertEqual(second, [1.0, 0.0, 0.0])
+        embed_fn.assert_called_once_with('Python Developer')
+        self.assertEqual(SemanticEmbedding.objects.count(), 1)
+
+    def test_changed_text_is_re_embedded(self):
+        """Editing the source text produces a new entry."""
+        embed_fn = MagicMock(return_value=[0.0, 1.0])
+
+        EmbeddingStore.get_or_embed('Bio v1', MODEL, embed_fn)
+        EmbeddingStore.get_or_embed('Bio v2', MODEL, embed_fn)
+
+        self.assertEqual(embed_fn.call_count, 2)
+        self.assertEqual(SemanticEmbedding.objects.count(), 2)
+
+    def test_failed_embedding_is_not_stored(self):
+        """None results are not cached so the next call retries."""
+        embed_fn = MagicMock(return_value=None)
+
+        result = EmbeddingStore.get_or_embed('text', MODEL, embed_fn)
+
+        self.assertIsNone(result)
+        self.assertFalse(SemanticEmbedding.objects.exists())
+
+    def test_get_many_single_query(self):
+        """get_many fetches all known texts in one query."""
+        EmbeddingStore.put('a', MODEL, [1.0])
+        EmbeddingStore.put('b', MODEL, [2.0])
+
+        with self.assertNumQueries(1):
+            found = EmbeddingStore.get_many(['a', 'b', 'c'], MODEL)
+
+        self.assertEqual(found, {'a': [1.0], 'b': [2.0]})
+
+
+class TestSemanticScoreCaching(TestCase):
+    """calculate_semantic_score should reuse stored embeddings."""
+
+    def setUp(self):
+        self.job = MagicMock()
+        self.job.title = 'Python Developer'
+        self.job.description = 'Django expert'
+        self.job.requirements = 'Python'
+        self.job.benefits = None
+        self.job.level = 'senior'
+        self.job.job_type = 'full-time'
+        self.job.required_skills.select_related.return_value.all.return_value = []
+
+        self.recruiter = MagicMock(spec=['current_position', 'bio', 'years_of_experience'])
+        self.recruiter.current_position = 'Backend Developer'
+        self.recruiter.bio = 'Python and Django'
+        self.recruiter.years_of_experience = 5
+
+    @patch('apps.assessment.ai_matching_scores.calculators.semantic_calculator.is_semantic_enabled', return_value=True)
+    @patch('apps.assessment.ai_matching_scores.calculators.semantic_calculator.get_embedding')
+    def test_unchanged_profile_needs_no_embedding_calls(self, mock_get_embedding, _):
+        """Repeated scoring of an unchanged pair makes zero embedding calls."""
+        mock_get_embedding.return_value = [1.0, 0.0, 0.0]
+
+        first = calculate_semantic_score(self.job, self.recruiter)
+        self.assertEqual(mock_get_embedding.call_count, 2)
+
+        second = calculate_semantic_score(self.job, self.recruiter)
+
+        self.assertEqual(mock_get_embedding.call_count, 2)
+        self.assertEqual(first['score'], Decimal('100.00'))
+        self.assertEqual(second['score'], first['score'])
+        self.assertEqual(second['details']['model'], get_embedding_model())
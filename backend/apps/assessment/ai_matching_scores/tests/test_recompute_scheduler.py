@@ -0,0 +1,176 @@
+"""
+Tests for the debounced match recompute scheduler.
+"""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.assessment.ai_matching_scores.models import MatchRecomputeSchedule
+from apps.assessment.ai_matching_scores.services.recompute_scheduler import (
+    claim_due_recompute,
+    get_recompute_stats,
+    requeue_stale_recomputes,
+    schedule_recompute,
+)
+from apps.assessment.ai_matching_scores.tasks import run_match_recompute_task
+
+
+RECRUITER = MatchRecomputeSchedule.TARGET_RECRUITER
+JOB = MatchRecomputeSchedule.TARGET_JOB
+
+
+@patch('apps.assessment.ai_matching_scores.tasks.run_match_recompute_task.apply_async')
+class TestScheduleRecompute(TestCase):
+    """Tests for schedule_recompute."""
+
+    def test_burst_of_triggers_enqueues_one_task(self, mock_apply_async):
+        """A profile save plus 15 skill edits produce a single delayed task."""
+        results = [schedule_recompute(RECRUITER, 7) for _ in range(16)]
+
+        self.assertEqual(results.count(True), 1)
+        mock_apply_async.assert_called_once()
+        self.assertEqual(mock_apply_async.call_args.kwargs['args'], [RECRUITER, 7])
+
+        schedule = MatchRecomputeSchedule.objects.get(target_type=RECRUITER, target_id=7)
+        self.assertEqual(schedule.pending_triggers, 16)
+        self.assertEqual(schedule.total_triggers, 16)
+
+    def test_targets_are_independent(self, mock_apply_async):
+        """Different targets (and target types) each get their own task."""
+        schedule_recompute(RECRUITER, 1)
+        schedule_recompute(RECRUITER, 2)
+        schedule_recompute(JOB, 1)
+
+        self.assertEqual(mock_apply_async.call_count, 3)
+
+    @override_settings(AI_MATCH_RECOMPUTE_DEBOUNCE_SECONDS=60, AI_MATCH_RECOMPUTE_MAX_WAIT_SECONDS=90)
+    def test_due_time_capped_by_max_wait(self, mock_apply_async):
+        """Continuous triggers cannot postpone the recompute beyond max wait."""
+        schedule_recompute(JOB, 3)
+        MatchRecomputeSchedule.objects.filter(target_id=3).update(
+            first_trigger_at=timezone.now() - timedelta(seconds=80)
+        )
+
+        schedule_recompute(JOB, 3)
+
+        schedule = MatchRecomputeSchedule.objects.get(target_id=3)
+        self.assertLessEqual(schedule.due_at, schedule.first_trigger_at + timedelta(seconds=90))
+
+    def test_new_window_after_run(self, mock_apply_async):
+        """A trigger after the recompute ran opens a new window and task."""
+        schedule_recompute(RECRUITER, 5)
+        MatchRecomputeSchedule.objects.filter(target_id=5).update(due_at=timezone.now())
+        claimed, _ = claim_due_recompute(RECRUITER, 5)
+
+        schedule_recompute(RECRUITER, 5)
+
+        self.assertTrue(claimed)
+        self.assertEqual(mock_apply_async.call_count, 2)
+
+    def test_broker_failure_keeps_entry_pending(self, mock_apply_async):
+        """A failed apply_async is logged; the entry stays pending for the sweeper."""
+        mock_apply_async.side_effect = ConnectionError('broker down')
+
+        self.assertTrue(schedule_recompute(RECRUITER, 6))
+
+        schedule = MatchRecomputeSchedule.objects.get(target_id=6)
+        self.assertEqual(schedule.pending_triggers, 1)
+        self.assertIsNotNone(schedule.scheduled_at)
+
+
+@override_settings(AI_MATCH_RECOMPUTE_STALE_SECONDS=600)
+@patch('apps.assessment.ai_matching_scores.tasks.run_match_recompute_task.apply_async')
+class TestRequeueStaleRecomputes(TestCase):
+    """Tests for the sweeper recovering lost recompute tasks."""
+
+    def _make_stale(self, target_id):
+        long_ago = timezone.now() - timedelta(seconds=700)
+        MatchRecomputeSchedule.objects.filter(target_id=target_id).update(
+            due_at=long_ago, scheduled_at=long_ago
+        )
+
+    def test_lost_task_is_requeued_once(self, mock_apply_async):
+        schedule_recompute(JOB, 20)
+        self._make_stale(20)
+        mock_apply_async.reset_mock()
+
+        self.assertEqual(requeue_stale_recomputes(), 1)
+        self.assertEqual(requeue_stale_recomputes(), 0)
+
+        mock_apply_async.assert_called_once_with(args=[JOB, 20], countdown=0)
+
+    def test_recent_and_idle_entries_are_left_alone(self, mock_apply_async):
+        schedule_recompute(JOB, 21)
+        schedule_recompute(JOB, 22)
+        self._make_stale(22)
+        MatchRecomputeSchedule.objects.filter(target_id=22).update(pending_triggers=0)
+        mock_apply_async.reset_mock()
+
+        self.assertEqual(requeue_stale_recomputes(), 0)
+        mock_apply_async.assert_not_called()
+
+    @patch('apps.assessment.ai_matching_scores.tasks.calculate_job_matches_task.delay')
+    def test_requeued_task_runs_recompute(self, mock_job_match, mock_apply_async):
+        schedule_recompute(JOB, 23)
+        self._make_stale(23)
+        requeue_stale_recomputes()
+
+        run_match_recompute_task(*mock_apply_async.call_args.kwargs['args'])
+
+        mock_job_match.assert_called_once_with(23)
+        self.assertEqual(MatchRecomputeSchedule.objects.get(target_id=23).pending_triggers, 0)
+
+
+@patch('apps.assessment.ai_matching_scores.tasks.run_match_recompute_task.apply_async')
+class TestRunMatchRecomputeTask(TestCase):
+    """Tests for run_match_recompute_task and the trigger statistics."""
+
+    def test_not_due_is_deferred(self, mock_apply_async):
+        """A task that fires while the window is still open re-schedules itself."""
+        schedule_recompute(RECRUITER, 9)
+        mock_apply_async.reset_mock()
+
+        with patch('apps.assessment.ai_matching_scores.tasks.calculate_candidate_matches_task.delay') as mock_match:
+            run_match_recompute_task(RECRUITER, 9)
+
+        mock_match.assert_not_called()
+        mock_apply_async.assert_called_once()
+        self.assertGreater(mock_apply_async.call_args.kwargs['countdown'], 0)
+
+    @patch('apps.assessment.ai_matching_scores.tasks.update_candidate_index_task.delay')
+    @patch('apps.assessment.ai_matching_scores.tasks.calculate_candidate_matches_task.delay')
+    def test_due_recruiter_runs_once(self, mock_match, mock_index, mock_apply_async):
+        """Sixteen triggers lead to exactly one recompute and index refresh."""
+        for _ in range(16):
+            schedule_recompute(RECRUITER, 4)
+        MatchRecomputeSchedule.objects.filter(target_id=4).update(due_at=timezone.now())
+
+        run_match_recompute_task(RECRUITER, 4)
+        run_match_recompute_task(RECRUITER, 4)
+
+        mock_match.assert_called_once_with(4)
+        mock_index.assert_called_once_with(4)
+        self.assertEqual(
+            get_recompute_stats(),
+            {'triggers': 16, 'executions': 1, 'saved': 15, 'pending': 0}
+        )
+
+    @patch('apps.assessment.ai_matching_scores.tasks.calculate_job_matches_task.delay')
+    def test_due_job_runs_job_matching(self, mock_job_match, mock_apply_async):
+        schedule_recompute(JOB, 12)
+        MatchRecomputeSchedule.objects.filter(target_id=12).update(due_at=timezone.now())
+
+        run_match_recompute_task(JOB, 12)
+
+        mock_job_match.assert_called_once_with(12)
+
+    def test_stats_count_pending(self, mock_apply_async):
+        schedule_recompute(JOB, 1)
+        schedule_recompute(JOB, 1)
+
+        self.assertEqual(
+            get_recompute_stats(),
+            {'triggers': 2, 'executions': 0, 'saved': 0, 'pending': 1}
+        )
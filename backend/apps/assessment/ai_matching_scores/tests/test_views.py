@@ -4,6 +4,7 @@ API Integration Tests for AI Matching Scores
 Tests for all 8 AI Matching API endpoints.
 """
 from decimal import Decimal
+from unittest.mock import patch
 
 from django.urls import reverse
 from django.contrib.auth import get_user_model
@@ -13,7 +14,7 @@ from rest_framework.test import APITestCase
 from apps.recruitment.jobs.models import Job
 from apps.candidate.recruiters.models import Recruiter
 from apps.company.companies.models import Company
-from apps.assessment.ai_matching_scores.models import AIMatchingScore
+from apps.assessment.ai_matching_scores.models import AIMatchingScore, MatchRecomputeSchedule
 
 
 User = get_user_model()
@@ -323,3 +324,61 @@ class TestMatchingInsightsView(AIMatchingAPITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['filters_applied']['job_id'], self.job.id)
+
+
+class TestRecomputeStatsView(AIMatchingAPITestCase):
+    """Tests for GET /api/ai-matching/recompute-stats"""
+
+    def test_recompute_stats_requires_admin(self):
+        """Non-admin users are rejected."""
+        response = self.client.get('/api/ai-matching/recompute-stats/')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_recompute_stats_success(self):
+        """Admins get trigger and execution counts."""
+        MatchRecomputeSchedule.objects.create(
+            target_type=MatchRecomputeSchedule.TARGET_RECRUITER,
+            target_id=self.recruiter.id,
+            total_triggers=16,
+            total_runs=1,
+        )
+        admin = User.objects.create_user(
+            email='admin@example.com',
+            password='testpass123',
+            full_name='Admin',
+            is_staff=True
+        )
+        self.client.force_authenticate(user=admin)
+
+        response = self.client.get('/api/ai-matching/recompute-stats/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'triggers': 16, 'executions': 1, 'saved': 15, 'pending': 0})
+
+
+class TestEmbeddingStatsView(AIMatchingAPITestCase):
+    """Tests for GET /api/ai-matching/embedding-stats"""
+
+    def test_embedding_stats_requires_admin(self):
+        """Non-admin users are rejected."""
+        response = self.client.get('/api/ai-matching/embedding-stats/')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @patch('apps.assessment.ai_matching_scores.views.GeminiService.get_embedding_metrics')
+    def test_embedding_stats_success(self, mock_metrics):
+        """Admins get the embedding client counters."""
+        mock_metrics.return_value = {'calls': 3, 'retries': 1, 'retries_denied': 0}
+        admin = User.objects.create_user(
+            email='embedding-admin@example.com',
+            password='testpass123',
+            full_name='Admin',
+            is_staff=True
+        )
+        self.client.force_authenticate(user=admin)
+
+        response = self.client.get('/api/ai-matching/embedding-stats/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'calls': 3, 'retries': 1, 'retries_denied': 0})
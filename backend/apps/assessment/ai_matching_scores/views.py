@@ -1,7 +1,7 @@
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
 from apps.recruitment.jobs.models import Job
 from apps.candidate.recruiters.models import Recruiter
@@ -27,6 +27,8 @@ from apps.assessment.ai_matching_scores.services.ai_matching_scores import (
     refresh_matches,
     get_matching_insights,
 )
+from apps.assessment.ai_matching_scores.services.gemini_service import GeminiService
+from apps.assessment.ai_matching_scores.services.recompute_scheduler import get_recompute_stats
 from apps.assessment.ai_matching_scores.selectors.ai_matching_scores import (
     get_matching_candidates,
     get_matching_jobs,
@@ -46,6 +48,8 @@ class AIMatchingViewSet(viewsets.GenericViewSet):
     - GET /api/ai-matching/top-matches - Get top matches
     - POST /api/ai-matching/refresh - Refresh scores
     - GET /api/ai-matching/insights - Get insights
+    - GET /api/ai-matching/recompute-stats - Recompute triggers vs executions (admin)
+    - GET /api/ai-matching/embedding-stats - Gemini embedding latency/quota counters (admin)
     """
     permission_classes = [IsAuthenticated]
     
@@ -160,6 +164,16 @@ class AIMatchingViewSet(viewsets.GenericViewSet):
         serializer = MatchingInsightsSerializer(insights)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'], url_path='recompute-stats', permission_classes=[IsAdminUser])
+    def recompute_stats(self, request):
+        """GET /api/ai-matching/recompute-stats - Debounced recompute triggers vs executions (admin)."""
+        return Response(get_recompute_stats())
+
+    @action(detail=False, methods=['get'], url_path='embedding-stats', permission_classes=[IsAdminUser])
+    def embedding_stats(self, request):
+        """GET /api/ai-matching/embedding-stats - Gemini embedding latency/quota counters (current process, admin)."""
+        return Response(GeminiService.get_embedding_metrics())
+
 class MatchingCandidatesView(viewsets.GenericViewSet):
     """
     GET /api/jobs/:id/matching-candidates
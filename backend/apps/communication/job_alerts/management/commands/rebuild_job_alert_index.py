@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from apps.communication.job_alerts.services.alert_index import JobAlertIndexService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the job alert inverted index from all active JobAlert rows'
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding job alert index ...")
+
+        try:
+            count = JobAlertIndexService.rebuild()
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} active alerts"))
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"Error: {e}"))
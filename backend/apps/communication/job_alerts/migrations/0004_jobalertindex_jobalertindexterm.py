@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_job_alert_index(apps, schema_editor):
+    """Index existing active alerts (same terms as JobAlertIndexService.build_terms)."""
+    JobAlert = apps.get_model('communication_job_alerts', 'JobAlert')
+    JobAlertIndex = apps.get_model('communication_job_alerts', 'JobAlertIndex')
+    JobAlertIndexTerm = apps.get_model('communication_job_alerts', 'JobAlertIndexTerm')
+
+    terms, entries = [], []
+    for alert in JobAlert.objects.filter(is_active=True).prefetch_related('skills', 'locations'):
+        skill_ids = [skill.id for skill in alert.skills.all()]
+        province_ids = [province.id for province in alert.locations.all()]
+
+        alert_terms = [
+            f"category:{alert.category_id or '*'}",
+            f"job_type:{alert.job_type or '*'}",
+            f"level:{alert.level or '*'}",
+        ]
+        alert_terms += [f"skill:{skill_id}" for skill_id in skill_ids]
+        alert_terms += [f"province:{province_id}" for province_id in province_ids] or ['province:*']
+
+        terms += [JobAlertIndexTerm(job_alert_id=alert.pk, term=term) for term in dict.fromkeys(alert_terms)]
+        entries.append(JobAlertIndex(
+            job_alert_id=alert.pk,
+            keywords=alert.keywords,
+            salary_min=alert.salary_min,
+            skill_count=len(skill_ids),
+            has_locations=bool(province_ids),
+        ))
+
+    JobAlertIndexTerm.objects.bulk_create(terms, batch_size=2000)
+    JobAlertIndex.objects.bulk_create(entries, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication_job_alerts', '0003_jobalert_use_ai_matching'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobAlertIndex',
+            fields=[
+                ('job_alert', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='index_entry', serialize=False, to='communication_job_alerts.jobalert', verbose_name='Job Alert')),
+                ('keywords', models.TextField(blank=True, null=True, verbose_name='Từ khóa')),
+                ('salary_min', models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True, verbose_name='Mức lương tối thiểu')),
+                ('skill_count', models.PositiveIntegerField(default=0, verbose_name='Số kỹ năng')),
+                ('has_locations', models.BooleanField(default=False, verbose_name='Có chọn địa điểm')),
+            ],
+            options={
+                'verbose_name': 'Chỉ mục Job Alert',
+                'verbose_name_plural': 'Chỉ mục Job Alert',
+                'db_table': 'job_alert_index',
+            },
+        ),
+        migrations.CreateModel(
+            name='JobAlertIndexTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='Term')),
+                ('job_alert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='index_terms', to='communication_job_alerts.jobalert', verbose_name='Job Alert')),
+            ],
+            options={
+                'verbose_name': 'Term chỉ mục Job Alert',
+                'verbose_name_plural': 'Term chỉ mục Job Alert',
+                'db_table': 'job_alert_index_terms',
+                'indexes': [models.Index(fields=['term', 'job_alert'], name='job_alert_term_idx')],
+                'unique_together': {('job_alert', 'term')},
+            },
+        ),
+        migrations.RunPython(build_job_alert_index, migrations.RunPython.noop),
+    ]
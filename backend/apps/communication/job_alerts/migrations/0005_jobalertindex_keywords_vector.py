@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:40
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def build_keywords_vectors(apps, schema_editor):
+    """Fill keywords_vector for indexed alerts (same config as job search vectors)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    JobAlertIndex = apps.get_model('communication_job_alerts', 'JobAlertIndex')
+    JobAlertIndex.objects.update(keywords_vector=SearchVector('keywords', config='english'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication_job_alerts', '0004_jobalertindex_jobalertindexterm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobalertindex',
+            name='keywords_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, null=True, verbose_name='tsvector từ khóa'),
+        ),
+        migrations.AddIndex(
+            model_name='jobalertindex',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['keywords_vector'], name='job_alert_keywords_gin'),
+        ),
+        migrations.RunPython(build_keywords_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:10
+
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def rebuild_keywords_vectors(apps, schema_editor):
+    """Rebuild keywords_vector with job_search so alert lexemes stay comparable with job vectors."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    JobAlertIndex = apps.get_model('communication_job_alerts', 'JobAlertIndex')
+    JobAlertIndex.objects.update(keywords_vector=SearchVector('keywords', config='job_search'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication_job_alerts', '0005_jobalertindex_keywords_vector'),
+        ('recruitment_jobs', '0005_job_search_config_unaccent'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_keywords_vectors, migrations.RunPython.noop),
+    ]
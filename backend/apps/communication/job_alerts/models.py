@@ -1,4 +1,6 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from apps.candidate.recruiters.models import Recruiter
 from apps.recruitment.job_categories.models import JobCategory
 from apps.geography.provinces.models import Province
@@ -176,3 +178,78 @@ class JobAlertMatch(models.Model):
 
     def __str__(self):
         return f"{self.job_alert.alert_name} - {self.job.title}"
+
+
+class JobAlertIndex(models.Model):
+    """Bảng Job_Alert_Index - Dữ liệu chấm điểm của alert đang hoạt động (inverted index)"""
+    
+    job_alert = models.OneToOneField(
+        JobAlert,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='index_entry',
+        verbose_name='Job Alert'
+    )
+    keywords = models.TextField(
+        null=True,
+        blank=True,
+        verbose_name='Từ khóa'
+    )
+    keywords_vector = SearchVectorField(
+        null=True,
+        blank=True,
+        verbose_name='tsvector từ khóa'
+    )
+    salary_min = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name='Mức lương tối thiểu'
+    )
+    skill_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Số kỹ năng'
+    )
+    has_locations = models.BooleanField(
+        default=False,
+        verbose_name='Có chọn địa điểm'
+    )
+    
+    class Meta:
+        db_table = 'job_alert_index'
+        verbose_name = 'Chỉ mục Job Alert'
+        verbose_name_plural = 'Chỉ mục Job Alert'
+        indexes = [
+            GinIndex(fields=['keywords_vector'], name='job_alert_keywords_gin'),
+        ]
+    
+    def __str__(self):
+        return f"Index #{self.job_alert_id}"
+
+
+class JobAlertIndexTerm(models.Model):
+    """Bảng Job_Alert_Index_Terms - Posting list: term (skill/tỉnh/danh mục/loại/cấp bậc) -> alert"""
+    
+    job_alert = models.ForeignKey(
+        JobAlert,
+        on_delete=models.CASCADE,
+        related_name='index_terms',
+        verbose_name='Job Alert'
+    )
+    term = models.CharField(
+        max_length=64,
+        verbose_name='Term'
+    )
+    
+    class Meta:
+        db_table = 'job_alert_index_terms'
+        verbose_name = 'Term chỉ mục Job Alert'
+        verbose_name_plural = 'Term chỉ mục Job Alert'
+        unique_together = ['job_alert', 'term']
+        indexes = [
+            models.Index(fields=['term', 'job_alert'], name='job_alert_term_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.term} -> {self.job_alert_id}"
@@ -0,0 +1,289 @@
+from collections import Counter
+from typing import Dict, List, Optional, Set
+import logging
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import transaction
+from django.db.models import F, Func, IntegerField, Value
+from django.db.models.functions import Coalesce
+
+from apps.communication.job_alerts.models import JobAlert, JobAlertIndex, JobAlertIndexTerm
+from apps.recruitment.jobs.services.search_vector import (
+    SEARCH_CONFIG,
+    TsvectorToArray,
+    search_vector_enabled,
+    text_lexemes,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# Wildcard term value: alert has no constraint on this dimension
+ANY = '*'
+
+# Number of ids per IN (...) when loading scoring data
+CHUNK_SIZE = 5000
+
+
+def make_term(dimension: str, value) -> str:
+    """Build a posting term, e.g. make_term('skill', 12) -> 'skill:12'."""
+    return f"{dimension}:{value}"
+
+
+def keywords_vector(keywords: Optional[str]) -> Optional[SearchVector]:
+    """
+    to_tsvector of an alert's keywords, usable in INSERT and UPDATE.
+
+    None on backends without full-text search, where keyword lexemes are
+    computed from the keywords column instead.
+    """
+    if not search_vector_enabled():
+        return None
+    return SearchVector(Value(keywords or ''), config=SEARCH_CONFIG)
+
+
+def lexemes_query(lexemes: Set[str]) -> SearchQuery:
+    """
+    OR-query over already normalised lexemes ('a' | 'b' | ...).
+
+    Lexemes are quoted and parsed with the 'simple' config so they are not
+    stemmed a second time.
+    """
+    quoted = (
+        "'" + lexeme.replace('\\', '\\\\').replace("'", "''") + "'"
+        for lexeme in sorted(lexemes)
+    )
+    return SearchQuery(' | '.join(quoted), search_type='raw', config='simple')
+
+
+class JobAlertIndexService:
+    """
+    Inverted index cho JobAlert đang hoạt động.
+
+    Mỗi alert được ghi thành các term trong job_alert_index_terms:
+    - category:<id> | category:*      (alert không chọn danh mục)
+    - job_type:<v>  | job_type:*
+    - level:<v>     | level:*
+    - skill:<id>    (mỗi kỹ năng một term)
+    - province:<id> | province:*      (alert không chọn địa điểm)
+
+    và một dòng job_alert_index với dữ liệu chấm điểm (keywords, keywords_vector,
+    salary_min, skill_count, has_locations). keywords_vector có GIN index để tìm
+    alert theo lexeme của job. Alert không hoạt động không có mặt trong index.
+    """
+
+    @staticmethod
+    def build_terms(alert: JobAlert, skill_ids: List[int], province_ids: List[int]) -> List[str]:
+        """Return the posting terms of an alert."""
+        terms = [
+            make_term('category', alert.category_id if alert.category_id else ANY),
+            make_term('job_type', alert.job_type or ANY),
+            make_term('level', alert.level or ANY),
+        ]
+        terms += [make_term('skill', skill_id) for skill_id in skill_ids]
+        if province_ids:
+            terms += [make_term('province', province_id) for province_id in province_ids]
+        else:
+            terms.append(make_term('province', ANY))
+        return terms
+
+    @classmethod
+    def index_alert(cls, alert: JobAlert) -> None:
+        """
+        (Re)index a single alert. Inactive alerts are removed from the index.
+        """
+        with transaction.atomic():
+            JobAlertIndexTerm.objects.filter(job_alert_id=alert.pk).delete()
+
+            if not alert.is_active:
+                JobAlertIndex.objects.filter(job_alert_id=alert.pk).delete()
+                return
+
+            skill_ids = list(alert.skills.values_list('id', flat=True))
+            province_ids = list(alert.locations.values_list('id', flat=True))
+
+            JobAlertIndexTerm.objects.bulk_create([
+                JobAlertIndexTerm(job_alert_id=alert.pk, term=term)
+                for term in dict.fromkeys(cls.build_terms(alert, skill_ids, province_ids))
+            ])
+            JobAlertIndex.objects.update_or_create(
+                job_alert_id=alert.pk,
+                defaults={
+                    'keywords': alert.keywords,
+                    'keywords_vector': keywords_vector(alert.keywords),
+                    'salary_min': alert.salary_min,
+                    'skill_count': len(skill_ids),
+                    'has_locations': bool(province_ids),
+                }
+            )
+
+    @staticmethod
+    def remove_alert(alert_id: int) -> None:
+        """Drop an alert from the index."""
+        JobAlertIndexTerm.objects.filter(job_alert_id=alert_id).delete()
+        JobAlertIndex.objects.filter(job_alert_id=alert_id).delete()
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """
+        Rebuild the whole index from JobAlert rows.
+
+        Returns:
+            Number of indexed (active) alerts
+        """
+        alerts = JobAlert.objects.filter(is_active=True).prefetch_related('skills', 'locations')
+
+        with transaction.atomic():
+            JobAlertIndexTerm.objects.all().delete()
+            JobAlertIndex.objects.all().delete()
+
+            count = 0
+            terms, entries = [], []
+            for alert in alerts.iterator(chunk_size=2000):
+                skill_ids = [skill.id for skill in alert.skills.all()]
+                province_ids = [province.id for province in alert.locations.all()]
+                terms += [
+                    JobAlertIndexTerm(job_alert_id=alert.pk, term=term)
+                    for term in dict.fromkeys(cls.build_terms(alert, skill_ids, province_ids))
+                ]
+                entries.append(JobAlertIndex(
+                    job_alert_id=alert.pk,
+                    keywords=alert.keywords,
+                    keywords_vector=keywords_vector(alert.keywords),
+                    salary_min=alert.salary_min,
+                    skill_count=len(skill_ids),
+                    has_locations=bool(province_ids),
+                ))
+                count += 1
+
+                if len(entries) >= 2000:
+                    JobAlertIndexTerm.objects.bulk_create(terms)
+                    JobAlertIndex.objects.bulk_create(entries)
+                    terms, entries = [], []
+
+            JobAlertIndexTerm.objects.bulk_create(terms)
+            JobAlertIndex.objects.bulk_create(entries)
+
+        logger.info(f"Rebuilt job alert index: {count} active alerts")
+        return count
+
+    @staticmethod
+    def get_postings(terms: List[str]) -> Dict[str, Set[int]]:
+        """Load the posting lists of the given terms with one query."""
+        postings: Dict[str, Set[int]] = {term: set() for term in terms}
+        rows = JobAlertIndexTerm.objects.filter(term__in=terms).values_list('term', 'job_alert_id')
+        for term, alert_id in rows.iterator(chunk_size=10000):
+            postings[term].add(alert_id)
+        return postings
+
+    @classmethod
+    def find_candidates(
+        cls,
+        category_id: Optional[int],
+        job_type: Optional[str],
+        level: Optional[str],
+        skill_ids: List[int],
+        province_id: Optional[int],
+    ) -> tuple:
+        """
+        Resolve the hard filters with set algebra over posting lists.
+
+        For each dimension the job has a value for, the allowed set is
+        postings[value] | postings[*]; candidates are the intersection of
+        the allowed sets. Dimensions where the job has no value do not
+        restrict.
+
+        Returns:
+            Tuple (candidate_ids, skill_hits, location_hits) where skill_hits
+            counts matched job skills per candidate and location_hits is the
+            set of candidates listing the job's province
+        """
+        filters = []
+        if category_id:
+            filters.append((make_term('category', category_id), make_term('category', ANY)))
+        if job_type:
+            filters.append((make_term('job_type', job_type), make_term('job_type', ANY)))
+        if level:
+            filters.append((make_term('level', level), make_term('level', ANY)))
+
+        skill_terms = [make_term('skill', skill_id) for skill_id in dict.fromkeys(skill_ids)]
+        province_term = make_term('province', province_id) if province_id else None
+
+        terms = [term for pair in filters for term in pair] + skill_terms
+        if province_term:
+            terms.append(province_term)
+        postings = cls.get_postings(terms)
+
+        if filters:
+            allowed_sets = [postings[exact] | postings[wildcard] for exact, wildcard in filters]
+            allowed_sets.sort(key=len)
+            candidates = set.intersection(*allowed_sets)
+        else:
+            candidates = set(JobAlertIndex.objects.values_list('job_alert_id', flat=True))
+
+        skill_hits = Counter()
+        for term in skill_terms:
+            skill_hits.update(postings[term] & candidates)
+
+        location_hits = postings[province_term] & candidates if province_term else set()
+
+        return candidates, skill_hits, location_hits
+
+    @staticmethod
+    def find_keyword_hits(job_lexemes: Set[str]) -> Dict[int, int]:
+        """
+        Count, per alert, the keyword lexemes that occur in the job.
+
+        keywords_vector @@ ('lexeme1' | 'lexeme2' | ...) is answered by the
+        GIN index, so only alerts sharing at least one lexeme with the job
+        are read. Alerts missing from the result have no hits. Without
+        full-text search the keywords of every indexed alert are scanned.
+        """
+        if not job_lexemes:
+            return {}
+        if not search_vector_enabled():
+            rows = JobAlertIndex.objects.exclude(keywords='').exclude(keywords__isnull=True)
+            hits = {}
+            for alert_id, keywords in rows.values_list('job_alert_id', 'keywords').iterator(chunk_size=10000):
+                count = len(job_lexemes & text_lexemes(keywords))
+                if count:
+                    hits[alert_id] = count
+            return hits
+        rows = (
+            JobAlertIndex.objects
+            .filter(keywords_vector=lexemes_query(job_lexemes))
+            .values_list('job_alert_id', TsvectorToArray(F('keywords_vector')))
+        )
+        return {
+            alert_id: len(job_lexemes.intersection(lexemes))
+            for alert_id, lexemes in rows.iterator(chunk_size=10000)
+        }
+
+    @staticmethod
+    def load_scoring_data(alert_ids) -> Dict[int, tuple]:
+        """
+        Load (keyword_count, salary_min, skill_count, has_locations) per candidate.
+
+        keyword_count is the number of lexemes in keywords_vector (in the
+        keywords column without full-text search).
+        """
+        alert_ids = list(alert_ids)
+        vector_enabled = search_vector_enabled()
+        if vector_enabled:
+            keyword_count = Coalesce(
+                Func(F('keywords_vector'), function='length', output_field=IntegerField()),
+                Value(0),
+            )
+        else:
+            keyword_count = F('keywords')
+        data = {}
+        for start in range(0, len(alert_ids), CHUNK_SIZE):
+            rows = JobAlertIndex.objects.filter(
+                job_alert_id__in=alert_ids[start:start + CHUNK_SIZE]
+            ).values_list('job_alert_id', keyword_count, 'salary_min', 'skill_count', 'has_locations')
+            for alert_id, keywords, *values in rows:
+                if not vector_enabled:
+                    keywords = len(text_lexemes(keywords))
+                data[alert_id] = (keywords, *values)
+        return data
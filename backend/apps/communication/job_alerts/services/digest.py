@@ -0,0 +1,186 @@
+from datetime import timedelta
+from itertools import groupby
+from typing import List, Optional
+import logging
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.communication.job_alerts.models import JobAlert, JobAlertMatch
+from apps.communication.notification_types.models import NotificationType
+from apps.communication.notifications.models import Notification
+from apps.communication.notifications.services.realtime import publish_notifications
+from apps.email.services import EmailService
+
+
+logger = logging.getLogger(__name__)
+
+
+# Digest period per frequency
+PERIODS = {
+    JobAlert.Frequency.DAILY: timedelta(days=1),
+    JobAlert.Frequency.WEEKLY: timedelta(weeks=1),
+}
+
+# An alert is due when its last digest is older than period - SLACK,
+# so a run scheduled at the same time every day is never skipped
+SLACK = timedelta(hours=1)
+
+# Jobs listed per alert in one email (all matches are still marked sent)
+MAX_JOBS_PER_ALERT = 10
+
+NOTIFICATION_TYPE_NAME = 'job_alert_digest'
+TEMPLATE_PATH = 'emails/job_alerts/digest.html'
+
+
+class JobAlertDigestService:
+    """
+    Gửi bản tin tổng hợp (daily/weekly) cho JobAlert theo frequency.
+
+    Unsent JobAlertMatch rows of due alerts are streamed ordered by
+    recruiter, grouped into one digest per recruiter and sent in batches:
+    one email per recruiter (over a single SMTP connection for the whole
+    run) and one in-app notification per recruiter. After each batch the
+    matches are marked sent and last_sent_at advanced in one transaction.
+    """
+
+    @staticmethod
+    def due_matches(frequency: str, now):
+        """Unsent matches of active alerts with this frequency whose period has elapsed."""
+        cutoff = now - PERIODS[frequency] + SLACK
+        return (
+            JobAlertMatch.objects
+            .filter(
+                is_sent=False,
+                job_alert__is_active=True,
+                job_alert__frequency=frequency,
+            )
+            .filter(Q(job_alert__last_sent_at__isnull=True) | Q(job_alert__last_sent_at__lte=cutoff))
+            .select_related('job', 'job__company', 'job_alert', 'job_alert__recruiter__user')
+            .order_by('job_alert__recruiter_id', 'job_alert_id', '-score', 'id')
+        )
+
+    @staticmethod
+    def build_digest(frequency: str, matches: List[JobAlertMatch]) -> dict:
+        """Group one recruiter's matches per alert for rendering."""
+        site_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:3000')
+        alerts = []
+        for alert, alert_matches in groupby(matches, key=lambda match: match.job_alert):
+            alert_matches = list(alert_matches)
+            alerts.append({
+                'name': alert.alert_name,
+                'total': len(alert_matches),
+                'more': max(len(alert_matches) - MAX_JOBS_PER_ALERT, 0),
+                'jobs': [
+                    {
+                        'title': match.job.title,
+                        'company_name': match.job.company.company_name,
+                        'link': f"{site_url}/jobs/{match.job.slug}",
+                    }
+                    for match in alert_matches[:MAX_JOBS_PER_ALERT]
+                ],
+            })
+        return {
+            'frequency': frequency,
+            'alerts': alerts,
+            'total': len(matches),
+        }
+
+    @classmethod
+    def run(cls, frequency: str, now=None, batch_size: Optional[int] = None) -> dict:
+        """
+        Send the digests of one frequency.
+
+        Recruiters whose email fails keep their matches unsent and are
+        retried on the next run.
+
+        Returns:
+            Dict with recruiters, emails, matches counts
+        """
+        now = now or timezone.now()
+        batch_size = batch_size or getattr(settings, 'JOB_ALERT_DIGEST_BATCH_SIZE', 100)
+        notification_type = NotificationType.objects.filter(
+            type_name=NOTIFICATION_TYPE_NAME,
+            is_active=True
+        ).first()
+
+        stats = {'recruiters': 0, 'emails': 0, 'matches': 0}
+        connection = get_connection()
+        try:
+            batch = []
+            matches = cls.due_matches(frequency, now).iterator(chunk_size=2000)
+            for _, recruiter_matches in groupby(matches, key=lambda match: match.job_alert.recruiter_id):
+                batch.append(list(recruiter_matches))
+                if len(batch) >= batch_size:
+                    cls._send_batch(frequency, batch, notification_type, connection, now, stats)
+                    batch = []
+            if batch:
+                cls._send_batch(frequency, batch, notification_type, connection, now, stats)
+        finally:
+            connection.close()
+
+        logger.info(
+            f"Job alert {frequency} digest: {stats['recruiters']} recruiters, "
+            f"{stats['emails']} emails, {stats['matches']} matches"
+        )
+        return stats
+
+    @classmethod
+    def _send_batch(cls, frequency, batch, notification_type, connection, now, stats) -> None:
+        """Send one batch of recruiter digests and commit their state."""
+        digests = [cls.build_digest(frequency, recruiter_matches) for recruiter_matches in batch]
+
+        emails, email_positions = [], []
+        for position, recruiter_matches in enumerate(batch):
+            # The email only lists alerts with email on; the in-app notification lists all
+            email_matches = [match for match in recruiter_matches if match.job_alert.email_notification]
+            if email_matches:
+                user = recruiter_matches[0].job_alert.recruiter.user
+                email_digest = cls.build_digest(frequency, email_matches)
+                emails.append({
+                    'recipient': user.email,
+                    'subject': f"{email_digest['total']} việc làm mới phù hợp với bạn",
+                    'template_path': TEMPLATE_PATH,
+                    'context': {'user_name': user.full_name, **email_digest},
+                })
+                email_positions.append(position)
+
+        failed = set()
+        if emails:
+            results = EmailService.send_batch(emails, connection=connection)
+            failed = {position for position, ok in zip(email_positions, results) if not ok}
+            stats['emails'] += len(results) - len(failed)
+
+        delivered = [
+            (recruiter_matches, digests[position])
+            for position, recruiter_matches in enumerate(batch)
+            if position not in failed
+        ]
+        if not delivered:
+            return
+
+        match_ids = [match.id for recruiter_matches, _ in delivered for match in recruiter_matches]
+        alert_ids = {match.job_alert_id for recruiter_matches, _ in delivered for match in recruiter_matches}
+
+        with transaction.atomic():
+            if notification_type is not None:
+                created = Notification.objects.bulk_create([
+                    Notification(
+                        user_id=recruiter_matches[0].job_alert.recruiter.user_id,
+                        notification_type=notification_type,
+                        title=f"{digest['total']} việc làm mới phù hợp với bạn",
+                        content=", ".join(alert['name'] for alert in digest['alerts']),
+                        entity_type='job_alert',
+                        entity_id=recruiter_matches[0].job_alert_id
+                    )
+                    for recruiter_matches, digest in delivered
+                ])
+                publish_notifications(created)
+            JobAlertMatch.objects.filter(id__in=match_ids).update(is_sent=True)
+            JobAlert.objects.filter(id__in=alert_ids).update(last_sent_at=now)
+
+        stats['recruiters'] += len(delivered)
+        stats['matches'] += len(match_ids)
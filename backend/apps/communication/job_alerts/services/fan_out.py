@@ -0,0 +1,122 @@
+from typing import List
+import logging
+
+from django.db import transaction
+
+from apps.candidate.recruiters.models import Recruiter
+from apps.communication.job_alerts.models import JobAlert, JobAlertMatch
+from apps.communication.notification_types.models import NotificationType
+from apps.communication.notifications.models import Notification
+from apps.communication.notifications.services.realtime import publish_notifications
+from apps.recruitment.jobs.models import Job
+
+
+logger = logging.getLogger(__name__)
+
+
+# Notification type used for job alert matches
+NOTIFICATION_TYPE_NAME = 'job_alert_match'
+
+# Rows per INSERT when bulk creating matches and notifications
+BATCH_SIZE = 1000
+
+
+class JobAlertFanOutService:
+    """
+    Ghi nhận match và gửi thông báo cho các JobAlert khớp với một Job.
+
+    The number of queries does not depend on the number of matched alerts:
+    one bulk insert of matches, one read of the matches still to notify,
+    one read of the recipients, one bulk insert of notifications and one
+    update marking the matches as sent.
+    """
+
+    @staticmethod
+    def fan_out(job: Job, alerts: List[JobAlert]) -> int:
+        """
+        Record matches for the given alerts and notify their owners.
+
+        Matches that already exist are left untouched (ignore_conflicts);
+        only matches not yet sent are notified, and only for instant
+        alerts (daily/weekly matches stay unsent for JobAlertDigestService).
+        Pending rows are locked with SKIP LOCKED so concurrent runs for the
+        same job never notify twice.
+
+        Args:
+            job: The published Job (company should be select_related)
+            alerts: Matched alerts, with _matching_score set
+
+        Returns:
+            Number of notifications created
+        """
+        if not alerts:
+            return 0
+
+        alerts_by_id = {
+            alert.id: alert for alert in alerts
+            if alert.frequency == JobAlert.Frequency.INSTANT
+        }
+
+        with transaction.atomic():
+            JobAlertMatch.objects.bulk_create(
+                [
+                    JobAlertMatch(
+                        job_alert_id=alert.id,
+                        job_id=job.id,
+                        is_sent=False,
+                        score=getattr(alert, '_matching_score', 0.0),
+                    )
+                    for alert in alerts
+                ],
+                batch_size=BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+
+            if not alerts_by_id:
+                return 0
+
+            notification_type = NotificationType.objects.filter(
+                type_name=NOTIFICATION_TYPE_NAME,
+                is_active=True
+            ).first()
+            if notification_type is None:
+                logger.warning(
+                    f"Failed to send notifications for job {job.id} "
+                    f"(NotificationType '{NOTIFICATION_TYPE_NAME}' missing?)"
+                )
+                return 0
+
+            pending = list(
+                JobAlertMatch.objects
+                .select_for_update(skip_locked=True)
+                .filter(job_id=job.id, job_alert_id__in=list(alerts_by_id), is_sent=False)
+                .values_list('id', 'job_alert_id')
+            )
+            if not pending:
+                return 0
+
+            user_ids = dict(
+                Recruiter.objects
+                .filter(id__in={alerts_by_id[alert_id].recruiter_id for _, alert_id in pending})
+                .values_list('id', 'user_id')
+            )
+
+            company_name = job.company.company_name
+            notifications = []
+            for _, alert_id in pending:
+                alert = alerts_by_id[alert_id]
+                notifications.append(Notification(
+                    user_id=user_ids[alert.recruiter_id],
+                    notification_type=notification_type,
+                    title=f"Job matched: {job.title}",
+                    content=f"Job {job.title} at {company_name} is matched with your alert '{alert.alert_name}'.",
+                    link=f"/jobs/{job.slug}",
+                    entity_type='job',
+                    entity_id=job.id
+                ))
+            Notification.objects.bulk_create(notifications, batch_size=BATCH_SIZE)
+            publish_notifications(notifications)
+
+            JobAlertMatch.objects.filter(id__in=[match_id for match_id, _ in pending]).update(is_sent=True)
+
+        return len(notifications)
@@ -1,10 +1,18 @@
+from django.contrib.postgres.search import SearchVector
 from django.db.models import Q, F, Value, Case, When, Count, FloatField, Exists, OuterRef
-from django.db.models.functions import Coalesce
 from typing import List
 import logging
 
 from apps.communication.job_alerts.models import JobAlert, JobAlertMatch
+from apps.communication.job_alerts.services.alert_index import CHUNK_SIZE, JobAlertIndexService
 from apps.recruitment.jobs.models import Job
+from apps.recruitment.jobs.services.search_vector import (
+    SEARCH_CONFIG,
+    JobSearchVectorService,
+    TsvectorToArray,
+    search_vector_enabled,
+    text_lexemes,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -20,13 +28,143 @@ class JobMatchingService:
     SALARY_WEIGHT = 10
     THRESHOLD = 50
     
+    @staticmethod
+    def _job_profile(job: Job) -> tuple:
+        """Extract (lexemes, province_id, salary_max, skill_ids) used for scoring."""
+        job_lexemes = JobSearchVectorService.get_lexemes(job.id)
+        job_location_id = (
+            job.address.province_id 
+            if hasattr(job, 'address') and job.address and job.address.province 
+            else None
+        )
+        job_salary_max = job.salary_max if hasattr(job, 'salary_max') else None
+        
+        job_skill_ids = []
+        if hasattr(job, 'required_skills'):
+            job_skill_ids = list(job.required_skills.values_list('skill_id', flat=True))
+        
+        return job_lexemes, job_location_id, job_salary_max, job_skill_ids
+    
+    @classmethod
+    def score_alert(
+        cls,
+        keyword_count: int,
+        keyword_hits: int,
+        job_salary_max,
+        salary_min,
+        skill_count: int,
+        matching_skill_count: int,
+        has_locations: bool,
+        has_location_match: bool,
+    ) -> float:
+        """
+        Chấm điểm một alert trong bộ nhớ.
+        
+        Keyword score is the share of the alert's keyword lexemes found in the
+        job's search vector (full score when the alert has no keywords).
+        Skill score uses integer division like the SQL expression
+        (SKILL_WEIGHT * matching / total on integer counts).
+        """
+        # A. Keyword Score (40%)
+        if keyword_count == 0:
+            keyword_score = float(cls.KEYWORD_WEIGHT)
+        else:
+            keyword_score = cls.KEYWORD_WEIGHT * keyword_hits / keyword_count
+        
+        # B. Skill Score (30%)
+        if skill_count == 0:
+            skill_score = float(cls.SKILL_WEIGHT)
+        else:
+            skill_score = float(cls.SKILL_WEIGHT * matching_skill_count // skill_count)
+        
+        # C. Location Score (20%)
+        if not has_locations or has_location_match:
+            location_score = float(cls.LOCATION_WEIGHT)
+        else:
+            location_score = 0.0
+        
+        # D. Salary Score (10%)
+        if salary_min is None or not job_salary_max or salary_min <= job_salary_max:
+            salary_score = float(cls.SALARY_WEIGHT)
+        else:
+            salary_score = 0.0
+        
+        return keyword_score + skill_score + location_score + salary_score
+    
     @classmethod
     def find_alerts_for_job(cls, job: Job) -> List[JobAlert]:
+        """
+        Tìm JobAlerts phù hợp qua inverted index (JobAlertIndexService).
+        
+        Hard filters (category, job type, level) are resolved with set
+        union/intersection over posting lists, matched skills and location
+        come from the job's skill/province postings, keyword hits come from
+        the GIN-indexed keywords_vector, and the weighted score is computed
+        in memory with score_alert(). Results are identical to
+        find_alerts_for_job_orm.
+        
+        Threshold: >= 50%
+        
+        Returns:
+            List of JobAlert objects ordered by score descending
+        """
+        job_lexemes, job_location_id, job_salary_max, job_skill_ids = cls._job_profile(job)
+        
+        candidates, skill_hits, location_hits = JobAlertIndexService.find_candidates(
+            category_id=job.category_id,
+            job_type=job.job_type,
+            level=job.level,
+            skill_ids=job_skill_ids,
+            province_id=job_location_id,
+        )
+        
+        keyword_hits = JobAlertIndexService.find_keyword_hits(job_lexemes)
+        
+        scores = {}
+        for alert_id, (keyword_count, salary_min, skill_count, has_locations) in (
+            JobAlertIndexService.load_scoring_data(candidates).items()
+        ):
+            score = cls.score_alert(
+                keyword_count,
+                keyword_hits.get(alert_id, 0),
+                job_salary_max,
+                salary_min,
+                skill_count,
+                skill_hits[alert_id],
+                has_locations,
+                alert_id in location_hits,
+            )
+            if score >= cls.THRESHOLD:
+                scores[alert_id] = score
+        
+        matched_ids = list(scores)
+        alerts = []
+        for start in range(0, len(matched_ids), CHUNK_SIZE):
+            alerts += list(
+                JobAlert.objects
+                .filter(id__in=matched_ids[start:start + CHUNK_SIZE])
+                .prefetch_related('skills', 'locations')
+            )
+        
+        for alert in alerts:
+            alert._matching_score = scores[alert.id]
+        # Ties keep alert id order, as the ORM query returns them
+        alerts.sort(key=lambda alert: (-alert._matching_score, alert.id))
+        
+        logger.info(f"Found {len(alerts)} alerts matching job {job.id} (inverted index)")
+        return alerts
+    
+    @classmethod
+    def find_alerts_for_job_orm(cls, job: Job) -> List[JobAlert]:
         """
         Tìm JobAlerts phù hợp sử dụng Django ORM Annotations.
         
+        Reference implementation of the scoring rules (one annotated query over
+        all active alerts, keyword share added in Python); kept to verify the
+        inverted index path.
+        
         Scoring Algorithm (Weighted):
-        - Keywords: 40% (keyword exists in job title/description)
+        - Keywords: 40% (share of keyword lexemes found in job title/requirements/description)
         - Skills: 30% (overlap between alert skills and job skills)
         - Location: 20% (job location matches alert locations)
         - Salary: 10% (job salary >= alert min salary)
@@ -37,18 +175,7 @@ class JobMatchingService:
             List of JobAlert objects ordered by score descending
         """
         # Prepare job data
-        job_title = job.title.lower() if job.title else ''
-        job_location_id = (
-            job.address.province_id 
-            if hasattr(job, 'address') and job.address and job.address.province 
-            else None
-        )
-        job_salary_max = job.salary_max if hasattr(job, 'salary_max') else None
-        
-        # Get job skill IDs
-        job_skill_ids = []
-        if hasattr(job, 'required_skills'):
-            job_skill_ids = list(job.required_skills.values_list('skill_id', flat=True))
+        job_lexemes, job_location_id, job_salary_max, job_skill_ids = cls._job_profile(job)
         
         # Build base query with hard filters
         query = JobAlert.objects.filter(is_active=True)
@@ -61,19 +188,15 @@ class JobMatchingService:
         if job.level:
             query = query.filter(Q(level=job.level) | Q(level__isnull=True))
         
+        # A. Keyword lexemes (40%), scored in Python below
+        vector_enabled = search_vector_enabled()
+        if vector_enabled:
+            query = query.annotate(
+                keyword_lexemes=TsvectorToArray(SearchVector('keywords', config=SEARCH_CONFIG)),
+            )
+        
         # Annotate scores using ORM
         query = query.annotate(
-            # A. Keyword Score (40%)
-            # Simple: if any keyword is in job title -> full score, else partial
-            # Note: Full FTS would require SearchVector, this is simplified
-            keyword_score=Case(
-                When(keywords__isnull=True, then=Value(cls.KEYWORD_WEIGHT, output_field=FloatField())),
-                When(keywords='', then=Value(cls.KEYWORD_WEIGHT, output_field=FloatField())),
-                When(keywords__icontains=job_title[:50], then=Value(cls.KEYWORD_WEIGHT, output_field=FloatField())),
-                default=Value(cls.KEYWORD_WEIGHT * 0.5, output_field=FloatField()),  # Partial score
-                output_field=FloatField()
-            ),
-            
             # B. Skill Score (30%)
             # Count matching skills / total alert skills
             matching_skill_count=Count(
@@ -114,24 +237,28 @@ class JobMatchingService:
                 default=Value(0, output_field=FloatField()),
                 output_field=FloatField()
             ),
-            
-            # Total Score
-            total_score=Coalesce(F('keyword_score'), Value(0.0)) + 
-                        Coalesce(F('skill_score'), Value(0.0)) + 
-                        Coalesce(F('location_score'), Value(0.0)) + 
-                        Coalesce(F('salary_score'), Value(0.0))
         )
         
-        # Filter by threshold and order by score
-        query = query.filter(total_score__gte=cls.THRESHOLD).order_by('-total_score')
-        
         # Prefetch related for efficient access
-        query = query.prefetch_related('skills', 'locations')
+        query = query.prefetch_related('skills', 'locations').order_by('id')
         
-        # Execute and attach score to objects
-        alerts = list(query)
-        for alert in alerts:
-            alert._matching_score = alert.total_score
+        # Add keyword score, filter by threshold and order by score
+        alerts = []
+        for alert in query:
+            if vector_enabled:
+                keyword_lexemes = set(alert.keyword_lexemes or [])
+            else:
+                keyword_lexemes = text_lexemes(alert.keywords)
+            if keyword_lexemes:
+                keyword_score = cls.KEYWORD_WEIGHT * len(keyword_lexemes & job_lexemes) / len(keyword_lexemes)
+            else:
+                keyword_score = float(cls.KEYWORD_WEIGHT)
+            alert._matching_score = (
+                keyword_score + alert.skill_score + alert.location_score + alert.salary_score
+            )
+            if alert._matching_score >= cls.THRESHOLD:
+                alerts.append(alert)
+        alerts.sort(key=lambda alert: -alert._matching_score)
         
         logger.info(f"Found {len(alerts)} alerts matching job {job.id} (ORM-based scoring)")
         return alerts
@@ -1,4 +1,4 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from apps.recruitment.jobs.models import Job
 import logging
@@ -7,6 +7,8 @@ logger = logging.getLogger(__name__)
 
 
 from django.db import transaction
+from apps.communication.job_alerts.models import JobAlert
+from apps.communication.job_alerts.services.alert_index import JobAlertIndexService
 from apps.communication.job_alerts.tasks import process_job_matching_task
 
 @receiver(post_save, sender=Job)
@@ -19,3 +21,42 @@ def trigger_job_matching(sender, instance, created, **kwargs):
         logger.info(f"Triggering async matching for Job {instance.id}")
         # Sử dụng on_commit để đảm bảo transaction đã commit trước khi task chạy
         transaction.on_commit(lambda: process_job_matching_task.delay(instance.id))
+
+@receiver(post_save, sender=JobAlert)
+def index_job_alert(sender, instance, **kwargs):
+    """
+    Cập nhật inverted index khi JobAlert được tạo/sửa (kể cả bật/tắt).
+    Chạy đồng bộ trong cùng transaction để index luôn khớp với dữ liệu.
+    """
+    JobAlertIndexService.index_alert(instance)
+
+@receiver(post_delete, sender=JobAlert)
+def unindex_job_alert(sender, instance, **kwargs):
+    """
+    Xóa JobAlert khỏi inverted index.
+    """
+    JobAlertIndexService.remove_alert(instance.pk)
+
+@receiver(m2m_changed, sender=JobAlert.skills.through)
+@receiver(m2m_changed, sender=JobAlert.locations.through)
+def reindex_job_alert_relations(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Cập nhật inverted index khi kỹ năng/địa điểm của JobAlert thay đổi.
+    """
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            JobAlertIndexService.index_alert(instance)
+        return
+    
+    # Changed from the Skill/Province side: reindex the affected alerts.
+    # post_clear carries no pk_set, so remember the alerts in pre_clear.
+    if action == 'pre_clear':
+        instance._cleared_job_alert_ids = list(instance.job_alerts.values_list('pk', flat=True))
+        return
+    if action == 'post_clear':
+        pk_set = getattr(instance, '_cleared_job_alert_ids', [])
+    elif action not in ('post_add', 'post_remove'):
+        return
+    
+    for alert in JobAlert.objects.filter(pk__in=pk_set):
+        JobAlertIndexService.index_alert(alert)
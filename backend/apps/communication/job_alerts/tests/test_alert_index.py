@@ -0,0 +1,189 @@
+# Job Alert Inverted Index Tests
+
+import itertools
+import random
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.communication.job_alerts.models import JobAlert, JobAlertIndex, JobAlertIndexTerm
+from apps.communication.job_alerts.services.alert_index import JobAlertIndexService
+from apps.communication.job_alerts.services.matching import JobMatchingService
+from apps.recruitment.jobs.models import Job
+from apps.recruitment.jobs.services.search_vector import JobSearchVectorService
+from apps.recruitment.job_skills.models import JobSkill
+from apps.recruitment.job_categories.models import JobCategory
+from apps.candidate.recruiters.models import Recruiter
+from apps.candidate.skills.models import Skill
+from apps.candidate.skill_categories.models import SkillCategory
+from apps.company.companies.models import Company
+from apps.geography.provinces.models import Province
+from apps.geography.addresses.models import Address
+
+User = get_user_model()
+
+
+class JobAlertIndexTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='index@example.com',
+            password='testpass123',
+            full_name='Index User',
+            role='recruiter'
+        )
+        cls.recruiter = Recruiter.objects.create(user=cls.user)
+        cls.company = Company.objects.create(user=cls.user, company_name="Index Corp", slug="index-corp")
+
+        cls.categories = [
+            JobCategory.objects.create(name=f"Category {i}", slug=f"category-{i}") for i in range(2)
+        ]
+        cls.provinces = [
+            Province.objects.create(province_name=f"Province {i}", province_code=f"P{i}", region="north")
+            for i in range(3)
+        ]
+        skill_category = SkillCategory.objects.create(name="Programming", slug="programming")
+        cls.skills = [
+            Skill.objects.create(name=f"Skill {i}", slug=f"skill-{i}", category=skill_category)
+            for i in range(5)
+        ]
+
+    def _create_alert(self, **kwargs):
+        skills = kwargs.pop('skills', [])
+        locations = kwargs.pop('locations', [])
+        alert = JobAlert.objects.create(recruiter=self.recruiter, alert_name='Alert', **kwargs)
+        alert.skills.add(*skills)
+        alert.locations.add(*locations)
+        return alert
+
+    def _create_job(self, index, skills=(), province=None, **kwargs):
+        job = Job.objects.create(
+            company=self.company,
+            slug=f"index-job-{index}",
+            status='published',
+            created_by=self.user,
+            address=Address.objects.create(address_line="Street", province=province) if province else None,
+            **kwargs
+        )
+        for skill in skills:
+            JobSkill.objects.create(job=job, skill=skill, is_required=True)
+        return job
+
+    def test_index_matches_orm_scoring(self):
+        """Inverted index and ORM annotation scoring select the same alerts with the same scores."""
+        rng = random.Random(42)
+        keywords_choices = [None, '', 'python developer', 'java', 'senior python developer']
+        for _ in range(40):
+            self._create_alert(
+                keywords=rng.choice(keywords_choices),
+                category=rng.choice([None] + self.categories),
+                job_type=rng.choice([None, 'full-time', 'part-time']),
+                level=rng.choice([None, 'junior', 'senior']),
+                salary_min=rng.choice([None, Decimal('1000.00'), Decimal('5000.00')]),
+                skills=rng.sample(self.skills, rng.randint(0, 4)),
+                locations=rng.sample(self.provinces, rng.randint(0, 2)),
+                is_active=rng.random() > 0.1,
+            )
+
+        combos = itertools.product(
+            [None, self.categories[0]],
+            ['full-time', 'part-time'],
+            ['junior', 'senior'],
+            [None, self.provinces[0]],
+        )
+        for index, (category, job_type, level, province) in enumerate(combos):
+            job = self._create_job(
+                index,
+                title='Python Developer',
+                category=category,
+                job_type=job_type,
+                level=level,
+                salary_max=Decimal('3000.00') if index % 2 else None,
+                skills=self.skills[:index % 4],
+                province=province,
+            )
+
+            expected = {a.id: a._matching_score for a in JobMatchingService.find_alerts_for_job_orm(job)}
+            actual = {a.id: a._matching_score for a in JobMatchingService.find_alerts_for_job(job)}
+
+            self.assertEqual(actual, expected)
+
+    def test_results_ordered_by_score(self):
+        self._create_alert(keywords='java', skills=self.skills[:2])
+        self._create_alert(keywords=None)
+        job = self._create_job(0, title='Python', skills=self.skills[:1])
+
+        scores = [a._matching_score for a in JobMatchingService.find_alerts_for_job(job)]
+
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_keyword_matches_job_description(self):
+        """A 'Django' alert matches a job that only mentions Django in its description."""
+        alert = self._create_alert(keywords='Django')
+        partial = self._create_alert(keywords='django, java')
+        self._create_alert(keywords='java')
+        job = self._create_job(0, title='Backend Developer', description='Build REST APIs with Django.')
+
+        hits = JobAlertIndexService.find_keyword_hits(JobSearchVectorService.get_lexemes(job.id))
+        scores = {a.id: a._matching_score for a in JobMatchingService.find_alerts_for_job(job)}
+
+        self.assertEqual(hits, {alert.id: 1, partial.id: 1})
+        self.assertEqual(scores[alert.id], 100.0)
+        self.assertEqual(scores[partial.id], 80.0)
+
+    def test_job_search_vector_follows_edits(self):
+        alert = self._create_alert(keywords='kubernetes')
+        job = self._create_job(0, title='Backend Developer')
+        self.assertEqual(JobAlertIndexService.find_keyword_hits(JobSearchVectorService.get_lexemes(job.id)), {})
+
+        job.requirements = 'Kubernetes in production'
+        job.save()
+
+        self.assertEqual(
+            JobAlertIndexService.find_keyword_hits(JobSearchVectorService.get_lexemes(job.id)),
+            {alert.id: 1}
+        )
+
+    def test_deactivated_alert_leaves_index(self):
+        alert = self._create_alert(keywords='python')
+        self.assertTrue(JobAlertIndex.objects.filter(job_alert=alert).exists())
+
+        alert.is_active = False
+        alert.save()
+
+        self.assertFalse(JobAlertIndex.objects.filter(job_alert=alert).exists())
+        self.assertFalse(JobAlertIndexTerm.objects.filter(job_alert=alert).exists())
+
+    def test_skill_and_location_changes_update_terms(self):
+        alert = self._create_alert(skills=self.skills[:2])
+        alert.skills.remove(self.skills[0])
+        alert.locations.add(self.provinces[1])
+
+        terms = set(JobAlertIndexTerm.objects.filter(job_alert=alert).values_list('term', flat=True))
+
+        self.assertEqual(
+            terms,
+            {'category:*', 'job_type:*', 'level:*', f'skill:{self.skills[1].id}', f'province:{self.provinces[1].id}'}
+        )
+        self.assertEqual(JobAlertIndex.objects.get(job_alert=alert).skill_count, 1)
+
+    def test_reverse_side_clear_updates_terms(self):
+        """Clearing alerts from the Skill side reindexes the affected alerts."""
+        alert = self._create_alert(skills=[self.skills[3]])
+
+        self.skills[3].job_alerts.clear()
+
+        self.assertFalse(
+            JobAlertIndexTerm.objects.filter(job_alert=alert, term=f'skill:{self.skills[3].id}').exists()
+        )
+
+    def test_rebuild(self):
+        self._create_alert(skills=self.skills[:2], locations=self.provinces[:1])
+        self._create_alert(is_active=False)
+        JobAlertIndexTerm.objects.all().delete()
+        JobAlertIndex.objects.all().delete()
+
+        self.assertEqual(JobAlertIndexService.rebuild(), 1)
+        self.assertEqual(JobAlertIndexTerm.objects.count(), 6)
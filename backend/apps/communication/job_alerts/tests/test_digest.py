@@ -0,0 +1,162 @@
+# Job Alert Digest Tests
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.communication.job_alerts.models import JobAlert, JobAlertMatch
+from apps.communication.job_alerts.services.digest import JobAlertDigestService
+from apps.communication.notification_types.models import NotificationType
+from apps.communication.notifications.models import Notification
+from apps.candidate.recruiters.models import Recruiter
+from apps.company.companies.models import Company
+from apps.recruitment.jobs.models import Job
+
+User = get_user_model()
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    TEMPLATES=[{
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [settings.BASE_DIR / 'templates'],
+        'APP_DIRS': True,
+        'OPTIONS': {},
+    }],
+)
+class JobAlertDigestTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(
+            email='digest-owner@example.com',
+            password='testpass123',
+            full_name='Owner',
+            role='company'
+        )
+        cls.company = Company.objects.create(user=cls.owner, company_name="Digest Corp", slug="digest-corp")
+        cls.notification_type = NotificationType.objects.create(type_name='job_alert_digest')
+        cls.jobs = [
+            Job.objects.create(
+                company=cls.company,
+                title=f'Job {i}',
+                slug=f'digest-job-{i}',
+                status='draft',
+                created_by=cls.owner,
+            )
+            for i in range(3)
+        ]
+
+    def _create_recruiter(self, index):
+        user = User.objects.create_user(
+            email=f'digest-{index}@example.com',
+            password='testpass123',
+            full_name=f'Candidate {index}',
+            role='recruiter'
+        )
+        return Recruiter.objects.create(user=user)
+
+    def _create_alert(self, recruiter, frequency=JobAlert.Frequency.DAILY, **kwargs):
+        return JobAlert.objects.create(recruiter=recruiter, alert_name='Alert', frequency=frequency, **kwargs)
+
+    def _match(self, alert, jobs):
+        for job in jobs:
+            JobAlertMatch.objects.create(job_alert=alert, job=job)
+
+    def test_one_email_per_recruiter(self):
+        recruiter = self._create_recruiter(0)
+        first = self._create_alert(recruiter)
+        second = self._create_alert(recruiter)
+        self._match(first, self.jobs[:2])
+        self._match(second, self.jobs[2:])
+        other = self._create_alert(self._create_recruiter(1))
+        self._match(other, self.jobs[:1])
+
+        stats = JobAlertDigestService.run(JobAlert.Frequency.DAILY)
+
+        self.assertEqual(stats, {'recruiters': 2, 'emails': 2, 'matches': 4})
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(Notification.objects.filter(notification_type=self.notification_type).count(), 2)
+        self.assertFalse(JobAlertMatch.objects.filter(is_sent=False).exists())
+        self.assertEqual(JobAlert.objects.filter(last_sent_at__isnull=False).count(), 3)
+
+    def test_only_due_alerts_of_the_frequency(self):
+        now = timezone.now()
+        recent = self._create_alert(self._create_recruiter(0), last_sent_at=now - timedelta(hours=2))
+        weekly = self._create_alert(self._create_recruiter(1), frequency=JobAlert.Frequency.WEEKLY)
+        due = self._create_alert(self._create_recruiter(2), last_sent_at=now - timedelta(days=1))
+        for alert in (recent, weekly, due):
+            self._match(alert, self.jobs[:1])
+
+        JobAlertDigestService.run(JobAlert.Frequency.DAILY, now=now)
+
+        self.assertEqual(
+            set(JobAlertMatch.objects.filter(is_sent=True).values_list('job_alert_id', flat=True)),
+            {due.id}
+        )
+
+    def test_email_disabled_still_marks_sent(self):
+        alert = self._create_alert(self._create_recruiter(0), email_notification=False)
+        self._match(alert, self.jobs)
+
+        stats = JobAlertDigestService.run(JobAlert.Frequency.DAILY)
+
+        self.assertEqual(stats['emails'], 0)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertFalse(JobAlertMatch.objects.filter(is_sent=False).exists())
+
+    def test_email_lists_only_alerts_with_email_on(self):
+        recruiter = self._create_recruiter(0)
+        emailed = JobAlert.objects.create(recruiter=recruiter, alert_name='Emailed', frequency=JobAlert.Frequency.DAILY)
+        silent = JobAlert.objects.create(
+            recruiter=recruiter, alert_name='Silent', frequency=JobAlert.Frequency.DAILY, email_notification=False
+        )
+        self._match(emailed, self.jobs[:1])
+        self._match(silent, self.jobs[1:])
+
+        with patch(
+            'apps.communication.job_alerts.services.digest.EmailService.send_batch',
+            side_effect=lambda emails, connection: [True] * len(emails)
+        ) as send_batch:
+            stats = JobAlertDigestService.run(JobAlert.Frequency.DAILY)
+
+        (email,) = send_batch.call_args.args[0]
+        self.assertEqual([alert['name'] for alert in email['context']['alerts']], ['Emailed'])
+        self.assertEqual(email['context']['total'], 1)
+        self.assertTrue(email['subject'].startswith('1 '))
+        # The in-app notification and sent state still cover every alert
+        notification = Notification.objects.get(notification_type=self.notification_type)
+        self.assertTrue(notification.title.startswith('3 '))
+        self.assertIn('Silent', notification.content)
+        self.assertEqual(stats['matches'], 3)
+
+    def test_failed_email_leaves_matches_unsent(self):
+        alert = self._create_alert(self._create_recruiter(0))
+        self._match(alert, self.jobs[:1])
+
+        with patch('apps.communication.job_alerts.services.digest.EmailService.send_batch', return_value=[False]):
+            stats = JobAlertDigestService.run(JobAlert.Frequency.DAILY)
+
+        self.assertEqual(stats['recruiters'], 0)
+        self.assertTrue(JobAlertMatch.objects.filter(job_alert=alert, is_sent=False).exists())
+        alert.refresh_from_db()
+        self.assertIsNone(alert.last_sent_at)
+
+    def test_batches_share_one_connection(self):
+        for index in range(3):
+            self._match(self._create_alert(self._create_recruiter(index)), self.jobs[:1])
+
+        with patch(
+            'apps.communication.job_alerts.services.digest.EmailService.send_batch',
+            side_effect=lambda emails, connection: [True] * len(emails)
+        ) as send_batch:
+            JobAlertDigestService.run(JobAlert.Frequency.DAILY, batch_size=2)
+
+        self.assertEqual([len(call.args[0]) for call in send_batch.call_args_list], [2, 1])
+        connections = {call.kwargs['connection'] for call in send_batch.call_args_list}
+        self.assertEqual(len(connections), 1)
@@ -0,0 +1,121 @@
+# Job Alert Fan-out Tests
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.communication.job_alerts.models import JobAlert, JobAlertMatch
+from apps.communication.job_alerts.services.fan_out import JobAlertFanOutService
+from apps.communication.job_alerts.tasks import process_job_matching_task
+from apps.communication.notification_types.models import NotificationType
+from apps.communication.notifications.models import Notification
+from apps.candidate.recruiters.models import Recruiter
+from apps.company.companies.models import Company
+from apps.recruitment.jobs.models import Job
+
+User = get_user_model()
+
+
+class JobAlertFanOutTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(
+            email='fanout-owner@example.com',
+            password='testpass123',
+            full_name='Owner',
+            role='company'
+        )
+        cls.company = Company.objects.create(user=cls.owner, company_name="Fanout Corp", slug="fanout-corp")
+        cls.notification_type = NotificationType.objects.create(type_name='job_alert_match')
+
+    def _create_alerts(self, count, start=0, frequency=JobAlert.Frequency.INSTANT):
+        alerts = []
+        for i in range(start, start + count):
+            user = User.objects.create_user(
+                email=f'fanout-{i}@example.com',
+                password='testpass123',
+                full_name=f'Candidate {i}',
+                role='recruiter'
+            )
+            recruiter = Recruiter.objects.create(user=user)
+            alerts.append(JobAlert.objects.create(recruiter=recruiter, alert_name=f'Alert {i}', frequency=frequency))
+        return alerts
+
+    def _create_job(self, slug):
+        return Job.objects.create(
+            company=self.company,
+            title='Python Developer',
+            slug=slug,
+            status='draft',
+            created_by=self.owner,
+        )
+
+    def test_fan_out_creates_matches_and_notifications(self):
+        alerts = self._create_alerts(3)
+        job = Job.objects.select_related('company').get(pk=self._create_job('fanout-job').pk)
+
+        sent = JobAlertFanOutService.fan_out(job, alerts)
+
+        self.assertEqual(sent, 3)
+        self.assertEqual(JobAlertMatch.objects.filter(job=job, is_sent=True).count(), 3)
+        self.assertEqual(
+            set(Notification.objects.filter(entity_id=job.id).values_list('user_id', flat=True)),
+            {alert.recruiter.user_id for alert in alerts}
+        )
+
+    def test_fan_out_is_idempotent(self):
+        alerts = self._create_alerts(2)
+        job = Job.objects.select_related('company').get(pk=self._create_job('fanout-again').pk)
+
+        JobAlertFanOutService.fan_out(job, alerts)
+        sent_again = JobAlertFanOutService.fan_out(job, alerts)
+
+        self.assertEqual(sent_again, 0)
+        self.assertEqual(Notification.objects.filter(entity_id=job.id).count(), 2)
+        self.assertEqual(JobAlertMatch.objects.filter(job=job).count(), 2)
+
+    def test_query_count_does_not_grow_with_matches(self):
+        small_job = Job.objects.select_related('company').get(pk=self._create_job('fanout-small').pk)
+        large_job = Job.objects.select_related('company').get(pk=self._create_job('fanout-large').pk)
+        small = self._create_alerts(2)
+        large = small + self._create_alerts(20, start=2)
+
+        with CaptureQueriesContext(connection) as small_queries:
+            JobAlertFanOutService.fan_out(small_job, small)
+        with CaptureQueriesContext(connection) as large_queries:
+            sent = JobAlertFanOutService.fan_out(large_job, large)
+
+        self.assertEqual(sent, 22)
+        self.assertEqual(len(large_queries), len(small_queries))
+
+    def test_digest_alerts_are_recorded_but_not_notified(self):
+        instant = self._create_alerts(1)
+        daily = self._create_alerts(2, start=1, frequency=JobAlert.Frequency.DAILY)
+        job = Job.objects.select_related('company').get(pk=self._create_job('fanout-digest').pk)
+
+        self.assertEqual(JobAlertFanOutService.fan_out(job, instant + daily), 1)
+        self.assertEqual(
+            set(JobAlertMatch.objects.filter(job=job, is_sent=False).values_list('job_alert_id', flat=True)),
+            {alert.id for alert in daily}
+        )
+
+    def test_missing_notification_type_records_unsent_matches(self):
+        NotificationType.objects.all().delete()
+        alerts = self._create_alerts(2)
+        job = Job.objects.select_related('company').get(pk=self._create_job('fanout-no-type').pk)
+
+        self.assertEqual(JobAlertFanOutService.fan_out(job, alerts), 0)
+        self.assertEqual(JobAlertMatch.objects.filter(job=job, is_sent=False).count(), 2)
+
+    def test_task_notifies_matched_alerts(self):
+        alerts = self._create_alerts(2)
+        job = self._create_job('fanout-task')
+
+        process_job_matching_task(job.id)
+
+        self.assertEqual(
+            set(JobAlertMatch.objects.filter(job=job, is_sent=True).values_list('job_alert_id', flat=True)),
+            {alert.id for alert in alerts}
+        )
@@ -134,6 +134,7 @@ class JobMatchingServiceTests(TestCase):
             title="Python Developer",
             slug="python-dev-salary-mismatch",
             salary_min=Decimal('500.00'), # Mismatch (< 1000)
+            salary_max=Decimal('500.00'), # Salary score compares the job's maximum
             status='published',
             job_type='full-time',
             level='junior',
@@ -180,6 +181,31 @@ class JobMatchingServiceTests(TestCase):
         # Should filter out self.alert
         self.assertNotIn(self.alert, matches_fail)
 
+    def test_min_only_salary_keeps_salary_score(self):
+        """A job without salary_max gets the full salary score, whatever its minimum."""
+        job = Job.objects.create(
+            company=self.company,
+            title="Python Django Developer",
+            slug="python-dev-min-only-salary",
+            salary_min=Decimal('500.00'),
+            status='published',
+            job_type='full-time',
+            level='junior',
+            application_deadline=timezone.now() + timezone.timedelta(days=30),
+            created_by=self.employer_user,
+            description="Job Description",
+            requirements="Job Requirements",
+            address=self.addr_hanoi
+        )
+        JobSkill.objects.create(job=job, skill=self.skill_python)
+        JobSkill.objects.create(job=job, skill=self.skill_django)
+
+        matches = JobMatchingService.find_alerts_for_job(job)
+        reference = JobMatchingService.find_alerts_for_job_orm(job)
+
+        self.assertEqual(matches[0]._matching_score, 100)
+        self.assertEqual(reference[0]._matching_score, 100)
+
     def test_location_mismatch(self):
         """Test location mismatch."""
         # Job in HCM, Alert wants Hanoi.
@@ -67,12 +67,11 @@ class MessageThreadSerializer(serializers.ModelSerializer):
         return obj.participants.filter(is_active=True).count()
     
     def get_unread_count(self, obj):
-        request = self.context.get('request')
-        if not request:
+        # Loaded once for the whole list by the view (selectors.get_unread_counts)
+        unread_counts = self.context.get('unread_counts')
+        if unread_counts is None:
             return 0
-        
-        # Unread count temporarily disabled during Mongo migration
-        return 0
+        return unread_counts.for_thread(obj.id)
 
 
 class MessageThreadDetailSerializer(serializers.ModelSerializer):
@@ -5,6 +5,7 @@ from rest_framework import viewsets, status, mixins
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from .models import MessageThread
 from .serializers import (
@@ -22,6 +23,7 @@ from apps.communication.messages.selectors.messages import (
     list_threads,
     get_thread_by_id,
     list_messages,
+    get_unread_counts,
 )
 from apps.communication.messages.services.messages import (
     create_thread,
@@ -52,6 +54,7 @@ class MessageThreadViewSet(
     - GET    /api/messages/threads/:id/messages/         - Get messages in thread
     - POST   /api/messages/threads/:id/messages/         - Send message
     - PATCH  /api/messages/threads/:id/read/             - Mark thread as read
+    - GET    /api/messages/threads/unread-count/         - Unread counts (total + per thread)
     - POST   /api/messages/threads/:id/participants/     - Add participant
     - DELETE /api/messages/threads/:id/participants/:uid/ - Remove participant
     """
@@ -70,19 +73,36 @@ class MessageThreadViewSet(
         List all message threads for the current user.
         """
         queryset = self.get_queryset()
+        context = {
+            'request': request,
+            'unread_counts': get_unread_counts(request.user.id),
+        }
         
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = MessageThreadSerializer(
-                page, many=True, context={'request': request}
+                page, many=True, context=context
             )
             return self.get_paginated_response(serializer.data)
         
         serializer = MessageThreadSerializer(
-            queryset, many=True, context={'request': request}
+            queryset, many=True, context=context
         )
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'], url_path='unread-count')
+    def unread_count(self, request):
+        """
+        GET /api/messages/threads/unread-count/
+        
+        Total and per-thread unread message counts of the current user.
+        """
+        unread_counts = get_unread_counts(request.user.id)
+        return Response({
+            'total': unread_counts.total,
+            'threads': {str(thread_id): count for thread_id, count in unread_counts.threads.items()},
+        })
+    
     def create(self, request):
         """
         POST /api/messages/threads/
@@ -149,22 +169,55 @@ class MessageThreadViewSet(
             return self._send_message(request, pk)
     
     def _list_messages(self, request, thread_id):
-        """Get messages in a thread."""
-        messages = list_messages(thread_id, request.user.id)
+        """
+        Get messages in a thread, newest page first.
+        
+        Query params:
+        - before: message id / ISO timestamp, older messages
+        - after: message id / ISO timestamp, newer messages
+        - limit: page size (default 50, max 100)
+        """
+        before = request.query_params.get('before') or None
+        after = request.query_params.get('after') or None
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 50)), 100))
+        except ValueError:
+            limit = 50
+        
+        try:
+            page = list_messages(thread_id, request.user.id, limit=limit, before=before, after=after)
+        except ValueError as e:
+            return Response(
+                {'detail': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        if messages is None:
+        if page is None:
             return Response(
                 {'detail': 'Thread not found or access denied'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        page = self.paginate_queryset(messages)
-        if page is not None:
-            serializer = MongoMessageSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        messages = page['results']
+        older = newer = None
+        if messages:
+            # Paging back (or the first page) knows whether older messages remain;
+            # paging forward always offers an "older" link and vice versa
+            if page['has_more'] or after is not None:
+                older = messages[0]['id']
+            if before is not None or (after is not None and page['has_more']):
+                newer = messages[-1]['id']
         
         serializer = MongoMessageSerializer(messages, many=True)
-        return Response(serializer.data)
+        return Response({
+            'previous': older and replace_query_param(
+                remove_query_param(request.build_absolute_uri(), 'after'), 'before', older
+            ),
+            'next': newer and replace_query_param(
+                remove_query_param(request.build_absolute_uri(), 'before'), 'after', newer
+            ),
+            'results': serializer.data,
+        })
     
     def _send_message(self, request, thread_id):
         """Send a message to a thread."""
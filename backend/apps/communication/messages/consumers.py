@@ -4,10 +4,11 @@ from channels.db import database_sync_to_async
 from django.utils import timezone
 
 """Lưu tin nhắn vào database."""
-from apps.communication.message_threads.models import MessageThread
 from apps.communication.message_participants.models import MessageParticipant
 from apps.communication.messages.services.mongo_service import MongoChatService
-from apps.communication.messages.tasks import persist_chat_message_task
+from apps.communication.messages.services.chat_writer import get_chat_writer
+from apps.communication.messages.services.participants import get_recipient_ids, is_thread_participant
+from apps.communication.messages.services.thread_activity import get_thread_activity_throttle
 from bson import ObjectId
 
 
@@ -72,6 +73,9 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 self.room_group_name,
                 self.channel_name
             )
+            
+            # Ghi ngay các tin nhắn còn trong bộ đệm
+            await get_chat_writer().flush()
     
     async def receive(self, text_data):
         """Xử lý khi nhận tin nhắn từ client."""
@@ -105,20 +109,24 @@ class ChatConsumer(AsyncWebsocketConsumer):
         
         # Generate message ID immediately for fast UI feedback
         message_id = str(ObjectId())
-        created_at = timezone.now().isoformat()
+        now = timezone.now()
+        created_at = now.isoformat()
         
-        # Update thread metadata in SQL (keep this fast)
-        await self.update_thread_metadata()
+        # Update thread metadata in SQL (one throttled UPDATE per thread)
+        await get_thread_activity_throttle().touch(int(self.thread_id), now, content)
+        recipient_ids = await self.get_recipient_ids()
         
-        # Offload Storage to background worker
-        persist_chat_message_task.delay(
-            thread_id=self.thread_id,
-            sender_id=self.user.id,
-            sender_name=self.user.full_name,
-            sender_avatar=getattr(self.user, 'avatar_url', None),
-            content=content,
-            message_id=message_id
-        )
+        # Buffered storage: written with the other messages of the next few ms
+        await get_chat_writer().submit({
+            'thread_id': int(self.thread_id),
+            'sender_id': self.user.id,
+            'sender_name': self.user.full_name,
+            'sender_avatar': getattr(self.user, 'avatar_url', None),
+            'content': content,
+            'message_id': message_id,
+            'created_at': created_at,
+            'recipient_ids': recipient_ids,
+        })
         
         # Gửi tin nhắn đến tất cả users trong room ngay lập tức
         await self.channel_layer.group_send(
@@ -201,23 +209,14 @@ class ChatConsumer(AsyncWebsocketConsumer):
     
     @database_sync_to_async
     def check_thread_access(self):
-        """Kiểm tra user có quyền truy cập thread không."""
+        """Kiểm tra user có quyền truy cập thread không (cache participant)."""
         
-        return MessageParticipant.objects.filter(
-            thread_id=self.thread_id,
-            user_id=self.user.id,
-            is_active=True
-        ).exists()
+        return is_thread_participant(self.thread_id, self.user.id)
     
     @database_sync_to_async
-    def update_thread_metadata(self):
-        """Cập nhật thời gian update của thread trong DB chính."""
-        try:
-            thread = MessageThread.objects.get(id=self.thread_id)
-            thread.save() # Triggers auto_now update
-            return True
-        except MessageThread.DoesNotExist:
-            return False
+    def get_recipient_ids(self):
+        """Người nhận (tăng unread counter): participant trừ người gửi, từ cache."""
+        return get_recipient_ids(self.thread_id, self.user.id)
     
     @database_sync_to_async
     def mark_thread_as_read(self):
@@ -227,3 +226,9 @@ class ChatConsumer(AsyncWebsocketConsumer):
             thread_id=self.thread_id,
             user_id=self.user.id
         ).update(last_read_at=timezone.now())
+        
+        # Reset unread counter in MongoDB
+        try:
+            MongoChatService.mark_read(self.user.id, self.thread_id)
+        except Exception:
+            pass
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.communication.messages.services.mongo_service import MongoChatService
+
+
+class Command(BaseCommand):
+    help = 'Convert legacy string thread ids, then create the MongoDB indexes used by chat history and unread counters'
+
+    def handle(self, *args, **options):
+        self.stdout.write("Migrating string thread ids ...")
+
+        # Fail with a non-zero exit so the one-shot compose service shows it
+        try:
+            migrated = MongoChatService.migrate_thread_ids()
+            self.stdout.write(
+                f"Converted {migrated['messages']} messages, folded {migrated['counters']} unread counters"
+            )
+            MongoChatService.ensure_indexes()
+        except Exception as e:
+            raise CommandError(f"Chat index setup failed: {e}") from e
+
+        self.stdout.write(self.style.SUCCESS("Chat indexes are in place"))
@@ -1,77 +1,98 @@
+from datetime import datetime, timezone as dt_timezone
+
 from django.core.management.base import BaseCommand
+from django.utils import timezone
 from apps.communication.message_participants.models import MessageParticipant
 from apps.communication.messages.services.mongo_service import MongoChatService
-from django.conf import settings
 import pymongo
-from datetime import datetime
+
+# Participants counted per aggregation (and counter upserts per bulk_write)
+BATCH_SIZE = 1000
+
+
+def unread_count_pipeline(participants: list[dict]) -> list[dict]:
+    """
+    Database aggregation returning {thread_id, user_id, count} per participant.
+
+    Each participant ({thread_id, user_id, last_read_at}) looks up the
+    messages of other senders in its thread created after last_read_at
+    (all of them when it is null, which sorts before every date) and
+    $group/$sum counts them on the server, so only the totals come back.
+    """
+    return [
+        {"$documents": participants},
+        {"$lookup": {
+            "from": "messages",
+            "let": {"thread_id": "$thread_id", "user_id": "$user_id", "last_read_at": "$last_read_at"},
+            "pipeline": [
+                {"$match": {"$expr": {"$and": [
+                    {"$eq": ["$thread_id", "$$thread_id"]},
+                    {"$gt": ["$created_at", "$$last_read_at"]},
+                    {"$ne": ["$sender_id", "$$user_id"]},
+                ]}}},
+                {"$group": {"_id": None, "count": {"$sum": 1}}},
+            ],
+            "as": "unread",
+        }},
+        {"$project": {
+            "_id": 0,
+            "thread_id": 1,
+            "user_id": 1,
+            "count": {"$ifNull": [{"$first": "$unread.count"}, 0]},
+        }},
+    ]
+
 
 class Command(BaseCommand):
-    help = 'Sync unread counters from SQL/Mongo messages to unread_counters collection'
+    help = 'Rebuild the unread_counters collection from messages and participants last_read_at'
 
     def handle(self, *args, **options):
-        client = pymongo.MongoClient(settings.MONGO_URI)
-        db = client[settings.MONGO_DB_NAME]
-        messages_col = db['messages']
+        db = MongoChatService._get_db()
         counters_col = db['unread_counters']
-        
-        # Clear existing counters? Or just upsert?
-        # Upsert is safer.
-        
+
+        # The $lookup matches the int thread_id; convert messages and
+        # counters still keyed by the legacy string id before recounting
+        migrated = MongoChatService.migrate_thread_ids()
+        self.stdout.write(
+            f"Converted {migrated['messages']} messages, folded {migrated['counters']} unread counters"
+        )
+
         self.stdout.write("Starting sync...")
-        
-        participants = MessageParticipant.objects.filter(is_active=True).select_related('thread', 'user')
-        
+
+        now = datetime.utcnow()
         count_updated = 0
-        total = participants.count()
-        
-        for idx, p in enumerate(participants):
-            thread_id = p.thread.id
-            user_id = p.user.id
-            last_read_at = p.last_read_at
-            
-            # Count messages in Mongo created after last_read_at
-            # Exclude messages sent by self? Usually unread is for received messages.
-            # Yes, standard logic: unread = received messages > read_time.
-            # But in group chat, it's any message > read_time.
-            # Excluding self: query should be {"sender_id": {"$ne": user_id}}
-            
-            query = {
-                "thread_id": thread_id,
-                "sender_id": {"$ne": user_id}
-            }
-            
-            if last_read_at:
-                query["created_at"] = {"$gt": last_read_at}
-                
-            unread_count = messages_col.count_documents(query)
-            
-            # Update counter
-            if unread_count > 0:
-                counters_col.update_one(
-                    {"user_id": user_id, "thread_id": thread_id},
-                    {
-                        "$set": {
-                            "count": unread_count,
-                            "last_updated": datetime.utcnow()
-                        }
-                    },
-                    upsert=True
-                )
-                count_updated += 1
-            else:
-                 # Ensure it's 0 if no unread
-                 counters_col.update_one(
-                    {"user_id": user_id, "thread_id": thread_id},
-                    {
-                        "$set": {
-                            "count": 0,
-                            "last_updated": datetime.utcnow()
-                        }
-                    },
-                    upsert=True
-                )
-            
-            if idx % 100 == 0:
-                self.stdout.write(f"Processed {idx}/{total} participants...")
+        batch = []
+        participants = MessageParticipant.objects.filter(
+            is_active=True
+        ).values_list('thread_id', 'user_id', 'last_read_at')
+        for thread_id, user_id, last_read_at in participants.iterator(chunk_size=BATCH_SIZE):
+            # pymongo stores naive UTC datetimes
+            if last_read_at is not None and timezone.is_aware(last_read_at):
+                last_read_at = timezone.make_naive(last_read_at, dt_timezone.utc)
+            batch.append({"thread_id": thread_id, "user_id": user_id, "last_read_at": last_read_at})
+            if len(batch) >= BATCH_SIZE:
+                count_updated += self._sync_batch(db, counters_col, batch, now)
+                batch = []
+
+        if batch:
+            count_updated += self._sync_batch(db, counters_col, batch, now)
 
         self.stdout.write(self.style.SUCCESS(f"Successfully synced unread counters. Updated {count_updated} records."))
+
+    @staticmethod
+    def _sync_batch(db, counters_col, participants: list[dict], now: datetime) -> int:
+        """Recount one batch of participants; returns how many have unread messages."""
+        operations = []
+        count_updated = 0
+        for row in db.aggregate(unread_count_pipeline(participants)):
+            operations.append(pymongo.UpdateOne(
+                {"user_id": row['user_id'], "thread_id": row['thread_id']},
+                {"$set": {"count": row['count'], "last_updated": now}},
+                upsert=True
+            ))
+            if row['count'] > 0:
+                count_updated += 1
+
+        if operations:
+            counters_col.bulk_write(operations, ordered=False)
+        return count_updated
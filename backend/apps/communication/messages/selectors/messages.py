@@ -1,9 +1,26 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+import logging
+
 from django.db.models import QuerySet, Count, Q
 from apps.communication.message_threads.models import MessageThread
 from apps.communication.message_participants.models import MessageParticipant
 from apps.communication.messages.services.mongo_service import MongoChatService
 
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class UnreadCounts:
+    """Unread counts of one user, loaded once per request for the thread list."""
+    total: int = 0
+    threads: Dict[int, int] = field(default_factory=dict)
+
+    def for_thread(self, thread_id: int) -> int:
+        return self.threads.get(int(thread_id), 0)
+
+
 def list_threads(user_id: int) -> QuerySet:
     """
     Get list of message threads for a user.
@@ -47,16 +64,29 @@ def get_thread_by_id(thread_id: int, user_id: int) -> Optional[MessageThread]:
         return None
 
 
-def list_messages(thread_id: int, user_id: int) -> Optional[QuerySet]:
+def list_messages(
+    thread_id: int,
+    user_id: int,
+    limit: int = 50,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+) -> Optional[dict]:
     """
-    Get messages in a thread.
+    Get one page of messages in a thread.
     
     Args:
         thread_id: ID of the thread
         user_id: ID of the user (for access check)
+        limit: Page size
+        before: Message id / ISO timestamp, page towards older messages
+        after: Message id / ISO timestamp, page towards newer messages
     
     Returns:
-        QuerySet of messages or None if thread not found or no access
+        {'results': messages oldest first, 'has_more': more messages in the
+        paging direction} or None if thread not found or no access
+    
+    Raises:
+        ValueError: If a cursor is invalid
     """
     # Check access
     if not MessageParticipant.objects.filter(
@@ -66,8 +96,21 @@ def list_messages(thread_id: int, user_id: int) -> Optional[QuerySet]:
     ).exists():
         return None
     
-    # MongoDB Logic
-    return MongoChatService.get_messages(thread_id=thread_id)
+    # MongoDB Logic: read one extra message to know whether another page exists.
+    # New messages store an int thread_id; older string ids are converted by
+    # MongoChatService.migrate_thread_ids (run by ensure_mongo_indexes).
+    messages = MongoChatService.get_messages(
+        thread_id=int(thread_id),
+        limit=limit + 1,
+        before=before,
+        after=after
+    )
+    has_more = len(messages) > limit
+    if has_more:
+        # The extra message is the farthest one from the cursor
+        messages = messages[:limit] if after is not None else messages[1:]
+    
+    return {'results': messages, 'has_more': has_more}
 
 
 # get_message_by_id removed (SQL)
@@ -80,6 +123,21 @@ def count_unread_messages(user_id: int) -> int:
     return MongoChatService.get_total_unread_count(user_id)
 
 
+def get_unread_counts(user_id: int) -> UnreadCounts:
+    """
+    Per-thread and total unread counts for a user (one Mongo aggregation).
+    
+    Returns empty counts when MongoDB is unavailable, so the thread list
+    still renders.
+    """
+    try:
+        summary = MongoChatService.get_unread_summary(user_id)
+    except Exception as e:
+        logger.warning(f"Unread counts of user {user_id} unavailable ({e})")
+        return UnreadCounts()
+    return UnreadCounts(total=summary['total'], threads=summary['threads'])
+
+
 def get_thread_between_users(user_ids: list[int]) -> Optional[MessageThread]:
     """
     Find existing thread between a set of users (for 1-1 or group chats).
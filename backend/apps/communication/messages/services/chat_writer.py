@@ -0,0 +1,108 @@
+from typing import List, Optional
+import asyncio
+import logging
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from apps.communication.messages.services.mongo_service import MongoChatService
+
+
+logger = logging.getLogger(__name__)
+
+
+def _write_batch(messages: List[dict]) -> int:
+    """Write one batch; whatever could not be written goes to Celery for retries."""
+    from apps.communication.messages.tasks import persist_chat_messages_task
+
+    try:
+        failed = MongoChatService.save_messages(messages)
+    except Exception as e:
+        logger.warning(f"Chat batch of {len(messages)} messages failed ({e}), queued for retry")
+        failed = messages
+
+    if failed:
+        persist_chat_messages_task.delay(failed)
+    return len(messages) - len(failed)
+
+
+class ChatMessageWriter:
+    """
+    Bộ đệm ghi tin nhắn chat theo lô trong process ASGI.
+
+    Consumers submit() messages (with their pre-generated ObjectId) and
+    return immediately. A batch is written CHAT_PERSIST_DELAY_MS after its
+    first message, or as soon as CHAT_PERSIST_BATCH_SIZE messages are
+    pending, with MongoChatService.save_messages: one insert_many and one
+    unread-counter bulk_write, off the event loop. Failed messages are
+    handed to persist_chat_messages_task, which retries idempotently.
+
+    Messages still pending when the process is killed are lost, so the
+    delay must stay in the millisecond range.
+    """
+
+    def __init__(self, delay: float, batch_size: int):
+        self.delay = delay
+        self.batch_size = batch_size
+        self._pending: List[dict] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._loop = None
+        self._flushes = set()
+
+    async def submit(self, message: dict) -> None:
+        """Queue one message (a save_messages item) for the next batch."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Timers of another (finished) event loop never fire
+            self._loop, self._timer = loop, None
+
+        self._pending.append(message)
+        if len(self._pending) >= self.batch_size:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._spawn(self.flush())
+        elif self._timer is None:
+            self._timer = self._spawn(self._flush_later())
+
+    def _spawn(self, coroutine) -> asyncio.Task:
+        # Keep a reference until done, the loop only holds weak ones
+        task = asyncio.ensure_future(coroutine)
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+        return task
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.delay)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write everything pending now.
+
+        Returns:
+            Number of messages written (not counting retries handed to Celery)
+        """
+        batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+        return await sync_to_async(_write_batch, thread_sensitive=False)(batch)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_chat_writer() -> ChatMessageWriter:
+    """ChatMessageWriter of this process, configured from settings."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = ChatMessageWriter(
+                    delay=getattr(settings, 'CHAT_PERSIST_DELAY_MS', 5) / 1000,
+                    batch_size=getattr(settings, 'CHAT_PERSIST_BATCH_SIZE', 200),
+                )
+    return _writer
@@ -5,16 +5,22 @@ from typing import Optional
 
 from django.utils import timezone
 from django.db import transaction
+from django.db.models import Q
 from django.core.files.uploadedfile import UploadedFile
 from django.conf import settings
 
 from pydantic import BaseModel
+from bson import ObjectId
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 
 from apps.communication.message_threads.models import MessageThread
 from apps.communication.message_participants.models import MessageParticipant
 from apps.communication.messages.services.mongo_service import MongoChatService
+from apps.communication.messages.services.participants import (
+    get_recipient_ids,
+    invalidate_thread_participants,
+)
 from apps.core.users.models import CustomUser
 
 
@@ -80,6 +86,7 @@ def create_thread(
             thread=thread,
             user_id=user_id
         )
+    invalidate_thread_participants(thread.id)
     
     # Send initial message if provided
     if data.initial_message:
@@ -117,6 +124,7 @@ def delete_thread(thread_id: int, user_id: int) -> bool:
     # Soft delete - mark as inactive
     participant.is_active = False
     participant.save(update_fields=['is_active'])
+    invalidate_thread_participants(thread_id)
     
     return True
 
@@ -125,7 +133,7 @@ def send_message(
     thread_id: int,
     sender: CustomUser,
     data: MessageCreateInput
-) -> Message:
+) -> dict:
     """
     Send a message to a thread.
     
@@ -135,7 +143,7 @@ def send_message(
         data: Message data
     
     Returns:
-        Created Message object
+        Created message (dict, MongoDB document)
     
     Raises:
         ValueError: If thread not found or sender is not a participant
@@ -160,11 +168,7 @@ def send_message(
     message = message_data # It's a dict
     
     # Update thread updated_at AND last_message metadata
-    MessageThread.objects.filter(id=thread_id).update(
-        updated_at=timezone.now(),
-        last_message_at=timezone.now(),
-        last_message_content=data.content[:500] if data.content else "Attachment"
-    )
+    touch_thread(thread_id, timezone.now(), data.content)
     
     # Send real-time notification via WebSocket
     try:
@@ -187,12 +191,11 @@ def send_message(
         
     # Increment Unread Counters for OTHER participants
     try:
-        recipient_ids = list(MessageParticipant.objects.filter(
-            thread_id=thread_id,
-            is_active=True
-        ).exclude(user_id=sender.id).values_list('user_id', flat=True))
-        
-        MongoChatService.increment_unread_counters(thread_id, recipient_ids)
+        # Same idempotent, race-safe counter path as the WebSocket writer
+        message_id = ObjectId(message['id'])
+        MongoChatService.count_unread_messages([
+            (thread_id, user_id, message_id) for user_id in get_recipient_ids(thread_id, sender.id)
+        ])
     except Exception as e:
         # Don't fail the message send if counter update fails
         # Log error here in real app
@@ -201,6 +204,25 @@ def send_message(
     return message
 
 
+def touch_thread(thread_id: int, at, content: Optional[str]) -> bool:
+    """
+    Record the latest message of a thread with one UPDATE (updated_at,
+    last_message_at, last_message_content). A write older than the stored
+    last message is ignored, so late or reordered writes never go back.
+    
+    Returns:
+        True if the thread row was updated
+    """
+    return bool(MessageThread.objects.filter(
+        Q(last_message_at__isnull=True) | Q(last_message_at__lte=at),
+        id=thread_id
+    ).update(
+        updated_at=at,
+        last_message_at=at,
+        last_message_content=content[:500] if content else "Attachment"
+    ))
+
+
 def delete_message(message_id: int, user_id: int) -> bool:
     """
     Delete a message.
@@ -299,6 +321,7 @@ def add_participant(
         # Re-activate
         existing.is_active = True
         existing.save(update_fields=['is_active'])
+        invalidate_thread_participants(thread_id)
         return existing
     
     # Create new participant
@@ -306,6 +329,7 @@ def add_participant(
         thread_id=thread_id,
         user_id=user_id
     )
+    invalidate_thread_participants(thread_id)
     
     # Send system message
     thread = MessageThread.objects.get(id=thread_id)
@@ -361,6 +385,7 @@ def remove_participant(
     # Soft delete
     participant.is_active = False
     participant.save(update_fields=['is_active'])
+    invalidate_thread_participants(thread_id)
     
     # Send system message
     thread = MessageThread.objects.get(id=thread_id)
@@ -1,9 +1,34 @@
 from datetime import datetime
 from django.conf import settings
 import pymongo
+from pymongo.errors import BulkWriteError
 from bson import ObjectId
 from bson.errors import InvalidId
 
+
+# Write error code of a duplicate _id (message already persisted) or of a
+# counter upsert that lost the race to create the same counter
+DUPLICATE_KEY_ERROR = 11000
+
+# Ids of the latest counted messages kept on each unread counter, so that
+# replayed batches are recognised and not counted twice
+UNREAD_COUNTED_IDS_KEPT = 1000
+
+
+# Fields returned by history queries (_id is always included)
+MESSAGE_PROJECTION = {
+    "thread_id": 1,
+    "sender_id": 1,
+    "sender_name": 1,
+    "sender_avatar": 1,
+    "content": 1,
+    "attachments": 1,
+    "attachment_url": 1,
+    "is_system_message": 1,
+    "created_at": 1,
+    "updated_at": 1,
+}
+
 class MongoChatService:
     _client = None
     _db = None
@@ -21,23 +46,23 @@ class MongoChatService:
         db = cls._get_db()
         return db['messages']
 
-    @classmethod
-    def save_message(cls, thread_id: int, sender_id: int, sender_name: str, sender_avatar: str, content: str, attachments=None, message_id=None):
-        """
-        Lưu tin nhắn vào MongoDB.
-        """
-        collection = cls._get_collection()
-        
+    @staticmethod
+    def _build_message_doc(thread_id: int, sender_id: int, sender_name: str, sender_avatar: str, content: str, attachments=None, message_id=None, created_at=None):
+        """Document of one message; created_at may be an ISO string."""
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at)
+        created_at = created_at or datetime.utcnow()
+
         doc = {
-            "thread_id": thread_id,  # Reference SQL ID
+            "thread_id": int(thread_id),  # Reference SQL ID (URL kwargs arrive as str)
             "sender_id": sender_id,  # Reference SQL ID
             "sender_name": sender_name, # Cache name để đỡ query lại
             "sender_avatar": sender_avatar, # Cache avatar
             "content": content,
             "attachments": attachments or [],
             "is_system_message": False,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
+            "created_at": created_at,
+            "updated_at": created_at
         }
         
         if message_id:
@@ -45,6 +70,19 @@ class MongoChatService:
                 doc["_id"] = ObjectId(message_id)
             except InvalidId:
                 pass # Let Mongo generate if invalid
+        return doc
+
+    @classmethod
+    def save_message(cls, thread_id: int, sender_id: int, sender_name: str, sender_avatar: str, content: str, attachments=None, message_id=None):
+        """
+        Lưu tin nhắn vào MongoDB.
+        """
+        collection = cls._get_collection()
+        
+        doc = cls._build_message_doc(
+            thread_id, sender_id, sender_name, sender_avatar, content,
+            attachments=attachments, message_id=message_id
+        )
         
         result = collection.insert_one(doc)
         
@@ -60,27 +98,101 @@ class MongoChatService:
         return ret_doc
 
     @classmethod
-    def increment_unread_counters(cls, thread_id: int, recipient_ids: list[int]):
+    def save_messages(cls, messages: list[dict]) -> list[dict]:
+        """
+        Persist a batch of messages: one unordered insert_many plus one
+        bulk_write for all their unread-counter increments.
+
+        Each item holds save_message's arguments plus the pre-generated
+        message_id, created_at and recipient_ids. A message whose _id is
+        already stored is not inserted again, but its increments are still
+        sent: count_unread_messages applies each (message, recipient) at
+        most once, so a retry after a failed counter write catches up
+        instead of losing the counts.
+
+        Returns:
+            Messages that failed with another error (to be retried)
+        """
+        if not messages:
+            return []
+
+        docs = [
+            cls._build_message_doc(**{key: value for key, value in message.items() if key != 'recipient_ids'})
+            for message in messages
+        ]
+
+        failed_indexes = set()
+        try:
+            cls._get_collection().insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get('writeErrors', []):
+                if error.get('code') != DUPLICATE_KEY_ERROR:
+                    failed_indexes.add(error['index'])
+
+        cls.count_unread_messages([
+            (message['thread_id'], user_id, doc['_id'])
+            for index, (message, doc) in enumerate(zip(messages, docs))
+            if index not in failed_indexes
+            for user_id in message.get('recipient_ids') or []
+        ])
+
+        return [messages[index] for index in sorted(failed_indexes)]
+
+    @classmethod
+    def count_unread_messages(cls, entries: list[tuple]) -> None:
         """
-        Increment unread count for recipients.
+        Increment unread counters once per (thread_id, user_id, message_id).
+
+        Missing counters are first created by an equality-only $setOnInsert
+        upsert, so a replay never inserts a second counter and concurrent
+        creators converge on one document. The increments are then plain
+        updates that only match while the message id is not among the
+        counter's last UNREAD_COUNTED_IDS_KEPT counted ids.
         """
-        if not recipient_ids:
+        if not entries:
             return
-            
-        db = cls._get_db()
-        counters_col = db['unread_counters']
-        
-        # Use bulk_write for performance
+
+        counters_col = cls._get_db()['unread_counters']
+        now = datetime.utcnow()
+        cls._create_unread_counters(
+            counters_col,
+            sorted({(int(thread_id), user_id) for thread_id, user_id, _ in entries}),
+            now
+        )
+        counters_col.bulk_write([
+            pymongo.UpdateOne(
+                {"user_id": user_id, "thread_id": int(thread_id), "counted_ids": {"$ne": message_id}},
+                {
+                    "$inc": {"count": 1},
+                    "$set": {"last_updated": now},
+                    "$push": {"counted_ids": {"$each": [message_id], "$slice": -UNREAD_COUNTED_IDS_KEPT}},
+                }
+            ) for thread_id, user_id, message_id in entries
+        ], ordered=False)
+
+    @staticmethod
+    def _create_unread_counters(counters_col, keys: list[tuple], now: datetime) -> None:
+        """
+        Upsert an empty counter for each (thread_id, user_id) that has none.
+
+        An upsert that loses the race to another writer fails on the unique
+        (user_id, thread_id) index; it is retried once, and then matches the
+        counter the other writer created.
+        """
         operations = [
             pymongo.UpdateOne(
-                {"user_id": uid, "thread_id": thread_id},
-                {"$inc": {"count": 1}, "$set": {"last_updated": datetime.utcnow()}},
+                {"user_id": user_id, "thread_id": thread_id},
+                {"$setOnInsert": {"count": 0, "counted_ids": [], "last_updated": now}},
                 upsert=True
-            ) for uid in recipient_ids
+            ) for thread_id, user_id in keys
         ]
-        
-        if operations:
-            counters_col.bulk_write(operations)
+        try:
+            counters_col.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get('writeErrors', [])
+            if any(error.get('code') != DUPLICATE_KEY_ERROR for error in errors):
+                raise
+            counters_col.bulk_write([operations[error['index']] for error in errors], ordered=False)
 
     @classmethod
     def mark_read(cls, user_id: int, thread_id: int):
@@ -91,23 +203,137 @@ class MongoChatService:
         counters_col = db['unread_counters']
         
         counters_col.update_one(
-            {"user_id": user_id, "thread_id": thread_id},
+            {"user_id": user_id, "thread_id": int(thread_id)},
             {"$set": {"count": 0, "last_updated": datetime.utcnow()}},
             upsert=True
         )
 
     @classmethod
-    def get_messages(cls, thread_id: int, limit=50, offset=0):
+    def ensure_indexes(cls):
+        """
+        Create the indexes the chat queries rely on (idempotent).
+
+        - messages (thread_id, _id): history pages seek on _id inside a thread
+        - messages (thread_id, created_at): unread recount after last_read_at
+        - unread_counters (user_id, thread_id), unique: counter upserts and totals;
+          one counter per user and thread even when writers create it concurrently
+        """
+        db = cls._get_db()
+        db['messages'].create_indexes([
+            pymongo.IndexModel(
+                [("thread_id", pymongo.ASCENDING), ("_id", pymongo.DESCENDING)],
+                name="thread_id_1__id_-1"
+            ),
+            pymongo.IndexModel(
+                [("thread_id", pymongo.ASCENDING), ("created_at", pymongo.DESCENDING)],
+                name="thread_id_1_created_at_-1"
+            ),
+        ])
+        db['unread_counters'].create_indexes([
+            pymongo.IndexModel(
+                [("user_id", pymongo.ASCENDING), ("thread_id", pymongo.ASCENDING)],
+                name="user_id_1_thread_id_1",
+                unique=True
+            ),
+        ])
+
+    @classmethod
+    def migrate_thread_ids(cls) -> dict:
+        """
+        Convert thread_id values stored as strings to int (idempotent).
+
+        Messages and unread counters written before thread ids were cast
+        carry the URL kwarg string. Messages are rewritten in place with
+        $toInt. String-keyed counters are folded into the int counter of the
+        same (user_id, thread_id), summing their counts, and then deleted, so
+        the unique counter index can be built afterwards.
+
+        Returns:
+            {'messages': messages converted, 'counters': string counters folded}
+        """
+        db = cls._get_db()
+        messages_result = db['messages'].update_many(
+            {"thread_id": {"$type": "string"}},
+            [{"$set": {"thread_id": {"$toInt": "$thread_id"}}}]
+        )
+
+        counters_col = db['unread_counters']
+        legacy_counters = counters_col.aggregate([
+            {"$match": {"thread_id": {"$type": "string"}}},
+            {"$group": {
+                "_id": {"user_id": "$user_id", "thread_id": {"$toInt": "$thread_id"}},
+                "ids": {"$push": "$_id"},
+                "count": {"$sum": "$count"},
+                "last_updated": {"$max": "$last_updated"},
+            }},
+        ])
+        counters_folded = 0
+        operations = []
+        for group in legacy_counters:
+            operations.append(pymongo.UpdateOne(
+                {"user_id": group['_id']['user_id'], "thread_id": group['_id']['thread_id']},
+                {
+                    "$inc": {"count": group['count']},
+                    "$max": {"last_updated": group['last_updated']},
+                    "$setOnInsert": {"counted_ids": []},
+                },
+                upsert=True
+            ))
+            operations.append(pymongo.DeleteMany({"_id": {"$in": group['ids']}}))
+            counters_folded += len(group['ids'])
+        if operations:
+            # Ordered: each counter is folded before its string copies are deleted
+            counters_col.bulk_write(operations, ordered=True)
+
+        return {'messages': messages_result.modified_count, 'counters': counters_folded}
+
+    @staticmethod
+    def _parse_cursor(value) -> ObjectId:
+        """
+        History cursor -> ObjectId bound.
+
+        Accepts a message id or an ISO timestamp; a timestamp becomes the
+        smallest ObjectId of that second, so the query stays on (thread_id, _id).
+
+        Raises:
+            ValueError: If the cursor is neither
+        """
+        if isinstance(value, ObjectId):
+            return value
+        if isinstance(value, datetime):
+            return ObjectId.from_datetime(value)
+        if ObjectId.is_valid(value):
+            return ObjectId(value)
+        try:
+            return ObjectId.from_datetime(datetime.fromisoformat(str(value).replace('Z', '+00:00')))
+        except ValueError:
+            raise ValueError(f"Invalid cursor '{value}'")
+
+    @classmethod
+    def get_messages(cls, thread_id: int, limit=50, before=None, after=None):
         """
-        Lấy danh sách tin nhắn từ MongoDB (Pagination).
+        Lấy danh sách tin nhắn từ MongoDB (cursor pagination).
+
+        Without a cursor returns the latest `limit` messages; `before` pages
+        towards older messages and `after` towards newer ones. Either is a
+        message id or an ISO timestamp. Messages are returned oldest first.
         """
         collection = cls._get_collection()
-        
-        cursor = collection.find({"thread_id": thread_id})\
-                           .sort("created_at", pymongo.DESCENDING)\
-                           .skip(offset)\
+
+        # Messages stored before migrate_thread_ids ran keep a string thread_id
+        query = {"thread_id": {"$in": [int(thread_id), str(thread_id)]}}
+        if after is not None:
+            query["_id"] = {"$gt": cls._parse_cursor(after)}
+            direction = pymongo.ASCENDING
+        else:
+            if before is not None:
+                query["_id"] = {"$lt": cls._parse_cursor(before)}
+            direction = pymongo.DESCENDING
+
+        cursor = collection.find(query, MESSAGE_PROJECTION)\
+                           .sort("_id", direction)\
                            .limit(limit)
-                           
+
         messages = []
         for doc in cursor:
             doc['id'] = str(doc['_id']) # Convert ObjectId to string
@@ -117,9 +343,11 @@ class MongoChatService:
             if isinstance(doc.get('updated_at'), datetime):
                  doc['updated_at'] = doc['updated_at'].isoformat()
             messages.append(doc)
-            
-        return messages[::-1]
-            
+
+        if direction == pymongo.DESCENDING:
+            messages.reverse()
+        return messages
+
     @classmethod
     def delete_message(cls, message_id: str, user_id: int):
         """
@@ -145,6 +373,34 @@ class MongoChatService:
         collection.delete_one({"_id": obj_id})
         return True
 
+    @classmethod
+    def get_unread_summary(cls, user_id: int) -> dict:
+        """
+        Per-thread and total unread counts of a user in one aggregation.
+
+        Returns:
+            {'total': int, 'threads': {thread_id: count}} (threads with unread messages only)
+        """
+        db = cls._get_db()
+        counters_col = db['unread_counters']
+        
+        pipeline = [
+            {"$match": {"user_id": user_id, "count": {"$gt": 0}}},
+            {"$group": {
+                "_id": None,
+                "total": {"$sum": "$count"},
+                "threads": {"$push": {"thread_id": "$thread_id", "count": "$count"}}
+            }}
+        ]
+        
+        result = list(counters_col.aggregate(pipeline))
+        if not result:
+            return {'total': 0, 'threads': {}}
+        return {
+            'total': result[0]['total'],
+            'threads': {int(row['thread_id']): row['count'] for row in result[0]['threads']},
+        }
+
     @classmethod
     def get_total_unread_count(cls, user_id: int) -> int:
         """
@@ -0,0 +1,88 @@
+from typing import FrozenSet
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.communication.message_participants.models import MessageParticipant
+from apps.core.cache import LRUCache
+
+
+logger = logging.getLogger(__name__)
+
+
+# Per-process tier in front of the shared cache: connects and messages of
+# busy threads do not even reach Redis. Other processes see a change
+# after CHAT_PARTICIPANTS_L1_TTL seconds at most.
+_local = LRUCache(
+    max_entries=getattr(settings, 'CHAT_PARTICIPANTS_L1_MAX_ENTRIES', 10000),
+    ttl=getattr(settings, 'CHAT_PARTICIPANTS_L1_TTL', 5),
+)
+
+
+def participants_key(thread_id: int) -> str:
+    return f"chat:participants:{thread_id}"
+
+
+def get_thread_participant_ids(thread_id: int) -> FrozenSet[int]:
+    """
+    IDs of the active participants of a thread.
+
+    Read from the process LRU, then the shared cache (kept
+    CHAT_PARTICIPANTS_CACHE_TTL seconds), then the database. Cache errors
+    (Redis down) fall back to the database. Services that add or remove
+    participants call invalidate_thread_participants().
+    """
+    key = participants_key(thread_id)
+    found, user_ids = _local.get(key)
+    if found:
+        return user_ids
+
+    try:
+        cached = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Participant cache read failed ({e})")
+        cached = None
+
+    if cached is None:
+        cached = list(MessageParticipant.objects.filter(
+            thread_id=thread_id,
+            is_active=True
+        ).values_list('user_id', flat=True))
+        try:
+            cache.set(key, cached, timeout=getattr(settings, 'CHAT_PARTICIPANTS_CACHE_TTL', 300))
+        except Exception as e:
+            logger.warning(f"Participant cache write failed ({e})")
+
+    user_ids = frozenset(cached)
+    _local.set(key, user_ids)
+    return user_ids
+
+
+def is_thread_participant(thread_id: int, user_id: int) -> bool:
+    """Access check of the chat hot path (WebSocket connect)."""
+    return user_id in get_thread_participant_ids(thread_id)
+
+
+def get_recipient_ids(thread_id: int, sender_id: int) -> list[int]:
+    """Participants whose unread counter a message of sender_id increments."""
+    return sorted(get_thread_participant_ids(thread_id) - {sender_id})
+
+
+def invalidate_thread_participants(thread_id: int) -> None:
+    """
+    Drop the cached participant set now and again after commit, so a
+    concurrent reader cannot re-cache the pre-commit rows.
+    """
+    key = participants_key(thread_id)
+
+    def drop():
+        _local.delete(key)
+        try:
+            cache.delete(key)
+        except Exception as e:
+            logger.warning(f"Participant cache invalidation failed ({e})")
+
+    drop()
+    transaction.on_commit(drop)
@@ -0,0 +1,86 @@
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+import asyncio
+import threading
+import time
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+
+from apps.communication.messages.services.messages import touch_thread
+
+
+# Per-thread bookkeeping kept before stale entries are pruned
+MAX_TRACKED_THREADS = 10000
+
+
+class ThreadActivityThrottle:
+    """
+    Ghi metadata tin nhắn cuối của thread, tối đa một UPDATE mỗi interval giây.
+
+    The first message of a burst is written at once (touch_thread); the
+    following ones only remember the newest (at, content), written by a
+    single trailing UPDATE when the interval ends. The thread list thus
+    always ends up on the real last message.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._written_at: Dict[int, float] = {}
+        self._pending: Dict[int, Tuple[datetime, str]] = {}
+        self._timers: Dict[int, asyncio.Task] = {}
+        self._loop = None
+
+    async def touch(self, thread_id: int, at: datetime, content: str) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Timers of another (finished) event loop never fire
+            self._loop = loop
+            self._timers.clear()
+
+        now = time.monotonic()
+        written_at = self._written_at.get(thread_id)
+        if written_at is None or now - written_at >= self.interval:
+            self._written_at[thread_id] = now
+            self._pending.pop(thread_id, None)
+            self._prune(now)
+            await database_sync_to_async(touch_thread)(thread_id, at, content)
+            return
+
+        self._pending[thread_id] = (at, content)
+        if thread_id not in self._timers:
+            delay = self.interval - (now - written_at)
+            self._timers[thread_id] = asyncio.ensure_future(self._write_later(thread_id, delay))
+
+    async def _write_later(self, thread_id: int, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timers.pop(thread_id, None)
+        pending = self._pending.pop(thread_id, None)
+        if pending is not None:
+            self._written_at[thread_id] = time.monotonic()
+            await database_sync_to_async(touch_thread)(thread_id, *pending)
+
+    def _prune(self, now: float) -> None:
+        if len(self._written_at) <= MAX_TRACKED_THREADS:
+            return
+        self._written_at = {
+            thread_id: written_at
+            for thread_id, written_at in self._written_at.items()
+            if now - written_at < self.interval or thread_id in self._timers
+        }
+
+
+_throttle: Optional[ThreadActivityThrottle] = None
+_throttle_lock = threading.Lock()
+
+
+def get_thread_activity_throttle() -> ThreadActivityThrottle:
+    """ThreadActivityThrottle of this process (CHAT_THREAD_ACTIVITY_INTERVAL seconds)."""
+    global _throttle
+    if _throttle is None:
+        with _throttle_lock:
+            if _throttle is None:
+                _throttle = ThreadActivityThrottle(
+                    interval=getattr(settings, 'CHAT_THREAD_ACTIVITY_INTERVAL', 2)
+                )
+    return _throttle
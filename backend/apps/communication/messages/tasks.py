@@ -26,21 +26,41 @@ def persist_chat_message_task(
         message_id: Optional message ID
         recipient_ids: List of user IDs to increment unread counters for
     """
+    message = {
+        'thread_id': thread_id,
+        'sender_id': sender_id,
+        'sender_name': sender_name,
+        'sender_avatar': sender_avatar,
+        'content': content,
+        'message_id': message_id,
+        'recipient_ids': recipient_ids,
+    }
     try:
-        MongoChatService.save_message(
-            thread_id=thread_id,
-            sender_id=sender_id,
-            sender_name=sender_name,
-            sender_avatar=sender_avatar,
-            content=content,
-            message_id=message_id
-        )
-        
-        # Increment unread counters if recipient_ids provided
-        if recipient_ids:
-            MongoChatService.increment_unread_counters(thread_id, recipient_ids)
+        # Idempotent on message_id: a retried task does not duplicate the message
+        if MongoChatService.save_messages([message]):
+            raise RuntimeError(f"Message {message_id} could not be written")
         
         return f"Message {message_id} persisted for thread {thread_id}"
     except Exception as e:
         logger.error(f"Error persisting message: {str(e)}")
         raise e
+
+
+@shared_task(
+    name="apps.communication.messages.persist_chat_messages",
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=5
+)
+def persist_chat_messages_task(self, messages: list[dict]):
+    """
+    Task ghi lại các tin nhắn mà ChatMessageWriter không ghi được.
+
+    The whole batch is retried on failure; messages already stored are
+    skipped by their pre-generated _id.
+    """
+    failed = MongoChatService.save_messages(messages)
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(messages)} chat messages could not be written")
+    return f"{len(messages)} messages persisted"
@@ -0,0 +1,82 @@
+# Chat Hot Path Tests
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from apps.communication.message_threads.models import MessageThread
+from apps.communication.message_participants.models import MessageParticipant
+from apps.communication.messages.services import participants, thread_activity
+from apps.communication.messages.services.messages import remove_participant, touch_thread
+from apps.communication.messages.services.participants import is_thread_participant
+from apps.communication.messages.services.thread_activity import ThreadActivityThrottle
+
+User = get_user_model()
+
+
+class ChatHotPathTests(TransactionTestCase):
+    """Cache ACL participant và cập nhật metadata thread có throttle"""
+
+    def setUp(self):
+        # Transactional: database_sync_to_async closes connections held in a test transaction
+        self.user = User.objects.create_user(
+            email='hotpath@example.com',
+            password='testpass123',
+            full_name='Hot Path User'
+        )
+        self.other_user = User.objects.create_user(
+            email='hotpath-other@example.com',
+            password='testpass123',
+            full_name='Other User'
+        )
+        self.thread = MessageThread.objects.create(subject='Hot Thread')
+        MessageParticipant.objects.create(thread=self.thread, user=self.user)
+        MessageParticipant.objects.create(thread=self.thread, user=self.other_user)
+        cache.clear()
+        participants._local.clear()
+
+    @override_settings(CHAT_PARTICIPANTS_CACHE_TTL=60)
+    @patch('apps.communication.messages.services.messages.MongoChatService')
+    def test_membership_is_cached_until_participants_change(self, mock_mongo):
+        with patch.object(participants._local, 'ttl', 60):
+            self.assertTrue(is_thread_participant(self.thread.id, self.other_user.id))
+            with self.assertNumQueries(0):
+                self.assertTrue(is_thread_participant(self.thread.id, self.other_user.id))
+
+            # The shared tier answers once the process tier is gone
+            participants._local.clear()
+            with self.assertNumQueries(0):
+                self.assertTrue(is_thread_participant(self.thread.id, self.other_user.id))
+
+            remove_participant(self.thread.id, self.other_user.id, self.user.id)
+            self.assertFalse(is_thread_participant(self.thread.id, self.other_user.id))
+
+    def test_touch_thread_never_goes_back(self):
+        now = timezone.now()
+        self.assertTrue(touch_thread(self.thread.id, now, 'newer'))
+        self.assertFalse(touch_thread(self.thread.id, now - timedelta(seconds=1), 'older'))
+
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.last_message_content, 'newer')
+        self.assertEqual(self.thread.last_message_at, now)
+
+    def test_burst_is_written_leading_and_trailing(self):
+        throttle = ThreadActivityThrottle(interval=0.05)
+
+        async def burst():
+            for content in ('one', 'two', 'three'):
+                await throttle.touch(self.thread.id, timezone.now(), content)
+            await asyncio.sleep(0.1)
+
+        with patch.object(thread_activity, 'touch_thread', wraps=touch_thread) as write:
+            async_to_sync(burst)()
+
+        self.assertEqual([call.args[2] for call in write.call_args_list], ['one', 'three'])
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.last_message_content, 'three')
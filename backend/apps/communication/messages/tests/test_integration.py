@@ -1,3 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from bson import ObjectId
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
@@ -120,3 +123,53 @@ class TestChatIntegration(APITestCase):
         # Verify gone
         msgs = MongoChatService.get_messages(self.thread.id)
         self.assertEqual(len(msgs), 0)
+
+    def _counters(self, user_id):
+        return list(MongoChatService._get_db()['unread_counters'].find(
+            {"user_id": user_id, "thread_id": self.thread.id}
+        ))
+
+    def test_replayed_message_is_counted_once(self):
+        """A message saved twice (writer retry) increments its counter once."""
+        MongoChatService.ensure_indexes()
+        message = {
+            'thread_id': self.thread.id,
+            'sender_id': self.user1.id,
+            'sender_name': "User 1",
+            'sender_avatar': "",
+            'content': "Hello",
+            'message_id': str(ObjectId()),
+            'recipient_ids': [self.user2.id],
+        }
+
+        MongoChatService.save_messages([message])
+        MongoChatService.save_messages([message])
+
+        counters = self._counters(self.user2.id)
+        self.assertEqual([counter['count'] for counter in counters], [1])
+
+    def test_replay_without_indexes_keeps_one_counter(self):
+        """Replays never insert a second counter, even before ensure_indexes has run."""
+        message_id = ObjectId()
+
+        MongoChatService.count_unread_messages([(self.thread.id, self.user2.id, message_id)])
+        MongoChatService.count_unread_messages([(self.thread.id, self.user2.id, message_id)])
+
+        counters = self._counters(self.user2.id)
+        self.assertEqual([counter['count'] for counter in counters], [1])
+
+    def test_concurrent_counter_creation_keeps_every_increment(self):
+        """Writers racing to create the same counter all get their message counted."""
+        MongoChatService.ensure_indexes()
+        message_ids = [ObjectId() for _ in range(8)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(
+                lambda message_id: MongoChatService.count_unread_messages(
+                    [(self.thread.id, self.user2.id, message_id)]
+                ),
+                message_ids
+            ))
+
+        counters = self._counters(self.user2.id)
+        self.assertEqual([counter['count'] for counter in counters], [8])
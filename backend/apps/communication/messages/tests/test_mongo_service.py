@@ -1,7 +1,16 @@
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import SimpleTestCase, override_settings
-from unittest.mock import patch, MagicMock
-from datetime import datetime
-from apps.communication.messages.services.mongo_service import MongoChatService
+from unittest.mock import ANY, MagicMock, call, patch
+from datetime import datetime, timezone
+import asyncio
+from asgiref.sync import async_to_sync
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from apps.communication.messages.services.chat_writer import ChatMessageWriter
+from apps.communication.messages.services.mongo_service import MongoChatService, UNREAD_COUNTED_IDS_KEPT
 
 @override_settings(MONGO_DB_NAME='test_chat_unit_db')
 class TestMongoChatService(SimpleTestCase):
@@ -58,10 +67,9 @@ class TestMongoChatService(SimpleTestCase):
         
         # Mock Find Cursor
         mock_cursor = MagicMock()
-        # Chaining calls: find().sort().skip().limit()
+        # Chaining calls: find().sort().limit()
         mock_collection.find.return_value = mock_cursor
         mock_cursor.sort.return_value = mock_cursor
-        mock_cursor.skip.return_value = mock_cursor
         mock_cursor.limit.return_value = mock_cursor
         
         # Mock Data from Mongo
@@ -88,13 +96,125 @@ class TestMongoChatService(SimpleTestCase):
         messages = MongoChatService.get_messages(thread_id=1)
         
         # Verify Sort Call
-        # Should sort by created_at DESC
-        mock_cursor.sort.assert_called_with("created_at", -1) # pymongo.DESCENDING is -1
+        # Should sort by _id DESC (matches the thread_id + _id index)
+        mock_cursor.sort.assert_called_with("_id", -1) # pymongo.DESCENDING is -1
+        mock_cursor.skip.assert_not_called()
         
         # Verify Result Reversal (Ascending for UI)
         self.assertEqual(messages[0]['content'], 'Message 1') # Oldest first
         self.assertEqual(messages[1]['content'], 'Message 2') # Newest last
 
+    def _mock_history(self, mock_client):
+        mock_db = MagicMock()
+        mock_collection = MagicMock()
+        mock_client.return_value.__getitem__.return_value = mock_db
+        mock_db.__getitem__.return_value = mock_collection
+        mock_cursor = mock_collection.find.return_value
+        mock_cursor.sort.return_value = mock_cursor
+        mock_cursor.limit.return_value = mock_cursor
+        mock_cursor.__iter__.return_value = iter([])
+        MongoChatService._client = None
+        MongoChatService._db = None
+        return mock_collection, mock_cursor
+
+    @patch('apps.communication.messages.services.mongo_service.pymongo.MongoClient')
+    def test_get_messages_before_cursor(self, mock_client):
+        """Test paging back seeks on _id with a projection."""
+        mock_collection, mock_cursor = self._mock_history(mock_client)
+        cursor_id = ObjectId()
+
+        MongoChatService.get_messages(thread_id=1, limit=20, before=str(cursor_id))
+
+        query, projection = mock_collection.find.call_args[0]
+        self.assertEqual(query, {'thread_id': {'$in': [1, '1']}, '_id': {'$lt': cursor_id}})
+        self.assertNotIn('_id', projection)
+        self.assertIn('content', projection)
+        mock_cursor.sort.assert_called_with("_id", -1)
+        mock_cursor.limit.assert_called_with(20)
+
+    @patch('apps.communication.messages.services.mongo_service.pymongo.MongoClient')
+    def test_get_messages_after_timestamp(self, mock_client):
+        """Test a timestamp cursor becomes an ObjectId bound, read ascending."""
+        mock_collection, mock_cursor = self._mock_history(mock_client)
+
+        MongoChatService.get_messages(thread_id=1, after='2023-01-01T10:00:00Z')
+
+        query = mock_collection.find.call_args[0][0]
+        self.assertEqual(
+            query['_id'],
+            {'$gt': ObjectId.from_datetime(datetime(2023, 1, 1, 10, 0, tzinfo=timezone.utc))}
+        )
+        mock_cursor.sort.assert_called_with("_id", 1)
+
+    @patch('apps.communication.messages.services.mongo_service.pymongo.MongoClient')
+    def test_get_messages_invalid_cursor(self, mock_client):
+        """Test an unparseable cursor raises ValueError."""
+        mock_collection, _ = self._mock_history(mock_client)
+
+        with self.assertRaises(ValueError):
+            MongoChatService.get_messages(thread_id=1, before='not-a-cursor')
+        mock_collection.find.assert_not_called()
+
+    @patch('apps.communication.messages.services.mongo_service.pymongo.MongoClient')
+    def test_ensure_indexes(self, mock_client):
+        """Test history and unread counter indexes are created."""
+        mock_collection, _ = self._mock_history(mock_client)
+
+        MongoChatService.ensure_indexes()
+
+        indexes = [
+            index.document
+            for call in mock_collection.create_indexes.call_args_list
+            for index in call[0][0]
+        ]
+        self.assertIn([('thread_id', 1), ('_id', -1)], [list(index['key'].items()) for index in indexes])
+        self.assertTrue(any(index.get('unique') for index in indexes))
+
+    @patch('apps.communication.messages.management.commands.ensure_mongo_indexes.MongoChatService')
+    def test_ensure_mongo_indexes_command_fails_loudly(self, mock_mongo):
+        """Test a failed index build exits non-zero instead of reporting success."""
+        mock_mongo.migrate_thread_ids.return_value = {'messages': 0, 'counters': 0}
+        mock_mongo.ensure_indexes.side_effect = Exception('E11000 duplicate key error')
+
+        with self.assertRaises(CommandError):
+            call_command('ensure_mongo_indexes', stdout=StringIO())
+
+    @patch('apps.communication.messages.services.mongo_service.pymongo.MongoClient')
+    def test_migrate_thread_ids(self, mock_client):
+        """Test string thread ids become ints and string counters fold into int ones."""
+        mock_collection, _ = self._mock_history(mock_client)
+        mock_collection.update_many.return_value.modified_count = 3
+        legacy_ids = [ObjectId(), ObjectId()]
+        mock_collection.aggregate.return_value = iter([{
+            '_id': {'user_id': 7, 'thread_id': 5},
+            'ids': legacy_ids,
+            'count': 4,
+            'last_updated': datetime(2026, 1, 1),
+        }])
+
+        result = MongoChatService.migrate_thread_ids()
+
+        self.assertEqual(result, {'messages': 3, 'counters': 2})
+        mock_collection.update_many.assert_called_once_with(
+            {'thread_id': {'$type': 'string'}},
+            [{'$set': {'thread_id': {'$toInt': '$thread_id'}}}]
+        )
+        operations = mock_collection.bulk_write.call_args[0][0]
+        self.assertEqual(operations[0]._filter, {'user_id': 7, 'thread_id': 5})
+        self.assertEqual(operations[0]._doc['$inc'], {'count': 4})
+        self.assertTrue(operations[0]._upsert)
+        self.assertEqual(operations[1]._filter, {'_id': {'$in': legacy_ids}})
+
+    @patch('apps.communication.messages.services.mongo_service.pymongo.MongoClient')
+    def test_migrate_thread_ids_nothing_left(self, mock_client):
+        """Test a migrated store is left untouched."""
+        mock_collection, _ = self._mock_history(mock_client)
+        mock_collection.update_many.return_value.modified_count = 0
+        mock_collection.aggregate.return_value = iter([])
+
+        self.assertEqual(MongoChatService.migrate_thread_ids(), {'messages': 0, 'counters': 0})
+        mock_collection.bulk_write.assert_not_called()
+
     @patch('apps.communication.messages.services.mongo_service.pymongo.MongoClient')
     def test_delete_message_success(self, mock_client):
         """Test deleting a message successfully."""
@@ -149,54 +269,6 @@ class TestMongoChatService(SimpleTestCase):
 class TestUnreadCounters(SimpleTestCase):
     """Test cases for MongoDB Unread Counters feature."""
     
-    @patch('apps.communication.messages.services.mongo_service.pymongo.MongoClient')
-    def test_increment_unread_counters(self, mock_client):
-        """Test that increment_unread_counters calls bulk_write correctly."""
-        # Setup Mock
-        mock_db = MagicMock()
-        mock_counters_col = MagicMock()
-        mock_client.return_value.__getitem__.return_value = mock_db
-        mock_db.__getitem__.return_value = mock_counters_col
-        
-        # Reset singleton
-        MongoChatService._client = None
-        MongoChatService._db = None
-        
-        # Execute
-        MongoChatService.increment_unread_counters(
-            thread_id=10,
-            recipient_ids=[1, 2, 3]
-        )
-        
-        # Verify bulk_write was called
-        mock_counters_col.bulk_write.assert_called_once()
-        
-        # Verify operations structure
-        call_args = mock_counters_col.bulk_write.call_args[0][0]
-        self.assertEqual(len(call_args), 3)  # 3 recipients = 3 operations
-
-    @patch('apps.communication.messages.services.mongo_service.pymongo.MongoClient')
-    def test_increment_unread_counters_empty_list(self, mock_client):
-        """Test that increment_unread_counters does nothing for empty list."""
-        # Setup Mock
-        mock_db = MagicMock()
-        mock_counters_col = MagicMock()
-        mock_client.return_value.__getitem__.return_value = mock_db
-        mock_db.__getitem__.return_value = mock_counters_col
-        
-        # Reset singleton
-        MongoChatService._client = None
-        MongoChatService._db = None
-        
-        # Execute with empty list
-        MongoChatService.increment_unread_counters(
-            thread_id=10,
-            recipient_ids=[]
-        )
-        
-        # bulk_write should NOT be called
-        mock_counters_col.bulk_write.assert_not_called()
-
     @patch('apps.communication.messages.services.mongo_service.pymongo.MongoClient')
     def test_mark_read_resets_count(self, mock_client):
         """Test that mark_read resets count to 0."""
@@ -275,3 +347,165 @@ class TestUnreadCounters(SimpleTestCase):
         
         # Verify returns 0
         self.assertEqual(result, 0)
+
+
+    @patch('apps.communication.messages.services.mongo_service.pymongo.MongoClient')
+    def test_get_unread_summary(self, mock_client):
+        """Test per-thread and total counts come from one aggregation."""
+        mock_db = MagicMock()
+        mock_counters_col = MagicMock()
+        mock_client.return_value.__getitem__.return_value = mock_db
+        mock_db.__getitem__.return_value = mock_counters_col
+        mock_counters_col.aggregate.return_value = [
+            {'_id': None, 'total': 7, 'threads': [{'thread_id': 10, 'count': 5}, {'thread_id': 11, 'count': 2}]}
+        ]
+        MongoChatService._client = None
+        MongoChatService._db = None
+
+        summary = MongoChatService.get_unread_summary(user_id=5)
+
+        self.assertEqual(summary, {'total': 7, 'threads': {10: 5, 11: 2}})
+        mock_counters_col.aggregate.assert_called_once()
+
+@override_settings(MONGO_DB_NAME='test_chat_unit_db')
+class TestBatchedPersistence(SimpleTestCase):
+    """Test cases for batched, idempotent message persistence."""
+
+    def _message(self, thread_id, recipient_ids):
+        return {
+            'thread_id': thread_id,
+            'sender_id': 1,
+            'sender_name': 'Sender',
+            'sender_avatar': None,
+            'content': 'Hi',
+            'message_id': str(ObjectId()),
+            'created_at': '2023-01-01T10:00:00+00:00',
+            'recipient_ids': recipient_ids,
+        }
+
+    def _mock_collection(self, mock_client):
+        mock_db = MagicMock()
+        mock_collection = MagicMock()
+        mock_client.return_value.__getitem__.return_value = mock_db
+        mock_db.__getitem__.return_value = mock_collection
+        MongoChatService._client = None
+        MongoChatService._db = None
+        return mock_collection
+
+    @staticmethod
+    def _created(thread_id, user_id):
+        return UpdateOne(
+            {"user_id": user_id, "thread_id": thread_id},
+            {"$setOnInsert": {"count": 0, "counted_ids": [], "last_updated": ANY}},
+            upsert=True
+        )
+
+    @staticmethod
+    def _counted(thread_id, user_id, message_id):
+        return UpdateOne(
+            {"user_id": user_id, "thread_id": thread_id, "counted_ids": {"$ne": message_id}},
+            {
+                "$inc": {"count": 1},
+                "$set": {"last_updated": ANY},
+                "$push": {"counted_ids": {"$each": [message_id], "$slice": -UNREAD_COUNTED_IDS_KEPT}},
+            }
+        )
+
+    @patch('apps.communication.messages.services.mongo_service.pymongo.MongoClient')
+    def test_save_messages_batches_writes(self, mock_client):
+        """Test one insert_many, one counter creation and one increment bulk_write per batch."""
+        mock_collection = self._mock_collection(mock_client)
+
+        messages = [self._message(10, [2, 3]), self._message(10, [2]), self._message(11, [2])]
+        failed = MongoChatService.save_messages(messages)
+
+        self.assertEqual(failed, [])
+        docs = mock_collection.insert_many.call_args[0][0]
+        ids = [ObjectId(m['message_id']) for m in messages]
+        self.assertEqual([doc['_id'] for doc in docs], ids)
+        self.assertEqual(mock_collection.insert_many.call_args[1], {'ordered': False})
+        self.assertEqual(mock_collection.bulk_write.call_args_list, [
+            call([self._created(10, 2), self._created(10, 3), self._created(11, 2)], ordered=False),
+            call([
+                self._counted(10, 2, ids[0]), self._counted(10, 3, ids[0]),
+                self._counted(10, 2, ids[1]), self._counted(11, 2, ids[2]),
+            ], ordered=False),
+        ])
+
+    @patch('apps.communication.messages.services.mongo_service.pymongo.MongoClient')
+    def test_save_messages_recounts_duplicates_idempotently(self, mock_client):
+        """Test stored messages are not inserted again but still reach their counters."""
+        mock_collection = self._mock_collection(mock_client)
+        mock_collection.insert_many.side_effect = BulkWriteError({
+            'writeErrors': [{'index': 0, 'code': 11000}, {'index': 2, 'code': 121}],
+        })
+
+        messages = [self._message(10, [2]), self._message(10, [3]), self._message(10, [4])]
+        failed = MongoChatService.save_messages(messages)
+
+        self.assertEqual(failed, [messages[2]])
+        # The duplicate may come from a batch whose counter write failed:
+        # it is sent again, guarded by counted_ids
+        ids = [ObjectId(m['message_id']) for m in messages]
+        self.assertEqual(
+            mock_collection.bulk_write.call_args_list[-1],
+            call([self._counted(10, 2, ids[0]), self._counted(10, 3, ids[1])], ordered=False)
+        )
+
+    @patch('apps.communication.messages.services.mongo_service.pymongo.MongoClient')
+    def test_counter_creation_race_is_retried(self, mock_client):
+        """Test a creation upsert that lost a race is retried once, other errors raise."""
+        mock_collection = self._mock_collection(mock_client)
+        mock_collection.bulk_write.side_effect = [
+            BulkWriteError({'writeErrors': [{'index': 1, 'code': 11000}]}),
+            None,
+            None,
+        ]
+        message = self._message(10, [2, 3])
+
+        MongoChatService.save_messages([message])
+
+        self.assertEqual(
+            mock_collection.bulk_write.call_args_list[1],
+            call([self._created(10, 3)], ordered=False)
+        )
+        self.assertEqual(len(mock_collection.bulk_write.call_args_list[2][0][0]), 2)
+
+        mock_collection.bulk_write.side_effect = BulkWriteError({
+            'writeErrors': [{'index': 0, 'code': 121}],
+        })
+        with self.assertRaises(BulkWriteError):
+            MongoChatService.save_messages([self._message(10, [2])])
+
+
+class TestChatMessageWriter(SimpleTestCase):
+    """Test cases for the per-process batched chat writer."""
+
+    def _run(self, writer, messages):
+        async def run():
+            for message in messages:
+                await writer.submit(message)
+            await asyncio.sleep(0.05)
+
+        async_to_sync(run)()
+
+    @patch('apps.communication.messages.services.chat_writer.MongoChatService.save_messages', return_value=[])
+    def test_messages_within_delay_share_a_batch(self, mock_save):
+        self._run(ChatMessageWriter(delay=0.01, batch_size=100), [{'n': 1}, {'n': 2}])
+
+        mock_save.assert_called_once_with([{'n': 1}, {'n': 2}])
+
+    @patch('apps.communication.messages.services.chat_writer.MongoChatService.save_messages', return_value=[])
+    def test_full_batch_is_written_without_waiting(self, mock_save):
+        self._run(ChatMessageWriter(delay=10, batch_size=2), [{'n': 1}, {'n': 2}])
+
+        mock_save.assert_called_once_with([{'n': 1}, {'n': 2}])
+
+    @patch('apps.communication.messages.tasks.persist_chat_messages_task.delay')
+    @patch('apps.communication.messages.services.chat_writer.MongoChatService.save_messages')
+    def test_failed_batch_is_retried_by_celery(self, mock_save, mock_delay):
+        mock_save.side_effect = RuntimeError('mongo down')
+
+        self._run(ChatMessageWriter(delay=0.01, batch_size=100), [{'n': 1}])
+
+        mock_delay.assert_called_once_with([{'n': 1}])
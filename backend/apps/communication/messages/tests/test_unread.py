@@ -0,0 +1,136 @@
+# Unread Counters Tests
+
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+from unittest.mock import patch
+from bson import ObjectId
+from django.core.cache import cache
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.communication.message_threads.models import MessageThread
+from apps.communication.message_participants.models import MessageParticipant
+from apps.communication.messages.services.messages import (
+    add_participant,
+    remove_participant,
+    send_message,
+    MessageCreateInput,
+)
+from apps.communication.messages.services.participants import get_recipient_ids
+
+User = get_user_model()
+
+
+class UnreadCountTests(APITestCase):
+    """Unread counter: người nhận từ cache participant + đọc số chưa đọc một lần"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='unread@example.com',
+            password='testpass123',
+            full_name='Unread User'
+        )
+        cls.other_user = User.objects.create_user(
+            email='unread-other@example.com',
+            password='testpass123',
+            full_name='Other User'
+        )
+        cls.third_user = User.objects.create_user(
+            email='unread-third@example.com',
+            password='testpass123',
+            full_name='Third User'
+        )
+        cls.thread = MessageThread.objects.create(subject='Unread Thread')
+        MessageParticipant.objects.create(thread=cls.thread, user=cls.user)
+        MessageParticipant.objects.create(thread=cls.thread, user=cls.other_user)
+        cls.quiet_thread = MessageThread.objects.create(subject='Quiet Thread')
+        MessageParticipant.objects.create(thread=cls.quiet_thread, user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+
+    @patch('apps.communication.messages.services.messages.MongoChatService')
+    def test_participant_changes_refresh_recipients(self, mock_mongo):
+        self.assertEqual(get_recipient_ids(self.thread.id, self.user.id), [self.other_user.id])
+
+        add_participant(self.thread.id, self.third_user.id, self.user.id)
+        self.assertEqual(
+            get_recipient_ids(self.thread.id, self.user.id),
+            sorted([self.other_user.id, self.third_user.id])
+        )
+
+        remove_participant(self.thread.id, self.other_user.id, self.user.id)
+        self.assertEqual(get_recipient_ids(self.thread.id, self.user.id), [self.third_user.id])
+
+    @patch('apps.communication.messages.services.messages.MongoChatService')
+    def test_send_message_increments_other_participants(self, mock_mongo):
+        message_id = ObjectId()
+        mock_mongo.save_message.return_value = {
+            'id': str(message_id), 'content': 'Hello', 'created_at': '2023-01-01'
+        }
+
+        send_message(self.thread.id, self.user, MessageCreateInput(content='Hello'))
+
+        mock_mongo.count_unread_messages.assert_called_once_with([(self.thread.id, self.other_user.id, message_id)])
+
+    @patch('apps.communication.messages.selectors.messages.MongoChatService')
+    def test_thread_list_uses_one_summary(self, mock_mongo):
+        mock_mongo.get_unread_summary.return_value = {'total': 4, 'threads': {self.thread.id: 4}}
+
+        response = self.client.get('/api/messages/threads/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_mongo.get_unread_summary.assert_called_once_with(self.user.id)
+        counts = {thread['id']: thread['unread_count'] for thread in response.data}
+        self.assertEqual(counts, {self.thread.id: 4, self.quiet_thread.id: 0})
+
+    @patch('apps.communication.messages.selectors.messages.MongoChatService')
+    def test_unread_count_endpoint(self, mock_mongo):
+        mock_mongo.get_unread_summary.return_value = {'total': 4, 'threads': {self.thread.id: 4}}
+
+        response = self.client.get('/api/messages/threads/unread-count/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'total': 4, 'threads': {str(self.thread.id): 4}})
+
+    @patch('apps.communication.messages.selectors.messages.MongoChatService')
+    def test_mongo_outage_shows_zero(self, mock_mongo):
+        mock_mongo.get_unread_summary.side_effect = ConnectionError('mongo down')
+
+        response = self.client.get('/api/messages/threads/unread-count/')
+
+        self.assertEqual(response.data, {'total': 0, 'threads': {}})
+
+    @patch('apps.communication.messages.management.commands.sync_unread_counters.MongoChatService')
+    def test_sync_counts_on_the_server(self, mock_mongo):
+        read_at = datetime(2023, 1, 1, 10, tzinfo=dt_timezone.utc)
+        MessageParticipant.objects.filter(thread=self.thread, user=self.user).update(last_read_at=read_at)
+        mock_mongo.migrate_thread_ids.return_value = {'messages': 0, 'counters': 0}
+        db = mock_mongo._get_db.return_value
+        db.aggregate.return_value = [
+            {'thread_id': self.thread.id, 'user_id': self.user.id, 'count': 3},
+            {'thread_id': self.thread.id, 'user_id': self.other_user.id, 'count': 0},
+        ]
+
+        call_command('sync_unread_counters', stdout=StringIO())
+
+        # Legacy string thread ids are converted before the int $lookup runs
+        mock_mongo.migrate_thread_ids.assert_called_once_with()
+        pipeline = db.aggregate.call_args[0][0]
+        participants = {(p['thread_id'], p['user_id']): p['last_read_at'] for p in pipeline[0]['$documents']}
+        self.assertEqual(participants[(self.thread.id, self.user.id)], datetime(2023, 1, 1, 10))
+        self.assertIsNone(participants[(self.quiet_thread.id, self.user.id)])
+        # Only totals leave the server: nothing collects message timestamps
+        self.assertNotIn('$push', str(pipeline))
+        lookup = pipeline[1]['$lookup']['pipeline']
+        self.assertEqual(lookup[-1], {'$group': {'_id': None, 'count': {'$sum': 1}}})
+
+        operations = db.__getitem__.return_value.bulk_write.call_args[0][0]
+        self.assertEqual(
+            {(op._filter['user_id'], op._doc['$set']['count']) for op in operations},
+            {(self.user.id, 3), (self.other_user.id, 0)}
+        )
@@ -178,6 +178,43 @@ class MessageViewTests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    @patch('apps.communication.messages.selectors.messages.MongoChatService')
+    def test_list_messages_cursor_links(self, mock_mongo):
+        """Test message history pages with before/after cursors."""
+        mock_mongo.get_messages.return_value = [
+            {
+                'id': str(i),
+                'content': f'Message {i}',
+                'sender_id': self.user.id,
+                'sender_name': 'Test User',
+                'created_at': '2023-01-01',
+                'updated_at': '2023-01-01',
+                'is_system_message': False,
+                'thread_id': self.message_thread.id
+            }
+            for i in range(3)
+        ]
+        url = f'/api/messages/threads/{self.message_thread.id}/messages/'
+        response = self.client.get(url, {'limit': 2, 'before': 'abc'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_mongo.get_messages.assert_called_with(
+            thread_id=self.message_thread.id, limit=3, before='abc', after=None
+        )
+        # The extra (oldest) message only signals that another page exists
+        self.assertEqual([m['id'] for m in response.data['results']], ['1', '2'])
+        self.assertIn('before=1', response.data['previous'])
+        self.assertIn('after=2', response.data['next'])
+        self.assertNotIn('before=', response.data['next'])
+
+    @patch('apps.communication.messages.selectors.messages.MongoChatService')
+    def test_list_messages_invalid_cursor(self, mock_mongo):
+        """Test an invalid cursor is a bad request."""
+        mock_mongo.get_messages.side_effect = ValueError("Invalid cursor 'x'")
+        url = f'/api/messages/threads/{self.message_thread.id}/messages/'
+        response = self.client.get(url, {'before': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     @patch('apps.communication.messages.services.messages.MongoChatService')
     def test_send_message_success(self, mock_mongo):
         """Test sending a message to thread."""
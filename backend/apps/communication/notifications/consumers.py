@@ -0,0 +1,67 @@
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
+
+from apps.communication.notifications.selectors.notifications import list_notifications_after
+from apps.communication.notifications.services.realtime import notification_event, notification_group
+
+
+class NotificationConsumer(AsyncJsonWebsocketConsumer):
+    """
+    WebSocket Consumer cho thông báo real-time.
+    
+    Kết nối: ws://domain/ws/notifications/?last_event_id=<id>
+    """
+    
+    async def connect(self):
+        """Xử lý khi client kết nối WebSocket."""
+        self.user = self.scope.get('user')
+        
+        # Kiểm tra user đã authenticated
+        if not self.user or not self.user.is_authenticated:
+            await self.close(code=4001)
+            return
+        
+        self.group_name = notification_group(self.user.id)
+        self.last_event_id = None
+        
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        
+        # Gửi lại các thông báo client đã bỏ lỡ
+        query = parse_qs(self.scope.get('query_string', b'').decode())
+        try:
+            last_event_id = int(query.get('last_event_id', [None])[0])
+        except (TypeError, ValueError):
+            return
+        
+        self.last_event_id = last_event_id
+        for event in await self.get_missed_events(last_event_id):
+            await self.send_json({'type': 'notification', 'notification': event})
+            self.last_event_id = event['id']
+    
+    async def disconnect(self, close_code):
+        """Xử lý khi client ngắt kết nối."""
+        if hasattr(self, 'group_name'):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+    
+    async def notification_created(self, event):
+        """Nhận thông báo mới từ group và gửi cho client."""
+        notification = event['notification']
+        if self.last_event_id is not None and notification['id'] <= self.last_event_id:
+            return
+        await self.send_json({'type': 'notification', 'notification': notification})
+    
+    @database_sync_to_async
+    def get_missed_events(self, last_event_id):
+        """Thông báo tạo sau last_event_id."""
+        return [
+            notification_event(notification)
+            for notification in list_notifications_after(
+                self.user.id,
+                last_event_id,
+                getattr(settings, 'NOTIFICATION_STREAM_REPLAY_LIMIT', 100)
+            )
+        ]
@@ -64,6 +64,8 @@ class Notification(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', 'is_read', 'created_at'], name='idx_notif_user_read'),
+            # Keyset pagination: (-created_at, -id) của một user
+            models.Index(fields=['user', '-created_at', '-id'], name='idx_notif_user_keyset'),
         ]
     
     def __str__(self):
@@ -48,6 +48,26 @@ def list_unread_notifications(user_id: int) -> QuerySet:
     return list_notifications(user_id, is_read=False)
 
 
+def list_notifications_after(user_id: int, last_id: int, limit: int = 100) -> QuerySet:
+    """
+    Get notifications created after a given one (oldest first).
+    
+    Used to replay what a real-time client missed (Last-Event-ID).
+    
+    Args:
+        user_id: ID of the user
+        last_id: ID of the last notification the client received
+        limit: Maximum number of notifications to return
+    
+    Returns:
+        QuerySet of notifications ordered by id asc
+    """
+    return Notification.objects.filter(
+        user_id=user_id,
+        id__gt=last_id
+    ).select_related('notification_type').order_by('id')[:limit]
+
+
 def get_notification_by_id(notification_id: int) -> Optional[Notification]:
     """
     Get a notification by its ID.
@@ -0,0 +1,68 @@
+from typing import Iterable, List, Tuple
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+from apps.communication.notifications.models import Notification
+
+
+logger = logging.getLogger(__name__)
+
+
+# Channel layer message type, handled by NotificationConsumer.notification_created
+NOTIFICATION_CREATED = 'notification.created'
+
+
+def notification_group(user_id: int) -> str:
+    """Channel layer group of one user's real-time subscribers."""
+    return f"notifications_{user_id}"
+
+
+def notification_event(notification: Notification) -> dict:
+    """Payload pushed to subscribers (SSE data / WebSocket message)."""
+    return {
+        'id': notification.id,
+        'title': notification.title,
+        'content': notification.content,
+        'link': notification.link or '',
+        'entity_type': notification.entity_type or '',
+        'entity_id': notification.entity_id,
+        'notification_type': notification.notification_type.type_name,
+        'created_at': notification.created_at.isoformat() if notification.created_at else None,
+    }
+
+
+async def _group_send_all(channel_layer, events: List[Tuple[int, dict]]) -> None:
+    for user_id, event in events:
+        try:
+            await channel_layer.group_send(
+                notification_group(user_id),
+                {'type': NOTIFICATION_CREATED, 'notification': event}
+            )
+        except Exception as e:
+            logger.warning(f"Notification {event['id']} push failed ({e})")
+
+
+def publish_notifications(notifications: Iterable[Notification]) -> None:
+    """
+    Push newly created notifications to their users' groups once the
+    current transaction commits. Delivery is best effort: clients that
+    were offline catch up from the database with Last-Event-ID.
+    """
+    events = [
+        (notification.user_id, notification_event(notification))
+        for notification in notifications
+        if notification.pk is not None
+    ]
+    if not events:
+        return
+
+    def send():
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        async_to_sync(_group_send_all)(channel_layer, events)
+
+    transaction.on_commit(send)
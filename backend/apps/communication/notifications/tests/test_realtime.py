@@ -0,0 +1,124 @@
+# Real-time Notifications Tests
+
+import json
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.communication.notifications.models import Notification
+from apps.communication.notification_types.models import NotificationType
+from apps.communication.notifications.services.notifications import (
+    create_notification,
+    send_bulk_notifications,
+    NotificationCreateInput,
+)
+from apps.communication.notifications.services.realtime import NOTIFICATION_CREATED, notification_group
+from apps.communication.notifications.views import notification_stream
+
+User = get_user_model()
+
+
+@override_settings(
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS=1,
+)
+class NotificationRealtimeTests(TestCase):
+    """Push thông báo qua channel layer + SSE stream (resume bằng Last-Event-ID)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='realtime@example.com',
+            password='testpass123',
+            full_name='Realtime User'
+        )
+        cls.notification_type = NotificationType.objects.create(
+            type_name='system',
+            template='System notification',
+            is_active=True
+        )
+
+    def _subscribe(self):
+        channel_layer = get_channel_layer()
+        channel_name = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(notification_group(self.user.id), channel_name)
+        return channel_layer, channel_name
+
+    def _notification(self, title):
+        return Notification.objects.create(
+            user=self.user,
+            notification_type=self.notification_type,
+            title=title,
+            content=title
+        )
+
+    def test_create_publishes_after_commit(self):
+        channel_layer, channel_name = self._subscribe()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            notification = create_notification(
+                self.user,
+                NotificationCreateInput(notification_type_id=self.notification_type.id, title='Hi', content='Hello')
+            )
+
+        # The callbacks list is filled when the block exits
+        self.assertEqual(len(callbacks), 1)
+        message = async_to_sync(channel_layer.receive)(channel_name)
+        self.assertEqual(message['type'], NOTIFICATION_CREATED)
+        self.assertEqual(message['notification']['id'], notification.id)
+        self.assertEqual(message['notification']['notification_type'], 'system')
+
+    def test_bulk_send_publishes_each_notification(self):
+        channel_layer, channel_name = self._subscribe()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            created = send_bulk_notifications([self.user.id], 'system', 'Bulk', 'Bulk content')
+
+        message = async_to_sync(channel_layer.receive)(channel_name)
+        self.assertEqual(message['notification']['id'], created[0].id)
+
+    def test_stream_requires_authentication(self):
+        request = RequestFactory().get('/api/notifications/stream/')
+
+        response = async_to_sync(notification_stream)(request)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_stream_replays_missed_then_pushes_live(self):
+        seen = self._notification('Seen')
+        missed = self._notification('Missed')
+        request = RequestFactory().get(
+            '/api/notifications/stream/',
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}',
+            HTTP_LAST_EVENT_ID=str(seen.id),
+        )
+        live = self._notification('Live')
+
+        async def read_stream():
+            response = await notification_stream(request)
+            body = response.streaming_content
+            chunks = [(await body.__anext__()).decode() for _ in range(3)]
+            await get_channel_layer().group_send(
+                notification_group(self.user.id),
+                {'type': NOTIFICATION_CREATED, 'notification': {'id': missed.id}}
+            )
+            await get_channel_layer().group_send(
+                notification_group(self.user.id),
+                {'type': NOTIFICATION_CREATED, 'notification': {'id': live.id + 1, 'title': 'Pushed'}}
+            )
+            chunks.append((await body.__anext__()).decode())
+            await body.aclose()
+            return response, chunks
+
+        response, chunks = async_to_sync(read_stream)()
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(chunks[0], 'retry: 3000\n\n')
+        self.assertTrue(chunks[1].startswith(f'id: {missed.id}\n'))
+        self.assertTrue(chunks[2].startswith(f'id: {live.id}\n'))
+        # The already replayed notification pushed again is skipped
+        self.assertTrue(chunks[3].startswith(f'id: {live.id + 1}\n'))
+        self.assertEqual(json.loads(chunks[3].split('data: ', 1)[1])['title'], 'Pushed')
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import NotificationViewSet
+from .views import NotificationViewSet, notification_stream
 
 router = DefaultRouter()
 router.register(r'', NotificationViewSet, basename='notification')
@@ -8,5 +8,7 @@ router.register(r'', NotificationViewSet, basename='notification')
 app_name = 'notifications'
 
 urlpatterns = [
+    # Async SSE view, outside the DRF router
+    path('stream/', notification_stream, name='notification-stream'),
     path('', include(router.urls)),
 ]
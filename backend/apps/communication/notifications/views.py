@@ -2,12 +2,21 @@ from rest_framework import viewsets, status, mixins
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.http import StreamingHttpResponse
-from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from asgiref.sync import sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from typing import Optional
 from .services.notifications import bulk_mark_as_read
+import asyncio
 import json
 import time
 
+from apps.core.pagination import KeysetPagination
+
 from .models import Notification
 from .serializers import (
     NotificationSerializer,
@@ -19,6 +28,7 @@ from .selectors.notifications import (
     list_unread_notifications,
     get_notification_by_id,
     count_unread_notifications,
+    list_notifications_after,
 )
 from .services.notifications import (
     mark_as_read,
@@ -26,6 +36,7 @@ from .services.notifications import (
     delete_notification,
     clear_all_notifications,
 )
+from .services.realtime import notification_event, notification_group
 
 
 class NotificationViewSet(
@@ -46,11 +57,13 @@ class NotificationViewSet(
     - DELETE /api/notifications/:id/       - Delete notification
     - DELETE /api/notifications/clear-all/ - Delete all notifications
     - GET    /api/notifications/settings/  - Get notification settings
-    - GET    /api/notifications/stream/    - SSE stream for real-time
+    - GET    /api/notifications/stream/    - SSE stream for real-time (notification_stream)
     """
     
     permission_classes = [IsAuthenticated]
     serializer_class = NotificationSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created_at', '-id')
     
     def get_queryset(self):
         """Get queryset filtered by current user."""
@@ -85,14 +98,10 @@ class NotificationViewSet(
             notification_type_id=type_filter
         )
         
-        # Pagination
+        # Keyset pagination
         page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = NotificationSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = NotificationSerializer(queryset, many=True)
-        return Response(serializer.data)
+        serializer = NotificationSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
     
     @action(detail=False, methods=['get'], url_path='unread')
     def unread(self, request):
@@ -104,15 +113,8 @@ class NotificationViewSet(
         queryset = list_unread_notifications(request.user.id)
         
         page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = NotificationSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = NotificationSerializer(queryset, many=True)
-        return Response({
-            'count': queryset.count(),
-            'results': serializer.data
-        })
+        serializer = NotificationSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
     
     def retrieve(self, request, pk=None):
         """
@@ -263,47 +265,121 @@ class NotificationViewSet(
         return Response({
             'unread_count': unread_count
         })
+
+
+def _parse_event_id(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _authenticate_stream(request):
+    """
+    JWT user of an SSE request: Authorization header, or ?token= since
+    EventSource cannot send headers. None when missing or invalid.
+    """
+    authentication = JWTAuthentication()
+    try:
+        result = authentication.authenticate(request)
+        if result is None:
+            raw_token = request.GET.get('token')
+            if not raw_token:
+                return None
+            return authentication.get_user(authentication.get_validated_token(raw_token))
+        return result[0]
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+def _sse_event(event: dict) -> str:
+    return f"id: {event['id']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def _notification_events(user_id: int, last_event_id: Optional[int]):
+    """
+    Async SSE body: replays what the client missed, then awaits the
+    user's channel layer group. No database polling; an idle client only
+    costs a coroutine and a heartbeat comment.
+    """
+    heartbeat = getattr(settings, 'NOTIFICATION_STREAM_HEARTBEAT_SECONDS', 25)
+    channel_layer = get_channel_layer()
+    group = notification_group(user_id)
+    channel_name = await channel_layer.new_channel()
+    # Subscribe before the replay so nothing created in between is lost
+    await channel_layer.group_add(group, channel_name)
+    joined_at = time.monotonic()
     
-    @action(detail=False, methods=['get'], url_path='stream')
-    def stream(self, request):
-        """
-        GET /api/notifications/stream/
+    try:
+        yield "retry: 3000\n\n"
         
-        SSE (Server-Sent Events) stream for real-time notifications.
-        Client should connect to this endpoint and listen for events.
-        """
-        def event_stream():
-            """Generator function for SSE."""
-            last_check = None
-            
-            while True:
-                # Get new notifications
-                queryset = list_unread_notifications(request.user.id)
-                
-                if last_check:
-                    queryset = queryset.filter(created_at__gt=last_check)
-                
-                if queryset.exists():
-                    for notification in queryset:
-                        data = {
-                            'id': notification.id,
-                            'title': notification.title,
-                            'content': notification.content,
-                            'notification_type': notification.notification_type.type_name,
-                            'created_at': notification.created_at.isoformat(),
-                        }
-                        yield f"data: {json.dumps(data)}\n\n"
-                
-                last_check = timezone.now()
-                
-                # Send heartbeat every 30 seconds
-                yield f": heartbeat\n\n"
-                time.sleep(5)  # Check every 5 seconds
+        if last_event_id is not None:
+            missed = await sync_to_async(
+                lambda: [
+                    notification_event(notification)
+                    for notification in list_notifications_after(
+                        user_id,
+                        last_event_id,
+                        getattr(settings, 'NOTIFICATION_STREAM_REPLAY_LIMIT', 100)
+                    )
+                ]
+            )()
+            for event in missed:
+                yield _sse_event(event)
+                last_event_id = event['id']
         
-        response = StreamingHttpResponse(
-            event_stream(),
-            content_type='text/event-stream'
+        while True:
+            try:
+                message = await asyncio.wait_for(channel_layer.receive(channel_name), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                # Group membership expires in the channel layer; renew it hourly
+                if time.monotonic() - joined_at > 3600:
+                    await channel_layer.group_add(group, channel_name)
+                    joined_at = time.monotonic()
+                continue
+            
+            event = message.get('notification')
+            if not event or (last_event_id is not None and event['id'] <= last_event_id):
+                continue
+            yield _sse_event(event)
+    finally:
+        await channel_layer.group_discard(group, channel_name)
+
+
+async def notification_stream(request):
+    """
+    GET /api/notifications/stream/
+    
+    SSE (Server-Sent Events) stream for real-time notifications.
+    Events are pushed when notifications are created; each carries the
+    notification id, so a reconnecting EventSource resumes with
+    Last-Event-ID (or ?last_event_id=).
+    """
+    if request.method != 'GET':
+        return JsonResponse({'detail': 'Method not allowed'}, status=405)
+    
+    user = await sync_to_async(_authenticate_stream)(request)
+    if user is None:
+        return JsonResponse(
+            {'detail': 'Authentication credentials were not provided.'},
+            status=status.HTTP_401_UNAUTHORIZED
         )
-        response['Cache-Control'] = 'no-cache'
-        response['X-Accel-Buffering'] = 'no'
-        return response
+    
+    if get_channel_layer() is None:
+        return JsonResponse(
+            {'detail': 'Real-time notifications are not available'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    
+    last_event_id = _parse_event_id(
+        request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    )
+    
+    response = StreamingHttpResponse(
+        _notification_events(user.id, last_event_id),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company_companies', '0002_allow_null_user'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['-created_at', '-id'], name='idx_companies_keyset'),
+        ),
+    ]
@@ -137,6 +137,10 @@ class Company(models.Model):
         app_label = 'company_companies'
         verbose_name = 'Công ty'
         verbose_name_plural = 'Công ty'
+        indexes = [
+            # Keyset pagination: (-created_at, -id)
+            models.Index(fields=['-created_at', '-id'], name='idx_companies_keyset'),
+        ]
     
     def __str__(self):
         return self.company_name
\ No newline at end of file
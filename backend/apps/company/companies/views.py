@@ -7,6 +7,7 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from django.db.models import Avg, Count
 from django.utils import timezone
 from django.conf import settings
+from apps.core.pagination import KeysetPagination
 from apps.email.services import EmailService
 from apps.company.companies.services.suggestions import CompanySuggestionService
 
@@ -36,6 +37,8 @@ class CompanyViewSet(viewsets.GenericViewSet):
     ViewSet cho quản lý Company.
     """
     serializer_class = CompanySerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created_at', '-id')
     
     def get_queryset(self):
         """
@@ -57,12 +60,8 @@ class CompanyViewSet(viewsets.GenericViewSet):
         """
         queryset = self.get_queryset()
         page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
     
     def create(self, request):
         """
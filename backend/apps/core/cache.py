@@ -0,0 +1,176 @@
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from django.core.cache import caches
+
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    LRU cache trong bộ nhớ của process, có TTL cho từng entry.
+
+    Thread safe; the least recently used entry is evicted once
+    max_entries is reached.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 5.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TwoTierCache:
+    """
+    Cache hai tầng: LRU trong process (L1) trước Django cache (L2, Redis).
+
+    Keys are built from an endpoint name and its parameters. L2 keys also
+    carry the namespace version, so invalidate() drops every entry of the
+    namespace at once by bumping the version; the local L1 is cleared
+    immediately and other processes' L1 entries expire after l1_ttl
+    seconds. L2 errors (Redis down) are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        l1_ttl: float = 5.0,
+        l2_ttl: int = 300,
+        max_entries: int = 1000,
+        alias: str = 'default',
+    ):
+        self.namespace = namespace
+        self.l2_ttl = l2_ttl
+        self.alias = alias
+        self.l1 = LRUCache(max_entries=max_entries, ttl=l1_ttl)
+        self._counters = {'l1_hits': 0, 'l2_hits': 0, 'misses': 0, 'invalidations': 0}
+        self._counters_lock = threading.Lock()
+
+    @property
+    def l2(self):
+        return caches[self.alias]
+
+    @property
+    def version_key(self) -> str:
+        return f"{self.namespace}:version"
+
+    def make_key(self, endpoint: str, params: Optional[dict] = None) -> str:
+        """Stable key for an endpoint and its parameters."""
+        if not params:
+            return endpoint
+        encoded = json.dumps(params, sort_keys=True, default=str)
+        return f"{endpoint}:{hashlib.md5(encoded.encode()).hexdigest()}"
+
+    def _count(self, counter: str) -> None:
+        with self._counters_lock:
+            self._counters[counter] += 1
+
+    def _version(self):
+        version = self.l2.get(self.version_key)
+        if version is None:
+            version = time.time_ns()
+            if not self.l2.add(self.version_key, version, timeout=None):
+                version = self.l2.get(self.version_key, version)
+        return version
+
+    def get_or_set(self, endpoint: str, params: Optional[dict], compute: Callable[[], Any]) -> Any:
+        """
+        Cached value of endpoint(params), computed on a miss.
+
+        A compute() result of None (e.g. not found) is returned but not
+        cached.
+        """
+        key = self.make_key(endpoint, params)
+
+        found, value = self.l1.get(key)
+        if found:
+            self._count('l1_hits')
+            return value
+
+        l2_key = None
+        try:
+            l2_key = f"{self.namespace}:{self._version()}:{key}"
+            value = self.l2.get(l2_key)
+        except Exception as e:
+            logger.warning(f"Cache {self.namespace}: L2 read failed ({e})")
+            value = None
+        if value is not None:
+            self._count('l2_hits')
+            self.l1.set(key, value)
+            return value
+
+        self._count('misses')
+        value = compute()
+        if value is None:
+            return None
+
+        self.l1.set(key, value)
+        if l2_key is not None:
+            try:
+                self.l2.set(l2_key, value, timeout=self.l2_ttl)
+            except Exception as e:
+                logger.warning(f"Cache {self.namespace}: L2 write failed ({e})")
+        return value
+
+    def invalidate(self) -> None:
+        """Drop every entry of the namespace (all processes, L1 within l1_ttl)."""
+        self._count('invalidations')
+        self.l1.clear()
+        try:
+            self.l2.set(self.version_key, time.time_ns(), timeout=None)
+        except Exception as e:
+            logger.warning(f"Cache {self.namespace}: invalidation failed ({e})")
+
+    def stats(self) -> dict:
+        """Hit/miss counters of this process."""
+        with self._counters_lock:
+            counters = dict(self._counters)
+        lookups = counters['l1_hits'] + counters['l2_hits'] + counters['misses']
+        return {
+            'namespace': self.namespace,
+            **counters,
+            'hit_ratio': round((counters['l1_hits'] + counters['l2_hits']) / lookups, 4) if lookups else 0.0,
+            'l1_entries': len(self.l1),
+        }
+
+    def reset_stats(self) -> None:
+        with self._counters_lock:
+            for counter in self._counters:
+                self._counters[counter] = 0
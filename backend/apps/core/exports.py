@@ -0,0 +1,338 @@
+from datetime import timedelta
+from typing import Any, Iterable, Iterator, Optional, Sequence, Tuple
+from tempfile import SpooledTemporaryFile
+from uuid import uuid4
+from xml.sax.saxutils import escape
+import csv
+import io
+import logging
+import re
+import zipfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+logger = logging.getLogger(__name__)
+
+
+# format -> (content type, file extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+}
+
+# Rows written between two yields of the streaming body
+ROWS_PER_CHUNK = 500
+
+# Characters that are not allowed in XML 1.0 documents
+_ILLEGAL_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def get_export_chunk_size() -> int:
+    """Rows fetched per database round trip by the export selectors."""
+    return getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+
+
+def parse_export_format(value: Optional[str]) -> str:
+    """
+    Validate the requested export format (csv by default).
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    fmt = (value or 'csv').lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{value}' (expected one of: {', '.join(EXPORT_FORMATS)})")
+    return fmt
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Write-only, non-seekable buffer drained by the streaming generators."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_csv(header: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """CSV body, one chunk per ROWS_PER_CHUNK rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(['' if value is None else value for value in row])
+        if count % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+_XLSX_STATIC_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Export" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _xlsx_cell(value: Any) -> str:
+    if value is None or value == '':
+        return '<c/>'
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    text = escape(_ILLEGAL_XML_CHARS.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values: Sequence[Any]) -> str:
+    return '<row>' + ''.join(_xlsx_cell(value) for value in values) + '</row>'
+
+
+def iter_xlsx(header: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """
+    XLSX body (single sheet, inline strings), one chunk per ROWS_PER_CHUNK rows.
+
+    The workbook is zipped on the fly with data descriptors, so nothing
+    but the current chunk is held in memory.
+    """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        yield buffer.drain()
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+                + _xlsx_row(header)
+            ).encode('utf-8'))
+
+            lines = []
+            for count, row in enumerate(rows, start=1):
+                lines.append(_xlsx_row(row))
+                if count % ROWS_PER_CHUNK == 0:
+                    sheet.write(''.join(lines).encode('utf-8'))
+                    lines.clear()
+                    data = buffer.drain()
+                    if data:
+                        yield data
+
+            sheet.write((''.join(lines) + '</sheetData></worksheet>').encode('utf-8'))
+    yield buffer.drain()
+
+
+def iter_export(fmt: str, header: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """Streaming body of an export in the given format."""
+    if fmt == 'xlsx':
+        return iter_xlsx(header, rows)
+    return iter_csv(header, rows)
+
+
+def streaming_export_response(
+    filename: str,
+    fmt: str,
+    header: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+) -> StreamingHttpResponse:
+    """StreamingHttpResponse downloading the rows as <filename>.<ext>."""
+    content_type, extension = EXPORT_FORMATS[fmt]
+    response = StreamingHttpResponse(iter_export(fmt, header, rows), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{extension}"'
+    return response
+
+
+# ----------------------------------------------------------------------
+# Async exports (Celery task -> private storage -> owner download)
+# ----------------------------------------------------------------------
+
+def get_export_storage() -> FileSystemStorage:
+    """
+    Private storage of async exports (EXPORT_ROOT, outside MEDIA_ROOT).
+
+    Export files hold personal data, so they have no public URL: they are
+    served to their owner by the export download endpoints until they
+    expire, and removed by cleanup_exports_task.
+    """
+    return FileSystemStorage(location=getattr(settings, 'EXPORT_ROOT', 'private/exports'))
+
+
+def get_export_file_ttl() -> timedelta:
+    """How long a finished export can be downloaded before it is deleted."""
+    return timedelta(seconds=getattr(settings, 'EXPORT_FILE_TTL', 86400))
+
+
+def _status_key(export_id: str) -> str:
+    return f"export:{export_id}"
+
+
+def _set_status(export_id: str, **fields) -> dict:
+    status = cache.get(_status_key(export_id)) or {'export_id': export_id}
+    status.update(fields)
+    cache.set(_status_key(export_id), status, timeout=getattr(settings, 'EXPORT_STATUS_TTL', 86400))
+    return status
+
+
+def start_async_export(task, owner_id: int, fmt: str, **params) -> dict:
+    """
+    Queue an export task and return its initial status.
+
+    The task is called as task.delay(export_id, fmt, **params) and is
+    expected to finish with save_export().
+    """
+    export_id = uuid4().hex
+    status = _set_status(export_id, owner_id=owner_id, format=fmt, status='pending', url=None)
+    task.delay(export_id, fmt, **params)
+    return status
+
+
+def save_export(
+    export_id: str,
+    filename: str,
+    fmt: str,
+    header: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+) -> Optional[str]:
+    """
+    Write an export to the private export storage.
+
+    Returns:
+        The storage path of the file, None if the export failed
+    """
+    _set_status(export_id, status='running')
+    extension = EXPORT_FORMATS[fmt][1]
+    storage = get_export_storage()
+    try:
+        with SpooledTemporaryFile(max_size=8 * 1024 * 1024) as tmp:
+            for chunk in iter_export(fmt, header, rows):
+                tmp.write(chunk)
+            tmp.seek(0)
+            path = storage.save(f"{export_id}/{filename}.{extension}", File(tmp))
+    except Exception as e:
+        logger.exception(f"Export {export_id} failed")
+        _set_status(export_id, status='failed', error=str(e))
+        return None
+
+    expires_at = timezone.now() + get_export_file_ttl()
+    _set_status(export_id, status='done', path=path, expires_at=expires_at.isoformat())
+    return path
+
+
+def get_export_status(export_id: str, owner_id: int) -> Optional[dict]:
+    """Status of an export started by owner_id, None if unknown or not theirs."""
+    status = cache.get(_status_key(export_id))
+    if not status or status.get('owner_id') != owner_id:
+        return None
+    return status
+
+
+def _is_expired(status: dict) -> bool:
+    expires_at = parse_datetime(status.get('expires_at') or '')
+    return expires_at is None or expires_at <= timezone.now()
+
+
+def export_status_data(status: dict, download_url: str) -> dict:
+    """
+    Export status as returned to the client: the storage path is hidden
+    and url is the download endpoint while the file is available.
+    """
+    data = {key: value for key, value in status.items() if key != 'path'}
+    available = status.get('status') == 'done' and not _is_expired(status)
+    if status.get('status') == 'done' and not available:
+        data['status'] = 'expired'
+    data['url'] = download_url if available else None
+    return data
+
+
+def open_export_file(status: dict) -> Optional[Tuple[File, str, str]]:
+    """
+    Open a finished, unexpired export for download.
+
+    Returns:
+        Tuple (file, filename, content_type), None if the file is not
+        available (still running, failed, expired or already cleaned up)
+    """
+    if status.get('status') != 'done' or _is_expired(status):
+        return None
+    storage = get_export_storage()
+    path = status['path']
+    if not storage.exists(path):
+        return None
+    content_type = EXPORT_FORMATS[status['format']][0]
+    return storage.open(path, 'rb'), path.rsplit('/', 1)[-1], content_type
+
+
+def delete_expired_exports() -> int:
+    """
+    Remove export files older than the export TTL.
+
+    Returns:
+        Number of deleted files
+    """
+    storage = get_export_storage()
+    if not storage.exists(''):
+        return 0
+    cutoff = timezone.now() - get_export_file_ttl()
+    deleted = 0
+    export_dirs, _ = storage.listdir('')
+    for export_dir in export_dirs:
+        _, files = storage.listdir(export_dir)
+        for name in files:
+            path = f"{export_dir}/{name}"
+            if storage.get_modified_time(path) <= cutoff:
+                storage.delete(path)
+                deleted += 1
+        if not any(storage.listdir(export_dir)):
+            storage.delete(export_dir)
+    return deleted
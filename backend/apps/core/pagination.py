@@ -0,0 +1,212 @@
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination trên một bộ sắp xếp cố định.
+
+    The view declares its sort tuple in ``keyset_ordering``, ending with a
+    unique field, e.g. ``('-featured', '-published_at', '-created_at', 'id')``.
+    A page is read with ``WHERE (sort tuple) after (cursor tuple)`` plus
+    ``LIMIT page_size + 1``, so page N costs the same as page 1 when a
+    composite index matches the tuple. Cursors are signed, opaque strings
+    holding the sort values of the boundary row.
+
+    NULLs sort as the largest value (NULLS FIRST for DESC, NULLS LAST for
+    ASC, the PostgreSQL default); the ORDER BY spells this out so other
+    backends page the same way. Sort names that are not model fields are
+    read as queryset annotations (e.g. a search rank) and stored as-is.
+    """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering = ('-pk',)
+    signing_salt = 'apps.core.pagination.keyset'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.page_size = self.get_page_size(request)
+        self.ordering = tuple(getattr(view, 'keyset_ordering', None) or self.ordering)
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor['reverse'])
+        ordering = reverse_ordering(self.ordering) if reverse else self.ordering
+
+        if cursor:
+            queryset = queryset.filter(self.keyset_filter(ordering, cursor['values']))
+
+        results = list(queryset.order_by(*order_by_nulls_largest(ordering))[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        """page_size query param, clamped to [1, max_page_size]."""
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._link(self.page[0], reverse=True)
+
+    def _link(self, obj, reverse):
+        cursor = self.encode_cursor(obj, reverse)
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    # Cursor encoding
+
+    def _field(self, name):
+        """Model field of a sort name, or None for an annotation."""
+        name = name.lstrip('-')
+        if name == 'pk':
+            return self.model._meta.pk
+        try:
+            return self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+    def _value(self, obj, name):
+        field = self._field(name)
+        return getattr(obj, field.attname if field else name.lstrip('-'))
+
+    def encode_cursor(self, obj, reverse):
+        values = [encode_value(self._value(obj, name)) for name in self.ordering]
+        return signing.dumps({'v': values, 'r': reverse}, salt=self.signing_salt, compress=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = signing.loads(encoded, salt=self.signing_salt)
+            values = payload['v']
+            if len(values) != len(self.ordering):
+                raise ValueError
+            values = [
+                decode_value(self._field(name), value)
+                for name, value in zip(self.ordering, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return {'values': values, 'reverse': bool(payload.get('r'))}
+
+    # Keyset predicate
+
+    def keyset_filter(self, ordering, values) -> Q:
+        """
+        Rows strictly after ``values`` in ``ordering``:
+        (a after va) OR (a = va AND b after vb) OR ...
+        The leading column is also bounded on its own so the index range
+        scan starts at the cursor.
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+        for name, value in zip(ordering, values):
+            after = after_q(name, value)
+            if after is not None:
+                condition |= equal & after
+            equal &= equal_q(name, value)
+
+        first_name, first_value = ordering[0], values[0]
+        if first_value is not None:
+            condition &= equal_q(first_name, first_value) | after_q(first_name, first_value)
+        return condition
+
+
+def reverse_ordering(ordering):
+    """('-a', 'b') -> ('a', '-b')"""
+    return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in ordering)
+
+
+def order_by_nulls_largest(ordering):
+    """Order expressions for ``ordering`` with NULLs sorted as the largest value."""
+    return [
+        F(name[1:]).desc(nulls_first=True) if name.startswith('-') else F(name).asc(nulls_last=True)
+        for name in ordering
+    ]
+
+
+def after_q(name, value):
+    """Q for 'strictly after value' on one column, or None if nothing can follow."""
+    field = name.lstrip('-')
+    if name.startswith('-'):
+        if value is None:
+            return Q(**{f'{field}__isnull': False})
+        return Q(**{f'{field}__lt': value})
+    if value is None:
+        return None
+    return Q(**{f'{field}__gt': value}) | Q(**{f'{field}__isnull': True})
+
+
+def equal_q(name, value):
+    field = name.lstrip('-')
+    if value is None:
+        return Q(**{f'{field}__isnull': True})
+    return Q(**{field: value})
+
+
+def encode_value(value):
+    """JSON-safe sort value; datetimes keep their microseconds."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    return value
+
+
+def decode_value(field, value):
+    """Sort value from a cursor; annotation values are kept as decoded JSON."""
+    if value is None or field is None:
+        return value
+    return field.to_python(value)
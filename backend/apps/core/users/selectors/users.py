@@ -1,4 +1,4 @@
-from typing import Iterable
+from typing import Iterable, Iterator
 from ..models import CustomUser
 
 import django_filters
@@ -7,8 +7,7 @@ from django.db.models import QuerySet
 from django.utils import timezone
 from django.db.models import Count
 
-import csv
-import io
+from apps.core.exports import get_export_chunk_size
 
 class UserFilter(django_filters.FilterSet):
     class Meta:
@@ -69,27 +68,13 @@ def get_user_stats() -> dict:
         "new_users_today": new_users_today
     }
 
-def export_users_csv() -> any:
+USER_EXPORT_HEADER = ['ID', 'Email', 'Full Name', 'Role', 'Status', 'Date Joined', 'Last Login']
+
+
+def iter_user_export_rows() -> Iterator[tuple]:
     """
-    Xuất danh sách user ra CSV.
-    Returns: file-like object or http response content generator
+    Các dòng export users (USER_EXPORT_HEADER), đọc theo từng chunk.
     """
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Header
-    writer.writerow(['ID', 'Email', 'Full Name', 'Role', 'Status', 'Date Joined', 'Last Login'])
-    
-    users = CustomUser.objects.all().iterator()
-    for user in users:
-        writer.writerow([
-            user.id,
-            user.email,
-            user.full_name,
-            user.role,
-            user.status,
-            user.date_joined,
-            user.last_login
-        ])
-        
-    return output.getvalue()
\ No newline at end of file
+    return CustomUser.objects.order_by('id').values_list(
+        'id', 'email', 'full_name', 'role', 'status', 'date_joined', 'last_login'
+    ).iterator(chunk_size=get_export_chunk_size())
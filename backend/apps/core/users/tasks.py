@@ -0,0 +1,26 @@
+from celery import shared_task
+import logging
+
+from apps.core.exports import delete_expired_exports, save_export
+from apps.core.users.selectors.users import USER_EXPORT_HEADER, iter_user_export_rows
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def export_users_task(export_id: str, fmt: str):
+    """
+    Celery task xuất danh sách users ra file trên storage (export bất đồng bộ).
+    """
+    return save_export(export_id, 'users_export', fmt, USER_EXPORT_HEADER, iter_user_export_rows())
+
+
+@shared_task
+def cleanup_exports_task():
+    """
+    Celery task xóa các file export bất đồng bộ đã hết hạn (chạy mỗi giờ).
+    """
+    deleted = delete_expired_exports()
+    if deleted:
+        logger.info(f"Deleted {deleted} expired export files")
+    return deleted
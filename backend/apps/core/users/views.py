@@ -1,3 +1,4 @@
+from django.http import FileResponse
 from rest_framework import viewsets, mixins, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
@@ -18,7 +19,8 @@ from .services.auth import (
     AuthenticationError
 )
 from .services.users import create_user, UserCreateInput, bulk_user_action, upload_user_avatar, update_user_role, update_user_status, delete_user, update_user, UserUpdateInput
-from .selectors.users import list_users, get_user_stats, export_users_csv
+from .selectors.users import list_users, get_user_stats, iter_user_export_rows, USER_EXPORT_HEADER
+from .tasks import export_users_task
 from .serializers import (
     CustomUserSerializer, LoginSerializer, LogoutSerializer, 
     LoginResponseSerializer, RegisterSerializer, RegisterResponseSerializer, 
@@ -27,7 +29,14 @@ from .serializers import (
     SocialAuthSerializer, Verify2FASerializer,
     UserUpdateSerializer, UserStatusSerializer, UserRoleSerializer, UserAvatarSerializer
 )
-from django.http import HttpResponse
+from apps.core.exports import (
+    export_status_data,
+    get_export_status,
+    open_export_file,
+    parse_export_format,
+    start_async_export,
+    streaming_export_response,
+)
 
 from apps.system.activity_logs.models import ActivityLog
 from apps.system.activity_logs.serializers import ActivityLogSerializer
@@ -193,17 +202,44 @@ class CustomUserViewSet(viewsets.GenericViewSet, mixins.RetrieveModelMixin, mixi
 
     @action(detail=False, methods=['get'], url_path='export')
     def export(self, request):
-        """GET /api/users/export/ - Export users CSV (admin only)"""
+        """GET /api/users/export/ - Export users CSV/XLSX, streaming (admin only)"""
         if not request.user.role == CustomUser.Role.ADMIN:
              return Response({"detail": "Permission denied"}, status=status.HTTP_403_FORBIDDEN)
              
         try:
-            csv_content = export_users_csv()
-            response = HttpResponse(csv_content, content_type='text/csv')
-            response['Content-Disposition'] = 'attachment; filename="users_export.csv"'
-            return response
-        except Exception as e:
+            fmt = parse_export_format(request.query_params.get('file_format'))
+        except ValueError as e:
              return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if request.query_params.get('async') in ('1', 'true'):
+            export = start_async_export(export_users_task, request.user.id, fmt)
+            return Response(export, status=status.HTTP_202_ACCEPTED)
+        
+        return streaming_export_response('users_export', fmt, USER_EXPORT_HEADER, iter_user_export_rows())
+
+    @action(detail=False, methods=['get'], url_path=r'export/(?P<export_id>[0-9a-f]+)')
+    def export_status(self, request, export_id=None):
+        """GET /api/users/export/:export_id/ - Trạng thái export bất đồng bộ (admin only)"""
+        if not request.user.role == CustomUser.Role.ADMIN:
+             return Response({"detail": "Permission denied"}, status=status.HTTP_403_FORBIDDEN)
+        
+        export = get_export_status(export_id, request.user.id)
+        if not export:
+            return Response({"detail": "Export not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(export_status_data(export, request.build_absolute_uri('download/')))
+
+    @action(detail=False, methods=['get'], url_path=r'export/(?P<export_id>[0-9a-f]+)/download')
+    def export_download(self, request, export_id=None):
+        """GET /api/users/export/:export_id/download/ - Tải file export (admin tạo export, trước khi hết hạn)"""
+        if not request.user.role == CustomUser.Role.ADMIN:
+             return Response({"detail": "Permission denied"}, status=status.HTTP_403_FORBIDDEN)
+
+        export = get_export_status(export_id, request.user.id)
+        download = open_export_file(export) if export else None
+        if not download:
+            return Response({"detail": "Export not found"}, status=status.HTTP_404_NOT_FOUND)
+        file, filename, content_type = download
+        return FileResponse(file, as_attachment=True, filename=filename, content_type=content_type)
 
     @action(detail=False, methods=['post'], url_path='bulk-action')
     def bulk_action(self, request):
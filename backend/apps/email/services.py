@@ -1,6 +1,6 @@
 import logging
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives, get_connection, send_mail
 from django.template import Context, Template
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
@@ -96,3 +96,58 @@ class EmailService:
                 error_message=str(e)
             )
             return False
+
+    @staticmethod
+    def send_batch(emails: list, connection=None) -> list:
+        """
+        Render file templates and send many emails over one SMTP connection.
+        Each item is a dict with recipient, subject, template_path and context.
+        Logs are written with a single bulk insert.
+        
+        Returns a success flag per email, in input order.
+        """
+        own_connection = connection is None
+        if own_connection:
+            connection = get_connection()
+        
+        results = []
+        logs = []
+        try:
+            connection.open()
+            for email in emails:
+                html_content = None
+                try:
+                    html_content = render_to_string(email['template_path'], email.get('context') or {})
+                    message = EmailMultiAlternatives(
+                        subject=email['subject'],
+                        body=strip_tags(html_content),
+                        from_email=settings.DEFAULT_FROM_EMAIL,
+                        to=[email['recipient']],
+                        connection=connection
+                    )
+                    message.attach_alternative(html_content, 'text/html')
+                    message.send()
+                    
+                    logs.append(SentEmail(
+                        recipient=email['recipient'],
+                        subject=email['subject'],
+                        content=html_content,
+                        status=SentEmail.Status.SENT
+                    ))
+                    results.append(True)
+                except Exception as e:
+                    logger.error(f"Error sending email to {email['recipient']}: {e}")
+                    logs.append(SentEmail(
+                        recipient=email['recipient'],
+                        subject=email['subject'],
+                        content=html_content or "",
+                        status=SentEmail.Status.FAILED,
+                        error_message=str(e)
+                    ))
+                    results.append(False)
+        finally:
+            if own_connection:
+                connection.close()
+            SentEmail.objects.bulk_create(logs)
+        
+        return results
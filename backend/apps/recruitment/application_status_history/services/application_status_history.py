@@ -1,3 +1,5 @@
+from typing import Iterable, List, Tuple
+
 from django.db import transaction
 from apps.recruitment.applications.models import Application
 from apps.recruitment.application_status_history.models import ApplicationStatusHistory
@@ -21,3 +23,27 @@ def log_status_history(
         changed_by=changed_by,
         notes=notes
     )
+
+
+def bulk_log_status_history(
+    changes: Iterable[Tuple[int, str, str]],
+    changed_by,
+    notes: str = None
+) -> List[ApplicationStatusHistory]:
+    """
+        Ghi lịch sử cho nhiều đơn cùng lúc (một bulk_create).
+        changes: (application_id, old_status, new_status)
+    """
+    return ApplicationStatusHistory.objects.bulk_create(
+        [
+            ApplicationStatusHistory(
+                application_id=application_id,
+                old_status=old_status,
+                new_status=new_status,
+                changed_by=changed_by,
+                notes=notes
+            )
+            for application_id, old_status, new_status in changes
+        ],
+        batch_size=1000
+    )
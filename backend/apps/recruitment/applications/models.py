@@ -91,6 +91,8 @@ class Application(models.Model):
         indexes = [
             models.Index(fields=['recruiter', 'status'], name='idx_app_recruiter_status'),
             models.Index(fields=['job', 'status'], name='idx_app_job_status'),
+            # Keyset pagination: (-applied_at, -id) trong một job
+            models.Index(fields=['job', '-applied_at', '-id'], name='idx_app_job_applied_keyset'),
         ]
     
     def __str__(self):
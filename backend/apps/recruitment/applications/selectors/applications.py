@@ -1,11 +1,17 @@
-from typing import Optional
+from typing import Iterator, Optional
 from django.db.models import QuerySet, Q, Count
 from django.utils import timezone
 from datetime import timedelta
 
+from apps.core.exports import get_export_chunk_size
 from apps.recruitment.applications.models import Application
 from apps.recruitment.jobs.models import Job
 
+# Keyset sort of a job's applications (matches idx_app_job_applied_keyset)
+APPLICATION_ORDERING = ('-applied_at', '-id')
+
+# by-rating lists: best rated first, then the default sort
+APPLICATION_RATING_ORDERING = ('-rating',) + APPLICATION_ORDERING
 
 def list_applications_by_job(job_id: int, filters: dict = None) -> QuerySet[Application]:
     """
@@ -56,6 +62,18 @@ def list_applications_by_recruiter(recruiter_id: int) -> QuerySet[Application]:
     ).order_by('-applied_at')
 
 
+def list_applications_for_user(user) -> QuerySet[Application]:
+    """
+        Lấy danh sách applications liên quan đến user:
+        đơn user đã nộp và đơn vào các job user sở hữu.
+    """
+    return Application.objects.filter(
+        Q(recruiter__user=user) | Q(job__company__user=user)
+    ).select_related(
+        'recruiter', 'recruiter__user', 'job'
+    ).order_by(*APPLICATION_ORDERING)
+
+
 def get_application_stats(user) -> dict:
     """
         Lấy thống kê applications cho user.
@@ -106,6 +124,37 @@ def list_applications_for_export(user, job_id: int = None, status: str = None) -
     return queryset.order_by('-applied_at')
 
 
+APPLICATION_EXPORT_HEADER = [
+    'ID', 'Job Title', 'Applicant Name', 'Email',
+    'Status', 'Rating', 'Applied At', 'Notes'
+]
+
+
+def iter_application_export_rows(user, job_id: int = None, status: str = None) -> Iterator[tuple]:
+    """
+        Các dòng export applications (APPLICATION_EXPORT_HEADER), đọc theo
+        từng chunk với values_list thay vì load model instances.
+    """
+    rows = list_applications_for_export(
+        user, job_id=job_id, status=status
+    ).values_list(
+        'id', 'job__title', 'recruiter__user__full_name', 'recruiter__user__email',
+        'status', 'rating', 'applied_at', 'notes'
+    ).iterator(chunk_size=get_export_chunk_size())
+    
+    for app_id, job_title, full_name, email, app_status, rating, applied_at, notes in rows:
+        yield (
+            app_id,
+            job_title,
+            full_name,
+            email,
+            app_status,
+            rating or '',
+            applied_at.strftime('%Y-%m-%d %H:%M'),
+            notes or ''
+        )
+
+
 def list_applications_by_status(job_id: int, status: str) -> QuerySet[Application]:
     """
         Lấy danh sách applications theo job_id và status.
@@ -141,7 +190,7 @@ def list_applications_by_rating(
         if max_rating is not None:
             queryset = queryset.filter(rating__lte=max_rating)
     
-    return queryset.order_by('-rating', '-applied_at')
+    return queryset.order_by(*APPLICATION_RATING_ORDERING)
 
 
 def search_applications(job_id: int, query: str) -> QuerySet[Application]:
@@ -1,12 +1,18 @@
+from collections import Counter
 from typing import Optional
 from pydantic import BaseModel
 from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Greatest
 from django.utils import timezone
 
 from apps.candidate.recruiters.models import Recruiter
 from apps.recruitment.jobs.models import Job
 from apps.recruitment.applications.models import Application
-from apps.recruitment.application_status_history.services.application_status_history import log_status_history
+from apps.recruitment.application_status_history.services.application_status_history import (
+    bulk_log_status_history,
+    log_status_history,
+)
 from apps.email.services import EmailService
 
 class ApplicationCreateInput(BaseModel):
@@ -244,63 +250,92 @@ def applicant_withdraw(application: Application, reason: str = None) -> Applicat
     return application
 
 
+# Trạng thái đích của từng thao tác hàng loạt (delete xóa hẳn đơn)
+BULK_ACTION_STATUSES = {
+    'reject': 'rejected',
+    'shortlist': 'shortlisted',
+}
+
+
 @transaction.atomic
 def bulk_action(application_ids: list, action: str, user, notes: str = None) -> dict:
     """
         Thực hiện thao tác hàng loạt trên nhiều applications.
+        
+        Set-based: one UPDATE for the target status (or one DELETE), one
+        bulk_create of the status history rows and one UPDATE of the job
+        counters, whatever the number of applications. Applications that
+        cannot take the action are reported per id in `errors`.
     """
-
-    # Get applications và validate ownership
-    applications = Application.objects.filter(
-        id__in=application_ids,
-        job__company__user=user  # Chỉ với jobs mà user sở hữu
-    ).select_related('job')
+    if action != 'delete' and action not in BULK_ACTION_STATUSES:
+        raise ValueError(f"Invalid action: {action}")
+    
+    requested_ids = set(application_ids)
     
-    if applications.count() != len(application_ids):
+    # Get applications và validate ownership (khóa các dòng tới hết transaction)
+    rows = list(
+        Application.objects.select_for_update(of=('self',)).filter(
+            id__in=requested_ids,
+            job__company__user=user  # Chỉ với jobs mà user sở hữu
+        ).values_list('id', 'job_id', 'status')
+    )
+    
+    if len(rows) != len(requested_ids):
         raise ValueError("Some applications do not exist or you do not have permission!")
     
-    processed = 0
-    errors = []
+    if action == 'delete':
+        Application.objects.filter(id__in=requested_ids).delete()
+        # Withdrawn applications were already taken off the counter
+        _decrement_application_counts(
+            Counter(job_id for _, job_id, old_status in rows if old_status != 'withdrawn')
+        )
+        return {
+            "processed": len(rows),
+            "errors": []
+        }
     
-    for app in applications:
-        try:
-            old_status = app.status
-            
-            if action == 'reject':
-                app.status = 'rejected'
-                app.reviewed_by = user
-                app.reviewed_at = timezone.now()
-                if notes:
-                    app.notes = notes
-                app.save()
-                
-            elif action == 'shortlist':
-                app.status = 'shortlisted'
-                app.reviewed_by = user
-                app.reviewed_at = timezone.now()
-                if notes:
-                    app.notes = notes
-                app.save()
-                
-            elif action == 'delete':
-                app.delete()
-            
-            # Log history (except delete)
-            if action != 'delete':
-                log_status_history(
-                    app,
-                    old_status,
-                    app.status,
-                    user,
-                    notes or f"Bulk {action}"
-                )
-            
-            processed += 1
-            
-        except Exception as e:
-            errors.append({"id": app.id, "error": str(e)})
+    new_status = BULK_ACTION_STATUSES[action]
+    changes = []
+    errors = []
+    for app_id, _, old_status in rows:
+        if old_status == 'withdrawn':
+            errors.append({"id": app_id, "error": "This application has been withdrawn!"})
+        else:
+            changes.append((app_id, old_status, new_status))
+    
+    if changes:
+        now = timezone.now()
+        fields = {
+            'status': new_status,
+            'reviewed_by': user,
+            'reviewed_at': now,
+            'updated_at': now,
+        }
+        if notes:
+            fields['notes'] = notes
+        Application.objects.filter(id__in=[app_id for app_id, _, _ in changes]).update(**fields)
+        
+        bulk_log_status_history(changes, user, notes or f"Bulk {action}")
     
     return {
-        "processed": processed,
+        "processed": len(changes),
         "errors": errors
     }
+
+
+def _decrement_application_counts(counts: Counter) -> None:
+    """
+        Giảm Job.application_count theo số đơn bị xóa của từng job (một UPDATE).
+    """
+    if not counts:
+        return
+    
+    Job.objects.filter(id__in=counts).update(
+        application_count=Greatest(
+            F('application_count') - Case(
+                *[When(id=job_id, then=Value(count)) for job_id, count in counts.items()],
+                output_field=IntegerField()
+            ),
+            Value(0)
+        )
+    )
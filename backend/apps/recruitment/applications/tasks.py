@@ -0,0 +1,21 @@
+from celery import shared_task
+import logging
+
+from apps.core.exports import save_export
+from apps.core.users.models import CustomUser
+from apps.recruitment.applications.selectors.applications import (
+    APPLICATION_EXPORT_HEADER,
+    iter_application_export_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def export_applications_task(export_id: str, fmt: str, user_id: int, job_id: int = None, status: str = None):
+    """
+    Celery task xuất applications ra file trên storage (export bất đồng bộ).
+    """
+    user = CustomUser.objects.get(id=user_id)
+    rows = iter_application_export_rows(user, job_id=job_id, status=status)
+    return save_export(export_id, 'applications', fmt, APPLICATION_EXPORT_HEADER, rows)
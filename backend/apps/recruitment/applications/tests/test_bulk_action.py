@@ -0,0 +1,107 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.users.models import CustomUser
+from apps.company.companies.models import Company
+from apps.recruitment.jobs.models import Job
+from apps.recruitment.applications.models import Application
+from apps.recruitment.applications.services.applications import bulk_action
+from apps.recruitment.application_status_history.models import ApplicationStatusHistory
+from apps.candidate.recruiters.models import Recruiter
+
+
+class BulkActionTests(TestCase):
+    """Thao tác hàng loạt set-based (UPDATE/DELETE + bulk history)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = CustomUser.objects.create_user(
+            email="bulk-owner@example.com",
+            password="password123",
+            full_name="Owner"
+        )
+        cls.company = Company.objects.create(user=cls.owner, company_name="Bulk Co", slug="bulk-co")
+        cls.recruiters = []
+        for i in range(12):
+            user = CustomUser.objects.create_user(
+                email=f"bulk-applicant-{i}@example.com",
+                password="password123",
+                full_name=f"Applicant {i}"
+            )
+            cls.recruiters.append(Recruiter.objects.create(user=user))
+
+    def _job_with_applications(self, slug, count, withdrawn=0):
+        job = Job.objects.create(
+            company=self.company,
+            title=slug,
+            slug=slug,
+            status="published",
+            created_by=self.owner
+        )
+        applications = [
+            Application.objects.create(
+                job=job,
+                recruiter=recruiter,
+                status='withdrawn' if i < withdrawn else 'pending'
+            )
+            for i, recruiter in enumerate(self.recruiters[:count])
+        ]
+        Job.objects.filter(id=job.id).update(application_count=count - withdrawn)
+        return job, applications
+
+    def _queries(self, ids, action):
+        with CaptureQueriesContext(connection) as queries:
+            bulk_action(ids, action, self.owner, notes="Campaign closed")
+        return len(queries)
+
+    def test_reject_is_set_based(self):
+        _, small = self._job_with_applications('small', 2)
+        _, large = self._job_with_applications('large', 12)
+
+        self.assertEqual(
+            self._queries([app.id for app in small], 'reject'),
+            self._queries([app.id for app in large], 'reject')
+        )
+        self.assertEqual(
+            set(Application.objects.filter(id__in=[app.id for app in large]).values_list('status', 'reviewed_by_id', 'notes')),
+            {('rejected', self.owner.id, 'Campaign closed')}
+        )
+        self.assertEqual(
+            ApplicationStatusHistory.objects.filter(new_status='rejected', old_status='pending').count(),
+            14
+        )
+
+    def test_withdrawn_applications_are_reported_per_id(self):
+        _, applications = self._job_with_applications('withdrawn', 4, withdrawn=1)
+
+        result = bulk_action([app.id for app in applications], 'shortlist', self.owner)
+
+        self.assertEqual(result['processed'], 3)
+        self.assertEqual([error['id'] for error in result['errors']], [applications[0].id])
+        applications[0].refresh_from_db()
+        self.assertEqual(applications[0].status, 'withdrawn')
+        self.assertFalse(ApplicationStatusHistory.objects.filter(application=applications[0]).exists())
+
+    def test_delete_adjusts_job_counter(self):
+        job, applications = self._job_with_applications('delete', 5, withdrawn=1)
+
+        result = bulk_action([app.id for app in applications[:3]], 'delete', self.owner)
+
+        self.assertEqual(result, {"processed": 3, "errors": []})
+        self.assertEqual(Application.objects.filter(job=job).count(), 2)
+        job.refresh_from_db()
+        # 4 active applications, 2 of them deleted (the withdrawn one was not counted)
+        self.assertEqual(job.application_count, 2)
+
+    def test_foreign_applications_abort_everything(self):
+        _, applications = self._job_with_applications('mine', 2)
+        other = CustomUser.objects.create_user(
+            email="bulk-other@example.com",
+            password="password123",
+            full_name="Other"
+        )
+
+        with self.assertRaises(ValueError):
+            bulk_action([app.id for app in applications], 'reject', other)
+        self.assertFalse(Application.objects.filter(status='rejected').exists())
@@ -0,0 +1,134 @@
+import csv
+import io
+import os
+import tempfile
+import zipfile
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.core.users.models import CustomUser
+from apps.core.users.tasks import cleanup_exports_task
+from apps.company.companies.models import Company
+from apps.recruitment.jobs.models import Job
+from apps.recruitment.applications.models import Application
+from apps.recruitment.applications.tasks import export_applications_task
+from apps.candidate.recruiters.models import Recruiter
+
+
+class ApplicationExportTests(APITestCase):
+    """Export applications dạng streaming (CSV/XLSX) và bất đồng bộ"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = CustomUser.objects.create_user(
+            email="export-owner@example.com",
+            password="password123",
+            full_name="Owner"
+        )
+        cls.company = Company.objects.create(user=cls.owner, company_name="Export Co", slug="export-co")
+        cls.job = Job.objects.create(
+            company=cls.company,
+            title="Export Job",
+            slug="export-job",
+            status="published",
+            created_by=cls.owner
+        )
+        cls.applicants = []
+        for i in range(3):
+            user = CustomUser.objects.create_user(
+                email=f"export-applicant-{i}@example.com",
+                password="password123",
+                full_name=f"Applicant {i}"
+            )
+            recruiter = Recruiter.objects.create(user=user)
+            Application.objects.create(job=cls.job, recruiter=recruiter, notes="a, \"quoted\" note" if i == 0 else None)
+            cls.applicants.append(user)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.owner)
+
+    def test_csv_is_streamed(self):
+        response = self.client.get(f'/api/applications/export/?job_id={self.job.id}')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0][:3], ['ID', 'Job Title', 'Applicant Name'])
+        self.assertEqual(len(rows), 4)
+        self.assertIn('a, "quoted" note', [row[7] for row in rows[1:]])
+
+    def test_xlsx_is_a_valid_workbook(self):
+        response = self.client.get('/api/applications/export/?file_format=xlsx')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('applications.xlsx', response['Content-Disposition'])
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertIsNone(archive.testzip())
+        sheet = archive.read('xl/worksheets/sheet1.xml').decode()
+        self.assertEqual(sheet.count('<row>'), 4)
+        self.assertIn('Applicant 2', sheet)
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get('/api/applications/export/?file_format=pdf')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def _run_async_export(self):
+        with patch.object(export_applications_task, 'delay', side_effect=export_applications_task) as delay:
+            response = self.client.get('/api/applications/export/?async=true')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        delay.assert_called_once()
+        return response.data['export_id']
+
+    def test_async_export_is_downloaded_by_owner_only(self):
+        with tempfile.TemporaryDirectory() as export_root, override_settings(EXPORT_ROOT=export_root):
+            export_id = self._run_async_export()
+
+            result = self.client.get(f'/api/applications/export/{export_id}/')
+            self.assertEqual(result.data['status'], 'done')
+            self.assertNotIn('path', result.data)
+            self.assertTrue(result.data['url'].endswith(f'/api/applications/export/{export_id}/download/'))
+
+            download = self.client.get(f'/api/applications/export/{export_id}/download/')
+            self.assertEqual(download.status_code, status.HTTP_200_OK)
+            self.assertIn('applications.csv', download['Content-Disposition'])
+            rows = list(csv.reader(io.StringIO(b''.join(download.streaming_content).decode())))
+            self.assertEqual(len(rows), 4)
+            download.close()
+
+            other = CustomUser.objects.create_user(
+                email="export-other@example.com",
+                password="password123",
+                full_name="Other"
+            )
+            self.client.force_authenticate(other)
+            self.assertEqual(
+                self.client.get(f'/api/applications/export/{export_id}/').status_code,
+                status.HTTP_404_NOT_FOUND
+            )
+            self.assertEqual(
+                self.client.get(f'/api/applications/export/{export_id}/download/').status_code,
+                status.HTTP_404_NOT_FOUND
+            )
+
+    def test_expired_export_is_not_served_and_cleaned_up(self):
+        with tempfile.TemporaryDirectory() as export_root, \
+                override_settings(EXPORT_ROOT=export_root, EXPORT_FILE_TTL=0):
+            export_id = self._run_async_export()
+
+            result = self.client.get(f'/api/applications/export/{export_id}/')
+            download = self.client.get(f'/api/applications/export/{export_id}/download/')
+            deleted = cleanup_exports_task()
+
+            self.assertEqual(result.data['status'], 'expired')
+            self.assertIsNone(result.data['url'])
+            self.assertEqual(download.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(deleted, 1)
+            self.assertEqual(os.listdir(export_root), [])
@@ -69,6 +69,38 @@ class ApplicationViewTests(APITestCase):
             bio="Another person"
         )
     
+    # ========== GET /api/applications (Đơn của user, phân trang) ==========
+    
+    def test_list_applications_owner_scoped(self):
+        """GET /api/applications - applicant and job owner see the application, others do not"""
+        app = Application.objects.create(job=self.job, recruiter=self.recruiter)
+        
+        for user, expected in ((self.applicant_user, [app.id]), (self.job_owner, [app.id]), (self.other_user, [])):
+            self.client.force_authenticate(user=user)
+            response = self.client.get('/api/applications/')
+            
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual([item['id'] for item in response.data['results']], expected)
+    
+    def test_list_applications_paginated(self):
+        """GET /api/applications?page_size=1 - cursor pages through the user's applications"""
+        first_app = Application.objects.create(job=self.job, recruiter=self.recruiter)
+        second_app = Application.objects.create(job=self.closed_job, recruiter=self.recruiter)
+        self.client.force_authenticate(user=self.applicant_user)
+        
+        first = self.client.get('/api/applications/', {'page_size': 1})
+        second = self.client.get(first.data['next'])
+        
+        self.assertEqual([item['id'] for item in first.data['results']], [second_app.id])
+        self.assertEqual([item['id'] for item in second.data['results']], [first_app.id])
+        self.assertIsNone(second.data['next'])
+    
+    def test_list_applications_unauthenticated(self):
+        """GET /api/applications - không login → 401"""
+        response = self.client.get('/api/applications/')
+        
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
     # ========== API #1: POST /api/applications (Nộp đơn ứng tuyển) ==========
     
     def test_create_application_success(self):
@@ -938,7 +970,7 @@ class JobApplicationFilterViewTests(APITestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIsInstance(response.data, list)
+        self.assertIsInstance(response.data['results'], list)
     
     def test_pending_applications_unauthenticated(self):
         """GET /api/jobs/:id/applications/pending - không login → 401"""
@@ -975,7 +1007,7 @@ class JobApplicationFilterViewTests(APITestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data['results']), 0)
     
     def test_pending_applications_filters_correctly(self):
         """GET /api/jobs/:id/applications/pending - chỉ status='pending'"""
@@ -985,7 +1017,7 @@ class JobApplicationFilterViewTests(APITestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        for app in response.data:
+        for app in response.data['results']:
             self.assertEqual(app['status'], 'pending')
     
     # ========== API #2: GET /api/jobs/:id/applications/shortlisted ==========
@@ -1032,7 +1064,7 @@ class JobApplicationFilterViewTests(APITestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        for app in response.data:
+        for app in response.data['results']:
             self.assertEqual(app['status'], 'shortlisted')
     
     # ========== API #3: GET /api/jobs/:id/applications/rejected ==========
@@ -1079,7 +1111,7 @@ class JobApplicationFilterViewTests(APITestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        for app in response.data:
+        for app in response.data['results']:
             self.assertEqual(app['status'], 'rejected')
     
     # ========== API #4: GET /api/jobs/:id/applications/by-rating ==========
@@ -1126,7 +1158,7 @@ class JobApplicationFilterViewTests(APITestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        for app in response.data:
+        for app in response.data['results']:
             self.assertEqual(app['rating'], 4)
     
     def test_by_rating_min_max(self):
@@ -1137,11 +1169,23 @@ class JobApplicationFilterViewTests(APITestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        for app in response.data:
+        for app in response.data['results']:
             if app['rating']:
                 self.assertGreaterEqual(app['rating'], 3)
                 self.assertLessEqual(app['rating'], 5)
     
+    def test_by_rating_pages_in_rating_order(self):
+        """GET /api/jobs/:id/applications/by-rating?min_rating=1 - paged, best rated first"""
+        self.client.force_authenticate(user=self.job_owner)
+        
+        url = f'/api/jobs/{self.job.id}/applications/by-rating/?min_rating=1&page_size=1'
+        first = self.client.get(url)
+        second = self.client.get(first.data['next'])
+        
+        self.assertEqual([app['id'] for app in first.data['results']], [self.app_shortlisted.id])
+        self.assertEqual([app['id'] for app in second.data['results']], [self.app_rejected.id])
+        self.assertIsNone(second.data['next'])
+    
     # ========== API #5: GET /api/jobs/:id/applications/search ==========
     
     def test_search_applications_success(self):
@@ -1152,6 +1196,8 @@ class JobApplicationFilterViewTests(APITestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([app['id'] for app in response.data['results']], [self.app_pending.id])
+        self.assertIn('next', response.data)
     
     def test_search_applications_unauthenticated(self):
         """GET /api/jobs/:id/applications/search - không login → 401"""
@@ -1186,4 +1232,4 @@ class JobApplicationFilterViewTests(APITestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, [])
+        self.assertEqual(response.data['results'], [])
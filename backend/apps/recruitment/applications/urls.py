@@ -19,6 +19,8 @@ urlpatterns = [
     path('stats/', ApplicationViewSet.as_view({'get': 'stats'}), name='application-stats'),
     path('bulk-action/', ApplicationViewSet.as_view({'post': 'bulk_action_view'}), name='application-bulk-action'),
     path('export/', ApplicationViewSet.as_view({'get': 'export'}), name='application-export'),
+    path('export/<str:export_id>/', ApplicationViewSet.as_view({'get': 'export_status'}), name='application-export-status'),
+    path('export/<str:export_id>/download/', ApplicationViewSet.as_view({'get': 'export_download'}), name='application-export-download'),
     # Then pk-based routes
     path('<int:pk>/status/', ApplicationViewSet.as_view({'patch': 'change_status'}), name='application-status'),
     path('<int:pk>/rating/', ApplicationViewSet.as_view({'patch': 'rate'}), name='application-rating'),
@@ -1,5 +1,4 @@
-import csv
-
+from django.http import FileResponse
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
@@ -12,8 +11,15 @@ from apps.recruitment.application_status_history.selectors.application_status_hi
 from apps.recruitment.application_status_history.serializers import StatusHistorySerializer
 from apps.recruitment.application_status_history.services.application_status_history import log_status_history
 from apps.candidate.recruiters.selectors.recruiters import get_recruiter_by_user
-
-from django.http import HttpResponse
+from apps.core.exports import (
+    export_status_data,
+    get_export_status,
+    open_export_file,
+    parse_export_format,
+    start_async_export,
+    streaming_export_response,
+)
+from apps.core.pagination import KeysetPagination
 
 from .models import Application
 
@@ -46,11 +52,16 @@ from .selectors.applications import (
     list_applications_by_job,
     list_applications_by_status,
     list_applications_by_rating,
-    list_applications_for_export,
+    list_applications_for_user,
     get_application_stats,
     get_application_by_id,
     search_applications,
+    iter_application_export_rows,
+    APPLICATION_EXPORT_HEADER,
+    APPLICATION_ORDERING,
+    APPLICATION_RATING_ORDERING,
 )
+from .tasks import export_applications_task
 
 class JobApplicationViewSet(viewsets.GenericViewSet):
     """
@@ -58,6 +69,14 @@ class JobApplicationViewSet(viewsets.GenericViewSet):
         Nested URL: /api/jobs/:job_id/applications/
     """
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    
+    @property
+    def keyset_ordering(self):
+        """Rating first for by-rating, else the index order (idx_app_job_applied_keyset)."""
+        if self.action == 'by_rating':
+            return APPLICATION_RATING_ORDERING
+        return APPLICATION_ORDERING
     
     def get_queryset(self):
         job_id = self.kwargs.get('job_id')
@@ -116,8 +135,9 @@ class JobApplicationViewSet(viewsets.GenericViewSet):
             return permission_error
         
         queryset = self.get_queryset()
-        serializer = ApplicationListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(queryset)
+        serializer = ApplicationListSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
     
     def _filter_by_status(self, request, job_id, filter_status):
         """
@@ -133,8 +153,9 @@ class JobApplicationViewSet(viewsets.GenericViewSet):
             return permission_error
         
         queryset = list_applications_by_status(job_id, filter_status)
-        serializer = ApplicationListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(queryset)
+        serializer = ApplicationListSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
     
     def pending(self, request, job_id=None):
         """
@@ -182,8 +203,9 @@ class JobApplicationViewSet(viewsets.GenericViewSet):
             min_rating=int(min_rating) if min_rating else None,
             max_rating=int(max_rating) if max_rating else None
         )
-        serializer = ApplicationListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(queryset)
+        serializer = ApplicationListSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
     
     def search(self, request, job_id=None):
         """
@@ -200,12 +222,13 @@ class JobApplicationViewSet(viewsets.GenericViewSet):
             return permission_error
         
         query = request.query_params.get('q', '')
+        queryset = search_applications(job_id, query)
         if not query:
-            return Response([])
+            queryset = queryset.none()
         
-        queryset = search_applications(job_id, query)
-        serializer = ApplicationListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(queryset)
+        serializer = ApplicationListSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 
 class ApplicationViewSet(viewsets.GenericViewSet):
@@ -214,6 +237,8 @@ class ApplicationViewSet(viewsets.GenericViewSet):
         URL: /api/applications/
     """
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = APPLICATION_ORDERING
     
     def _is_applicant(self, request, application):
         """
@@ -240,6 +265,16 @@ class ApplicationViewSet(viewsets.GenericViewSet):
             )
         return application, None
     
+    def list(self, request):
+        """
+            GET /api/applications/
+            Đơn của user: đơn đã nộp và đơn vào các job user sở hữu (phân trang theo cursor)
+        """
+        queryset = list_applications_for_user(request.user)
+        page = self.paginate_queryset(queryset)
+        serializer = ApplicationListSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
     def create(self, request):
         """
             POST /api/applications/
@@ -631,41 +666,68 @@ class ApplicationViewSet(viewsets.GenericViewSet):
     def export(self, request):
         """
             GET /api/applications/export/
-            Export danh sách applications (CSV)
+            Export danh sách applications (CSV/XLSX, streaming)
+            
+            Query params:
+                - file_format: csv (mặc định) | xlsx
+                - async: true → chạy nền qua Celery, trả về export_id
         """
         
         job_id = request.query_params.get('job_id')
         status_filter = request.query_params.get('status')
         
-        applications = list_applications_for_export(
+        try:
+            fmt = parse_export_format(request.query_params.get('file_format'))
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if request.query_params.get('async') in ('1', 'true'):
+            export = start_async_export(
+                export_applications_task,
+                request.user.id,
+                fmt,
+                user_id=request.user.id,
+                job_id=int(job_id) if job_id else None,
+                status=status_filter
+            )
+            return Response(export, status=status.HTTP_202_ACCEPTED)
+        
+        rows = iter_application_export_rows(
             request.user,
             job_id=int(job_id) if job_id else None,
             status=status_filter
         )
+        return streaming_export_response('applications', fmt, APPLICATION_EXPORT_HEADER, rows)
+    
+    def export_status(self, request, export_id=None):
+        """
+            GET /api/applications/export/:export_id/
+            Trạng thái export bất đồng bộ (kèm link tải khi xong)
+        """
+        
+        export = get_export_status(export_id, request.user.id)
+        if not export:
+            return Response(
+                {"detail": "Export not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(export_status_data(export, request.build_absolute_uri('download/')))
+    
+    def export_download(self, request, export_id=None):
+        """
+            GET /api/applications/export/:export_id/download/
+            Tải file export (chỉ người tạo, trước khi hết hạn)
+        """
         
-        # Create CSV response
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="applications.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'ID', 'Job Title', 'Applicant Name', 'Email', 
-            'Status', 'Rating', 'Applied At', 'Notes'
-        ])
-        
-        for app in applications:
-            writer.writerow([
-                app.id,
-                app.job.title,
-                app.recruiter.user.full_name,
-                app.recruiter.user.email,
-                app.status,
-                app.rating or '',
-                app.applied_at.strftime('%Y-%m-%d %H:%M'),
-                app.notes or ''
-            ])
-        
-        return response
+        export = get_export_status(export_id, request.user.id)
+        download = open_export_file(export) if export else None
+        if not download:
+            return Response(
+                {"detail": "Export not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        file, filename, content_type = download
+        return FileResponse(file, as_attachment=True, filename=filename, content_type=content_type)
     
     def list_interviews(self, request, pk=None):
         """
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment_job_views', '0003_alter_jobview_viewed_at'),
+        ('recruitment_jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobview',
+            index=models.Index(fields=['job', 'viewed_at'], name='idx_job_views_job_viewed_at'),
+        ),
+        migrations.CreateModel(
+            name='JobViewDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Ngày')),
+                ('total_views', models.IntegerField(default=0, verbose_name='Tổng lượt xem')),
+                ('logged_in_views', models.IntegerField(default=0, verbose_name='Lượt xem đã đăng nhập')),
+                ('user_ids', models.JSONField(default=list, verbose_name='Người xem (ID)')),
+                ('anonymous_ips', models.JSONField(default=list, verbose_name='IP người xem ẩn danh')),
+                ('referrer_counts', models.JSONField(default=dict, verbose_name='Lượt xem theo nguồn')),
+                ('device_counts', models.JSONField(default=dict, verbose_name='Lượt xem theo thiết bị')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Ngày cập nhật')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_daily_stats', to='recruitment_jobs.job', verbose_name='Công việc')),
+            ],
+            options={
+                'verbose_name': 'Thống kê lượt xem theo ngày',
+                'verbose_name_plural': 'Thống kê lượt xem theo ngày',
+                'db_table': 'job_view_daily_stats',
+                'constraints': [models.UniqueConstraint(fields=('job', 'date'), name='uq_job_view_daily_stats_job_date')],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobViewRollupState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='Tên')),
+                ('last_view_id', models.BigIntegerField(default=0, verbose_name='JobView.id cuối đã tổng hợp')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Ngày cập nhật')),
+            ],
+            options={
+                'verbose_name': 'Trạng thái tổng hợp lượt xem',
+                'verbose_name_plural': 'Trạng thái tổng hợp lượt xem',
+                'db_table': 'job_view_rollup_state',
+            },
+        ),
+    ]
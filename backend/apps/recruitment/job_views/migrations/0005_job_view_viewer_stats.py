@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from apps.recruitment.job_views.services.hyperloglog import HyperLogLog
+
+
+def build_viewer_sketches(apps, schema_editor):
+    """Fold the per-day user_ids / anonymous_ips lists into one sketch per job."""
+    JobViewDailyStat = apps.get_model('recruitment_job_views', 'JobViewDailyStat')
+    JobViewViewerStat = apps.get_model('recruitment_job_views', 'JobViewViewerStat')
+
+    # Rows come ordered by job, so only one sketch is built at a time
+    pending, job_id, sketch = [], None, None
+    stats = JobViewDailyStat.objects.values_list('job_id', 'user_ids', 'anonymous_ips').order_by('job_id')
+    for row_job_id, user_ids, anonymous_ips in stats.iterator(chunk_size=2000):
+        if row_job_id != job_id:
+            if sketch is not None:
+                pending.append(JobViewViewerStat(job_id=job_id, viewer_sketch=sketch.to_bytes()))
+            job_id, sketch = row_job_id, HyperLogLog()
+        for user_id in user_ids:
+            sketch.add(f"u{user_id}")
+        for ip in anonymous_ips:
+            sketch.add(f"ip{ip}")
+        if len(pending) >= 1000:
+            JobViewViewerStat.objects.bulk_create(pending)
+            pending = []
+
+    if sketch is not None:
+        pending.append(JobViewViewerStat(job_id=job_id, viewer_sketch=sketch.to_bytes()))
+    JobViewViewerStat.objects.bulk_create(pending)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment_job_views', '0004_job_view_daily_stats'),
+        ('recruitment_jobs', '0007_similarjob_jobsimilaritystate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobViewViewerStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('viewer_sketch', models.BinaryField(default=bytes, verbose_name='Sketch người xem')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Ngày cập nhật')),
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='view_viewer_stat', to='recruitment_jobs.job', verbose_name='Công việc')),
+            ],
+            options={
+                'verbose_name': 'Thống kê người xem duy nhất',
+                'verbose_name_plural': 'Thống kê người xem duy nhất',
+                'db_table': 'job_view_viewer_stats',
+            },
+        ),
+        migrations.RunPython(build_viewer_sketches, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='jobviewdailystat',
+            name='anonymous_ips',
+        ),
+        migrations.RemoveField(
+            model_name='jobviewdailystat',
+            name='user_ids',
+        ),
+    ]
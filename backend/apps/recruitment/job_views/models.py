@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class JobView(models.Model):
@@ -36,8 +37,9 @@ class JobView(models.Model):
         blank=True,
         verbose_name='Nguồn truy cập'
     )
+    # default (không dùng auto_now_add) để giữ thời điểm xem khi ghi theo lô
     viewed_at = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
         db_index=True,
         verbose_name='Thời gian xem'
     )
@@ -47,6 +49,108 @@ class JobView(models.Model):
         verbose_name = 'Lượt xem công việc'
         verbose_name_plural = 'Lượt xem công việc'
         ordering = ['-viewed_at']
+        indexes = [
+            models.Index(fields=['job', 'viewed_at'], name='idx_job_views_job_viewed_at'),
+        ]
     
     def __str__(self):
         return f"{self.job.title} - {self.viewed_at}"
+
+
+class JobViewDailyStat(models.Model):
+    """Bảng Job_View_Daily_Stats - Tổng hợp lượt xem theo job và ngày (cập nhật tăng dần)"""
+    
+    job = models.ForeignKey(
+        'recruitment_jobs.Job',
+        on_delete=models.CASCADE,
+        related_name='view_daily_stats',
+        verbose_name='Công việc'
+    )
+    date = models.DateField(
+        verbose_name='Ngày'
+    )
+    total_views = models.IntegerField(
+        default=0,
+        verbose_name='Tổng lượt xem'
+    )
+    logged_in_views = models.IntegerField(
+        default=0,
+        verbose_name='Lượt xem đã đăng nhập'
+    )
+    referrer_counts = models.JSONField(
+        default=dict,
+        verbose_name='Lượt xem theo nguồn'
+    )
+    device_counts = models.JSONField(
+        default=dict,
+        verbose_name='Lượt xem theo thiết bị'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Ngày cập nhật'
+    )
+    
+    class Meta:
+        db_table = 'job_view_daily_stats'
+        verbose_name = 'Thống kê lượt xem theo ngày'
+        verbose_name_plural = 'Thống kê lượt xem theo ngày'
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'date'], name='uq_job_view_daily_stats_job_date'),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id} - {self.date}: {self.total_views}"
+
+
+class JobViewViewerStat(models.Model):
+    """Bảng Job_View_Viewer_Stats - Người xem duy nhất của job từ trước đến nay (HyperLogLog)"""
+    
+    job = models.OneToOneField(
+        'recruitment_jobs.Job',
+        on_delete=models.CASCADE,
+        related_name='view_viewer_stat',
+        verbose_name='Công việc'
+    )
+    # Fixed-size sketch of the user ids / anonymous IPs seen (services.hyperloglog)
+    viewer_sketch = models.BinaryField(
+        default=bytes,
+        verbose_name='Sketch người xem'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Ngày cập nhật'
+    )
+    
+    class Meta:
+        db_table = 'job_view_viewer_stats'
+        verbose_name = 'Thống kê người xem duy nhất'
+        verbose_name_plural = 'Thống kê người xem duy nhất'
+    
+    def __str__(self):
+        return f"{self.job_id}"
+
+
+class JobViewRollupState(models.Model):
+    """Bảng Job_View_Rollup_State - Vị trí (JobView.id) đã được tổng hợp"""
+    
+    name = models.CharField(
+        max_length=50,
+        unique=True,
+        verbose_name='Tên'
+    )
+    last_view_id = models.BigIntegerField(
+        default=0,
+        verbose_name='JobView.id cuối đã tổng hợp'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Ngày cập nhật'
+    )
+    
+    class Meta:
+        db_table = 'job_view_rollup_state'
+        verbose_name = 'Trạng thái tổng hợp lượt xem'
+        verbose_name_plural = 'Trạng thái tổng hợp lượt xem'
+    
+    def __str__(self):
+        return f"{self.name}: {self.last_view_id}"
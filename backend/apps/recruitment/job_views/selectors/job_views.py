@@ -1,13 +1,48 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import date, timedelta
-from django.db.models import Count, Q
-from django.db.models.functions import TruncDate
+from django.db.models import Sum
 from django.utils import timezone
-from urllib.parse import urlparse
 
-import re
+from apps.recruitment.job_views.models import JobView, JobViewDailyStat
+from apps.recruitment.job_views.services.rollup import (
+    VIEW_FIELDS,
+    DayStat,
+    JobViewRollupService,
+    aggregate_views,
+    viewer_key,
+)
 
-from apps.recruitment.job_views.models import JobView
+
+def _get_tail_views(job_id: int) -> List[dict]:
+    """Lượt xem của job chưa được tổng hợp (id > watermark), đọc trực tiếp."""
+    return list(
+        JobView.objects.filter(
+            id__gt=JobViewRollupService.watermark(),
+            job_id=job_id
+        ).values(*VIEW_FIELDS)
+    )
+
+
+def _get_daily_stats(job_id: int, start_date: Optional[date] = None, tail: Optional[List[dict]] = None) -> dict:
+    """
+        Thống kê theo ngày của job: các dòng JobViewDailyStat cộng với các
+        lượt xem chưa được tổng hợp (tail, đọc trực tiếp nếu không truyền vào).
+
+        Returns:
+            {date: DayStat}
+    """
+    stats = JobViewDailyStat.objects.filter(job_id=job_id)
+    if start_date:
+        stats = stats.filter(date__gte=start_date)
+    days = {stat.date: DayStat.from_model(stat) for stat in stats}
+
+    if tail is None:
+        tail = _get_tail_views(job_id)
+    for (_, day), delta in aggregate_views(tail).items():
+        if start_date and day < start_date:
+            continue
+        days.setdefault(day, DayStat()).merge(delta)
+    return days
 
 
 def get_view_stats(job_id: int) -> dict:
@@ -23,28 +58,31 @@ def get_view_stats(job_id: int) -> dict:
                 "views_this_month": int
             }
     """
-    today = timezone.now().date()
+    today = timezone.localdate()
     week_ago = today - timedelta(days=7)
     month_ago = today - timedelta(days=30)
     
-    queryset = JobView.objects.filter(job_id=job_id)
+    # Only the last 30 days are read row by row; older days only count in the total
+    tail = _get_tail_views(job_id)
+    days = _get_daily_stats(job_id, month_ago, tail)
     
     # Tổng lượt xem
-    total_views = queryset.count()
-    
-    # Lượt xem duy nhất (bởi user hoặc IP)
-    unique_by_user = queryset.exclude(user__isnull=True).values('user').distinct().count()
-    unique_by_ip = queryset.filter(user__isnull=True).values('ip_address').distinct().count()
-    unique_views = unique_by_user + unique_by_ip
-    
-    # Lượt xem hôm nay
-    views_today = queryset.filter(viewed_at__date=today).count()
-    
-    # Lượt xem tuần này
-    views_this_week = queryset.filter(viewed_at__date__gte=week_ago).count()
-    
-    # Lượt xem tháng này
-    views_this_month = queryset.filter(viewed_at__date__gte=month_ago).count()
+    total_views = (
+        JobViewDailyStat.objects.filter(job_id=job_id).aggregate(total=Sum('total_views'))['total'] or 0
+    ) + len(tail)
+    
+    # Lượt xem duy nhất (bởi user hoặc IP, ước lượng HyperLogLog)
+    viewers = JobViewRollupService.viewer_sketch(job_id)
+    for view in tail:
+        key = viewer_key(view)
+        if key:
+            viewers.add(key)
+    unique_views = viewers.count()
+    
+    # Lượt xem hôm nay / tuần này / tháng này
+    views_today = sum(day.total_views for d, day in days.items() if d == today)
+    views_this_week = sum(day.total_views for d, day in days.items() if d >= week_ago)
+    views_this_month = sum(day.total_views for d, day in days.items() if d >= month_ago)
     
     return {
         "total_views": total_views,
@@ -73,24 +111,17 @@ def get_view_chart_data(job_id: int, period: str = '7d') -> dict:
     days_map = {'7d': 7, '30d': 30, '90d': 90}
     days = days_map.get(period, 7)
     
-    start_date = timezone.now().date() - timedelta(days=days - 1)
+    end_date = timezone.localdate()
+    start_date = end_date - timedelta(days=days - 1)
     
-    # Lấy lượt xem theo ngày
-    queryset = JobView.objects.filter(
-        job_id=job_id,
-        viewed_at__date__gte=start_date
-    ).annotate(
-        date=TruncDate('viewed_at')
-    ).values('date').annotate(
-        views=Count('id')
-    ).order_by('date')
-    
-    # Chuyển đổi thành list và điền các ngày thiếu
-    views_by_date = {item['date']: item['views'] for item in queryset}
+    # Lượt xem theo ngày (bảng tổng hợp)
+    views_by_date = {
+        day: stat.total_views
+        for day, stat in _get_daily_stats(job_id, start_date).items()
+    }
     
     data = []
     current_date = start_date
-    end_date = timezone.now().date()
     
     while current_date <= end_date:
         data.append({
@@ -116,51 +147,27 @@ def get_viewer_demographics(job_id: int) -> dict:
                 "authenticated_ratio": {"logged_in": int, "anonymous": int}
             }
     """
-    queryset = JobView.objects.filter(job_id=job_id)
-    
-    # Thống kê theo referrer
-    referrer_counts = {}
-    for view in queryset.exclude(referrer__isnull=True).exclude(referrer=''):
-        try:
-            parsed = urlparse(view.referrer)
-            domain = parsed.netloc or 'direct'
-            # Loại bỏ prefix www
-            if domain.startswith('www.'):
-                domain = domain[4:]
-            referrer_counts[domain] = referrer_counts.get(domain, 0) + 1
-        except:
-            referrer_counts['other'] = referrer_counts.get('other', 0) + 1
-    
-    # Thêm traffic trực tiếp
-    direct_count = queryset.filter(Q(referrer__isnull=True) | Q(referrer='')).count()
-    if direct_count > 0:
-        referrer_counts['direct'] = direct_count
+    total = DayStat()
+    for day in _get_daily_stats(job_id).values():
+        total.merge(day)
     
+    # Thống kê theo referrer (domain, đã tính sẵn khi tổng hợp)
     by_referrer = sorted(
-        [{"source": k, "count": v} for k, v in referrer_counts.items()],
+        [{"source": k, "count": v} for k, v in total.referrer_counts.items()],
         key=lambda x: x['count'],
         reverse=True
     )[:10]  # Top 10
     
-    # Thống kê theo device (parse user_agent)
-    device_counts = {"mobile": 0, "desktop": 0, "tablet": 0, "other": 0}
-    
-    for view in queryset.exclude(user_agent__isnull=True).exclude(user_agent=''):
-        ua = view.user_agent.lower()
-        if 'mobile' in ua or 'android' in ua or 'iphone' in ua:
-            device_counts['mobile'] += 1
-        elif 'tablet' in ua or 'ipad' in ua:
-            device_counts['tablet'] += 1
-        elif 'windows' in ua or 'macintosh' in ua or 'linux' in ua:
-            device_counts['desktop'] += 1
-        else:
-            device_counts['other'] += 1
-    
-    by_device = [{"device": k, "count": v} for k, v in device_counts.items() if v > 0]
+    # Thống kê theo device (đã phân loại user_agent khi tổng hợp)
+    by_device = [
+        {"device": k, "count": total.device_counts[k]}
+        for k in ("mobile", "desktop", "tablet", "other")
+        if total.device_counts[k] > 0
+    ]
     
     # Tỷ lệ người dùng đã đăng nhập
-    logged_in = queryset.exclude(user__isnull=True).count()
-    anonymous = queryset.filter(user__isnull=True).count()
+    logged_in = total.logged_in_views
+    anonymous = total.total_views - total.logged_in_views
     
     return {
         "by_referrer": by_referrer,
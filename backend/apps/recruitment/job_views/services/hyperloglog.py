@@ -0,0 +1,54 @@
+from typing import Optional
+import hashlib
+import math
+
+
+# 2^12 one-byte registers: 4 KB per sketch, ~1.6% standard error
+HLL_PRECISION = 12
+HLL_REGISTERS = 1 << HLL_PRECISION
+
+# Bits of the 64-bit hash left after the register index
+_RANK_BITS = 64 - HLL_PRECISION
+
+
+class HyperLogLog:
+    """
+    Bộ đếm xấp xỉ số phần tử phân biệt (HyperLogLog, kích thước cố định).
+
+    Each value is hashed to 64 bits; the first HLL_PRECISION bits pick a
+    register, which keeps the longest run of leading zeros seen in the
+    rest. Sketches merge by register-wise max, so a union never grows
+    with the number of values.
+    """
+
+    __slots__ = ('registers',)
+
+    def __init__(self, registers: Optional[bytes] = None):
+        # Stored sketches may come back as memoryview (PostgreSQL bytea)
+        self.registers = bytearray(registers) if registers else bytearray(HLL_REGISTERS)
+        if len(self.registers) != HLL_REGISTERS:
+            raise ValueError(f"Expected {HLL_REGISTERS} registers, got {len(self.registers)}")
+
+    def add(self, value: str) -> None:
+        hashed = int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), 'big')
+        index = hashed >> _RANK_BITS
+        rank = _RANK_BITS - (hashed & ((1 << _RANK_BITS) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        """Estimated number of distinct values added."""
+        m = HLL_REGISTERS
+        estimate = (0.7213 / (1 + 1.079 / m)) * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small range: linear counting is exact-ish while registers are empty
+            return round(m * math.log(m / zeros))
+        return round(estimate)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
+
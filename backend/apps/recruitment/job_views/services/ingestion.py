@@ -0,0 +1,367 @@
+from collections import Counter, deque
+from datetime import datetime
+from typing import List, Optional, Tuple
+import ipaddress
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DataError, IntegrityError, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from apps.recruitment.job_views.models import JobView
+from apps.recruitment.jobs.models import Job
+
+
+logger = logging.getLogger(__name__)
+
+
+# Redis keys of the ingestion stream and of the flusher lock
+STREAM_KEY = 'job_views:stream'
+FLUSH_LOCK_KEY = 'job_views:flush_lock'
+DEAD_LETTER_KEY = 'job_views:dead_letter'
+
+# Upper bound on buffered events (XADD MAXLEN ~), protects Redis memory
+# if the flusher stops running
+STREAM_MAX_LEN = 1_000_000
+
+# Events kept in the dead-letter list for inspection (oldest dropped first)
+DEAD_LETTER_MAX_LEN = 10_000
+
+# Errors that fail an event on every retry (bad data, not an outage)
+PERMANENT_ERRORS = (DataError, IntegrityError, ValueError, KeyError, TypeError)
+
+# Columns copied from the request, truncated to their model limits
+MAX_USER_AGENT_LENGTH = 1000
+MAX_REFERRER_LENGTH = 500
+
+
+class MemoryJobViewBuffer:
+    """
+    Bộ đệm lượt xem trong bộ nhớ của process (dev/test, không cần Redis).
+
+    Events are only visible to the process that recorded them, so the
+    flusher must run in the same process.
+    """
+
+    def __init__(self):
+        self._events = deque()
+        self.dead_letters = deque(maxlen=DEAD_LETTER_MAX_LEN)
+        self._lock = threading.Lock()
+
+    def push(self, event: dict) -> None:
+        with self._lock:
+            self._events.append(event)
+
+    def read(self, count: int) -> Tuple[list, List[dict]]:
+        with self._lock:
+            events = [self._events[i] for i in range(min(count, len(self._events)))]
+        return list(range(len(events))), events
+
+    def ack(self, ids: list) -> None:
+        with self._lock:
+            for _ in ids:
+                self._events.popleft()
+
+    def dead_letter(self, events: List[dict]) -> None:
+        with self._lock:
+            self.dead_letters.extend(events)
+
+    def __len__(self):
+        return len(self._events)
+
+
+class RedisJobViewBuffer:
+    """
+    Bộ đệm lượt xem trên Redis stream (dùng chung giữa web và worker).
+
+    Web processes XADD one entry per view; the flusher reads entries with
+    XRANGE and XDELs them only after they are committed, so a crash during
+    a flush re-delivers the chunk instead of losing it.
+    """
+
+    def __init__(self, url: str):
+        import redis
+        self.client = redis.Redis.from_url(url)
+
+    def push(self, event: dict) -> None:
+        self.client.xadd(
+            STREAM_KEY,
+            {'event': json.dumps(event)},
+            maxlen=STREAM_MAX_LEN,
+            approximate=True
+        )
+
+    def read(self, count: int) -> Tuple[list, List[dict]]:
+        entries = self.client.xrange(STREAM_KEY, count=count)
+        return (
+            [entry_id for entry_id, _ in entries],
+            [json.loads(fields[b'event']) for _, fields in entries],
+        )
+
+    def ack(self, ids: list) -> None:
+        if ids:
+            self.client.xdel(STREAM_KEY, *ids)
+
+    def dead_letter(self, events: List[dict]) -> None:
+        pipe = self.client.pipeline()
+        pipe.rpush(DEAD_LETTER_KEY, *[json.dumps(event) for event in events])
+        pipe.ltrim(DEAD_LETTER_KEY, -DEAD_LETTER_MAX_LEN, -1)
+        pipe.execute()
+
+    def lock(self, timeout: int):
+        return self.client.lock(FLUSH_LOCK_KEY, timeout=timeout, blocking=False)
+
+    @staticmethod
+    def renew_lock(lock) -> bool:
+        """Reset the lock TTL to its full timeout; False if it expired and was taken over."""
+        from redis.exceptions import LockError
+        try:
+            lock.reacquire()
+        except LockError:
+            return False
+        return True
+
+    @staticmethod
+    def release_lock(lock) -> None:
+        from redis.exceptions import LockError
+        try:
+            lock.release()
+        except LockError:
+            # Expired while flushing; the next holder owns it now
+            pass
+
+    def __len__(self):
+        return self.client.xlen(STREAM_KEY)
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def client_ip(meta: dict) -> Optional[str]:
+    """
+    Address of the viewer, used for deduplication.
+
+    X-Forwarded-For is client-supplied, so it is only read when the request
+    comes from one of JOB_VIEW_TRUSTED_PROXIES; the viewer is then the
+    right-most address not added by a trusted proxy.
+    """
+    remote_addr = meta.get('REMOTE_ADDR') or None
+    trusted = set(getattr(settings, 'JOB_VIEW_TRUSTED_PROXIES', []))
+    if remote_addr not in trusted:
+        return remote_addr
+
+    forwarded = [ip.strip() for ip in meta.get('HTTP_X_FORWARDED_FOR', '').split(',') if ip.strip()]
+    for ip in reversed(forwarded):
+        if ip not in trusted:
+            return ip
+    return forwarded[0] if forwarded else remote_addr
+
+
+def valid_ip(value: Optional[str]) -> Optional[str]:
+    """Normalized IP address, or None when value is not one (stored as inet)."""
+    if not value:
+        return None
+    try:
+        return str(ipaddress.ip_address(value))
+    except ValueError:
+        return None
+
+
+def get_buffer():
+    """Buffer configured by JOB_VIEW_BUFFER ('redis' or 'memory'), one per process."""
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                if getattr(settings, 'JOB_VIEW_BUFFER', 'memory') == 'redis':
+                    _buffer = RedisJobViewBuffer(settings.JOB_VIEW_REDIS_URL)
+                else:
+                    _buffer = MemoryJobViewBuffer()
+    return _buffer
+
+
+class JobViewIngestionService:
+    """
+    Ghi nhận lượt xem công việc qua bộ đệm và ghi xuống DB theo lô.
+
+    record() only appends an event to the buffer (no row lock on jobs).
+    flush(), run periodically by flush_job_views_task, bulk inserts the
+    JobView rows and applies the view_count increments of a whole chunk
+    with one UPDATE ... CASE.
+    """
+
+    @staticmethod
+    def dedup_key(job_id: int, user_id: Optional[int], ip_address: Optional[str]) -> Optional[str]:
+        """Cache key identifying a viewer of a job, or None for anonymous viewers without IP."""
+        if user_id:
+            return f"job_views:seen:{job_id}:u{user_id}"
+        if ip_address:
+            return f"job_views:seen:{job_id}:ip{ip_address}"
+        return None
+
+    @classmethod
+    def record(
+        cls,
+        job_id: int,
+        user_id: Optional[int] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        referrer: Optional[str] = None,
+    ) -> bool:
+        """
+        Buffer one view.
+
+        A viewer (user, else IP) is counted once per job every
+        JOB_VIEW_DEDUP_SECONDS; 0 disables deduplication.
+
+        Returns:
+            False when the view was dropped as a duplicate
+        """
+        # Forwarded addresses are client content; one the database rejects
+        # would fail its whole flush chunk
+        ip_address = valid_ip(ip_address)
+        window = getattr(settings, 'JOB_VIEW_DEDUP_SECONDS', 1800)
+        key = cls.dedup_key(job_id, user_id, ip_address)
+        if window and key and not cache.add(key, 1, timeout=window):
+            return False
+
+        get_buffer().push({
+            'job_id': job_id,
+            'user_id': user_id,
+            'ip_address': ip_address,
+            'user_agent': (user_agent or '')[:MAX_USER_AGENT_LENGTH] or None,
+            'referrer': (referrer or '')[:MAX_REFERRER_LENGTH] or None,
+            'viewed_at': timezone.now().isoformat(),
+        })
+        return True
+
+    @classmethod
+    def flush(cls, batch_size: Optional[int] = None, max_batches: int = 100) -> int:
+        """
+        Move buffered views to the database, chunk by chunk.
+
+        With the Redis buffer only one flusher runs at a time (Redis lock);
+        a concurrent run returns immediately. The lock TTL is renewed before
+        every chunk, and a flusher whose lock expired stops instead of
+        applying chunks the new holder may also be reading.
+
+        A chunk the database rejects is retried event by event; events that
+        fail on bad data go to the buffer's dead-letter list and the chunk
+        is acknowledged, so one bad event cannot stall the stream. Other
+        errors (e.g. the database is down) leave the chunk to the next run.
+
+        Returns:
+            Number of views written
+        """
+        batch_size = batch_size or getattr(settings, 'JOB_VIEW_FLUSH_BATCH_SIZE', 5000)
+        buffer = get_buffer()
+
+        lock = buffer.lock(timeout=300) if hasattr(buffer, 'lock') else None
+        if lock is not None and not lock.acquire():
+            return 0
+
+        written = 0
+        try:
+            for batch in range(max_batches):
+                if lock is not None and batch and not buffer.renew_lock(lock):
+                    logger.warning("Job view flush lock expired, stopping flush")
+                    lock = None
+                    break
+                ids, events = buffer.read(batch_size)
+                if not events:
+                    break
+                try:
+                    written += cls.apply(events)
+                except Exception:
+                    logger.exception("Job view chunk failed, retrying its events one by one")
+                    written += cls.apply_each(ids, events, buffer)
+                buffer.ack(ids)
+                if len(events) < batch_size:
+                    break
+        finally:
+            if lock is not None:
+                buffer.release_lock(lock)
+
+        if written:
+            logger.info(f"Flushed {written} job views")
+        return written
+
+    @classmethod
+    def apply_each(cls, ids: list, events: List[dict], buffer) -> int:
+        """
+        Write events one at a time, dead-lettering those that fail on bad data.
+
+        Each event commits on its own, so when another error stops the loop
+        the events already handled (written or dead-lettered) are acked
+        before it is re-raised; the next flush only re-reads the rest.
+
+        Returns:
+            Number of views written
+        """
+        written = 0
+        dead = []
+        handled = 0
+        try:
+            for event in events:
+                try:
+                    written += cls.apply([event])
+                except PERMANENT_ERRORS:
+                    dead.append(event)
+                handled += 1
+        finally:
+            if dead:
+                logger.error(f"Moved {len(dead)} job view events to the dead-letter list")
+                buffer.dead_letter(dead)
+            if handled < len(events):
+                buffer.ack(ids[:handled])
+        return written
+
+    @staticmethod
+    def apply(events: List[dict]) -> int:
+        """
+        Write one chunk of events: one bulk INSERT of JobView rows and one
+        UPDATE of jobs.view_count. Events of deleted jobs are dropped and
+        deleted users are stored as anonymous views.
+
+        Returns:
+            Number of views written
+        """
+        job_ids = set(
+            Job.objects.filter(id__in={event['job_id'] for event in events}).values_list('id', flat=True)
+        )
+        user_ids = {event['user_id'] for event in events if event['user_id']}
+        if user_ids:
+            user_ids = set(get_user_model().objects.filter(id__in=user_ids).values_list('id', flat=True))
+
+        views = [
+            JobView(
+                job_id=event['job_id'],
+                user_id=event['user_id'] if event['user_id'] in user_ids else None,
+                ip_address=event['ip_address'],
+                user_agent=event['user_agent'],
+                referrer=event['referrer'],
+                viewed_at=datetime.fromisoformat(event['viewed_at']),
+            )
+            for event in events
+            if event['job_id'] in job_ids
+        ]
+        if not views:
+            return 0
+
+        increments = Counter(view.job_id for view in views)
+        with transaction.atomic():
+            JobView.objects.bulk_create(views, batch_size=1000)
+            Job.objects.filter(id__in=list(increments)).update(
+                view_count=F('view_count') + Case(
+                    *[When(id=job_id, then=Value(count)) for job_id, count in increments.items()],
+                    default=Value(0),
+                    output_field=IntegerField()
+                )
+            )
+        return len(views)
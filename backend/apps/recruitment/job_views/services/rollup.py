@@ -0,0 +1,242 @@
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.recruitment.job_views.models import JobView, JobViewDailyStat, JobViewRollupState, JobViewViewerStat
+from apps.recruitment.job_views.services.hyperloglog import HyperLogLog
+
+
+logger = logging.getLogger(__name__)
+
+
+ROLLUP_NAME = 'job_view_daily'
+
+# JobView columns read by the rollup and by the live tail of the selectors
+VIEW_FIELDS = ('id', 'job_id', 'user_id', 'ip_address', 'user_agent', 'referrer', 'viewed_at')
+
+
+def referrer_source(referrer: Optional[str]) -> str:
+    """Domain of a referrer without 'www.', 'direct' when there is none."""
+    if not referrer:
+        return 'direct'
+    try:
+        domain = urlparse(referrer).netloc or 'direct'
+    except ValueError:
+        return 'other'
+    return domain[4:] if domain.startswith('www.') else domain
+
+
+def viewer_key(view: dict) -> Optional[str]:
+    """Identity of a viewer for unique counts: user, else IP, None when neither is known."""
+    if view['user_id']:
+        return f"u{view['user_id']}"
+    if view['ip_address']:
+        return f"ip{view['ip_address']}"
+    return None
+
+
+def device_class(user_agent: Optional[str]) -> Optional[str]:
+    """mobile / tablet / desktop / other, None when there is no user agent."""
+    if not user_agent:
+        return None
+    ua = user_agent.lower()
+    if 'mobile' in ua or 'android' in ua or 'iphone' in ua:
+        return 'mobile'
+    if 'tablet' in ua or 'ipad' in ua:
+        return 'tablet'
+    if 'windows' in ua or 'macintosh' in ua or 'linux' in ua:
+        return 'desktop'
+    return 'other'
+
+
+class DayStat:
+    """Tổng hợp lượt xem của một job trong một ngày (trong bộ nhớ)."""
+
+    __slots__ = ('total_views', 'logged_in_views', 'referrer_counts', 'device_counts')
+
+    def __init__(self):
+        self.total_views = 0
+        self.logged_in_views = 0
+        self.referrer_counts = Counter()
+        self.device_counts = Counter()
+
+    @classmethod
+    def from_model(cls, stat: JobViewDailyStat) -> 'DayStat':
+        day = cls()
+        day.total_views = stat.total_views
+        day.logged_in_views = stat.logged_in_views
+        day.referrer_counts = Counter(stat.referrer_counts)
+        day.device_counts = Counter(stat.device_counts)
+        return day
+
+    def add_view(self, view: dict) -> None:
+        self.total_views += 1
+        if view['user_id']:
+            self.logged_in_views += 1
+        self.referrer_counts[referrer_source(view['referrer'])] += 1
+        device = device_class(view['user_agent'])
+        if device:
+            self.device_counts[device] += 1
+
+    def merge(self, other: 'DayStat') -> None:
+        self.total_views += other.total_views
+        self.logged_in_views += other.logged_in_views
+        self.referrer_counts.update(other.referrer_counts)
+        self.device_counts.update(other.device_counts)
+
+    def apply_to(self, stat: JobViewDailyStat) -> JobViewDailyStat:
+        stat.total_views = self.total_views
+        stat.logged_in_views = self.logged_in_views
+        stat.referrer_counts = dict(self.referrer_counts)
+        stat.device_counts = dict(self.device_counts)
+        return stat
+
+
+def aggregate_views(views: Iterable[dict]) -> Dict[Tuple[int, date], DayStat]:
+    """Group JobView values (VIEW_FIELDS) per (job_id, local date)."""
+    days = defaultdict(DayStat)
+    for view in views:
+        days[(view['job_id'], timezone.localdate(view['viewed_at']))].add_view(view)
+    return days
+
+
+class JobViewRollupService:
+    """
+    Tổng hợp JobView vào JobViewDailyStat theo từng lô (tăng dần theo id).
+
+    Views are consumed in id order past a watermark stored in
+    JobViewRollupState, so each view is rolled up exactly once even when
+    it is written late (buffered ingestion). Views past the watermark are
+    read live by the selectors, which keeps the endpoints exact between
+    runs. Unique viewers are kept per job in one fixed-size HyperLogLog
+    sketch (JobViewViewerStat), not as per-day id lists. JobView rows are
+    expected to be inserted by the single job view flusher, so ids become
+    visible in order.
+    """
+
+    @staticmethod
+    def watermark() -> int:
+        """Last JobView.id already rolled up."""
+        return (
+            JobViewRollupState.objects
+            .filter(name=ROLLUP_NAME)
+            .values_list('last_view_id', flat=True)
+            .first()
+        ) or 0
+
+    @staticmethod
+    def viewer_sketch(job_id: int) -> HyperLogLog:
+        """All-time viewer sketch of a job (empty before its first rollup)."""
+        sketch = (
+            JobViewViewerStat.objects
+            .filter(job_id=job_id)
+            .values_list('viewer_sketch', flat=True)
+            .first()
+        )
+        return HyperLogLog(sketch)
+
+    @classmethod
+    def run(cls, batch_size: Optional[int] = None, max_batches: int = 100) -> int:
+        """
+        Roll up new views.
+
+        Returns:
+            Number of views rolled up
+        """
+        batch_size = batch_size or getattr(settings, 'JOB_VIEW_ROLLUP_BATCH_SIZE', 50000)
+        JobViewRollupState.objects.get_or_create(name=ROLLUP_NAME)
+
+        total = 0
+        for _ in range(max_batches):
+            count = cls._run_batch(batch_size)
+            total += count
+            if count < batch_size:
+                break
+
+        if total:
+            logger.info(f"Rolled up {total} job views")
+        return total
+
+    @staticmethod
+    def _run_batch(batch_size: int) -> int:
+        with transaction.atomic():
+            # Serializes concurrent runs on the state row
+            state = JobViewRollupState.objects.select_for_update().get(name=ROLLUP_NAME)
+            views = list(
+                JobView.objects
+                .filter(id__gt=state.last_view_id)
+                .order_by('id')
+                .values(*VIEW_FIELDS)[:batch_size]
+            )
+            if not views:
+                return 0
+
+            days = aggregate_views(views)
+            existing = {
+                (stat.job_id, stat.date): stat
+                for stat in JobViewDailyStat.objects.filter(
+                    job_id__in={job_id for job_id, _ in days},
+                    date__in={day for _, day in days},
+                )
+            }
+
+            now = timezone.now()
+            created, updated = [], []
+            for (job_id, day), delta in days.items():
+                stat = existing.get((job_id, day))
+                if stat is None:
+                    created.append(delta.apply_to(JobViewDailyStat(job_id=job_id, date=day)))
+                else:
+                    merged = DayStat.from_model(stat)
+                    merged.merge(delta)
+                    stat.updated_at = now
+                    updated.append(merged.apply_to(stat))
+
+            JobViewDailyStat.objects.bulk_create(created, batch_size=1000)
+            JobViewDailyStat.objects.bulk_update(
+                updated,
+                ['total_views', 'logged_in_views', 'referrer_counts', 'device_counts', 'updated_at'],
+                batch_size=1000
+            )
+            JobViewRollupService._update_viewer_sketches(views, now)
+
+            state.last_view_id = views[-1]['id']
+            state.save(update_fields=['last_view_id', 'updated_at'])
+        return len(views)
+
+    @staticmethod
+    def _update_viewer_sketches(views: list, now) -> None:
+        """Add the viewers of a batch to the all-time sketch of their jobs."""
+        viewers = defaultdict(set)
+        for view in views:
+            key = viewer_key(view)
+            if key:
+                viewers[view['job_id']].add(key)
+        if not viewers:
+            return
+
+        existing = {
+            stat.job_id: stat
+            for stat in JobViewViewerStat.objects.filter(job_id__in=list(viewers))
+        }
+        created, updated = [], []
+        for job_id, keys in viewers.items():
+            stat = existing.get(job_id)
+            sketch = HyperLogLog(stat.viewer_sketch if stat else None)
+            for key in keys:
+                sketch.add(key)
+            if stat is None:
+                created.append(JobViewViewerStat(job_id=job_id, viewer_sketch=sketch.to_bytes()))
+            else:
+                stat.viewer_sketch = sketch.to_bytes()
+                stat.updated_at = now
+                updated.append(stat)
+
+        JobViewViewerStat.objects.bulk_create(created, batch_size=1000)
+        JobViewViewerStat.objects.bulk_update(updated, ['viewer_sketch', 'updated_at'], batch_size=1000)
@@ -0,0 +1,23 @@
+from celery import shared_task
+import logging
+
+from apps.recruitment.job_views.services.ingestion import JobViewIngestionService
+from apps.recruitment.job_views.services.rollup import JobViewRollupService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def flush_job_views_task():
+    """
+    Celery task ghi các lượt xem trong bộ đệm xuống DB (chạy mỗi 30 giây).
+    """
+    return JobViewIngestionService.flush()
+
+
+@shared_task
+def rollup_job_views_task():
+    """
+    Celery task tổng hợp JobView mới vào JobViewDailyStat (chạy mỗi 5 phút).
+    """
+    return JobViewRollupService.run()
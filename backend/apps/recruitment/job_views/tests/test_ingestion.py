@@ -0,0 +1,233 @@
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.db import DataError
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.core.users.models import CustomUser
+from apps.company.companies.models import Company
+from apps.recruitment.jobs.models import Job
+from apps.recruitment.job_views.models import JobView
+from apps.recruitment.job_views.services import ingestion
+from apps.recruitment.job_views.services.ingestion import JobViewIngestionService
+
+
+@override_settings(JOB_VIEW_BUFFER='memory', JOB_VIEW_DEDUP_SECONDS=1800)
+class JobViewIngestionTests(APITestCase):
+    """Ghi nhận lượt xem qua bộ đệm + flush theo lô"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = CustomUser.objects.create_user(
+            email="ingest-owner@example.com",
+            password="password123",
+            full_name="Owner"
+        )
+        cls.viewer = CustomUser.objects.create_user(
+            email="ingest-viewer@example.com",
+            password="password123",
+            full_name="Viewer"
+        )
+        cls.company = Company.objects.create(user=cls.owner, company_name="Ingest Co", slug="ingest-co")
+        cls.jobs = [
+            Job.objects.create(
+                company=cls.company,
+                title=f"Job {i}",
+                slug=f"ingest-job-{i}",
+                status="published",
+                created_by=cls.owner
+            )
+            for i in range(2)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        ingestion._buffer = None
+
+    def tearDown(self):
+        ingestion._buffer = None
+
+    def test_view_endpoint_buffers_until_flush(self):
+        job = self.jobs[0]
+        self.client.force_authenticate(self.viewer)
+        response = self.client.post(
+            f'/api/jobs/{job.id}/view/',
+            HTTP_USER_AGENT='Mozilla/5.0',
+            HTTP_REFERER='https://example.com/search',
+            REMOTE_ADDR='10.0.0.1'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['recorded'])
+        self.assertFalse(JobView.objects.exists())
+
+        self.assertEqual(JobViewIngestionService.flush(), 1)
+        view = JobView.objects.get()
+        self.assertEqual(
+            (view.job_id, view.ip_address, view.user_agent, view.referrer),
+            (job.id, '10.0.0.1', 'Mozilla/5.0', 'https://example.com/search')
+        )
+        job.refresh_from_db()
+        self.assertEqual(job.view_count, 1)
+
+    def test_duplicate_views_are_dropped(self):
+        job = self.jobs[0]
+        self.client.force_authenticate(self.viewer)
+
+        first = self.client.post(f'/api/jobs/{job.id}/view/', REMOTE_ADDR='10.0.0.1')
+        second = self.client.post(f'/api/jobs/{job.id}/view/', REMOTE_ADDR='10.0.0.2')
+
+        self.assertTrue(first.data['recorded'])
+        self.assertFalse(second.data['recorded'])
+        self.assertEqual(JobViewIngestionService.flush(), 1)
+        self.assertEqual(JobView.objects.get().user_id, self.viewer.id)
+
+    def test_forwarded_for_ignored_without_trusted_proxy(self):
+        """A spoofed X-Forwarded-For cannot change the address used for dedup."""
+        self.assertEqual(
+            ingestion.client_ip({'REMOTE_ADDR': '10.0.0.1', 'HTTP_X_FORWARDED_FOR': '1.1.1.1'}),
+            '10.0.0.1'
+        )
+
+    @override_settings(JOB_VIEW_TRUSTED_PROXIES=['10.0.0.254'])
+    def test_client_ip_behind_trusted_proxy(self):
+        """Behind a trusted proxy the right-most untrusted forwarded address is used."""
+        self.assertEqual(
+            ingestion.client_ip({'REMOTE_ADDR': '10.0.0.254', 'HTTP_X_FORWARDED_FOR': '9.9.9.9, 203.0.113.7'}),
+            '203.0.113.7'
+        )
+        self.assertEqual(
+            ingestion.client_ip({'REMOTE_ADDR': '10.0.0.9', 'HTTP_X_FORWARDED_FOR': '203.0.113.7'}),
+            '10.0.0.9'
+        )
+
+    @override_settings(JOB_VIEW_DEDUP_SECONDS=0)
+    def test_flush_stops_when_lock_expires(self):
+        """A flusher that lost its lock stops after the chunk in progress."""
+        from redis.exceptions import LockNotOwnedError
+
+        for _ in range(4):
+            JobViewIngestionService.record(self.jobs[0].id)
+        buffer = ingestion.get_buffer()
+        lock = MagicMock()
+        lock.acquire.return_value = True
+        lock.reacquire.side_effect = LockNotOwnedError('expired')
+        buffer.lock = lambda timeout: lock
+        buffer.renew_lock = ingestion.RedisJobViewBuffer.renew_lock
+        buffer.release_lock = ingestion.RedisJobViewBuffer.release_lock
+
+        written = JobViewIngestionService.flush(batch_size=2)
+
+        self.assertEqual(written, 2)
+        self.assertEqual(len(buffer), 2)
+        lock.release.assert_not_called()
+
+    @override_settings(JOB_VIEW_DEDUP_SECONDS=0)
+    def test_flush_aggregates_increments_per_job(self):
+        for job_id, count in ((self.jobs[0].id, 3), (self.jobs[1].id, 2)):
+            for _ in range(count):
+                JobViewIngestionService.record(job_id, ip_address='10.0.0.1')
+
+        written = JobViewIngestionService.flush(batch_size=2)
+
+        self.assertEqual(written, 5)
+        self.assertEqual(
+            dict(Job.objects.filter(id__in=[job.id for job in self.jobs]).values_list('id', 'view_count')),
+            {self.jobs[0].id: 3, self.jobs[1].id: 2}
+        )
+        self.assertEqual(len(ingestion.get_buffer()), 0)
+
+    def test_flush_keeps_view_time_and_skips_deleted_jobs(self):
+        viewed_at = timezone.now() - timedelta(minutes=5)
+        ingestion.get_buffer().push({
+            'job_id': self.jobs[0].id, 'user_id': None, 'ip_address': None,
+            'user_agent': None, 'referrer': None, 'viewed_at': viewed_at.isoformat(),
+        })
+        ingestion.get_buffer().push({
+            'job_id': 0, 'user_id': None, 'ip_address': None,
+            'user_agent': None, 'referrer': None, 'viewed_at': viewed_at.isoformat(),
+        })
+
+        self.assertEqual(JobViewIngestionService.flush(), 1)
+        self.assertEqual(JobView.objects.get().viewed_at, viewed_at)
+
+    @override_settings(JOB_VIEW_DEDUP_SECONDS=0)
+    def test_invalid_ip_is_stored_as_none(self):
+        """A forwarded value that is not an IP address never reaches the inet column."""
+        JobViewIngestionService.record(self.jobs[0].id, ip_address='unknown, <script>')
+        JobViewIngestionService.record(self.jobs[0].id, ip_address='2001:DB8::1')
+
+        self.assertEqual(JobViewIngestionService.flush(), 2)
+        self.assertEqual(
+            set(JobView.objects.values_list('ip_address', flat=True)),
+            {None, '2001:db8::1'}
+        )
+
+    @override_settings(JOB_VIEW_DEDUP_SECONDS=0)
+    def test_rejected_event_is_dead_lettered_and_chunk_acked(self):
+        """One event the database rejects does not stall the rest of the stream."""
+        for ip in ('10.0.0.1', '10.0.0.2', '10.0.0.3'):
+            JobViewIngestionService.record(self.jobs[0].id, ip_address=ip)
+        apply = JobViewIngestionService.apply
+
+        def reject_bad(events):
+            if any(event['ip_address'] == '10.0.0.2' for event in events):
+                raise DataError('invalid input syntax for type inet')
+            return apply(events)
+
+        with patch.object(JobViewIngestionService, 'apply', side_effect=reject_bad):
+            written = JobViewIngestionService.flush()
+
+        self.assertEqual(written, 2)
+        buffer = ingestion.get_buffer()
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual([event['ip_address'] for event in buffer.dead_letters], ['10.0.0.2'])
+        self.jobs[0].refresh_from_db()
+        self.assertEqual(self.jobs[0].view_count, 2)
+
+    @override_settings(JOB_VIEW_DEDUP_SECONDS=0)
+    def test_outage_leaves_chunk_for_next_run(self):
+        """Errors other than bad data keep the chunk buffered."""
+        from django.db import OperationalError
+
+        JobViewIngestionService.record(self.jobs[0].id, ip_address='10.0.0.1')
+
+        with patch.object(JobViewIngestionService, 'apply', side_effect=OperationalError('down')):
+            with self.assertRaises(OperationalError):
+                JobViewIngestionService.flush()
+
+        self.assertEqual(len(ingestion.get_buffer()), 1)
+        self.assertEqual(JobViewIngestionService.flush(), 1)
+
+    @override_settings(JOB_VIEW_DEDUP_SECONDS=0)
+    def test_outage_during_retry_acks_written_events(self):
+        """Events committed one by one before an outage are not written again."""
+        from django.db import OperationalError
+
+        for ip in ('10.0.0.1', '10.0.0.2', '10.0.0.3'):
+            JobViewIngestionService.record(self.jobs[0].id, ip_address=ip)
+        apply = JobViewIngestionService.apply
+
+        def fail_chunk_then_second_event(events):
+            if len(events) > 1:
+                raise DataError('invalid input syntax for type inet')
+            if events[0]['ip_address'] == '10.0.0.2':
+                raise OperationalError('connection dropped')
+            return apply(events)
+
+        with patch.object(JobViewIngestionService, 'apply', side_effect=fail_chunk_then_second_event):
+            with self.assertRaises(OperationalError):
+                JobViewIngestionService.flush()
+
+        self.assertEqual(len(ingestion.get_buffer()), 2)
+        self.assertEqual(JobViewIngestionService.flush(), 2)
+        self.assertEqual(
+            sorted(JobView.objects.values_list('ip_address', flat=True)),
+            ['10.0.0.1', '10.0.0.2', '10.0.0.3']
+        )
+        self.jobs[0].refresh_from_db()
+        self.assertEqual(self.jobs[0].view_count, 3)
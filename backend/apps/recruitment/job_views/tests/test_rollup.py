@@ -0,0 +1,116 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.core.users.models import CustomUser
+from apps.company.companies.models import Company
+from apps.recruitment.jobs.models import Job
+from apps.recruitment.job_views.models import JobView, JobViewDailyStat, JobViewViewerStat
+from apps.recruitment.job_views.selectors.job_views import (
+    get_view_chart_data,
+    get_view_stats,
+    get_viewer_demographics,
+)
+from apps.recruitment.job_views.services.rollup import JobViewRollupService
+
+
+class JobViewRollupTests(APITestCase):
+    """Tổng hợp lượt xem theo ngày (JobViewDailyStat)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = CustomUser.objects.create_user(
+            email="rollup-owner@example.com",
+            password="password123",
+            full_name="Owner"
+        )
+        cls.viewer = CustomUser.objects.create_user(
+            email="rollup-viewer@example.com",
+            password="password123",
+            full_name="Viewer"
+        )
+        cls.company = Company.objects.create(user=cls.owner, company_name="Rollup Co", slug="rollup-co")
+        cls.job = Job.objects.create(
+            company=cls.company,
+            title="Rollup Job",
+            slug="rollup-job",
+            status="published",
+            created_by=cls.owner
+        )
+
+    def _view(self, days_ago=0, **kwargs):
+        return JobView.objects.create(
+            job=self.job,
+            viewed_at=timezone.now() - timedelta(days=days_ago),
+            **kwargs
+        )
+
+    def test_rollup_groups_views_per_day(self):
+        self._view(user=self.viewer, ip_address='10.0.0.1', referrer='https://www.google.com/search',
+                   user_agent='Mozilla/5.0 (iPhone; CPU iPhone OS 14_0)')
+        self._view(user=self.viewer, ip_address='10.0.0.2')
+        self._view(days_ago=2, ip_address='10.0.0.3', user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64)')
+
+        self.assertEqual(JobViewRollupService.run(), 3)
+
+        today = JobViewDailyStat.objects.get(job=self.job, date=timezone.localdate())
+        self.assertEqual(today.total_views, 2)
+        self.assertEqual(today.logged_in_views, 2)
+        self.assertEqual(today.referrer_counts, {'google.com': 1, 'direct': 1})
+        self.assertEqual(today.device_counts, {'mobile': 1})
+        self.assertEqual(JobViewDailyStat.objects.filter(job=self.job).count(), 2)
+
+    def test_rollup_is_incremental(self):
+        self._view(ip_address='10.0.0.1')
+        JobViewRollupService.run()
+        self._view(ip_address='10.0.0.1')
+        self._view(ip_address='10.0.0.2')
+
+        self.assertEqual(JobViewRollupService.run(batch_size=1), 2)
+        self.assertEqual(JobViewRollupService.run(), 0)
+
+        stat = JobViewDailyStat.objects.get(job=self.job)
+        self.assertEqual(stat.total_views, 3)
+        self.assertEqual(JobViewRollupService.viewer_sketch(self.job.id).count(), 2)
+
+    def test_viewer_sketch_stays_fixed_size(self):
+        """Unique viewers are one fixed-size sketch per job, whatever the traffic."""
+        for i in range(300):
+            self._view(days_ago=i % 3, ip_address=f'10.0.{i // 256}.{i % 256}')
+        JobViewRollupService.run()
+        size = len(JobViewViewerStat.objects.get(job=self.job).viewer_sketch)
+
+        for i in range(300):
+            self._view(ip_address=f'10.1.{i // 256}.{i % 256}')
+        JobViewRollupService.run()
+
+        self.assertEqual(JobViewViewerStat.objects.count(), 1)
+        self.assertEqual(len(JobViewViewerStat.objects.get(job=self.job).viewer_sketch), size)
+        # HyperLogLog estimate, within a few percent
+        self.assertAlmostEqual(get_view_stats(self.job.id)['unique_views'], 600, delta=30)
+
+    def test_selectors_combine_rollup_and_tail(self):
+        self._view(user=self.viewer, referrer='https://linkedin.com/jobs')
+        self._view(days_ago=3, ip_address='10.0.0.1')
+        JobViewRollupService.run()
+        # Not rolled up yet
+        self._view(user=self.viewer, user_agent='Mozilla/5.0 (Macintosh)')
+
+        stats = get_view_stats(self.job.id)
+        self.assertEqual(
+            (stats['total_views'], stats['unique_views'], stats['views_today'], stats['views_this_week']),
+            (3, 2, 2, 3)
+        )
+
+        chart = {item['date']: item['views'] for item in get_view_chart_data(self.job.id)['data']}
+        self.assertEqual(chart[timezone.localdate().isoformat()], 2)
+        self.assertEqual(chart[(timezone.localdate() - timedelta(days=3)).isoformat()], 1)
+
+        demographics = get_viewer_demographics(self.job.id)
+        self.assertEqual(demographics['authenticated_ratio'], {'logged_in': 2, 'anonymous': 1})
+        self.assertEqual(demographics['by_device'], [{'device': 'desktop', 'count': 1}])
+        self.assertEqual(
+            {item['source']: item['count'] for item in demographics['by_referrer']},
+            {'linkedin.com': 1, 'direct': 2}
+        )
@@ -5,3 +5,6 @@ class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.recruitment.jobs'
     label = 'recruitment_jobs'
+
+    def ready(self):
+        import apps.recruitment.jobs.signals
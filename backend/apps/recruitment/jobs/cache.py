@@ -0,0 +1,13 @@
+from django.conf import settings
+
+from apps.core.cache import TwoTierCache
+
+
+# Response cache of the public job endpoints (featured, urgent, similar,
+# retrieve_by_slug); invalidated by the Job signals in signals.py
+job_cache = TwoTierCache(
+    'jobs',
+    l1_ttl=getattr(settings, 'JOB_CACHE_L1_TTL', 5),
+    l2_ttl=getattr(settings, 'JOB_CACHE_L2_TTL', 300),
+    max_entries=getattr(settings, 'JOB_CACHE_L1_MAX_ENTRIES', 1000),
+)
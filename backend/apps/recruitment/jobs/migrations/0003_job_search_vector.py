@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:40
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def build_job_search_vectors(apps, schema_editor):
+    """Fill search_vector for existing jobs (same expression as job_search_vector())."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Job = apps.get_model('recruitment_jobs', 'Job')
+    Job.objects.update(search_vector=(
+        SearchVector('title', weight='A', config='english')
+        + SearchVector('requirements', weight='B', config='english')
+        + SearchVector('description', weight='C', config='english')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment_jobs', '0002_job_idx_jobs_title_desc_gin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True, verbose_name='Chỉ mục tìm kiếm'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='idx_jobs_search_vector_gin'),
+        ),
+        migrations.RunPython(build_job_search_vectors, migrations.RunPython.noop),
+    ]
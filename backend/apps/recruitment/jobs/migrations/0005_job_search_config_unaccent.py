@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:10
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.operations import UnaccentExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def rebuild_job_search_vectors(apps, schema_editor):
+    """Rebuild search_vector with job_search and skill names (same expression as job_search_vector())."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Job = apps.get_model('recruitment_jobs', 'Job')
+    JobSkill = apps.get_model('recruitment_job_skills', 'JobSkill')
+    skill_names = Subquery(
+        JobSkill.objects
+        .filter(job_id=OuterRef('pk'))
+        .values('job_id')
+        .annotate(names=StringAgg('skill__name', delimiter=' '))
+        .values('names')[:1]
+    )
+    Job.objects.update(search_vector=(
+        SearchVector('title', weight='A', config='job_search')
+        + SearchVector(skill_names, weight='B', config='job_search')
+        + SearchVector('requirements', weight='C', config='job_search')
+        + SearchVector('description', weight='D', config='job_search')
+    ))
+
+
+def create_job_search_config(apps, schema_editor):
+    """Create the job_search text search configuration (english + unaccent)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE TEXT SEARCH CONFIGURATION job_search (COPY = english);")
+    schema_editor.execute(
+        "ALTER TEXT SEARCH CONFIGURATION job_search "
+        "ALTER MAPPING FOR hword, hword_part, word WITH unaccent, english_stem;"
+    )
+
+
+def drop_job_search_config(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP TEXT SEARCH CONFIGURATION job_search;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment_jobs', '0004_job_idx_jobs_status_keyset'),
+        ('recruitment_job_skills', '0002_initial'),
+    ]
+
+    operations = [
+        UnaccentExtension(),
+        migrations.RunPython(create_job_search_config, drop_job_search_config),
+        migrations.RunPython(rebuild_job_search_vectors, migrations.RunPython.noop),
+    ]
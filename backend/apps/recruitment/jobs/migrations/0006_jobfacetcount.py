@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment_jobs', '0005_job_search_config_unaccent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(max_length=20, verbose_name='Facet')),
+                ('value', models.CharField(max_length=50, verbose_name='Giá trị')),
+                ('label', models.CharField(max_length=255, verbose_name='Nhãn')),
+                ('count', models.IntegerField(default=0, verbose_name='Số lượng')),
+                ('refreshed_at', models.DateTimeField(verbose_name='Thời điểm cập nhật')),
+            ],
+            options={
+                'verbose_name': 'Số lượng theo facet',
+                'verbose_name_plural': 'Số lượng theo facet',
+                'db_table': 'job_facet_counts',
+                'constraints': [models.UniqueConstraint(fields=('facet', 'value'), name='uq_job_facet_counts_facet_value')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment_jobs', '0006_jobfacetcount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSimilarityState',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='similarity_state', serialize=False, to='recruitment_jobs.job', verbose_name='Công việc')),
+                ('features_hash', models.CharField(max_length=32, verbose_name='Hash đặc trưng')),
+                ('computed_at', models.DateTimeField(verbose_name='Thời điểm tính')),
+            ],
+            options={
+                'verbose_name': 'Trạng thái tính việc làm tương tự',
+                'verbose_name_plural': 'Trạng thái tính việc làm tương tự',
+                'db_table': 'job_similarity_state',
+            },
+        ),
+        migrations.CreateModel(
+            name='SimilarJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Độ tương tự')),
+                ('rank', models.SmallIntegerField(verbose_name='Thứ hạng')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_jobs', to='recruitment_jobs.job', verbose_name='Công việc')),
+                ('similar_job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_to_jobs', to='recruitment_jobs.job', verbose_name='Công việc tương tự')),
+            ],
+            options={
+                'verbose_name': 'Việc làm tương tự',
+                'verbose_name_plural': 'Việc làm tương tự',
+                'db_table': 'similar_jobs',
+                'indexes': [models.Index(fields=['job', 'rank'], name='idx_similar_jobs_job_rank')],
+                'constraints': [models.UniqueConstraint(fields=('job', 'similar_job'), name='uq_similar_jobs_pair')],
+            },
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 
 class Job(models.Model):
@@ -185,6 +186,13 @@ class Job(models.Model):
         auto_now=True,
         verbose_name='Ngày cập nhật'
     )
+    # tsvector(title/skills/requirements/description), cập nhật bởi JobSearchVectorService
+    search_vector = SearchVectorField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Chỉ mục tìm kiếm'
+    )
     
     class Meta:
         db_table = 'jobs'
@@ -199,7 +207,112 @@ class Job(models.Model):
                 name='idx_jobs_title_desc_gin',
                 opclasses=['gin_trgm_ops', 'gin_trgm_ops']
             ),
+            GinIndex(fields=['search_vector'], name='idx_jobs_search_vector_gin'),
+            # Keyset pagination: (-featured, -published_at, -created_at, id)
+            models.Index(
+                fields=['status', '-featured', '-published_at', '-created_at', 'id'],
+                name='idx_jobs_status_keyset'
+            ),
+        ]
+    
+    def __str__(self):
+        return self.title
+
+
+class JobFacetCount(models.Model):
+    """Bảng Job_Facet_Counts - Số lượng tin theo facet (tính sẵn cho danh sách không lọc)"""
+    
+    facet = models.CharField(
+        max_length=20,
+        verbose_name='Facet'
+    )
+    value = models.CharField(
+        max_length=50,
+        verbose_name='Giá trị'
+    )
+    label = models.CharField(
+        max_length=255,
+        verbose_name='Nhãn'
+    )
+    count = models.IntegerField(
+        default=0,
+        verbose_name='Số lượng'
+    )
+    refreshed_at = models.DateTimeField(
+        verbose_name='Thời điểm cập nhật'
+    )
+    
+    class Meta:
+        db_table = 'job_facet_counts'
+        verbose_name = 'Số lượng theo facet'
+        verbose_name_plural = 'Số lượng theo facet'
+        constraints = [
+            models.UniqueConstraint(fields=['facet', 'value'], name='uq_job_facet_counts_facet_value'),
         ]
     
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f"{self.facet}={self.value}: {self.count}"
+
+
+class SimilarJob(models.Model):
+    """Bảng Similar_Jobs - Top-K việc làm tương tự của mỗi tin (tính sẵn)"""
+    
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name='similar_jobs',
+        verbose_name='Công việc'
+    )
+    similar_job = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name='similar_to_jobs',
+        verbose_name='Công việc tương tự'
+    )
+    score = models.FloatField(
+        verbose_name='Độ tương tự'
+    )
+    rank = models.SmallIntegerField(
+        verbose_name='Thứ hạng'
+    )
+    
+    class Meta:
+        db_table = 'similar_jobs'
+        verbose_name = 'Việc làm tương tự'
+        verbose_name_plural = 'Việc làm tương tự'
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'similar_job'], name='uq_similar_jobs_pair'),
+        ]
+        indexes = [
+            models.Index(fields=['job', 'rank'], name='idx_similar_jobs_job_rank'),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id} ~ {self.similar_job_id} ({self.score:.2f})"
+
+
+class JobSimilarityState(models.Model):
+    """Bảng Job_Similarity_State - Dấu vân tay đặc trưng của job lúc tính danh sách tương tự"""
+    
+    job = models.OneToOneField(
+        Job,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='similarity_state',
+        verbose_name='Công việc'
+    )
+    features_hash = models.CharField(
+        max_length=32,
+        verbose_name='Hash đặc trưng'
+    )
+    computed_at = models.DateTimeField(
+        verbose_name='Thời điểm tính'
+    )
+    
+    class Meta:
+        db_table = 'job_similarity_state'
+        verbose_name = 'Trạng thái tính việc làm tương tự'
+        verbose_name_plural = 'Trạng thái tính việc làm tương tự'
+    
+    def __str__(self):
+        return f"{self.job_id}: {self.features_hash}"
@@ -0,0 +1,178 @@
+from collections import defaultdict
+
+from django.db import connection
+from django.db.models import Case, CharField, Count, F, Q, QuerySet, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import LessThan
+
+from apps.geography.provinces.models import Province
+from apps.recruitment.job_categories.models import JobCategory
+from apps.recruitment.jobs.models import Job, JobFacetCount
+
+
+# Facets returned by /api/jobs/search/, in display order
+FACETS = ('category', 'level', 'job_type', 'province', 'salary_band')
+
+# Column of each facet in the grouped query
+FACET_COLUMNS = {
+    'category': 'category_id',
+    'level': 'level',
+    'job_type': 'job_type',
+    'province': 'province_id',
+    'salary_band': 'salary_band',
+}
+
+# list_jobs() filters whose facets are stored in JobFacetCount
+STORED_FACET_FILTERS = {'status': 'published'}
+
+# Facets whose values are foreign keys
+ID_FACETS = ('category', 'province')
+
+# Salary bands (VND per month) on the top of the posted range, ascending:
+# (value, label, upper bound exclusive)
+SALARY_BANDS = (
+    ('under_10m', 'Dưới 10 triệu', 10_000_000),
+    ('10m_20m', '10 - 20 triệu', 20_000_000),
+    ('20m_30m', '20 - 30 triệu', 30_000_000),
+    ('30m_50m', '30 - 50 triệu', 50_000_000),
+    ('over_50m', 'Trên 50 triệu', None),
+)
+NEGOTIABLE_BAND = ('negotiable', 'Thỏa thuận')
+
+
+def salary_band_expression() -> Case:
+    """CASE expression giving the salary band of a job."""
+    top = Coalesce(F('salary_max'), F('salary_min'))
+    whens = [
+        When(
+            Q(is_salary_negotiable=True) | Q(salary_max__isnull=True, salary_min__isnull=True),
+            then=Value(NEGOTIABLE_BAND[0])
+        ),
+    ]
+    for value, _, upper in SALARY_BANDS[:-1]:
+        whens.append(When(LessThan(top, upper), then=Value(value)))
+    return Case(*whens, default=Value(SALARY_BANDS[-1][0]), output_field=CharField())
+
+
+def compute_job_facets(queryset: QuerySet[Job]) -> dict:
+    """
+        Đếm số tin theo từng facet cho một queryset (một câu GROUP BY).
+
+        The filtered queryset is used as a subquery and grouped with
+        GROUPING SETS, so all facets come back from a single scan of the
+        matching rows. Backends without GROUPING SETS (SQLite in tests) run
+        one GROUP BY per facet instead. Jobs without a category or province
+        are not listed under those facets.
+
+        Returns:
+            {facet: [{'value', 'label', 'count'}, ...]} ordered by count desc
+    """
+    hits = (
+        queryset
+        .order_by()
+        .values(
+            'category_id',
+            'level',
+            'job_type',
+            province_id=F('address__province_id'),
+            salary_band=salary_band_expression(),
+        )
+    )
+    if connection.vendor == 'postgresql':
+        counts = _count_with_grouping_sets(hits)
+    else:
+        counts = _count_per_facet(hits)
+
+    labels = _facet_labels(counts)
+    return {
+        facet: [
+            {'value': value, 'label': labels[facet].get(value, str(value)), 'count': count}
+            for value, count in sorted(counts[facet].items(), key=lambda item: (-item[1], str(item[0])))
+        ]
+        for facet in FACETS
+    }
+
+
+def _count_with_grouping_sets(hits: QuerySet) -> dict:
+    """{facet: {value: count}} from one GROUP BY GROUPING SETS over hits."""
+    hits_sql, params = hits.query.sql_with_params()
+
+    columns = [FACET_COLUMNS[facet] for facet in FACETS]
+    groupings = ', '.join(f'GROUPING({column})' for column in columns)
+    sets = ', '.join(f'({column})' for column in columns)
+    sql = (
+        f"SELECT {', '.join(columns)}, {groupings}, COUNT(*) "
+        f"FROM ({hits_sql}) AS hits "
+        f"GROUP BY GROUPING SETS ({sets})"
+    )
+
+    counts = defaultdict(dict)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for row in cursor.fetchall():
+            values, grouped, count = row[:len(FACETS)], row[len(FACETS):-1], row[-1]
+            # GROUPING(column) is 0 for the column of the current grouping set
+            index = grouped.index(0)
+            if values[index] is not None:
+                counts[FACETS[index]][values[index]] = count
+    return counts
+
+
+def _count_per_facet(hits: QuerySet) -> dict:
+    """{facet: {value: count}} with one GROUP BY query per facet."""
+    counts = defaultdict(dict)
+    for facet in FACETS:
+        column = FACET_COLUMNS[facet]
+        rows = hits.values(column).annotate(count=Count('*')).values_list(column, 'count')
+        counts[facet] = {value: count for value, count in rows if value is not None}
+    return counts
+
+
+def _facet_labels(counts: dict) -> dict:
+    """Display labels of the facet values present in counts."""
+    return {
+        'category': dict(
+            JobCategory.objects.filter(id__in=list(counts['category'])).values_list('id', 'name')
+        ) if counts['category'] else {},
+        'province': dict(
+            Province.objects.filter(id__in=list(counts['province'])).values_list('id', 'province_name')
+        ) if counts['province'] else {},
+        'level': dict(Job.Level.choices),
+        'job_type': dict(Job.JobType.choices),
+        'salary_band': dict([NEGOTIABLE_BAND] + [(value, label) for value, label, _ in SALARY_BANDS]),
+    }
+
+
+def get_stored_job_facets() -> dict:
+    """
+        Facet tính sẵn trong JobFacetCount (tin đã đăng, STORED_FACET_FILTERS).
+        Returns an empty dict when the table has not been refreshed yet.
+    """
+    rows = list(JobFacetCount.objects.order_by('facet', '-count', 'value'))
+    if not rows:
+        return {}
+
+    facets = {facet: [] for facet in FACETS}
+    for row in rows:
+        if row.facet not in facets:
+            continue
+        value = int(row.value) if row.facet in ID_FACETS else row.value
+        facets[row.facet].append({'value': value, 'label': row.label, 'count': row.count})
+    return facets
+
+
+def get_job_facets(filters: dict, queryset: QuerySet[Job]) -> dict:
+    """
+        Facet counts for a list_jobs() queryset.
+
+        When the filters are exactly STORED_FACET_FILTERS the counts come
+        from JobFacetCount (refreshed periodically by
+        refresh_job_facets_task), which counts the same jobs as the hits.
+        Any other filters, or a table that is still empty, are computed
+        with compute_job_facets().
+    """
+    if filters == STORED_FACET_FILTERS:
+        facets = get_stored_job_facets()
+        if facets:
+            return facets
+    return compute_job_facets(queryset)
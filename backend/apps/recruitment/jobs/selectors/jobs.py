@@ -1,14 +1,25 @@
 from typing import Optional
 
-from django.db.models import QuerySet, Q, Count, Case, When, IntegerField, Value
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import QuerySet, Q, F, Count, Case, When, IntegerField, FloatField, Value, Exists, OuterRef
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from datetime import timedelta
 
-from apps.recruitment.jobs.models import Job
+from apps.recruitment.jobs.models import Job, JobSimilarityState
 from apps.recruitment.applications.models import Application
 from apps.candidate.recruiter_skills.models import RecruiterSkill
+from apps.recruitment.jobs.services.recommendations import recommend_job_ids
 from apps.recruitment.job_skills.models import JobSkill
+from apps.recruitment.jobs.services.search_vector import SEARCH_CONFIG, search_vector_enabled
+
+# Default sort of job lists (matches idx_jobs_status_keyset)
+JOB_ORDERING = ('-featured', '-published_at', '-created_at', 'id')
+
+# Search results: relevance first, then the default sort
+JOB_SEARCH_ORDERING = ('-search_rank',) + JOB_ORDERING
+
 
 def list_jobs(filters: dict = None) -> QuerySet[Job]:
     """
@@ -17,13 +28,14 @@ def list_jobs(filters: dict = None) -> QuerySet[Job]:
         Filters:
             - company_id: int
             - category_id: int  
+            - province_id: int (province of the job address)
             - job_type: str (full-time, part-time, etc.)
             - level: str (intern, fresher, junior, etc.)
             - status: str (draft, published, closed, expired)
             - is_remote: bool
             - salary_min: decimal
             - salary_max: decimal
-            - search: str (search in title)
+            - search: str (full-text search, ranked; see search_jobs)
     """
     queryset = Job.objects.select_related(
         'company', 'category', 'created_by'
@@ -40,6 +52,10 @@ def list_jobs(filters: dict = None) -> QuerySet[Job]:
     if filters.get('category_id'):
         queryset = queryset.filter(category_id=filters['category_id'])
     
+    # Filter by province
+    if filters.get('province_id'):
+        queryset = queryset.filter(address__province_id=filters['province_id'])
+    
     # Filter by job_type
     if filters.get('job_type'):
         queryset = queryset.filter(job_type=filters['job_type'])
@@ -70,11 +86,60 @@ def list_jobs(filters: dict = None) -> QuerySet[Job]:
             Q(salary_min__lte=filters['salary_max']) | Q(is_salary_negotiable=True)
         )
     
-    # Search in title
+    # Full-text search, ordered by relevance
     if filters.get('search'):
-        queryset = queryset.filter(title__icontains=filters['search'])
+        return search_jobs(queryset, filters['search']).order_by(*JOB_SEARCH_ORDERING)
     
-    return queryset.order_by('-featured', '-published_at', '-created_at')
+    return queryset.order_by(*JOB_ORDERING)
+
+
+def search_jobs(queryset: QuerySet[Job], term: str) -> QuerySet[Job]:
+    """
+        Tìm kiếm toàn văn trên search_vector (title, skills, requirements,
+        description) và annotate search_rank.
+
+        The term is parsed as a websearch query with the job_search config
+        (unaccent + english stemming), so "ky su" matches "kỹ sư". Titles
+        that are word-similar to the term (trigram, idx_jobs_title_desc_gin)
+        are kept as well so typos still find results. Both predicates are
+        index backed, so the cost follows the number of matches rather than
+        the size of the table.
+
+        Backends without full-text search (SQLite tests) use a substring
+        match instead, see _search_jobs_icontains().
+    """
+    term = term.strip()
+    if not search_vector_enabled():
+        return _search_jobs_icontains(queryset, term)
+    query = SearchQuery(term, config=SEARCH_CONFIG, search_type='websearch')
+    return queryset.filter(
+        Q(search_vector=query) | Q(title__trigram_word_similar=term)
+    ).annotate(
+        search_rank=(
+            Coalesce(SearchRank(F('search_vector'), query), Value(0.0))
+            + TrigramWordSimilarity(term, 'title')
+        )
+    )
+
+
+def _search_jobs_icontains(queryset: QuerySet[Job], term: str) -> QuerySet[Job]:
+    """
+        Substring search over the same fields as search_vector; title
+        matches rank first.
+    """
+    skill_match = JobSkill.objects.filter(job_id=OuterRef('pk'), skill__name__icontains=term)
+    return queryset.filter(
+        Q(title__icontains=term)
+        | Q(requirements__icontains=term)
+        | Q(description__icontains=term)
+        | Exists(skill_match)
+    ).annotate(
+        search_rank=Case(
+            When(title__icontains=term, then=Value(1.0)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+    )
 
 
 def get_job_by_id(job_id: int) -> Optional[Job]:
@@ -162,6 +227,23 @@ def list_urgent_jobs(days: int = 7) -> QuerySet[Job]:
 
 
 def get_similar_jobs(job_id: int, limit: int = 10) -> QuerySet[Job]:
+    """
+        Việc làm tương tự, đọc từ bảng SimilarJob (top-K tính sẵn bởi
+        refresh_similar_jobs_task, tra cứu theo index (job, rank)).
+        Jobs not computed yet fall back to _get_similar_jobs_live.
+    """
+    if not JobSimilarityState.objects.filter(job_id=job_id).exists():
+        return _get_similar_jobs_live(job_id, limit)
+    
+    return Job.objects.filter(
+        similar_to_jobs__job_id=job_id,
+        status='published'
+    ).select_related(
+        'company', 'category'
+    ).order_by('similar_to_jobs__rank')[:limit]
+
+
+def _get_similar_jobs_live(job_id: int, limit: int = 10) -> QuerySet[Job]:
     """
         Tìm jobs tương tự dựa trên multi-factor:
             - Same category (highest priority)
@@ -207,34 +289,39 @@ def get_similar_jobs(job_id: int, limit: int = 10) -> QuerySet[Job]:
 def get_job_recommendations(recruiter_id: int, limit: int = 20) -> QuerySet[Job]:
     """
         Gợi ý việc làm cho ứng viên (Hybrid approach):
-            - Nếu có skills → match với job_skills
+            - Nếu có skills → chấm điểm trên ma trận job × skill (theo mức
+              độ thành thạo và kỹ năng bắt buộc), giữ đúng thứ tự điểm
             - Fallback → trending jobs (high views, recent)
     """
 
-    # Get recruiter's skill IDs
-    recruiter_skill_ids = list(
+    # Get recruiter's skills with proficiency
+    recruiter_skills = dict(
         RecruiterSkill.objects.filter(
             recruiter_id=recruiter_id
-        ).values_list('skill_id', flat=True)
+        ).values_list('skill_id', 'proficiency_level')
     )
     
-    if recruiter_skill_ids:
-        # Skill-based recommendations
-        matching_job_ids = JobSkill.objects.filter(
-            skill_id__in=recruiter_skill_ids
-        ).values('job_id').annotate(
-            match_count=Count('skill_id')
-        ).order_by('-match_count').values_list('job_id', flat=True)[:limit * 2]
-        
-        queryset = Job.objects.filter(
-            id__in=matching_job_ids,
-            status='published'
-        ).select_related(
-            'company', 'category'
-        ).order_by('-published_at')[:limit]
+    if recruiter_skills:
+        # Over-fetch: the matrix may still hold jobs closed since its last refresh
+        ranked_ids = [
+            job_id for job_id, _ in recommend_job_ids(recruiter_skills, k=limit * 2)
+        ]
         
-        if queryset.exists():
-            return queryset
+        if ranked_ids:
+            queryset = Job.objects.filter(
+                id__in=ranked_ids,
+                status='published'
+            ).select_related(
+                'company', 'category'
+            ).order_by(
+                Case(
+                    *[When(id=job_id, then=Value(position)) for position, job_id in enumerate(ranked_ids)],
+                    output_field=IntegerField()
+                )
+            )[:limit]
+            
+            if queryset.exists():
+                return queryset
     
     # Fallback: Trending jobs (high views, recent published)
     return Job.objects.filter(
@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.utils import timezone
+
+from apps.recruitment.jobs.models import JobFacetCount
+from apps.recruitment.jobs.selectors.facets import STORED_FACET_FILTERS, compute_job_facets
+from apps.recruitment.jobs.selectors.jobs import list_jobs
+
+
+def refresh_job_facets() -> int:
+    """
+        Tính lại bảng JobFacetCount cho danh sách tin đã đăng.
+
+        Jobs matching STORED_FACET_FILTERS (published) are counted. The
+        counts are computed with one grouped query and swapped in within a
+        transaction, so readers see either the old or the new snapshot.
+
+        Returns:
+            Number of stored facet rows
+    """
+    facets = compute_job_facets(list_jobs(STORED_FACET_FILTERS))
+    now = timezone.now()
+    rows = [
+        JobFacetCount(
+            facet=facet,
+            value=str(item['value']),
+            label=str(item['label'])[:255],
+            count=item['count'],
+            refreshed_at=now
+        )
+        for facet, items in facets.items()
+        for item in items
+    ]
+
+    with transaction.atomic():
+        JobFacetCount.objects.all().delete()
+        JobFacetCount.objects.bulk_create(rows)
+    return len(rows)
@@ -244,17 +244,28 @@ def duplicate_job(user: CustomUser, job: Job) -> Job:
     return new_job
 
 
-@transaction.atomic
-def record_job_view(job: Job) -> Job:
+def record_job_view(
+    job: Job,
+    user: Optional[CustomUser] = None,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    referrer: Optional[str] = None
+) -> bool:
     """
-        Ghi nhận lượt xem (atomic increment).
+        Ghi nhận lượt xem vào bộ đệm (JobView + view_count được ghi theo lô
+        bởi flush_job_views_task).
+
+        Returns:
+            False nếu lượt xem bị bỏ qua do trùng (cùng user/IP trong cửa sổ dedup)
     """
-    from django.db.models import F
-    Job.objects.filter(id=job.id).update(
-        view_count=F('view_count') + 1
+    from apps.recruitment.job_views.services.ingestion import JobViewIngestionService
+    return JobViewIngestionService.record(
+        job.id,
+        user_id=user.id if user is not None and user.is_authenticated else None,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        referrer=referrer
     )
-    job.refresh_from_db()
-    return job
 
 
 @transaction.atomic
@@ -0,0 +1,280 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+import logging
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Max
+
+from apps.recruitment.jobs.models import Job
+from apps.recruitment.job_skills.models import JobSkill
+
+
+logger = logging.getLogger(__name__)
+
+
+# Weight of a job requirement (matrix values)
+REQUIRED_WEIGHT = 1.0
+OPTIONAL_WEIGHT = 0.5
+
+# Weight of a recruiter skill by proficiency (query vector values)
+PROFICIENCY_WEIGHTS = {
+    'basic': 0.25,
+    'intermediate': 0.5,
+    'advanced': 0.75,
+    'expert': 1.0,
+}
+
+# Fold the delta rows into the CSR arrays once they grow past this many rows
+# (or past 10% of the base, whichever is larger)
+DELTA_COMPACT_MIN = 1000
+
+
+class JobSkillMatrix:
+    """
+    Ma trận thưa job × skill (CSR, NumPy) của các tin đã đăng, dùng để gợi ý việc làm.
+
+    Row values are the requirement weights (required / optional); a
+    recruiter's skills form a dense vector over the skill columns weighted
+    by proficiency, so scoring every job is one sparse mat-vec. Scores are
+    normalized by the row total, i.e. the proficiency-weighted share of the
+    job's requirements the recruiter covers.
+
+    The matrix is kept per process and refreshed incrementally: jobs whose
+    updated_at passed the watermark are re-read into a small delta (their
+    old rows are masked out) and folded into new CSR arrays once the delta
+    grows. Hard-deleted jobs are only dropped by the periodic full rebuild,
+    so callers re-check the status of the returned jobs.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.skill_columns: Dict[int, int] = {}
+        self._reset_rows()
+        self.watermark = None
+        self.built_at = 0.0
+        self.checked_at = 0.0
+
+    def _reset_rows(self):
+        self.job_ids = np.zeros(0, dtype=np.int64)
+        self.published = np.zeros(0, dtype=np.float64)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.entry_rows = np.zeros(0, dtype=np.int64)
+        self.data = np.zeros(0, dtype=np.float32)
+        self.row_totals = np.zeros(0, dtype=np.float32)
+        self.alive = np.zeros(0, dtype=bool)
+        self.rows: Dict[int, int] = {}
+        self.delta: Dict[int, Tuple[float, np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return int(self.alive.sum()) + len(self.delta)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _column(self, skill_id: int) -> int:
+        column = self.skill_columns.get(skill_id)
+        if column is None:
+            column = self.skill_columns[skill_id] = len(self.skill_columns)
+        return column
+
+    def _load_rows(self, job_filter: Optional[dict] = None) -> Dict[int, Tuple[float, np.ndarray, np.ndarray]]:
+        """{job_id: (published timestamp, columns, weights)} of published jobs (two queries)."""
+        jobs = Job.objects.filter(status='published', **(job_filter or {}))
+        published = {
+            job_id: published_at.timestamp() if published_at else 0.0
+            for job_id, published_at in jobs.values_list('id', 'published_at')
+        }
+
+        entries = defaultdict(list)
+        for job_id, skill_id, is_required in (
+            JobSkill.objects
+            .filter(job_id__in=jobs.values('id'))
+            .values_list('job_id', 'skill_id', 'is_required')
+        ):
+            weight = REQUIRED_WEIGHT if is_required else OPTIONAL_WEIGHT
+            entries[job_id].append((self._column(skill_id), weight))
+
+        rows = {}
+        for job_id, items in entries.items():
+            if job_id not in published:
+                continue
+            columns, weights = zip(*sorted(items))
+            rows[job_id] = (
+                published[job_id],
+                np.array(columns, dtype=np.int32),
+                np.array(weights, dtype=np.float32),
+            )
+        return rows
+
+    def _set_base(self, rows: Dict[int, Tuple[float, np.ndarray, np.ndarray]]):
+        self._reset_rows()
+        if not rows:
+            return
+        job_ids = list(rows)
+        self.job_ids = np.array(job_ids, dtype=np.int64)
+        self.published = np.array([rows[job_id][0] for job_id in job_ids], dtype=np.float64)
+        lengths = np.array([len(rows[job_id][1]) for job_id in job_ids], dtype=np.int64)
+        self.indptr = np.concatenate(([0], np.cumsum(lengths)))
+        self.indices = np.concatenate([rows[job_id][1] for job_id in job_ids])
+        self.data = np.concatenate([rows[job_id][2] for job_id in job_ids])
+        self.entry_rows = np.repeat(np.arange(len(job_ids)), lengths)
+        self.row_totals = np.add.reduceat(self.data, self.indptr[:-1]).astype(np.float32)
+        self.alive = np.ones(len(job_ids), dtype=bool)
+        self.rows = {job_id: row for row, job_id in enumerate(job_ids)}
+
+    @staticmethod
+    def _current_watermark():
+        return Job.objects.aggregate(latest=Max('updated_at'))['latest']
+
+    def build(self):
+        """Rebuild the matrix from every published job."""
+        with self._lock:
+            watermark = self._current_watermark()
+            self.skill_columns = {}
+            self._set_base(self._load_rows())
+            self.watermark = watermark
+            self.built_at = self.checked_at = time.monotonic()
+        logger.info(f"Built job skill matrix with {len(self)} jobs, {len(self.skill_columns)} skills")
+
+    def refresh(self) -> int:
+        """
+        Re-read the jobs updated since the last load.
+
+        Returns:
+            Number of jobs re-read
+        """
+        with self._lock:
+            if self.watermark is None:
+                self.build()
+                return len(self)
+
+            watermark = self._current_watermark()
+            self.checked_at = time.monotonic()
+            if watermark is None or watermark <= self.watermark:
+                return 0
+
+            changed = list(
+                Job.objects
+                .filter(updated_at__gte=self.watermark)
+                .values_list('id', flat=True)
+            )
+            rows = self._load_rows({'id__in': changed})
+            for job_id in changed:
+                row = self.rows.get(job_id)
+                if row is not None:
+                    self.alive[row] = False
+                self.delta.pop(job_id, None)
+            self.delta.update(rows)
+            self.watermark = watermark
+
+            if len(self.delta) >= max(DELTA_COMPACT_MIN, len(self.rows) // 10):
+                self.compact()
+            return len(changed)
+
+    def compact(self):
+        """Fold the delta rows into new CSR arrays."""
+        with self._lock:
+            rows = {}
+            for row in np.flatnonzero(self.alive):
+                start, end = self.indptr[row], self.indptr[row + 1]
+                rows[int(self.job_ids[row])] = (
+                    float(self.published[row]), self.indices[start:end], self.data[start:end]
+                )
+            rows.update(self.delta)
+            self._set_base(rows)
+
+    def ensure_fresh(self):
+        """Refresh when older than JOB_RECOMMENDATION_REFRESH_SECONDS, rebuild past REBUILD_SECONDS."""
+        now = time.monotonic()
+        with self._lock:
+            if self.watermark is None or now - self.built_at > getattr(settings, 'JOB_RECOMMENDATION_REBUILD_SECONDS', 3600):
+                self.build()
+            elif now - self.checked_at > getattr(settings, 'JOB_RECOMMENDATION_REFRESH_SECONDS', 30):
+                self.refresh()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def query_vector(self, skills: Dict[int, str]) -> np.ndarray:
+        """Dense vector over the skill columns from {skill_id: proficiency_level}."""
+        vector = np.zeros(len(self.skill_columns), dtype=np.float32)
+        for skill_id, proficiency in skills.items():
+            column = self.skill_columns.get(skill_id)
+            if column is not None:
+                vector[column] = PROFICIENCY_WEIGHTS.get(proficiency, PROFICIENCY_WEIGHTS['intermediate'])
+        return vector
+
+    def score(self, skills: Dict[int, str], k: int = 20) -> List[Tuple[int, float]]:
+        """
+        Return up to k (job_id, score) pairs, best first (newest first on ties).
+
+        Args:
+            skills: Mapping skill_id -> proficiency_level of the recruiter
+            k: Number of jobs to return
+        """
+        if k <= 0:
+            return []
+
+        with self._lock:
+            vector = self.query_vector(skills)
+            if not vector.any():
+                return []
+
+            ids, scores, published = [], [], []
+            if len(self.job_ids):
+                # CSR mat-vec: per-entry products summed per row
+                dots = np.bincount(
+                    self.entry_rows,
+                    weights=self.data * vector[self.indices],
+                    minlength=len(self.job_ids),
+                )
+                base_scores = dots / self.row_totals
+                keep = self.alive & (dots > 0)
+                ids.append(self.job_ids[keep])
+                scores.append(base_scores[keep])
+                published.append(self.published[keep])
+
+            for job_id, (published_at, columns, weights) in self.delta.items():
+                dot = float(weights @ vector[columns])
+                if dot > 0:
+                    ids.append(np.array([job_id], dtype=np.int64))
+                    scores.append(np.array([dot / weights.sum()]))
+                    published.append(np.array([published_at]))
+
+        if not ids:
+            return []
+        ids = np.concatenate(ids)
+        scores = np.concatenate(scores)
+        published = np.concatenate(published)
+        if len(ids) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            # Keep every job tied with the k-th score so the tie-break is by recency
+            top = np.flatnonzero(scores >= scores[top].min())
+            ids, scores, published = ids[top], scores[top], published[top]
+        order = np.lexsort((-published, -scores))[:k]
+        return [(int(ids[i]), round(float(scores[i]), 4)) for i in order]
+
+
+_matrix: Optional[JobSkillMatrix] = None
+_matrix_lock = threading.Lock()
+
+
+def get_job_skill_matrix() -> JobSkillMatrix:
+    """Process-wide matrix, built on first use and refreshed when stale."""
+    global _matrix
+    with _matrix_lock:
+        if _matrix is None:
+            _matrix = JobSkillMatrix()
+    _matrix.ensure_fresh()
+    return _matrix
+
+
+def recommend_job_ids(skills: Dict[int, str], k: int = 20) -> List[Tuple[int, float]]:
+    """Top-k (job_id, score) for a recruiter's {skill_id: proficiency_level}."""
+    return get_job_skill_matrix().score(skills, k)
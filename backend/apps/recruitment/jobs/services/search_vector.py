@@ -0,0 +1,135 @@
+import re
+import unicodedata
+from typing import Iterable, Optional, Set
+
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import CharField, F, Func, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from apps.recruitment.jobs.models import Job
+from apps.recruitment.job_skills.models import JobSkill
+
+
+# Text search configuration shared by job vectors, job alert keywords and
+# search queries, so that all sides produce the same lexemes. job_search is
+# a copy of 'english' with unaccent in front of the stemmer (migration
+# recruitment_jobs 0005), so "ky su" and "kỹ sư" give the same lexemes.
+SEARCH_CONFIG = 'job_search'
+
+# Fields that feed Job.search_vector
+SEARCH_FIELDS = ('title', 'requirements', 'description')
+
+WORD_RE = re.compile(r'\w+')
+
+
+def search_vector_enabled(using: str = DEFAULT_DB_ALIAS) -> bool:
+    """
+    Whether stored tsvectors are maintained on this database.
+
+    Only PostgreSQL has tsvector/text search configs; on other backends
+    (the SQLite test database) vectors are not written and lexemes are
+    computed in Python with text_lexemes().
+    """
+    return connections[using].vendor == 'postgresql'
+
+
+def text_lexemes(*texts: Optional[str]) -> Set[str]:
+    """
+    Lowercased, unaccented words of the given texts.
+
+    Python stand-in for the job_search lexemes on backends without full-text
+    search; words are not stemmed.
+    """
+    lexemes = set()
+    for text in texts:
+        if not text:
+            continue
+        text = unicodedata.normalize('NFKD', text.lower().replace('đ', 'd'))
+        text = ''.join(char for char in text if not unicodedata.combining(char))
+        lexemes.update(WORD_RE.findall(text))
+    return lexemes
+
+
+def job_skill_names():
+    """Space separated skill names of the outer job (subquery)."""
+    return Subquery(
+        JobSkill.objects
+        .filter(job_id=OuterRef('pk'))
+        .values('job_id')
+        .annotate(names=StringAgg('skill__name', delimiter=' '))
+        .values('names')[:1]
+    )
+
+
+def job_search_vector() -> SearchVector:
+    """
+    tsvector expression over title (A), skill names (B), requirements (C)
+    and description (D).
+    """
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector(job_skill_names(), weight='B', config=SEARCH_CONFIG)
+        + SearchVector('requirements', weight='C', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='D', config=SEARCH_CONFIG)
+    )
+
+
+class TsvectorToArray(Func):
+    """tsvector_to_array(vector): lexemes of a tsvector as text[]."""
+    function = 'tsvector_to_array'
+    output_field = ArrayField(CharField())
+
+
+class JobSearchVectorService:
+    """
+    Duy trì Job.search_vector (tsvector được tính sẵn, có GIN index).
+
+    The vector is written with a single UPDATE ... SET search_vector =
+    to_tsvector(...) so the text never round-trips through Python.
+    """
+
+    @staticmethod
+    def update(job_ids: Iterable[int]) -> int:
+        """
+        Recompute the stored vector of the given jobs.
+
+        Returns:
+            Number of updated rows
+        """
+        if not search_vector_enabled():
+            return 0
+        return Job.objects.filter(pk__in=list(job_ids)).update(search_vector=job_search_vector())
+
+    @staticmethod
+    def rebuild() -> int:
+        """Recompute the stored vector of every job."""
+        if not search_vector_enabled():
+            return 0
+        return Job.objects.update(search_vector=job_search_vector())
+
+    @staticmethod
+    def get_lexemes(job_id: int) -> Set[str]:
+        """
+        Lexemes of a job, read from the stored vector with one query.
+
+        Falls back to computing the vector on the fly when it has not been
+        stored yet. Without full-text search the lexemes come from
+        text_lexemes() over the same fields.
+        """
+        if not search_vector_enabled():
+            job = Job.objects.filter(pk=job_id).values(*SEARCH_FIELDS).first()
+            if job is None:
+                return set()
+            skill_names = JobSkill.objects.filter(job_id=job_id).values_list('skill__name', flat=True)
+            return text_lexemes(*job.values(), *skill_names)
+        lexemes = (
+            Job.objects
+            .filter(pk=job_id)
+            .annotate(lexemes=TsvectorToArray(Coalesce(F('search_vector'), job_search_vector())))
+            .values_list('lexemes', flat=True)
+            .first()
+        )
+        return set(lexemes or [])
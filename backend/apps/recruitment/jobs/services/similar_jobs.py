@@ -0,0 +1,325 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional
+import hashlib
+import logging
+import uuid
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from apps.recruitment.jobs.cache import job_cache
+from apps.recruitment.jobs.models import Job, JobSimilarityState, SimilarJob
+from apps.recruitment.job_skills.models import JobSkill
+
+
+logger = logging.getLogger(__name__)
+
+
+# Weight of each feature in the similarity score (sums to 1)
+WEIGHTS = {
+    'skills': 0.40,
+    'category': 0.20,
+    'level': 0.10,
+    'job_type': 0.10,
+    'salary': 0.10,
+    'location': 0.10,
+}
+
+# Neighbours below this score are not stored
+MIN_SCORE = 0.2
+
+# Cache lock that keeps two refreshes from rewriting the same rows
+REFRESH_LOCK_KEY = 'similar_jobs:refresh_lock'
+
+# Levels in seniority order; adjacent levels get half the level weight
+LEVEL_ORDER = {level: index for index, level in enumerate(Job.Level.values)}
+
+
+@dataclass(frozen=True)
+class JobFeatures:
+    """Đặc trưng của một job dùng để tính độ tương tự."""
+    category_id: Optional[int]
+    level: str
+    job_type: str
+    salary_min: Optional[float]
+    salary_max: Optional[float]
+    province_id: Optional[int]
+    is_remote: bool
+    skill_ids: FrozenSet[int]
+
+    def fingerprint(self) -> str:
+        """Hash of the features; a change means the neighbour lists must be recomputed."""
+        parts = (
+            self.category_id, self.level, self.job_type, self.salary_min, self.salary_max,
+            self.province_id, self.is_remote, tuple(sorted(self.skill_ids)),
+        )
+        return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def load_features() -> Dict[int, JobFeatures]:
+    """Features of every published job (two queries)."""
+    skills = defaultdict(set)
+    for job_id, skill_id in (
+        JobSkill.objects
+        .filter(job__status='published')
+        .values_list('job_id', 'skill_id')
+    ):
+        skills[job_id].add(skill_id)
+
+    features = {}
+    for job_id, category_id, level, job_type, salary_min, salary_max, province_id, is_remote in (
+        Job.objects
+        .filter(status='published')
+        .values_list(
+            'id', 'category_id', 'level', 'job_type', 'salary_min', 'salary_max',
+            'address__province_id', 'is_remote'
+        )
+    ):
+        features[job_id] = JobFeatures(
+            category_id=category_id,
+            level=level,
+            job_type=job_type,
+            salary_min=float(salary_min) if salary_min is not None else None,
+            salary_max=float(salary_max) if salary_max is not None else None,
+            province_id=province_id,
+            is_remote=is_remote,
+            skill_ids=frozenset(skills.get(job_id, ())),
+        )
+    return features
+
+
+def _salary_overlap(a: JobFeatures, b: JobFeatures) -> float:
+    """Overlap / union of the two salary ranges (0 when a range is unknown)."""
+    a_low, a_high = a.salary_min or a.salary_max, a.salary_max or a.salary_min
+    b_low, b_high = b.salary_min or b.salary_max, b.salary_max or b.salary_min
+    if a_low is None or b_low is None:
+        return 0.0
+    union = max(a_high, b_high) - min(a_low, b_low)
+    if union <= 0:
+        return 1.0
+    return max(0.0, min(a_high, b_high) - max(a_low, b_low)) / union
+
+
+def similarity(a: JobFeatures, b: JobFeatures) -> float:
+    """Similarity in [0, 1]; symmetric. Scalar form of FeatureArrays.scores."""
+    score = 0.0
+    if a.skill_ids and b.skill_ids:
+        score += WEIGHTS['skills'] * len(a.skill_ids & b.skill_ids) / len(a.skill_ids | b.skill_ids)
+    if a.category_id is not None and a.category_id == b.category_id:
+        score += WEIGHTS['category']
+    if a.level == b.level:
+        score += WEIGHTS['level']
+    elif a.level in LEVEL_ORDER and b.level in LEVEL_ORDER and abs(LEVEL_ORDER[a.level] - LEVEL_ORDER[b.level]) == 1:
+        score += WEIGHTS['level'] / 2
+    if a.job_type == b.job_type:
+        score += WEIGHTS['job_type']
+    score += WEIGHTS['salary'] * _salary_overlap(a, b)
+    if (a.is_remote and b.is_remote) or (a.province_id is not None and a.province_id == b.province_id):
+        score += WEIGHTS['location']
+    return score
+
+
+class FeatureArrays:
+    """
+    Đặc trưng của tất cả job dưới dạng mảng NumPy (một dòng mỗi job).
+
+    scores() rates one job against every job with array operations, in the
+    same order of terms as similarity(), so both give the same floats.
+    Skill overlap counts come from an inverted index skill -> rows.
+    """
+
+    def __init__(self, features: Dict[int, JobFeatures]):
+        values = list(features.values())
+        self.features = features
+        self.job_ids = np.fromiter(features, dtype=np.int64, count=len(values))
+        self.rows = {job_id: row for row, job_id in enumerate(features)}
+
+        level_codes, job_type_codes = {}, {}
+        self.category = np.array([-1 if f.category_id is None else f.category_id for f in values], dtype=np.int64)
+        self.level = np.array([level_codes.setdefault(f.level, len(level_codes)) for f in values], dtype=np.int64)
+        self.level_order = np.array([LEVEL_ORDER.get(f.level, -1) for f in values], dtype=np.int64)
+        self.job_type = np.array(
+            [job_type_codes.setdefault(f.job_type, len(job_type_codes)) for f in values], dtype=np.int64
+        )
+        # Same fallbacks as _salary_overlap; NaN when the range is unknown
+        self.salary_low = np.array([_or_nan(f.salary_min or f.salary_max) for f in values], dtype=np.float64)
+        self.salary_high = np.array([_or_nan(f.salary_max or f.salary_min) for f in values], dtype=np.float64)
+        self.province = np.array([-1 if f.province_id is None else f.province_id for f in values], dtype=np.int64)
+        self.is_remote = np.array([f.is_remote for f in values], dtype=bool)
+        self.skill_count = np.array([len(f.skill_ids) for f in values], dtype=np.int64)
+
+        skill_rows = defaultdict(list)
+        for row, feature in enumerate(values):
+            for skill_id in feature.skill_ids:
+                skill_rows[skill_id].append(row)
+        self.skill_rows = {skill_id: np.array(rows, dtype=np.int64) for skill_id, rows in skill_rows.items()}
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def scores(self, row: int) -> np.ndarray:
+        """Similarity of the job at `row` with every job (itself included)."""
+        own = self.features[int(self.job_ids[row])]
+        count = len(self)
+        score = np.zeros(count, dtype=np.float64)
+
+        if own.skill_ids:
+            shared = np.bincount(
+                np.concatenate([self.skill_rows[skill_id] for skill_id in own.skill_ids]),
+                minlength=count
+            )
+            union = self.skill_count + len(own.skill_ids) - shared
+            score += np.where(self.skill_count > 0, WEIGHTS['skills'] * shared / union, 0.0)
+        if own.category_id is not None:
+            score += np.where(self.category == own.category_id, WEIGHTS['category'], 0.0)
+
+        same_level = self.level == self.level[row]
+        adjacent = (
+            (self.level_order >= 0) & (self.level_order[row] >= 0)
+            & (np.abs(self.level_order - self.level_order[row]) == 1)
+        )
+        score += np.where(same_level, WEIGHTS['level'], np.where(adjacent, WEIGHTS['level'] / 2, 0.0))
+        score += np.where(self.job_type == self.job_type[row], WEIGHTS['job_type'], 0.0)
+
+        low, high = self.salary_low[row], self.salary_high[row]
+        if not np.isnan(low):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                union = np.maximum(self.salary_high, high) - np.minimum(self.salary_low, low)
+                overlap = np.maximum(0.0, np.minimum(self.salary_high, high) - np.maximum(self.salary_low, low))
+                ratio = np.where(union <= 0, 1.0, overlap / union)
+            score += WEIGHTS['salary'] * np.where(np.isnan(self.salary_low), 0.0, ratio)
+
+        same_place = (self.is_remote & own.is_remote)
+        if own.province_id is not None:
+            same_place = same_place | (self.province == own.province_id)
+        score += np.where(same_place, WEIGHTS['location'], 0.0)
+        return score
+
+
+def _or_nan(value: Optional[float]) -> float:
+    return np.nan if value is None else value
+
+
+class SimilarJobService:
+    """
+    Duy trì bảng SimilarJob: top-K việc làm tương tự của mỗi tin đã đăng.
+
+    Each run fingerprints the features of the published jobs and only
+    recomputes the lists that can have changed: jobs whose features
+    changed, jobs whose list contains a changed or removed job, and jobs
+    a changed job now scores higher than their current K-th neighbour.
+
+    Only one refresh runs at a time (cache lock), and at most
+    SIMILAR_JOBS_MAX_CHANGED_PER_RUN changed jobs are taken per run; the
+    rest keep their old fingerprint and are picked up by the next runs.
+    """
+
+    @staticmethod
+    def top_neighbours(job_id: int, arrays: FeatureArrays, top_k: int) -> List[tuple]:
+        """[(score, other_id)] of the best top_k neighbours, best first (ties: higher id first)."""
+        row = arrays.rows[job_id]
+        scores = arrays.scores(row)
+        scores[row] = -1.0
+        candidates = np.flatnonzero(scores >= MIN_SCORE)
+        order = np.lexsort((-arrays.job_ids[candidates], -scores[candidates]))[:top_k]
+        return [(float(scores[index]), int(arrays.job_ids[index])) for index in candidates[order]]
+
+    @classmethod
+    def refresh(cls, top_k: Optional[int] = None) -> dict:
+        """
+        Bring the SimilarJob table up to date, unless another refresh is running.
+
+        Returns:
+            Dict with changed, deferred, removed and recomputed job counts
+            ({'skipped': True} when another refresh holds the lock)
+        """
+        token = uuid.uuid4().hex
+        timeout = getattr(settings, 'SIMILAR_JOBS_LOCK_TIMEOUT', 1800)
+        if not cache.add(REFRESH_LOCK_KEY, token, timeout=timeout):
+            logger.info("Similar jobs refresh already running, skipping")
+            return {'skipped': True}
+        try:
+            return cls._refresh(top_k)
+        finally:
+            if cache.get(REFRESH_LOCK_KEY) == token:
+                cache.delete(REFRESH_LOCK_KEY)
+
+    @classmethod
+    def _refresh(cls, top_k: Optional[int] = None) -> dict:
+        top_k = top_k or getattr(settings, 'SIMILAR_JOBS_TOP_K', 10)
+        max_changed = getattr(settings, 'SIMILAR_JOBS_MAX_CHANGED_PER_RUN', 2000)
+        features = load_features()
+        hashes = {job_id: feature.fingerprint() for job_id, feature in features.items()}
+        stored = dict(JobSimilarityState.objects.values_list('job_id', 'features_hash'))
+
+        changed = {job_id for job_id, digest in hashes.items() if stored.get(job_id) != digest}
+        removed = set(stored) - set(features)
+        deferred = len(changed) - max_changed
+        if deferred > 0:
+            changed = set(sorted(changed)[:max_changed])
+        stats = {'changed': len(changed), 'deferred': max(deferred, 0), 'removed': len(removed), 'recomputed': 0}
+        if not changed and not removed:
+            return stats
+
+        # Lists that contain a changed or removed job
+        affected = set(
+            SimilarJob.objects
+            .filter(similar_job_id__in=changed | removed)
+            .values_list('job_id', flat=True)
+        )
+        # Lists a changed job may now enter: one vectorized pass per changed job
+        arrays = FeatureArrays(features)
+        list_size = np.zeros(len(arrays), dtype=np.int64)
+        lowest_score = np.zeros(len(arrays), dtype=np.float64)
+        for job_id, count, lowest in (
+            SimilarJob.objects
+            .values('job_id')
+            .annotate(count=Count('id'), lowest=Min('score'))
+            .values_list('job_id', 'count', 'lowest')
+        ):
+            row = arrays.rows.get(job_id)
+            if row is not None:
+                list_size[row], lowest_score[row] = count, lowest
+        settled = np.zeros(len(arrays), dtype=bool)
+        settled[[arrays.rows[job_id] for job_id in (changed | affected) if job_id in arrays.rows]] = True
+        for job_id in changed:
+            scores = arrays.scores(arrays.rows[job_id])
+            enters = ~settled & (scores >= MIN_SCORE) & ((list_size < top_k) | (scores > lowest_score))
+            affected.update(arrays.job_ids[enters].tolist())
+            settled |= enters
+
+        recompute = (changed | affected) & set(features)
+        rows = [
+            SimilarJob(job_id=job_id, similar_job_id=other_id, score=round(score, 4), rank=rank)
+            for job_id in recompute
+            for rank, (score, other_id) in enumerate(cls.top_neighbours(job_id, arrays, top_k), start=1)
+        ]
+
+        now = timezone.now()
+        with transaction.atomic():
+            SimilarJob.objects.filter(job_id__in=recompute | removed).delete()
+            SimilarJob.objects.bulk_create(rows, batch_size=1000)
+            JobSimilarityState.objects.filter(job_id__in=removed).delete()
+            JobSimilarityState.objects.bulk_create(
+                [
+                    JobSimilarityState(job_id=job_id, features_hash=hashes[job_id], computed_at=now)
+                    for job_id in changed
+                ],
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=['job'],
+                update_fields=['features_hash', 'computed_at'],
+            )
+        job_cache.invalidate()
+
+        stats['recomputed'] = len(recompute)
+        logger.info(
+            f"Similar jobs: {stats['changed']} changed ({stats['deferred']} deferred), "
+            f"{stats['removed']} removed, {stats['recomputed']} lists recomputed"
+        )
+        return stats
@@ -0,0 +1,74 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.candidate.skills.models import Skill
+from apps.recruitment.jobs.cache import job_cache
+from apps.recruitment.jobs.models import Job
+from apps.recruitment.job_skills.models import JobSkill
+from apps.recruitment.jobs.services.search_vector import (
+    SEARCH_FIELDS,
+    JobSearchVectorService,
+    search_vector_enabled,
+)
+
+
+@receiver(post_save, sender=Job)
+def update_job_search_vector(sender, instance, update_fields=None, **kwargs):
+    """
+    Cập nhật search_vector khi tiêu đề/mô tả/yêu cầu của Job thay đổi.
+    Saves limited to other fields (update_fields) are skipped, and so is
+    every save on backends without stored vectors.
+    """
+    if not search_vector_enabled():
+        return
+    if update_fields is not None and not set(update_fields) & set(SEARCH_FIELDS):
+        return
+    JobSearchVectorService.update([instance.pk])
+
+
+@receiver(post_save, sender=JobSkill)
+@receiver(post_delete, sender=JobSkill)
+def update_job_search_vector_on_skill(sender, instance, **kwargs):
+    """Cập nhật search_vector khi kỹ năng yêu cầu của Job thay đổi."""
+    if not search_vector_enabled():
+        return
+    JobSearchVectorService.update([instance.job_id])
+
+
+@receiver(post_save, sender=JobSkill)
+@receiver(post_delete, sender=JobSkill)
+def touch_job_on_skill_change(sender, instance, **kwargs):
+    """
+    Cập nhật updated_at của Job khi kỹ năng yêu cầu thay đổi, để ma trận
+    job × skill của gợi ý việc làm đọc lại job này ở lần refresh kế tiếp.
+    """
+    Job.objects.filter(pk=instance.job_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=JobSkill)
+@receiver(post_delete, sender=JobSkill)
+def invalidate_job_cache(sender, **kwargs):
+    """
+    Xóa cache các endpoint job công khai khi Job (kể cả publish/close/
+    featured, đều đi qua Job.save) hoặc kỹ năng của Job thay đổi.
+    Runs again after commit so a request that read the old rows while the
+    transaction was open cannot leave them cached.
+    """
+    job_cache.invalidate()
+    transaction.on_commit(job_cache.invalidate)
+
+
+@receiver(post_save, sender=Skill)
+def update_job_search_vector_on_skill_rename(sender, instance, created=False, update_fields=None, **kwargs):
+    """Cập nhật search_vector của các Job dùng kỹ năng khi tên kỹ năng thay đổi."""
+    if not search_vector_enabled():
+        return
+    if created or (update_fields is not None and 'name' not in update_fields):
+        return
+    JobSearchVectorService.update(
+        JobSkill.objects.filter(skill_id=instance.pk).values_list('job_id', flat=True)
+    )
@@ -0,0 +1,25 @@
+from celery import shared_task
+import logging
+
+from apps.recruitment.jobs.services.facets import refresh_job_facets
+from apps.recruitment.jobs.services.similar_jobs import SimilarJobService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_job_facets_task():
+    """
+    Celery task làm mới bảng JobFacetCount (chạy định kỳ qua celery beat).
+    """
+    count = refresh_job_facets()
+    logger.info(f"Refreshed {count} job facet counts")
+    return count
+
+
+@shared_task
+def refresh_similar_jobs_task():
+    """
+    Celery task cập nhật bảng SimilarJob cho các job có đặc trưng thay đổi.
+    """
+    return SimilarJobService.refresh()
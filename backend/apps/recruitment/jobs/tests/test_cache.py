@@ -0,0 +1,156 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.core.cache import LRUCache, TwoTierCache
+from apps.core.users.models import CustomUser
+from apps.company.companies.models import Company
+from apps.recruitment.jobs.cache import job_cache
+from apps.recruitment.jobs.models import Job
+from apps.recruitment.jobs.services.jobs import close_job, set_job_featured
+
+
+class TwoTierCacheTests(APITestCase):
+    """Cache hai tầng (LRU trong process + Django cache)"""
+
+    def setUp(self):
+        cache.clear()
+        self.cache = TwoTierCache('test', l1_ttl=60, l2_ttl=60, max_entries=2)
+
+    def test_tiers_and_counters(self):
+        compute = lambda: {'value': 1}
+
+        self.cache.get_or_set('endpoint', {'a': 1}, compute)
+        self.cache.get_or_set('endpoint', {'a': 1}, compute)
+        self.cache.l1.clear()
+        self.cache.get_or_set('endpoint', {'a': 1}, compute)
+
+        stats = self.cache.stats()
+        self.assertEqual((stats['misses'], stats['l1_hits'], stats['l2_hits']), (1, 1, 1))
+
+    def test_invalidate_drops_both_tiers(self):
+        self.cache.get_or_set('endpoint', None, lambda: 'old')
+
+        self.cache.invalidate()
+
+        self.assertEqual(self.cache.get_or_set('endpoint', None, lambda: 'new'), 'new')
+
+    def test_none_is_not_cached(self):
+        self.cache.get_or_set('endpoint', None, lambda: None)
+
+        self.assertEqual(self.cache.get_or_set('endpoint', None, lambda: 'value'), 'value')
+        self.assertEqual(self.cache.stats()['misses'], 2)
+
+    def test_l2_errors_fall_back_to_compute(self):
+        with patch.object(TwoTierCache, 'l2') as l2:
+            l2.get.side_effect = ConnectionError('redis down')
+            value = self.cache.get_or_set('endpoint', None, lambda: 'value')
+
+        self.assertEqual(value, 'value')
+
+    def test_lru_evicts_least_recently_used(self):
+        lru = LRUCache(max_entries=2, ttl=60)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+
+        self.assertEqual([lru.get(key)[0] for key in ('a', 'b', 'c')], [True, False, True])
+
+
+class JobEndpointCacheTests(APITestCase):
+    """Cache cho featured / urgent / similar / slug và invalidation theo signal"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            email="cache@example.com",
+            password="password123",
+            full_name="Cache User"
+        )
+        cls.company = Company.objects.create(user=cls.user, company_name="Cache Co", slug="cache-co")
+
+    def setUp(self):
+        cache.clear()
+        job_cache.l1.clear()
+        job_cache.reset_stats()
+        self.job = Job.objects.create(
+            company=self.company,
+            title="Cached Job",
+            slug="cached-job",
+            job_type="full-time",
+            level="senior",
+            status="published",
+            created_by=self.user
+        )
+
+    def _featured_ids(self):
+        response = self.client.get('/api/jobs/featured/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [job['id'] for job in response.data]
+
+    def test_repeated_requests_hit_cache(self):
+        self.client.get(f'/api/jobs/slug/{self.job.slug}/')
+        with self.assertNumQueries(0):
+            response = self.client.get(f'/api/jobs/slug/{self.job.slug}/')
+
+        self.assertEqual(response.data['id'], self.job.id)
+        self.assertEqual(job_cache.stats()['l1_hits'], 1)
+
+    def test_set_featured_invalidates(self):
+        self.assertEqual(self._featured_ids(), [])
+
+        set_job_featured(self.job, True)
+
+        self.assertEqual(self._featured_ids(), [self.job.id])
+
+    def test_close_invalidates(self):
+        set_job_featured(self.job, True)
+        self.assertEqual(self._featured_ids(), [self.job.id])
+
+        close_job(self.job)
+
+        self.assertEqual(self._featured_ids(), [])
+
+    def test_delete_invalidates_slug(self):
+        url = f'/api/jobs/slug/{self.job.slug}/'
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self.job.delete()
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_similar_is_cached_per_job(self):
+        other = Job.objects.create(
+            company=self.company,
+            title="Other Job",
+            slug="other-job",
+            job_type="full-time",
+            level="senior",
+            status="published",
+            created_by=self.user
+        )
+
+        first = self.client.get(f'/api/jobs/{self.job.id}/similar/').data
+        second = self.client.get(f'/api/jobs/{other.id}/similar/').data
+
+        self.assertEqual([job['id'] for job in first], [other.id])
+        self.assertEqual([job['id'] for job in second], [self.job.id])
+
+    def test_cache_stats_requires_admin(self):
+        response = self.client.get('/api/jobs/cache-stats/')
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+        admin = CustomUser.objects.create_user(
+            email="cache-admin@example.com",
+            password="password123",
+            full_name="Admin",
+            is_staff=True
+        )
+        self.client.force_authenticate(admin)
+        response = self.client.get('/api/jobs/cache-stats/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('hit_ratio', response.data)
@@ -0,0 +1,125 @@
+from decimal import Decimal
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.core.users.models import CustomUser
+from apps.company.companies.models import Company
+from apps.geography.addresses.models import Address
+from apps.geography.provinces.models import Province
+from apps.recruitment.job_categories.models import JobCategory
+from apps.recruitment.jobs.models import Job, JobFacetCount
+from apps.recruitment.jobs.services.facets import refresh_job_facets
+
+
+class JobFacetTests(APITestCase):
+    """Facet counts cho GET /api/jobs/search/"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            email="facets@example.com",
+            password="password123",
+            full_name="Facet User"
+        )
+        cls.company = Company.objects.create(user=cls.user, company_name="Facet Co", slug="facet-co")
+        cls.it = JobCategory.objects.create(name="IT", slug="it")
+        cls.hanoi = Province.objects.create(
+            province_code='HN',
+            province_name='Hà Nội',
+            province_type='municipality',
+            region='north'
+        )
+        address = Address.objects.create(address_line="1 Tràng Tiền", province=cls.hanoi)
+
+        cls._create_job("Python Developer", level="senior", category=cls.it, address=address,
+                        salary_min=Decimal('15000000'), salary_max=Decimal('25000000'))
+        cls._create_job("Java Developer", level="junior", category=cls.it,
+                        salary_max=Decimal('8000000'))
+        cls._create_job("Sales", level="junior", is_salary_negotiable=True)
+        cls._create_job("Draft Developer", level="lead", status="draft")
+
+    @classmethod
+    def _create_job(cls, title, status="published", **kwargs):
+        return Job.objects.create(
+            company=cls.company,
+            title=title,
+            slug=title.lower().replace(" ", "-"),
+            job_type="full-time",
+            status=status,
+            created_by=cls.user,
+            **kwargs
+        )
+
+    def _counts(self, facets, facet):
+        return {item['value']: item['count'] for item in facets[facet]}
+
+    def test_facets_follow_filters(self):
+        response = self.client.get('/api/jobs/search/', {'status': 'published'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 3)
+        facets = response.data['facets']
+        self.assertEqual(self._counts(facets, 'level'), {'junior': 2, 'senior': 1})
+        self.assertEqual(self._counts(facets, 'category'), {self.it.id: 2})
+        self.assertEqual(self._counts(facets, 'province'), {self.hanoi.id: 1})
+        self.assertEqual(self._counts(facets, 'job_type'), {'full-time': 3})
+        self.assertEqual(
+            self._counts(facets, 'salary_band'),
+            {'20m_30m': 1, 'under_10m': 1, 'negotiable': 1}
+        )
+        self.assertEqual(facets['province'][0]['label'], 'Hà Nội')
+
+    def test_facets_of_search_term(self):
+        response = self.client.get('/api/jobs/search/', {'search': 'developer', 'level': 'junior'})
+
+        self.assertEqual([job['title'] for job in response.data['results']], ['Java Developer'])
+        self.assertEqual(self._counts(response.data['facets'], 'level'), {'junior': 1})
+
+    def test_published_facets_use_stored_counts(self):
+        refresh_job_facets()
+        JobFacetCount.objects.filter(facet='level', value='junior').update(count=42)
+
+        stored = self.client.get('/api/jobs/search/', {'status': 'published'}).data['facets']
+        filtered = self.client.get('/api/jobs/search/', {'status': 'published', 'job_type': 'full-time'}).data['facets']
+
+        self.assertEqual(self._counts(stored, 'level')['junior'], 42)
+        self.assertEqual(self._counts(filtered, 'level')['junior'], 2)
+
+    def test_stored_facets_match_hits(self):
+        """Stored counts describe the same jobs as the hits of the request."""
+        refresh_job_facets()
+
+        response = self.client.get('/api/jobs/search/', {'status': 'published'})
+
+        levels = {}
+        for job in response.data['results']:
+            levels[job['level']] = levels.get(job['level'], 0) + 1
+        self.assertEqual(self._counts(response.data['facets'], 'level'), levels)
+
+    def test_unfiltered_facets_count_every_hit(self):
+        """Without filters the hits include drafts, so the facets are computed live."""
+        refresh_job_facets()
+
+        response = self.client.get('/api/jobs/search/')
+
+        self.assertEqual(len(response.data['results']), 4)
+        self.assertEqual(
+            self._counts(response.data['facets'], 'level'),
+            {'junior': 2, 'senior': 1, 'lead': 1}
+        )
+
+    def test_refresh_replaces_rows(self):
+        refresh_job_facets()
+        first = JobFacetCount.objects.count()
+
+        refresh_job_facets()
+
+        self.assertEqual(JobFacetCount.objects.count(), first)
+        self.assertEqual(JobFacetCount.objects.get(facet='category', value=str(self.it.id)).count, 2)
+
+    def test_refresh_counts_published_jobs_only(self):
+        refresh_job_facets()
+
+        self.assertFalse(JobFacetCount.objects.filter(facet='level', value='lead').exists())
+        self.assertEqual(JobFacetCount.objects.get(facet='job_type', value='full-time').count, 3)
@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.core.users.models import CustomUser
+from apps.company.companies.models import Company
+from apps.recruitment.jobs.models import Job
+
+
+class JobKeysetPaginationTests(APITestCase):
+    """Keyset pagination cho GET /api/jobs/"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            email="keyset@example.com",
+            password="password123",
+            full_name="Keyset User"
+        )
+        cls.company = Company.objects.create(user=cls.user, company_name="Keyset Co", slug="keyset-co")
+
+        now = timezone.now()
+        specs = [
+            # (featured, published_at) - ties on published_at exercise the id tie-breaker
+            (True, now - timedelta(days=3)),
+            (False, now - timedelta(days=1)),
+            (False, now - timedelta(days=1)),
+            (False, now - timedelta(days=2)),
+            (False, None),
+            (True, now),
+            (False, now - timedelta(days=5)),
+        ]
+        cls.jobs = [
+            Job.objects.create(
+                company=cls.company,
+                title=f"Job {i}",
+                slug=f"keyset-job-{i}",
+                status="published",
+                featured=featured,
+                published_at=published_at,
+                created_by=cls.user,
+            )
+            for i, (featured, published_at) in enumerate(specs)
+        ]
+        cls.expected = list(
+            Job.objects
+            .filter(status="published")
+            .order_by('-featured', F('published_at').desc(nulls_first=True), '-created_at', 'id')
+            .values_list('id', flat=True)
+        )
+
+    def _walk(self, url):
+        ids, pages = [], []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.data)
+            ids += [job['id'] for job in response.data['results']]
+            url = response.data['next']
+        return ids, pages
+
+    def test_pages_follow_sort_tuple(self):
+        ids, pages = self._walk('/api/jobs/?page_size=2')
+
+        self.assertEqual(ids, self.expected)
+        self.assertEqual(len(pages), 4)
+        self.assertIsNone(pages[0]['previous'])
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get('/api/jobs/?page_size=3').data
+        second = self.client.get(first['next']).data
+
+        back = self.client.get(second['previous']).data
+
+        self.assertEqual(
+            [job['id'] for job in back['results']],
+            [job['id'] for job in first['results']]
+        )
+
+    def test_page_size_is_bounded(self):
+        response = self.client.get('/api/jobs/?page_size=100000')
+
+        self.assertEqual(len(response.data['results']), len(self.expected))
+        self.assertLessEqual(len(response.data['results']), 100)
+
+        response = self.client.get('/api/jobs/')
+        self.assertLessEqual(len(response.data['results']), 20)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/jobs/?cursor=not-a-cursor')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.core.users.models import CustomUser
+from apps.company.companies.models import Company
+from apps.candidate.recruiters.models import Recruiter
+from apps.candidate.recruiter_skills.models import RecruiterSkill
+from apps.candidate.skill_categories.models import SkillCategory
+from apps.candidate.skills.models import Skill
+from apps.recruitment.jobs.models import Job
+from apps.recruitment.job_skills.models import JobSkill
+from apps.recruitment.jobs.services import recommendations
+from apps.recruitment.jobs.services.recommendations import JobSkillMatrix
+
+
+@override_settings(JOB_RECOMMENDATION_REFRESH_SECONDS=0)
+class JobRecommendationTests(APITestCase):
+    """Gợi ý việc làm qua ma trận thưa job × skill"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = CustomUser.objects.create_user(
+            email="reco-owner@example.com",
+            password="password123",
+            full_name="Owner"
+        )
+        cls.candidate = CustomUser.objects.create_user(
+            email="reco-candidate@example.com",
+            password="password123",
+            full_name="Candidate"
+        )
+        cls.company = Company.objects.create(user=cls.owner, company_name="Reco Co", slug="reco-co")
+        cls.recruiter = Recruiter.objects.create(user=cls.candidate)
+
+        category = SkillCategory.objects.create(name='Backend', slug='backend')
+        cls.python = Skill.objects.create(name='Python', slug='python', category=category)
+        cls.django = Skill.objects.create(name='Django', slug='django', category=category)
+        cls.go = Skill.objects.create(name='Go', slug='go', category=category)
+
+        RecruiterSkill.objects.create(recruiter=cls.recruiter, skill=cls.python, proficiency_level='expert')
+        RecruiterSkill.objects.create(recruiter=cls.recruiter, skill=cls.django, proficiency_level='basic')
+
+    def setUp(self):
+        recommendations._matrix = None
+
+    def tearDown(self):
+        recommendations._matrix = None
+
+    def _job(self, slug, skills, days_ago=0):
+        job = Job.objects.create(
+            company=self.company,
+            title=slug,
+            slug=slug,
+            status='published',
+            published_at=timezone.now() - timedelta(days=days_ago),
+            created_by=self.owner
+        )
+        for skill, is_required in skills:
+            JobSkill.objects.create(job=job, skill=skill, is_required=is_required)
+        return job
+
+    def _recommended_ids(self):
+        self.client.force_authenticate(self.candidate)
+        response = self.client.get('/api/jobs/recommendations/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [job['id'] for job in response.data]
+
+    def test_ranked_by_weighted_overlap(self):
+        python_only = self._job('python-only', [(self.python, True)], days_ago=5)
+        django_only = self._job('django-only', [(self.django, True)])
+        mixed = self._job('mixed', [(self.python, True), (self.go, True)], days_ago=1)
+        self._job('go-only', [(self.go, True)])
+
+        self.assertEqual(self._recommended_ids(), [python_only.id, mixed.id, django_only.id])
+
+    def test_optional_skills_weigh_less(self):
+        required = self._job('required-go', [(self.python, True), (self.go, False)], days_ago=3)
+        optional = self._job('optional-go', [(self.python, True), (self.go, True)])
+
+        self.assertEqual(self._recommended_ids(), [required.id, optional.id])
+
+    def test_refresh_picks_up_changes(self):
+        self._job('python', [(self.python, True)])
+        job = self._job('late-skill', [(self.go, True)])
+        self.assertNotIn(job.id, self._recommended_ids())
+
+        JobSkill.objects.create(job=job, skill=self.python, is_required=True)
+        self.assertIn(job.id, self._recommended_ids())
+
+        job.status = 'closed'
+        job.save()
+        self.assertNotIn(job.id, self._recommended_ids())
+
+    def test_matrix_compaction_keeps_scores(self):
+        jobs = [self._job(f'job-{i}', [(self.python, True)], days_ago=i) for i in range(3)]
+        matrix = JobSkillMatrix()
+        matrix.build()
+        before = matrix.score({self.python.id: 'expert'})
+
+        Job.objects.filter(id=jobs[0].id).update(updated_at=timezone.now() + timedelta(seconds=1))
+        matrix.refresh()
+        self.assertIn(jobs[0].id, matrix.delta)
+        matrix.compact()
+
+        self.assertEqual(matrix.score({self.python.id: 'expert'}), before)
+        self.assertEqual([job_id for job_id, _ in before], [job.id for job in jobs])
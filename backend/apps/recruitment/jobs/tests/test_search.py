@@ -0,0 +1,82 @@
+from unittest import skipUnless
+
+from django.db import connection
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.candidate.skill_categories.models import SkillCategory
+from apps.candidate.skills.models import Skill
+from apps.core.users.models import CustomUser
+from apps.company.companies.models import Company
+from apps.recruitment.job_skills.models import JobSkill
+from apps.recruitment.jobs.models import Job
+
+
+class JobSearchTests(APITestCase):
+    """Tìm kiếm toàn văn cho GET /api/jobs/?search="""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            email="search@example.com",
+            password="password123",
+            full_name="Search User"
+        )
+        cls.company = Company.objects.create(user=cls.user, company_name="Search Co", slug="search-co")
+
+        cls.engineer = cls._create_job("Kỹ sư phần mềm", description="Phát triển hệ thống nội bộ")
+        cls.backend = cls._create_job("Backend Developer", requirements="3 năm kinh nghiệm Django")
+        cls.designer = cls._create_job("Graphic Designer", description="Thiết kế ấn phẩm, làm việc với backend team")
+        cls.draft = cls._create_job("Backend Intern", status="draft")
+
+        category = SkillCategory.objects.create(name="Programming", slug="programming")
+        kubernetes = Skill.objects.create(name="Kubernetes", slug="kubernetes", category=category)
+        JobSkill.objects.create(job=cls.backend, skill=kubernetes)
+
+    @classmethod
+    def _create_job(cls, title, status="published", **kwargs):
+        return Job.objects.create(
+            company=cls.company,
+            title=title,
+            slug=title.lower().replace(" ", "-"),
+            status=status,
+            created_by=cls.user,
+            **kwargs
+        )
+
+    def _search(self, term):
+        response = self.client.get('/api/jobs/', {'search': term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [job['id'] for job in response.data['results']]
+
+    @skipUnless(connection.vendor == 'postgresql', "job_search config and unaccent need PostgreSQL")
+    def test_unaccented_term_matches_vietnamese_title(self):
+        self.assertEqual(self._search("ky su"), [self.engineer.id])
+
+    def test_searches_requirements_and_skill_names(self):
+        self.assertEqual(self._search("django"), [self.backend.id])
+        self.assertEqual(self._search("kubernetes"), [self.backend.id])
+
+    def test_title_match_ranks_first(self):
+        self.assertEqual(self._search("backend"), [self.backend.id, self.designer.id])
+
+    @skipUnless(connection.vendor == 'postgresql', "trigram similarity needs PostgreSQL")
+    def test_typo_falls_back_to_trigram(self):
+        self.assertIn(self.backend.id, self._search("backnd"))
+
+    def test_skill_change_updates_vector(self):
+        category = SkillCategory.objects.get(slug="programming")
+        terraform = Skill.objects.create(name="Terraform", slug="terraform", category=category)
+        job_skill = JobSkill.objects.create(job=self.designer, skill=terraform)
+        self.assertEqual(self._search("terraform"), [self.designer.id])
+
+        job_skill.delete()
+        self.assertEqual(self._search("terraform"), [])
+
+    def test_search_pages_follow_rank(self):
+        first = self.client.get('/api/jobs/', {'search': 'backend', 'page_size': 1}).data
+        second = self.client.get(first['next']).data
+
+        self.assertEqual([job['id'] for job in first['results']], [self.backend.id])
+        self.assertEqual([job['id'] for job in second['results']], [self.designer.id])
+        self.assertIsNone(second['next'])
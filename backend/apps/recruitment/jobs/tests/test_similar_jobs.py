@@ -0,0 +1,139 @@
+import random
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.core.users.models import CustomUser
+from apps.company.companies.models import Company
+from apps.recruitment.jobs.cache import job_cache
+from apps.recruitment.jobs.models import Job, JobSimilarityState, SimilarJob
+from apps.recruitment.jobs.services.similar_jobs import (
+    REFRESH_LOCK_KEY,
+    FeatureArrays,
+    JobFeatures,
+    SimilarJobService,
+    similarity,
+)
+
+
+class SimilarJobServiceTests(APITestCase):
+    """Bảng việc làm tương tự tính sẵn + cập nhật tăng dần"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            email="similar@example.com",
+            password="password123",
+            full_name="Similar User"
+        )
+        cls.company = Company.objects.create(user=cls.user, company_name="Similar Co", slug="similar-co")
+
+    def setUp(self):
+        cache.clear()
+        job_cache.l1.clear()
+
+    def _job(self, slug, **fields):
+        fields.setdefault('job_type', 'full-time')
+        fields.setdefault('level', 'senior')
+        return Job.objects.create(
+            company=self.company,
+            title=slug,
+            slug=slug,
+            status='published',
+            created_by=self.user,
+            **fields
+        )
+
+    def _neighbours(self, job):
+        return list(
+            SimilarJob.objects.filter(job=job).order_by('rank').values_list('similar_job_id', flat=True)
+        )
+
+    def test_refresh_builds_ranked_lists(self):
+        a = self._job('a', salary_min=1000, salary_max=2000)
+        b = self._job('b', salary_min=1000, salary_max=2000)
+        c = self._job('c', level='junior', job_type='part-time')
+
+        stats = SimilarJobService.refresh(top_k=5)
+
+        self.assertEqual((stats['changed'], stats['recomputed']), (3, 3))
+        self.assertEqual(self._neighbours(a), [b.id])
+        self.assertEqual(self._neighbours(c), [])
+        self.assertEqual(JobSimilarityState.objects.count(), 3)
+
+    def test_refresh_only_recomputes_changed_jobs(self):
+        a = self._job('a')
+        b = self._job('b')
+        self._job('c', level='intern', job_type='part-time')
+        SimilarJobService.refresh(top_k=5)
+
+        self.assertEqual(SimilarJobService.refresh(top_k=5)['recomputed'], 0)
+
+        Job.objects.filter(id=b.id).update(status='closed')
+        stats = SimilarJobService.refresh(top_k=5)
+
+        self.assertEqual(stats['removed'], 1)
+        self.assertEqual(stats['recomputed'], 1)
+        self.assertEqual(self._neighbours(a), [])
+        self.assertFalse(SimilarJob.objects.filter(job_id=b.id).exists())
+
+    def test_endpoint_reads_precomputed_list(self):
+        a = self._job('a')
+        b = self._job('b')
+        SimilarJobService.refresh(top_k=5)
+
+        response = self.client.get(f'/api/jobs/{a.id}/similar/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([job['id'] for job in response.data], [b.id])
+
+    def test_overlapping_refresh_is_skipped(self):
+        self._job('a')
+        cache.add(REFRESH_LOCK_KEY, 'other-run')
+
+        self.assertEqual(SimilarJobService.refresh(top_k=5), {'skipped': True})
+        self.assertFalse(JobSimilarityState.objects.exists())
+
+        cache.delete(REFRESH_LOCK_KEY)
+        self.assertEqual(SimilarJobService.refresh(top_k=5)['changed'], 1)
+        self.assertIsNone(cache.get(REFRESH_LOCK_KEY))
+
+    @override_settings(SIMILAR_JOBS_MAX_CHANGED_PER_RUN=2)
+    def test_changed_jobs_are_capped_per_run(self):
+        jobs = [self._job(f'job-{i}') for i in range(3)]
+
+        first = SimilarJobService.refresh(top_k=5)
+        second = SimilarJobService.refresh(top_k=5)
+
+        self.assertEqual((first['changed'], first['deferred']), (2, 1))
+        self.assertEqual((second['changed'], second['deferred']), (1, 0))
+        self.assertEqual(set(self._neighbours(jobs[0])), {jobs[1].id, jobs[2].id})
+
+
+class FeatureArraysTests(SimpleTestCase):
+    """Điểm tương tự dạng vector khớp với similarity()"""
+
+    def test_scores_match_scalar_similarity(self):
+        rng = random.Random(7)
+        levels = list(Job.Level.values) + ['unknown']
+        features = {
+            job_id: JobFeatures(
+                category_id=rng.choice([None, 1, 2]),
+                level=rng.choice(levels),
+                job_type=rng.choice(['full-time', 'part-time']),
+                salary_min=rng.choice([None, 0.0, 1000.0, 1500.0]),
+                salary_max=rng.choice([None, 1000.0, 2000.0]),
+                province_id=rng.choice([None, 1, 2]),
+                is_remote=rng.random() < 0.3,
+                skill_ids=frozenset(rng.sample(range(6), rng.randint(0, 4))),
+            )
+            for job_id in range(1, 60)
+        }
+        arrays = FeatureArrays(features)
+
+        for job_id, own in features.items():
+            scores = arrays.scores(arrays.rows[job_id])
+            for other_id, other in features.items():
+                self.assertAlmostEqual(scores[arrays.rows[other_id]], similarity(own, other), places=12)
@@ -49,7 +49,7 @@ class JobViewTests(APITestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 1)
+        self.assertGreaterEqual(len(response.data['results']), 1)
     
     def test_list_jobs_with_filters(self):
         """Test GET /api/jobs/?job_type=full-time"""
@@ -57,7 +57,7 @@ class JobViewTests(APITestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        for job in response.data:
+        for job in response.data['results']:
             self.assertEqual(job['job_type'], 'full-time')
     
     # ========== RETRIEVE Tests ==========
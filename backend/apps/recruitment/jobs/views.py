@@ -1,8 +1,10 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
+from django.utils import timezone
 
+from .cache import job_cache
 from .models import Job
 from .permissions import IsJobOwnerOrReadOnly
 from .serializers import (
@@ -20,8 +22,11 @@ from .selectors.jobs import (
     list_featured_jobs,
     list_urgent_jobs,
     get_similar_jobs,
-    get_job_recommendations
+    get_job_recommendations,
+    JOB_ORDERING,
+    JOB_SEARCH_ORDERING
 )
+from .selectors.facets import get_job_facets
 from .services.jobs import (
     create_job,
     update_job,
@@ -34,6 +39,7 @@ from .services.jobs import (
     set_job_featured,
     JobInput
 )
+from apps.core.pagination import KeysetPagination
 from apps.candidate.recruiters.selectors.recruiters import get_recruiter_by_user
 from apps.recruitment.saved_jobs.services.saved_jobs import save_job
 from apps.recruitment.saved_jobs.serializers import SavedJobSerializer
@@ -42,6 +48,7 @@ from apps.recruitment.saved_jobs.selectors.saved_jobs import is_job_saved
 from apps.recruitment.job_views.selectors.job_views import get_viewer_demographics as get_demographics
 from apps.recruitment.job_views.selectors.job_views import get_view_chart_data
 from apps.recruitment.job_views.selectors.job_views import get_view_stats as get_job_view_stats
+from apps.recruitment.job_views.services.ingestion import client_ip
 
 
 class JobViewSet(viewsets.GenericViewSet):
@@ -50,12 +57,21 @@ class JobViewSet(viewsets.GenericViewSet):
     
     Endpoints:
     - GET    /api/jobs/               → list (public)
+    - GET    /api/jobs/search/        → list + facet counts (public)
     - POST   /api/jobs/               → create (authenticated + company owner)
     - GET    /api/jobs/:id/           → retrieve (public)
     - GET    /api/jobs/slug/:slug/    → retrieve by slug (public)
     - PUT    /api/jobs/:id/           → update (authenticated + owner)
     """
     permission_classes = [IsJobOwnerOrReadOnly]
+    pagination_class = KeysetPagination
+    
+    @property
+    def keyset_ordering(self):
+        """Relevance first when searching, else the index order (idx_jobs_status_keyset)."""
+        if self.request.query_params.get('search', '').strip():
+            return JOB_SEARCH_ORDERING
+        return JOB_ORDERING
     
     def get_queryset(self):
         filters = self._build_filters()
@@ -74,6 +90,9 @@ class JobViewSet(viewsets.GenericViewSet):
         if params.get('category_id'):
             filters['category_id'] = int(params['category_id'])
         
+        if params.get('province_id'):
+            filters['province_id'] = int(params['province_id'])
+        
         if params.get('job_type'):
             filters['job_type'] = params['job_type']
         
@@ -92,7 +111,7 @@ class JobViewSet(viewsets.GenericViewSet):
         if params.get('salary_max'):
             filters['salary_max'] = params['salary_max']
         
-        if params.get('search'):
+        if params.get('search', '').strip():
             filters['search'] = params['search']
         
         return filters
@@ -100,11 +119,27 @@ class JobViewSet(viewsets.GenericViewSet):
     def list(self, request):
         """
             GET /api/jobs/
-            Danh sách tin tuyển dụng (public, có filter)
+            Danh sách tin tuyển dụng (public, có filter, phân trang theo cursor)
         """
         queryset = self.get_queryset()
-        serializer = JobListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(queryset)
+        serializer = JobListSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        """
+            GET /api/jobs/search/
+            Kết quả tìm kiếm (cùng filter với list) kèm số lượng theo facet:
+            category, level, job_type, province, salary_band
+        """
+        filters = self._build_filters()
+        queryset = list_jobs(filters)
+        page = self.paginate_queryset(queryset)
+        serializer = JobListSerializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        response.data['facets'] = get_job_facets(filters, queryset)
+        return response
     
     def create(self, request):
         """
@@ -144,14 +179,18 @@ class JobViewSet(viewsets.GenericViewSet):
             GET /api/jobs/slug/:slug/
             Chi tiết tin tuyển dụng theo slug
         """
-        job = get_job_by_slug(slug)
-        if not job:
+        def compute():
+            job = get_job_by_slug(slug)
+            return JobDetailSerializer(job).data if job else None
+        
+        data = job_cache.get_or_set('retrieve_by_slug', {'slug': slug}, compute)
+        if data is None:
             return Response(
                 {"detail": "Job not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        return Response(JobDetailSerializer(job).data)
+        return Response(data)
     
     def update(self, request, pk=None):
         """
@@ -308,9 +347,11 @@ class JobViewSet(viewsets.GenericViewSet):
             GET /api/jobs/featured/
             Việc làm nổi bật
         """
-        queryset = list_featured_jobs()
-        serializer = JobListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        data = job_cache.get_or_set(
+            'featured', None,
+            lambda: JobListSerializer(list_featured_jobs(), many=True).data
+        )
+        return Response(data)
     
     @action(detail=False, methods=['get'], url_path='urgent')
     def urgent(self, request):
@@ -318,9 +359,12 @@ class JobViewSet(viewsets.GenericViewSet):
             GET /api/jobs/urgent/
             Việc làm gấp (deadline trong 7 ngày)
         """
-        queryset = list_urgent_jobs()
-        serializer = JobListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        # Theo ngày: danh sách thay đổi khi sang ngày mới
+        data = job_cache.get_or_set(
+            'urgent', {'date': timezone.localdate()},
+            lambda: JobListSerializer(list_urgent_jobs(), many=True).data
+        )
+        return Response(data)
     
     @action(detail=True, methods=['get'], url_path='similar')
     def similar(self, request, pk=None):
@@ -328,16 +372,27 @@ class JobViewSet(viewsets.GenericViewSet):
             GET /api/jobs/:id/similar/
             Việc làm tương tự
         """
-        job = get_job_by_id(pk)
-        if not job:
+        def compute():
+            if not get_job_by_id(pk):
+                return None
+            return JobListSerializer(get_similar_jobs(pk), many=True).data
+        
+        data = job_cache.get_or_set('similar', {'id': str(pk)}, compute)
+        if data is None:
             return Response(
                 {"detail": "Job not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        queryset = get_similar_jobs(pk)
-        serializer = JobListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        return Response(data)
+    
+    @action(detail=False, methods=['get'], url_path='cache-stats', permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        """
+            GET /api/jobs/cache-stats/
+            Số lần hit/miss của cache endpoint job (process hiện tại, admin)
+        """
+        return Response(job_cache.stats())
     
     @action(detail=False, methods=['get'], url_path='recommendations')
     def recommendations(self, request):
@@ -375,8 +430,18 @@ class JobViewSet(viewsets.GenericViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        updated = record_job_view(job)
-        return Response({"view_count": updated.view_count})
+        recorded = record_job_view(
+            job,
+            user=request.user,
+            ip_address=client_ip(request.META),
+            user_agent=request.META.get('HTTP_USER_AGENT'),
+            referrer=request.META.get('HTTP_REFERER')
+        )
+        # view_count trong DB được cập nhật theo lô, trả về giá trị ước lượng
+        return Response({
+            "view_count": job.view_count + (1 if recorded else 0),
+            "recorded": recorded
+        })
     
     @action(detail=True, methods=['post', 'delete'], url_path='feature')
     def feature(self, request, pk=None):
@@ -127,6 +127,10 @@ class Review(models.Model):
         db_table = 'reviews'
         verbose_name = 'Đánh giá công ty'
         verbose_name_plural = 'Đánh giá công ty'
+        indexes = [
+            # Keyset pagination: (-created_at, -id) trong một công ty
+            models.Index(fields=['company', 'status', '-created_at', '-id'], name='idx_reviews_company_keyset'),
+        ]
     
     def __str__(self):
         return f"{self.company.company_name} - {self.rating} sao"
@@ -32,6 +32,7 @@ from apps.social.reviews.selectors.reviews import (
 )
 from apps.company.companies.models import Company
 from apps.candidate.recruiters.models import Recruiter
+from apps.core.pagination import KeysetPagination
 
 
 class ReviewViewSet(viewsets.GenericViewSet):
@@ -206,6 +207,8 @@ class CompanyReviewsView(viewsets.GenericViewSet):
     GET /api/companies/:id/reviews - List company reviews
     POST /api/companies/:id/reviews - Create review
     """
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created_at', '-id')
     
     def get_permissions(self):
         if self.request.method == 'GET':
@@ -222,7 +225,7 @@ class CompanyReviewsView(viewsets.GenericViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        reviews = get_company_reviews(company_id)
+        reviews = self.paginate_queryset(get_company_reviews(company_id))
         stats = get_company_review_stats(company_id)
         serializer = ReviewListSerializer(reviews, many=True)
         
@@ -230,6 +233,8 @@ class CompanyReviewsView(viewsets.GenericViewSet):
             'company_id': company_id,
             'company_name': company.company_name,
             'reviews': serializer.data,
+            'next': self.paginator.get_next_link(),
+            'previous': self.paginator.get_previous_link(),
             'stats': stats,
         })
     
@@ -15,7 +15,8 @@ from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
 from channels.security.websocket import AllowedHostsOriginValidator
 
-from apps.communication.messages.routing import websocket_urlpatterns
+from apps.communication.messages.routing import websocket_urlpatterns as chat_websocket_urlpatterns
+from apps.communication.notifications.routing import websocket_urlpatterns as notification_websocket_urlpatterns
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
@@ -25,7 +26,7 @@ application = ProtocolTypeRouter({
     "http": django_asgi_app,
     "websocket": AllowedHostsOriginValidator(
         AuthMiddlewareStack(
-            URLRouter(websocket_urlpatterns)
+            URLRouter(chat_websocket_urlpatterns + notification_websocket_urlpatterns)
         )
     ),
 })
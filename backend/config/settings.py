@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 from dotenv import load_dotenv
+from celery.schedules import crontab
 
 # Load .env file
 try:
@@ -204,6 +205,46 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+
+# Cache: Redis; CACHE_REDIS_URL='' falls back to locmem (no Redis)
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', f"redis://{os.getenv('REDIS_HOST', 'localhost')}:6379/2")
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_REDIS_URL,
+    } if CACHE_REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'job-portal',
+    },
+}
+
+# Response cache of public job endpoints: in-process LRU (L1) + CACHES (L2)
+JOB_CACHE_L1_TTL = int(os.getenv('JOB_CACHE_L1_TTL', 5))
+JOB_CACHE_L2_TTL = int(os.getenv('JOB_CACHE_L2_TTL', 300))
+JOB_CACHE_L1_MAX_ENTRIES = int(os.getenv('JOB_CACHE_L1_MAX_ENTRIES', 1000))
+
+# Neighbours kept per job in the similar jobs table
+SIMILAR_JOBS_TOP_K = int(os.getenv('SIMILAR_JOBS_TOP_K', 10))
+# Changed jobs rescored per refresh (the rest wait for the next run) and
+# lifetime of the lock that keeps refreshes from overlapping
+SIMILAR_JOBS_MAX_CHANGED_PER_RUN = int(os.getenv('SIMILAR_JOBS_MAX_CHANGED_PER_RUN', 2000))
+SIMILAR_JOBS_LOCK_TIMEOUT = int(os.getenv('SIMILAR_JOBS_LOCK_TIMEOUT', 1800))
+
+# In-process job x skill matrix behind job recommendations
+JOB_RECOMMENDATION_REFRESH_SECONDS = int(os.getenv('JOB_RECOMMENDATION_REFRESH_SECONDS', 30))
+JOB_RECOMMENDATION_REBUILD_SECONDS = int(os.getenv('JOB_RECOMMENDATION_REBUILD_SECONDS', 3600))
+
+# CSV/XLSX exports: rows per database round trip, lifetime of async export status
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
+EXPORT_STATUS_TTL = int(os.getenv('EXPORT_STATUS_TTL', 86400))
+# Async export files: private directory shared by web and worker (never
+# under MEDIA_ROOT), downloadable by their owner for EXPORT_FILE_TTL seconds
+EXPORT_ROOT = os.getenv('EXPORT_ROOT', os.path.join(BASE_DIR, 'var', 'exports'))
+EXPORT_FILE_TTL = int(os.getenv('EXPORT_FILE_TTL', 86400))
+
+# Real-time notifications (SSE / WebSocket over the channel layer)
+NOTIFICATION_STREAM_HEARTBEAT_SECONDS = int(os.getenv('NOTIFICATION_STREAM_HEARTBEAT_SECONDS', 25))
+NOTIFICATION_STREAM_REPLAY_LIMIT = int(os.getenv('NOTIFICATION_STREAM_REPLAY_LIMIT', 100))
 ASGI_APPLICATION = 'config.asgi.application'
 
 # Channel Layers với Redis cho real-time
@@ -335,10 +376,52 @@ VNP_RETURN_URL = os.getenv('VNP_RETURN_URL', 'http://localhost:3000/billing/paym
 # ===== MongoDB Configuration (Chat) =====
 MONGO_URI = os.getenv('MONGO_URI', 'mongodb://mongo:27017/')
 MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'jobportal_chat')
+# WebSocket chat messages are buffered per ASGI process and written in batches
+CHAT_PERSIST_DELAY_MS = int(os.getenv('CHAT_PERSIST_DELAY_MS', 5))
+CHAT_PERSIST_BATCH_SIZE = int(os.getenv('CHAT_PERSIST_BATCH_SIZE', 200))
+# Active participant ids per thread (unread counter recipients)
+CHAT_PARTICIPANTS_CACHE_TTL = int(os.getenv('CHAT_PARTICIPANTS_CACHE_TTL', 300))
+# Per-process LRU in front of it (WebSocket connect ACL and recipients)
+CHAT_PARTICIPANTS_L1_TTL = int(os.getenv('CHAT_PARTICIPANTS_L1_TTL', 5))
+CHAT_PARTICIPANTS_L1_MAX_ENTRIES = int(os.getenv('CHAT_PARTICIPANTS_L1_MAX_ENTRIES', 10000))
+# At most one thread metadata UPDATE per thread and process every N seconds
+CHAT_THREAD_ACTIVITY_INTERVAL = int(os.getenv('CHAT_THREAD_ACTIVITY_INTERVAL', 2))
 
 # ===== AI Configuration =====
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+GEMINI_API_BASE_URL = os.getenv('GEMINI_API_BASE_URL')  # Override for a local fake server
+
+# Batched embedding client limits
+GEMINI_EMBED_BATCH_SIZE = int(os.getenv('GEMINI_EMBED_BATCH_SIZE', 100))
+GEMINI_EMBED_MAX_CONCURRENCY = int(os.getenv('GEMINI_EMBED_MAX_CONCURRENCY', 4))
+GEMINI_EMBED_REQUESTS_PER_SECOND = float(os.getenv('GEMINI_EMBED_REQUESTS_PER_SECOND', 5))
+GEMINI_EMBED_MAX_ATTEMPTS = int(os.getenv('GEMINI_EMBED_MAX_ATTEMPTS', 4))
+GEMINI_RETRY_BUDGET_RATIO = float(os.getenv('GEMINI_RETRY_BUDGET_RATIO', 0.2))
+
+# Candidate ANN index (recruiter embeddings, memory-mapped by workers)
+AI_CANDIDATE_INDEX_DIR = os.getenv('AI_CANDIDATE_INDEX_DIR', os.path.join(BASE_DIR, 'var', 'candidate_index'))
+AI_CANDIDATE_TOP_K = int(os.getenv('AI_CANDIDATE_TOP_K', 50))
+AI_CANDIDATE_INDEX_RETENTION_SECONDS = int(os.getenv('AI_CANDIDATE_INDEX_RETENTION_SECONDS', 3600))
+
+# Debounced match recompute (profile/skill edits coalesced per recruiter or job)
+AI_MATCH_RECOMPUTE_DEBOUNCE_SECONDS = int(os.getenv('AI_MATCH_RECOMPUTE_DEBOUNCE_SECONDS', 30))
+AI_MATCH_RECOMPUTE_MAX_WAIT_SECONDS = int(os.getenv('AI_MATCH_RECOMPUTE_MAX_WAIT_SECONDS', 300))
+AI_MATCH_RECOMPUTE_STALE_SECONDS = int(os.getenv('AI_MATCH_RECOMPUTE_STALE_SECONDS', 600))
+
+# Job alert digests (daily/weekly emails)
+FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:3000')
+JOB_ALERT_DIGEST_BATCH_SIZE = int(os.getenv('JOB_ALERT_DIGEST_BATCH_SIZE', 100))
+
+# Job view ingestion: views are buffered ('redis' stream or per-process
+# 'memory') and written in batches by flush_job_views_task
+JOB_VIEW_BUFFER = os.getenv('JOB_VIEW_BUFFER', 'redis')
+JOB_VIEW_REDIS_URL = os.getenv('JOB_VIEW_REDIS_URL', f"redis://{os.getenv('REDIS_HOST', 'localhost')}:6379/1")
+JOB_VIEW_DEDUP_SECONDS = int(os.getenv('JOB_VIEW_DEDUP_SECONDS', 1800))
+# Reverse proxies whose X-Forwarded-For is trusted (comma separated addresses)
+JOB_VIEW_TRUSTED_PROXIES = [ip.strip() for ip in os.getenv('JOB_VIEW_TRUSTED_PROXIES', '').split(',') if ip.strip()]
+JOB_VIEW_FLUSH_BATCH_SIZE = int(os.getenv('JOB_VIEW_FLUSH_BATCH_SIZE', 5000))
+JOB_VIEW_ROLLUP_BATCH_SIZE = int(os.getenv('JOB_VIEW_ROLLUP_BATCH_SIZE', 50000))
 
 # ===== Celery Configuration =====
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://redis:6379/0')
@@ -347,3 +430,41 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+
+# Celery beat: periodic jobs
+CELERY_BEAT_SCHEDULE = {
+    'job-alert-daily-digest': {
+        'task': 'apps.communication.job_alerts.tasks.send_job_alert_digest_task',
+        'schedule': crontab(hour=8, minute=0),
+        'args': ('daily',),
+    },
+    'job-alert-weekly-digest': {
+        'task': 'apps.communication.job_alerts.tasks.send_job_alert_digest_task',
+        'schedule': crontab(hour=8, minute=0, day_of_week='mon'),
+        'args': ('weekly',),
+    },
+    'job-facets-refresh': {
+        'task': 'apps.recruitment.jobs.tasks.refresh_job_facets_task',
+        'schedule': crontab(minute='*/10'),
+    },
+    'similar-jobs-refresh': {
+        'task': 'apps.recruitment.jobs.tasks.refresh_similar_jobs_task',
+        'schedule': crontab(minute='*/10'),
+    },
+    'job-views-flush': {
+        'task': 'apps.recruitment.job_views.tasks.flush_job_views_task',
+        'schedule': 30.0,
+    },
+    'job-views-rollup': {
+        'task': 'apps.recruitment.job_views.tasks.rollup_job_views_task',
+        'schedule': crontab(minute='*/5'),
+    },
+    'match-recompute-sweep': {
+        'task': 'apps.assessment.ai_matching_scores.tasks.requeue_stale_recomputes_task',
+        'schedule': crontab(minute='*/5'),
+    },
+    'exports-cleanup': {
+        'task': 'apps.core.users.tasks.cleanup_exports_task',
+        'schedule': crontab(minute=0),
+    },
+}
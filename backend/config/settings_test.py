@@ -149,6 +149,21 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tests',
+    }
+}
+
+# MongoDB chat store; unit tests mock the client, nothing connects to it
+MONGO_URI = 'mongodb://localhost:27017/'
+MONGO_DB_NAME = 'test_jobportal_chat'
+
+# Chat participant sets are not cached across tests (ids are reused after rollbacks)
+CHAT_PARTICIPANTS_CACHE_TTL = 0
+CHAT_PARTICIPANTS_L1_TTL = 0
+
 AUTH_PASSWORD_VALIDATORS = []
 
 LANGUAGE_CODE = 'en-us'
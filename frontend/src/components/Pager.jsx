@@ -0,0 +1,20 @@
+// Previous/Next buttons for cursor-paginated lists ({ next, previous, results }).
+// next/previous are the absolute links returned by the API; a null link disables its button.
+const Pager = ({ next, previous, onPage }) => {
+    if (!next && !previous) return null;
+
+    const buttonClass = 'px-4 py-2 rounded border bg-white hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed';
+
+    return (
+        <div className="flex justify-between mt-6">
+            <button className={buttonClass} disabled={!previous} onClick={() => onPage(previous)}>
+                Previous
+            </button>
+            <button className={buttonClass} disabled={!next} onClick={() => onPage(next)}>
+                Next
+            </button>
+        </div>
+    );
+};
+
+export default Pager;
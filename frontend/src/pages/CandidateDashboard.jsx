@@ -1,14 +1,19 @@
 import { useState, useEffect } from 'react';
 import api from '../services/api';
+import Pager from '../components/Pager';
 
 const CandidateDashboard = () => {
     const [applications, setApplications] = useState([]);
+    const [links, setLinks] = useState({ next: null, previous: null });
+
+    // url is 'applications/' for the first page, then the API's next/previous links
+    const fetchApps = async (url = 'applications/') => {
+        const res = await api.get(url);
+        setApplications(res.data.results);
+        setLinks({ next: res.data.next, previous: res.data.previous });
+    };
 
     useEffect(() => {
-        const fetchApps = async () => {
-            const res = await api.get('applications/');
-            setApplications(res.data);
-        };
         fetchApps();
     }, []);
 
@@ -24,8 +29,7 @@ const CandidateDashboard = () => {
                         {applications.map(app => (
                             <div key={app.id} className="border p-4 rounded flex justify-between items-center">
                                 <div>
-                                    <h3 className="font-bold text-lg">{app.job_detail?.title}</h3>
-                                    <p className="text-gray-600">{app.job_detail?.employer?.employer_profile?.company_name}</p>
+                                    <h3 className="font-bold text-lg">{app.job_title}</h3>
                                     <p className="text-xs text-gray-400">Applied on: {new Date(app.applied_at).toLocaleDateString()}</p>
                                 </div>
                                 <div>
@@ -39,6 +43,7 @@ const CandidateDashboard = () => {
                         ))}
                     </div>
                 )}
+                <Pager next={links.next} previous={links.previous} onPage={fetchApps} />
             </div>
         </div>
     );
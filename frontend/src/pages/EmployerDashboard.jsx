@@ -1,9 +1,11 @@
 import { useState, useEffect } from 'react';
 import api from '../services/api';
+import Pager from '../components/Pager';
 
 const EmployerDashboard = () => {
     const [jobs, setJobs] = useState([]);
     const [applications, setApplications] = useState([]);
+    const [appLinks, setAppLinks] = useState({ next: null, previous: null });
     const [activeTab, setActiveTab] = useState('jobs');
     const [newJob, setNewJob] = useState({ title: '', description: '', location: '', salary_range: '', deadline: '' });
 
@@ -21,8 +23,19 @@ const EmployerDashboard = () => {
         // For now, I'll trust the implemented functionality or just list all recent jobs if I see them.
         // Actually, viewing applications implies seeing who applied to MY jobs.
         const appsRes = await api.get('applications/');
-        setJobs(jobsRes.data); // This is ALL jobs public, probably should filter by current user's jobs if I had ID.
-        setApplications(appsRes.data); // API viewset filters this correctly for Employer.
+        setJobs(jobsRes.data.results); // This is ALL jobs public, probably should filter by current user's jobs if I had ID.
+        setApplicationPage(appsRes.data); // Applications to my jobs (and any I applied to)
+    };
+
+    // Lists are cursor paginated: { next, previous, results }
+    const setApplicationPage = (page) => {
+        setApplications(page.results);
+        setAppLinks({ next: page.next, previous: page.previous });
+    };
+
+    const fetchApplications = async (url) => {
+        const appsRes = await api.get(url);
+        setApplicationPage(appsRes.data);
     };
 
     const handleCreateJob = async (e) => {
@@ -76,14 +89,15 @@ const EmployerDashboard = () => {
                         <tbody>
                             {applications.map(app => (
                                 <tr key={app.id} className="border-t">
-                                    <td className="py-2">{app.candidate_detail?.email}</td>
-                                    <td className="py-2">{app.job_detail?.title}</td>
+                                    <td className="py-2">{app.recruiter_email}</td>
+                                    <td className="py-2">{app.job_title}</td>
                                     <td className="py-2"><span className="bg-yellow-100 text-yellow-800 px-2 rounded text-sm">{app.status}</span></td>
                                     <td className="py-2">{new Date(app.applied_at).toLocaleDateString()}</td>
                                 </tr>
                             ))}
                         </tbody>
                     </table>
+                    <Pager next={appLinks.next} previous={appLinks.previous} onPage={fetchApplications} />
                 </div>
             )}
         </div>
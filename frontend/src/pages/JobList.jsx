@@ -1,25 +1,31 @@
 import { useState, useEffect } from 'react';
 import api from '../services/api';
 import { Link } from 'react-router-dom';
+import Pager from '../components/Pager';
 
 const JobList = () => {
     const [jobs, setJobs] = useState([]);
+    const [links, setLinks] = useState({ next: null, previous: null });
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState('');
     const [search, setSearch] = useState('');
 
+    // url is 'jobs/' for the first page, then the API's next/previous links
+    const fetchJobs = async (url = 'jobs/') => {
+        try {
+            const res = await api.get(url);
+            setJobs(res.data.results);
+            setLinks({ next: res.data.next, previous: res.data.previous });
+            setError('');
+        } catch (err) {
+            console.error(err);
+            setError('Failed to load jobs');
+        } finally {
+            setLoading(false);
+        }
+    };
+
     useEffect(() => {
-        const fetchJobs = async () => {
-            try {
-                const res = await api.get('jobs/');
-                setJobs(res.data);
-            } catch (err) {
-                console.error(err);
-                setError('Failed to load jobs');
-            } finally {
-                setLoading(false);
-            }
-        };
         fetchJobs();
     }, []);
 
@@ -74,6 +80,8 @@ const JobList = () => {
                 ))}
                 {filteredJobs.length === 0 && <p className="text-center text-gray-500">No jobs found.</p>}
             </div>
+
+            <Pager next={links.next} previous={links.previous} onPage={fetchJobs} />
         </div>
     );
 };